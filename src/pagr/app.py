@@ -152,7 +152,7 @@ etl_manager = get_etl_manager()
 @st.cache_resource
 def get_portfolio_manager():
     """Create and cache portfolio manager instance."""
-    return PortfolioManager(etl_manager.memgraph_client)
+    return PortfolioManager(etl_manager.memgraph_client, sweeper=etl_manager.orphan_sweeper)
 
 portfolio_manager = get_portfolio_manager()
 
@@ -0,0 +1,185 @@
+"""Headless command line entry point (``pagr``).
+
+Runs the ETL pipeline without Streamlit, e.g. for overnight batches:
+
+    pagr etl data/accounts/ --report stats.json
+    pagr etl accounts.txt --clear
+    pagr refresh --kind prices --limit 500
+    pagr sweep --report sweep.json
+
+Sources may be directories (every supported portfolio file in them),
+manifests (``.txt``/``.lst``, one path per line) or portfolio files.
+``refresh`` re-fetches only graph nodes past their freshness TTL; ``sweep``
+deletes nodes no portfolio refers to any more. Run
+reports are JSON, written to ``--report`` or stdout; logs go to stderr.
+"""
+
+import argparse
+import json
+import logging
+import sys
+from typing import Dict, List, Optional
+
+from pagr.fds.services.orphan_sweeper import ORPHAN_KINDS
+from pagr.fds.services.refresh_planner import REFRESH_KINDS
+
+logger = logging.getLogger(__name__)
+
+EXIT_OK = 0
+EXIT_PARTIAL = 1
+EXIT_FAILED = 2
+
+
+def build_parser() -> argparse.ArgumentParser:
+    """Build the argument parser."""
+    parser = argparse.ArgumentParser(prog="pagr", description="Portfolio analytics graph tools")
+    parser.add_argument("--config", default="config/config.yaml", help="Path to config.yaml")
+    parser.add_argument("--log-level", default="INFO", help="Logging level (default: INFO)")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    etl = commands.add_parser("etl", help="Load, enrich and write many portfolios in one batch")
+    etl.add_argument("sources", nargs="+", help="Portfolio files, directories or manifests")
+    etl.add_argument("--clear", action="store_true", help="Clear the database before writing")
+    etl.add_argument(
+        "--transaction-size", type=int, default=1000, help="Graph statements per write transaction"
+    )
+    etl.add_argument("--report", default="-", help="Write the JSON report to this file (default: stdout)")
+
+    refresh = commands.add_parser("refresh", help="Refresh graph nodes past their freshness TTL")
+    refresh.add_argument(
+        "--kind", action="append", choices=REFRESH_KINDS, help="Node type to refresh (repeatable; default: all)"
+    )
+    refresh.add_argument("--limit", type=int, help="Most nodes of each type to refresh (default: from config)")
+    refresh.add_argument("--report", default="-", help="Write the JSON report to this file (default: stdout)")
+
+    sweep = commands.add_parser("sweep", help="Delete graph nodes no portfolio refers to")
+    sweep.add_argument(
+        "--kind", action="append", choices=ORPHAN_KINDS, help="Node type to sweep (repeatable; default: all)"
+    )
+    sweep.add_argument("--report", default="-", help="Write the JSON report to this file (default: stdout)")
+    return parser
+
+
+def write_report(report: Dict, path: str) -> None:
+    """Write a JSON run report to a file, or stdout for "-"."""
+    text = json.dumps(report, indent=2, default=str)
+    if path == "-":
+        print(text)
+    else:
+        with open(path, "w") as f:
+            f.write(text + "\n")
+        logger.info(f"Wrote report to {path}")
+
+
+def run_etl(args: argparse.Namespace) -> int:
+    """Run the batch ETL command.
+
+    Args:
+        args: Parsed arguments
+
+    Returns:
+        Process exit code
+    """
+    from pagr.etl_manager import ETLManager
+    from pagr.fds.services.batch import discover_portfolio_files
+
+    try:
+        files = discover_portfolio_files(args.sources)
+    except FileNotFoundError as e:
+        logger.error(str(e))
+        return EXIT_FAILED
+    if not files:
+        logger.error("No portfolio files found")
+        return EXIT_FAILED
+    logger.info(f"Processing {len(files)} portfolio files")
+
+    manager = ETLManager(config_path=args.config)
+    try:
+        result = manager.process_batch(
+            files,
+            clear=args.clear,
+            transaction_size=args.transaction_size,
+            progress=lambda stage, stats: logger.info(f"Stage: {stage}"),
+        )
+    except Exception as e:
+        logger.exception(f"Batch ETL failed: {e}")
+        return EXIT_FAILED
+
+    write_report(result.to_dict(), args.report)
+
+    if not result.portfolios:
+        return EXIT_FAILED
+    return EXIT_PARTIAL if result.failed else EXIT_OK
+
+
+def run_refresh(args: argparse.Namespace) -> int:
+    """Run the stale-node refresh command.
+
+    Args:
+        args: Parsed arguments
+
+    Returns:
+        Process exit code
+    """
+    from pagr.etl_manager import ETLManager
+
+    manager = ETLManager(config_path=args.config)
+    try:
+        result = manager.refresh_stale(kinds=args.kind, limit=args.limit)
+    except Exception as e:
+        logger.exception(f"Refresh failed: {e}")
+        return EXIT_FAILED
+
+    write_report(result.to_dict(), args.report)
+    return EXIT_PARTIAL if result.errors else EXIT_OK
+
+
+def run_sweep(args: argparse.Namespace) -> int:
+    """Run the orphan sweep command.
+
+    Args:
+        args: Parsed arguments
+
+    Returns:
+        Process exit code
+    """
+    from pagr.etl_manager import ETLManager
+
+    manager = ETLManager(config_path=args.config)
+    try:
+        result = manager.sweep_orphans(kinds=args.kind)
+    except Exception as e:
+        logger.exception(f"Sweep failed: {e}")
+        return EXIT_FAILED
+
+    write_report(result.to_dict(), args.report)
+    return EXIT_OK
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Console script entry point.
+
+    Args:
+        argv: Arguments (defaults to sys.argv[1:])
+
+    Returns:
+        Process exit code
+    """
+    args = build_parser().parse_args(argv)
+    logging.basicConfig(
+        level=args.log_level.upper(),
+        stream=sys.stderr,
+        format="%(asctime)s - %(name)s - %(levelname)s - %(message)s",
+    )
+
+    if args.command == "etl":
+        return run_etl(args)
+    if args.command == "refresh":
+        return run_refresh(args)
+    if args.command == "sweep":
+        return run_sweep(args)
+    return EXIT_FAILED
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,24 +1,46 @@
-"""ETL pipeline manager for Streamlit app."""
+"""ETL pipeline manager shared by the Streamlit app and the pagr CLI.
+
+This module must not import Streamlit, so headless batch runs work without it.
+"""
 
 import logging
+import threading
+import uuid
 from pathlib import Path
 import tempfile
-import streamlit as st
+from typing import Callable, Iterable, List, Optional
 
-from pagr.fds.config import load_config
+from pagr.fds.config import (
+    FIBOConfig, FreshnessConfig, JobsConfig, MaintenanceConfig, PricesConfig, RegistryConfig, load_config,
+)
 from pagr.fds.clients.factset_client import FactSetClient
+from pagr.fds.clients.rate_limiter import RateLimiter
+from pagr.fds.clients.fi_analytics_client import FIAnalyticsClient
 from pagr.fds.clients.memgraph_client import MemgraphClient
 from pagr.fds.loaders.portfolio_loader import PortfolioLoader
 from pagr.fds.graph.builder import GraphBuilder
-from pagr.fds.services.pipeline import ETLPipeline
-from pagr.fds.graph.queries import QueryService
-from pagr.session_manager import PipelineStatistics
+from pagr.fds.services.batch import BatchPipeline, BatchResult
+from pagr.fds.services.entity_registry import EntityRegistry
+from pagr.fds.services.job_runner import JobRunner, JobStore
+from pagr.fds.services.orphan_sweeper import OrphanSweeper, SweepResult
+from pagr.fds.services.pipeline import ETLPipeline, PIPELINE_STAGES
+from pagr.fds.services.bond_analytics import BondAnalyticsService
+from pagr.fds.services.price_refresh import PriceRefreshResult, PriceRefreshService
+from pagr.fds.services.price_store import PriceStore
+from pagr.fds.services.refresh_planner import RefreshPlanner, RefreshResult
+from pagr.fds.services.pricing import PriceFetcher
+from pagr.fds.enrichers.hierarchy_crawler import EntityHierarchyCrawler
+from pagr.fds.graph.queries import GraphQueries, QueryService
+from pagr.fds.graph.schema import IndexDefinition
 
 logger = logging.getLogger(__name__)
 
+# Stages reported by process_upload, for job progress
+UPLOAD_STAGES = PIPELINE_STAGES + ["write", "analytics"]
+
 
 class ETLManager:
-    """Manages ETL pipeline execution in Streamlit context."""
+    """Manages ETL pipeline execution for the Streamlit app and batch runs."""
 
     def __init__(self, config_path: str = "config/config.yaml"):
         """Initialize ETL manager with configuration."""
@@ -29,8 +51,24 @@ class ETLManager:
             self.config = None
 
         self._factset_client = None
+        self._fi_analytics_client = None
         self._memgraph_client = None
         self._query_service = None
+        self._hierarchy_crawler = None
+        self._price_store = None
+        self._job_runner = None
+        self._entity_registry = None
+        self._orphan_sweeper = None
+        # Graph version last stamped by this manager; any other version means
+        # another writer changed the graph since
+        self._graph_version = None
+
+        # One request budget for every FactSet client and thread in the process
+        rps = self.config.factset.rate_limit_rps if self.config else 10
+        self.rate_limiter = RateLimiter(rps)
+        # Uploads rewrite portfolio subgraphs and share the entity registry
+        # and hierarchy crawler, so they hold this lock while running
+        self._graph_lock = threading.RLock()
 
     @staticmethod
     def _read_factset_credentials(credentials_file: str) -> tuple[str, str]:
@@ -96,10 +134,28 @@ class ETLManager:
             self._factset_client = FactSetClient(
                 username=username,
                 api_key=api_key,
-                rate_limit_rps=10
+                rate_limit_rps=self.rate_limiter.rate,
+                rate_limiter=self.rate_limiter,
             )
         return self._factset_client
 
+    @property
+    def fi_analytics_client(self) -> FIAnalyticsClient:
+        """Get or create the FI analytics calculations client.
+
+        Use its calculate_async() from the UI so long-running calculations
+        do not block the Streamlit thread.
+        """
+        if self._fi_analytics_client is None:
+            factset = self.factset_client
+            kwargs = {}
+            if self.config:
+                kwargs = {"base_url": self.config.factset.fi_analytics_url, "timeout": self.config.factset.timeout}
+            self._fi_analytics_client = FIAnalyticsClient(
+                factset.username, factset.api_key, rate_limiter=self.rate_limiter, **kwargs
+            )
+        return self._fi_analytics_client
+
     @property
     def memgraph_client(self) -> MemgraphClient:
         """Get or create Memgraph client."""
@@ -131,6 +187,73 @@ class ETLManager:
             self._query_service = QueryService(self.memgraph_client)
         return self._query_service
 
+    @property
+    def hierarchy_crawler(self) -> EntityHierarchyCrawler:
+        """Get or create the hierarchy crawler shared across uploads."""
+        if self._hierarchy_crawler is None:
+            fibo = self.config.fibo if self.config else FIBOConfig()
+            self._hierarchy_crawler = EntityHierarchyCrawler(
+                self.factset_client,
+                max_depth=fibo.hierarchy_max_depth,
+                min_ownership=fibo.hierarchy_min_ownership,
+                batch_size=fibo.hierarchy_batch_size,
+            )
+        return self._hierarchy_crawler
+
+    @property
+    def price_store(self) -> PriceStore:
+        """Get or create the local price history store."""
+        if self._price_store is None:
+            prices = self.config.prices if self.config else PricesConfig()
+            self._price_store = PriceStore(prices.store_path)
+        return self._price_store
+
+    @property
+    def entity_registry(self) -> EntityRegistry:
+        """Get or create the registry of enriched entities shared across uploads."""
+        if self._entity_registry is None:
+            registry = self.config.registry if self.config else RegistryConfig()
+            self._entity_registry = EntityRegistry(registry.store_path, max_age_days=registry.max_age_days)
+        return self._entity_registry
+
+    @property
+    def job_runner(self) -> JobRunner:
+        """Get or create the background runner for upload jobs."""
+        if self._job_runner is None:
+            jobs = self.config.jobs if self.config else JobsConfig()
+            self._job_runner = JobRunner(
+                self.process_upload,
+                JobStore(jobs.store_path),
+                stages=UPLOAD_STAGES,
+                max_workers=jobs.max_workers,
+            )
+        return self._job_runner
+
+    @property
+    def orphan_sweeper(self) -> OrphanSweeper:
+        """Get or create the batched portfolio deleter and orphan sweeper."""
+        if self._orphan_sweeper is None:
+            maintenance = self.config.maintenance if self.config else MaintenanceConfig()
+            fibo = self.config.fibo if self.config else FIBOConfig()
+            self._orphan_sweeper = OrphanSweeper(
+                self.memgraph_client,
+                batch_size=maintenance.delete_batch_size,
+                company_depth=fibo.hierarchy_max_depth,
+            )
+        return self._orphan_sweeper
+
+    def submit_upload(self, uploaded_file, owner: Optional[str] = None) -> str:
+        """Queue an uploaded portfolio file for background processing.
+
+        Args:
+            uploaded_file: Streamlit uploaded file object
+            owner: Optional submitter, e.g. a session id
+
+        Returns:
+            Job id; poll it with job_runner.get()
+        """
+        return self.job_runner.submit(uploaded_file.name, uploaded_file.getvalue(), owner=owner)
+
     def check_connection(self) -> bool:
         """Check if Memgraph is accessible."""
         try:
@@ -146,7 +269,11 @@ class ETLManager:
 
     def process_uploaded_csv(self, uploaded_file) -> tuple:
         """
-        Process uploaded CSV through ETL pipeline.
+        Process uploaded portfolio file through ETL pipeline.
+
+        CSV, Parquet and Arrow IPC uploads are supported; the format is taken
+        from the uploaded file's name. This runs on the caller's thread; use
+        submit_upload() to process in the background.
 
         Args:
             uploaded_file: Streamlit uploaded file object
@@ -157,52 +284,326 @@ class ETLManager:
         Raises:
             Exception: If processing fails
         """
-        # Write uploaded file to temp location
-        with tempfile.NamedTemporaryFile(delete=False, suffix=".csv", mode='wb') as tmp_file:
-            tmp_file.write(uploaded_file.getvalue())
+        return self.process_upload(getattr(uploaded_file, "name", None), uploaded_file.getvalue())
+
+    def process_upload(
+        self,
+        name: Optional[str],
+        data: bytes,
+        progress: Optional[Callable] = None,
+    ) -> tuple:
+        """
+        Process portfolio file contents through the ETL pipeline.
+
+        Args:
+            name: Original file name (its extension selects the reader)
+            data: File contents
+            progress: Optional callback invoked with each UPLOAD_STAGES name
+                and the running PipelineStatistics
+
+        Returns:
+            Tuple of (Portfolio, PipelineStatistics)
+
+        Raises:
+            Exception: If processing fails
+        """
+        # Write uploaded file to temp location, keeping its extension so the
+        # loader picks the right reader
+        suffix = Path(name).suffix.lower() if isinstance(name, str) else ""
+        if suffix.lstrip(".") not in PortfolioLoader.SUPPORTED_FORMATS:
+            suffix = ".csv"
+        with tempfile.NamedTemporaryFile(delete=False, suffix=suffix, mode='wb') as tmp_file:
+            tmp_file.write(data)
             tmp_path = tmp_file.name
 
+        def report(stage, stats):
+            if progress is not None:
+                progress(stage, stats)
+
+        try:
+            with self._graph_lock:
+                return self._run_pipeline(tmp_path, report)
+        finally:
+            # Clean up temp file
+            Path(tmp_path).unlink(missing_ok=True)
+
+    def _run_pipeline(self, tmp_path: str, report: Callable) -> tuple:
+        """Run the ETL pipeline on a file and replace that portfolio's subgraph.
+
+        Other portfolios and the shared entity nodes are left in place; only
+        entities not yet in the graph are written.
+
+        Raises:
+            MemgraphQueryError: If a write transaction fails
+        """
+        # Ensure Memgraph connection is established
+        if not self.memgraph_client.is_connected:
+            self.memgraph_client.connect()
+
+        # Indexes back MERGE lookups on position_id / fibo_id
+        self.setup_database_schema()
+        self._sync_with_graph()
+
+        portfolio_loader = PortfolioLoader()
+        graph_builder = GraphBuilder()
+
+        pipeline = ETLPipeline(
+            factset_client=self.factset_client,
+            portfolio_loader=portfolio_loader,
+            graph_builder=graph_builder,
+            fibo_config=self.config.fibo if self.config else None,
+            hierarchy_crawler=self.hierarchy_crawler,
+            price_store=self.price_store,
+            entity_registry=self.entity_registry,
+        )
+
+        # Execute ETL pipeline
+        portfolio, statements, stats = pipeline.execute(tmp_path, progress=report)
+
+        if not portfolio:
+            raise Exception("Failed to load portfolio")
+
+        # Execute graph statements in Memgraph
+        report("write", stats)
+        # Re-uploading a portfolio replaces its positions and aggregates in the
+        # first write transaction; entities it no longer references are left
+        # to the orphan sweep
+        statements = GraphQueries.replace_portfolio(portfolio.name) + statements
+        logger.info(f"Writing {len(statements)} graph statements")
         try:
-            # Ensure Memgraph connection is established
+            self.memgraph_client.execute_transactions(statements)
+        except Exception:
+            # Earlier batches may have committed; let readers see that
+            self.mark_graph_changed()
+            raise
+        self.entity_registry.mark_in_graph(pipeline.graph_entity_ids)
+
+        report("analytics", stats)
+        self.refresh_bond_analytics([portfolio.name])
+        self.mark_graph_changed()
+
+        logger.info(f"Pipeline complete: {stats.positions_loaded} positions, "
+                   f"{stats.companies_enriched} companies enriched")
+
+        return portfolio, stats
+
+    def process_batch(
+        self,
+        portfolio_files: Iterable[str],
+        clear: bool = False,
+        transaction_size: int = 1000,
+        progress: Optional[Callable] = None,
+    ) -> BatchResult:
+        """
+        Process many portfolio files in one run and write them to Memgraph.
+
+        Identifiers shared between portfolios are priced and enriched once
+        (see BatchPipeline), and the resulting statements are committed in
+        transactions of transaction_size statements.
+
+        Args:
+            portfolio_files: Portfolio file paths
+            clear: Clear the database before writing
+            transaction_size: Statements per write transaction
+            progress: Optional callback invoked with each stage name and the
+                running PipelineStatistics
+
+        Returns:
+            BatchResult
+
+        Raises:
+            MemgraphQueryError: If a write transaction fails
+        """
+        def report(stage, stats):
+            if progress is not None:
+                progress(stage, stats)
+
+        with self._graph_lock:
             if not self.memgraph_client.is_connected:
                 self.memgraph_client.connect()
+            if clear:
+                self.clear_database()
+            else:
+                self._sync_with_graph()
+            self.setup_database_schema()
 
-            # Clear existing data from database
-            self.clear_database()
+            pipeline = ETLPipeline(
+                factset_client=self.factset_client,
+                portfolio_loader=PortfolioLoader(),
+                graph_builder=GraphBuilder(),
+                fibo_config=self.config.fibo if self.config else None,
+                hierarchy_crawler=self.hierarchy_crawler,
+                price_store=self.price_store,
+                entity_registry=self.entity_registry,
+            )
+            result = BatchPipeline(pipeline).execute(portfolio_files, progress=report)
+
+            report("write", result.stats)
+            deletes = [] if clear else [
+                statement
+                for portfolio in result.portfolios
+                for statement in GraphQueries.replace_portfolio(portfolio.name)
+            ]
+            if result.statements:
+                logger.info(f"Writing {len(result.statements)} graph statements")
+                # Old portfolios are removed in the same transaction as the
+                # first write batch, so a failed write leaves them in place
+                first = deletes + result.statements[:transaction_size]
+                self.memgraph_client.execute_transactions(first, batch_size=len(first))
+                if len(result.statements) > transaction_size:
+                    self.memgraph_client.execute_transactions(
+                        result.statements[transaction_size:], batch_size=transaction_size
+                    )
+            self.entity_registry.mark_in_graph(pipeline.graph_entity_ids)
+
+            report("analytics", result.stats)
+            self.refresh_bond_analytics([portfolio.name for portfolio in result.portfolios])
+            self.query_service.invalidate_caches()
+            self.mark_graph_changed()
+
+        return result
+
+    def refresh_prices(self) -> PriceRefreshResult:
+        """Reprice every portfolio in the database without re-running enrichment.
 
-            portfolio_loader = PortfolioLoader()
-            graph_builder = GraphBuilder()
+        Returns:
+            PriceRefreshResult with counts and any errors
+        """
+        if not self.memgraph_client.is_connected:
+            self.memgraph_client.connect()
+
+        service = PriceRefreshService(
+            self.memgraph_client,
+            PriceFetcher(self.factset_client),
+            query_service=self.query_service,
+        )
+        result = service.refresh()
+        self.refresh_bond_analytics()
+        self.mark_graph_changed()
+        return result
+
+    def refresh_stale(self, kinds: Optional[Iterable[str]] = None, limit: Optional[int] = None) -> RefreshResult:
+        """Refresh only the prices, profiles and hierarchies past their TTL.
+
+        TTLs and the per-type limit come from the freshness config section.
 
+        Args:
+            kinds: Subset of refresh_planner.REFRESH_KINDS (all if omitted)
+            limit: Override for the most nodes of each type refreshed
+
+        Returns:
+            RefreshResult with counts and any errors
+        """
+        freshness = self.config.freshness if self.config else FreshnessConfig()
+        if limit is not None:
+            freshness = freshness.model_copy(update={"max_refresh_per_run": limit})
+
+        with self._graph_lock:
+            if not self.memgraph_client.is_connected:
+                self.memgraph_client.connect()
+
+            # A dedicated pipeline: no registry, so stale nodes are rewritten,
+            # and its own crawler, so re-crawls don't reset the uploads' one
             pipeline = ETLPipeline(
                 factset_client=self.factset_client,
-                portfolio_loader=portfolio_loader,
-                graph_builder=graph_builder
+                portfolio_loader=PortfolioLoader(),
+                graph_builder=GraphBuilder(),
+                fibo_config=self.config.fibo if self.config else None,
+            )
+            planner = RefreshPlanner(
+                self.memgraph_client,
+                pipeline,
+                PriceRefreshService(
+                    self.memgraph_client,
+                    PriceFetcher(self.factset_client),
+                    query_service=self.query_service,
+                ),
+                config=freshness,
             )
+            result = planner.refresh(kinds)
+            if result.prices_refreshed or result.profiles_refreshed:
+                self.refresh_bond_analytics()
+            if result.prices_refreshed or result.statements_executed:
+                self.mark_graph_changed()
 
-            # Execute ETL pipeline
-            portfolio, statements, stats = pipeline.execute(tmp_path)
+        return result
 
-            if not portfolio:
-                raise Exception("Failed to load portfolio")
+    def refresh_bond_analytics(self, portfolio_names: Optional[List[str]] = None) -> int:
+        """Recompute yield, duration, convexity and accrued interest on Bond nodes.
 
-            # Execute graph statements in Memgraph
-            if statements:
-                logger.info(f"Executing {len(statements)} graph statements")
-                for stmt in statements:
-                    try:
-                        self.memgraph_client.execute_query(stmt)
-                    except Exception as e:
-                        logger.warning(f"Statement execution error: {e}")
-                        stats.errors.append(str(e))
+        Failures are logged and do not interrupt the caller.
 
-            logger.info(f"Pipeline complete: {stats.positions_loaded} positions, "
-                       f"{stats.companies_enriched} companies enriched")
+        Args:
+            portfolio_names: Only bonds held by these portfolios (all bonds if omitted)
 
-            return portfolio, stats
+        Returns:
+            Number of bonds updated
+        """
+        try:
+            return BondAnalyticsService(self.memgraph_client).refresh(portfolio_names=portfolio_names)
+        except Exception as e:
+            logger.warning(f"Bond analytics refresh failed: {e}")
+            return 0
 
-        finally:
-            # Clean up temp file
-            Path(tmp_path).unlink(missing_ok=True)
+    def sweep_orphans(self, kinds: Optional[Iterable[str]] = None) -> SweepResult:
+        """Delete graph nodes no longer referenced by any portfolio.
+
+        Args:
+            kinds: Subset of orphan_sweeper.ORPHAN_KINDS (all if omitted)
+
+        Returns:
+            SweepResult with deletions per kind
+        """
+        with self._graph_lock:
+            if not self.memgraph_client.is_connected:
+                self.memgraph_client.connect()
+
+            result = self.orphan_sweeper.sweep(kinds)
+            if result.total_deleted:
+                # Swept entities must be written and crawled again by the next upload
+                if self._entity_registry is not None:
+                    self._entity_registry.forget_graph()
+                if self._hierarchy_crawler is not None:
+                    self._hierarchy_crawler.reset()
+                self.query_service.invalidate_caches()
+                self.mark_graph_changed()
+        return result
+
+    def mark_graph_changed(self) -> None:
+        """Stamp the graph with a new version after a write.
+
+        PortfolioManager caches reconstructed portfolios against this stamp,
+        so every write path must call it. The stamp is also remembered, so
+        _sync_with_graph can tell this manager's writes from anyone else's.
+        Failures are logged and do not interrupt the caller.
+        """
+        version = uuid.uuid4().hex
+        try:
+            self.memgraph_client.execute_query(GraphQueries.stamp_graph_version(), {"version": version})
+            self._graph_version = version
+        except Exception as e:
+            logger.warning(f"Failed to stamp graph version: {e}")
+            self._graph_version = None
+
+    def _sync_with_graph(self) -> None:
+        """Resync in-process graph membership if another writer changed the graph.
+
+        The entity registry's in-graph set and the hierarchy crawler's visited
+        companies decide which entity nodes an upload links to instead of
+        writing. They stay accurate across this manager's own writes; after
+        anyone else's (a CLI run, a portfolio deletion) they are reloaded from
+        the graph and reset.
+        """
+        rows = self.memgraph_client.execute_query(GraphQueries.graph_version())
+        version = rows[0].get("version") if rows else None
+        if version is not None and version == self._graph_version:
+            return
+
+        # Link to entity nodes already in the graph instead of rewriting them
+        self.entity_registry.sync_from_graph(self.memgraph_client)
+        if self._hierarchy_crawler is not None:
+            self._hierarchy_crawler.reset()
+        self._graph_version = version
 
     def clear_database(self):
         """Clear all data from Memgraph database."""
@@ -213,6 +614,13 @@ class ETLManager:
 
             logger.info("Clearing database")
             self.memgraph_client.execute_query("MATCH (n) DETACH DELETE n")
+            if self._hierarchy_crawler is not None:
+                # Crawled hierarchies are gone with the graph; allow re-crawling
+                self._hierarchy_crawler.reset()
+            if self._entity_registry is not None:
+                # Cached enrichments stay valid; their nodes must be written again
+                self._entity_registry.forget_graph()
+            self.mark_graph_changed()
             logger.info("Database cleared successfully")
         except Exception as e:
             logger.error(f"Failed to clear database: {e}")
@@ -222,8 +630,15 @@ class ETLManager:
         """Set up database indexes for better query performance."""
         try:
             logger.info("Setting up database indexes")
-            # Indexes are created by the GraphBuilder during graph creation
-            # Additional optimization can be added here if needed
+            if not self.memgraph_client.is_connected:
+                self.memgraph_client.connect()
+
+            # Memgraph's CREATE INDEX is idempotent; failures are non-fatal
+            for statement in IndexDefinition.get_indexes():
+                try:
+                    self.memgraph_client.execute_query(statement)
+                except Exception as e:
+                    logger.debug(f"Index statement skipped ({statement}): {e}")
             logger.info("Database optimization configuration complete")
         except Exception as e:
             logger.warning(f"Schema setup issue: {e}")
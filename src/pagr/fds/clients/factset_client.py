@@ -8,6 +8,8 @@ from typing import Any, Optional
 import requests
 from tenacity import retry, stop_after_attempt, wait_exponential, retry_if_exception_type
 
+from pagr.fds.clients.rate_limiter import RateLimiter
+
 logger = logging.getLogger(__name__)
 
 
@@ -49,6 +51,7 @@ class FactSetClient:
         rate_limit_rps: int = 10,
         timeout: int = 30,
         max_retries: int = 3,
+        rate_limiter: Optional[RateLimiter] = None,
     ):
         """Initialize FactSet API client.
 
@@ -59,6 +62,9 @@ class FactSetClient:
             rate_limit_rps: Requests per second limit
             timeout: Request timeout in seconds
             max_retries: Maximum retry attempts
+            rate_limiter: Shared rate limiter, so several clients and threads stay
+                within one request budget (a private one at rate_limit_rps is
+                created if omitted)
 
         Raises:
             ValueError: If credentials are invalid
@@ -72,8 +78,7 @@ class FactSetClient:
         self.timeout = timeout
         self.max_retries = max_retries
 
-        # Rate limiting: delay between requests
-        self.rate_limit_delay = 1.0 / rate_limit_rps
+        self.rate_limiter = rate_limiter or RateLimiter(rate_limit_rps)
 
         # Create session with auth
         self.session = requests.Session()
@@ -115,6 +120,7 @@ class FactSetClient:
         url = f"{self.base_url}{endpoint}"
 
         try:
+            self.rate_limiter.acquire()
             if method.upper() == "POST":
                 response = self.session.post(
                     url, json=json_data, timeout=self.timeout, **kwargs
@@ -159,9 +165,6 @@ class FactSetClient:
             # Check for other errors
             response.raise_for_status()
 
-            # Apply rate limiting
-            time.sleep(self.rate_limit_delay)
-
             # Parse response
             return response.json()
 
@@ -269,17 +272,44 @@ class FactSetClient:
         end_date = datetime.now().strftime("%Y-%m-%d")
         start_date = (datetime.now() - timedelta(days=5)).strftime("%Y-%m-%d")
 
-        logger.info(f"Fetching prices for {len(tickers)} tickers from {start_date} to {end_date}")
+        return self.get_price_history(tickers, start_date, end_date)
+
+    def get_price_history(
+        self,
+        ids: list[str],
+        start_date: str,
+        end_date: str,
+        id_type: Optional[str] = None,
+    ) -> dict:
+        """Fetch daily close prices for an explicit date range.
+
+        Args:
+            ids: Tickers (or ISINs/CUSIPs with id_type)
+            start_date: First date (YYYY-MM-DD, inclusive)
+            end_date: Last date (YYYY-MM-DD, inclusive)
+            id_type: Optional identifier type ("ISIN" or "CUSIP")
+
+        Returns:
+            API response with one item per identifier and trading day
+
+        Raises:
+            FactSetClientError: If API call fails
+        """
+        logger.info(f"Fetching prices for {len(ids)} ids from {start_date} to {end_date}")
+
+        json_data = {
+            "ids": ids,
+            "frequency": "D",
+            "startDate": start_date,
+            "endDate": end_date
+        }
+        if id_type:
+            json_data["idType"] = id_type
 
         return self._make_request(
             "POST",
             "/content/factset-global-prices/v1/prices",
-            json_data={
-                "ids": tickers,
-                "frequency": "D",
-                "startDate": start_date,
-                "endDate": end_date
-            },
+            json_data=json_data,
         )
 
     def get_bond_prices(self, identifiers: list[str], id_type: str = "CUSIP") -> dict:
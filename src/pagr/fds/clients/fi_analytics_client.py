@@ -0,0 +1,449 @@
+"""Client for the FactSet Fixed Income analytics engine (FI API v3).
+
+Calculations are long-running: POST /calculations returns 201 with the
+result when it finishes quickly, otherwise 202 with a Location to poll.
+FIAnalyticsClient submits bond sleeves in batches, polls every outstanding
+job from one loop with backoff (honouring the server's Cache-Control
+max-age hint), yields results as jobs complete, and caches rows per
+(bond, as-of date, discount curve, calculations). calculate_async() runs a
+request on a worker thread so callers like the Streamlit app never block.
+"""
+
+import logging
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import Any, Dict, Iterable, Iterator, List, Mapping, Optional, Sequence, Tuple
+
+import requests
+
+from pagr.fds.clients.factset_client import (
+    FactSetAuthenticationError,
+    FactSetClient,
+    FactSetClientError,
+    FactSetNotFoundError,
+    FactSetPermissionError,
+)
+from pagr.fds.clients.rate_limiter import RateLimiter
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_BASE_URL = "https://api.factset.com/analytics/engines/fi/v3"
+
+CacheKey = Tuple[str, str, str, Tuple[str, ...]]
+
+
+@dataclass
+class FICalculationJob:
+    """A submitted calculation and its polling state."""
+
+    symbols: List[str]
+    calculation_id: Optional[str] = None
+    poll_interval: float = 1.0
+    next_poll: float = 0.0
+    done: bool = False
+    result: Any = None
+
+
+@dataclass
+class FIResultCache:
+    """Thread-safe cache of result rows per (symbol, as-of date, curve, calculations)."""
+
+    rows: Dict[CacheKey, Dict[str, Any]] = field(default_factory=dict)
+    _lock: threading.Lock = field(default_factory=threading.Lock, repr=False)
+
+    def get(self, key: CacheKey) -> Optional[Dict[str, Any]]:
+        """Return a cached row, or None."""
+        with self._lock:
+            return self.rows.get(key)
+
+    def put(self, key: CacheKey, row: Dict[str, Any]) -> None:
+        """Store a row."""
+        with self._lock:
+            self.rows[key] = row
+
+    def __len__(self) -> int:
+        return len(self.rows)
+
+
+class FIAnalyticsClient:
+    """Batching, polling and caching client for FI analytics calculations."""
+
+    def __init__(
+        self,
+        username: str,
+        api_key: str,
+        base_url: str = DEFAULT_BASE_URL,
+        timeout: int = 30,
+        batch_size: int = 500,
+        poll_interval: float = 1.0,
+        max_poll_interval: float = 30.0,
+        backoff: float = 1.5,
+        max_wait: float = 600.0,
+        cache: Optional[FIResultCache] = None,
+        max_workers: int = 2,
+        rate_limiter: Optional[RateLimiter] = None,
+        max_retries: int = 3,
+    ):
+        """Initialize FI analytics client.
+
+        Args:
+            username: FactSet username (format: USERNAME-SERIAL)
+            api_key: FactSet API key
+            base_url: FI engine base URL
+            timeout: Request timeout in seconds
+            batch_size: Securities per calculation request
+            poll_interval: First status poll delay in seconds
+            max_poll_interval: Upper bound on the poll delay
+            backoff: Multiplier applied to the poll delay after each pending poll
+            max_wait: Seconds to wait for all jobs before giving up
+            cache: Result cache (a new one is created if omitted)
+            max_workers: Threads used by calculate_async
+            rate_limiter: Optional limiter shared with other FactSet clients
+            max_retries: Retries after a rate-limited (429) response
+
+        Raises:
+            ValueError: If credentials are missing
+        """
+        if not username or not api_key:
+            raise ValueError("Username and API key are required")
+
+        self.base_url = base_url.rstrip("/")
+        self.timeout = timeout
+        self.batch_size = max(1, batch_size)
+        self.poll_interval = poll_interval
+        self.max_poll_interval = max_poll_interval
+        self.backoff = backoff
+        self.max_wait = max_wait
+        self.cache = cache or FIResultCache()
+        self.rate_limiter = rate_limiter
+        self.max_retries = max(0, max_retries)
+
+        self.session = requests.Session()
+        self.session.auth = (username, api_key)
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="fi-analytics")
+
+        logger.info(f"Initialized FI analytics client for {username}")
+
+    def close(self) -> None:
+        """Shut down the background worker threads and HTTP session."""
+        self._executor.shutdown(wait=False, cancel_futures=True)
+        self.session.close()
+
+    def _request(
+        self, method: str, path: str, json_data: Optional[dict] = None, headers: Optional[dict] = None
+    ) -> requests.Response:
+        """Send a request and map error statuses to FactSet client errors.
+
+        Args:
+            method: HTTP method
+            path: Path under the FI base URL
+            json_data: JSON request body
+            headers: Extra request headers
+
+        Returns:
+            Response with a 2xx status
+
+        Raises:
+            FactSetAuthenticationError: If authentication fails (401)
+            FactSetPermissionError: If access is denied (403)
+            FactSetNotFoundError: If the calculation or endpoint is unknown (404)
+            FactSetClientError: For other errors, including still being rate
+                limited after max_retries retries
+        """
+        url = path if path.startswith("http") else f"{self.base_url}{path}"
+        for attempt in range(self.max_retries + 1):
+            if self.rate_limiter is not None:
+                self.rate_limiter.acquire()
+            try:
+                response = self.session.request(method, url, json=json_data, headers=headers, timeout=self.timeout)
+            except requests.exceptions.RequestException as e:
+                logger.error(f"FI analytics request error for {path}: {e}")
+                raise FactSetClientError(f"Request error: {e}")
+
+            if response.status_code != 429:
+                break
+            if attempt == self.max_retries:
+                raise FactSetClientError(f"FI analytics rate limited after {attempt + 1} attempts: {path}")
+            retry_after = float(response.headers.get("Retry-After", 5))
+            logger.warning(f"FI analytics rate limited. Waiting {retry_after} seconds before retry...")
+            time.sleep(retry_after)
+
+        if response.status_code == 401:
+            raise FactSetAuthenticationError("Invalid credentials. Check FDS_USERNAME and FDS_API_KEY.")
+        if response.status_code == 403:
+            raise FactSetPermissionError(f"No access to {path}. Check your API subscription.")
+        if response.status_code == 404:
+            raise FactSetNotFoundError(f"Not found: {path}")
+        if response.status_code >= 400:
+            raise FactSetClientError(f"FI analytics error {response.status_code}: {response.text[:200]}")
+        return response
+
+    def get_discount_curves(self, currency: Optional[str] = None) -> dict:
+        """List available discount curves.
+
+        Args:
+            currency: Optional currency filter (e.g. "USD")
+
+        Returns:
+            API response keyed by curve name
+        """
+        path = "/discount-curves" + (f"?currency={currency}" if currency else "")
+        return self._request("GET", path).json()
+
+    def submit(
+        self,
+        securities: List[Dict[str, Any]],
+        calculations: Sequence[str],
+        as_of_date: str,
+        settlement: Optional[str] = None,
+    ) -> FICalculationJob:
+        """Submit one calculation request.
+
+        Args:
+            securities: FISecurity objects (symbol, calcFromValue, ...)
+            calculations: Calculation names (e.g. "Effective Duration")
+            as_of_date: As-of date (YYYYMMDD or YYYY-MM-DD)
+            settlement: Optional settlement date for all securities
+
+        Returns:
+            FICalculationJob (already done if the server answered 201)
+        """
+        job_settings = {"asOfDate": as_of_date}
+        if settlement:
+            job_settings["settlement"] = settlement
+        body = {
+            "data": {
+                "securities": securities,
+                "calculations": list(calculations),
+                "jobSettings": job_settings,
+            },
+            "meta": {"contentorganization": "SimplifiedRow", "format": "JsonStach"},
+        }
+        response = self._request("POST", "/calculations", json_data=body)
+        job = FICalculationJob(
+            symbols=[s["symbol"] for s in securities],
+            poll_interval=self.poll_interval,
+            next_poll=time.monotonic() + self.poll_interval,
+        )
+
+        if response.status_code == 201:
+            job.done = True
+            job.result = response.json().get("data")
+            return job
+
+        location = response.headers.get("Location", "")
+        job.calculation_id = location.rstrip("/").split("/")[-2] if location.endswith("/status") else None
+        if not job.calculation_id:
+            job.calculation_id = ((response.json() or {}).get("data") or {}).get("calculationId")
+        if not job.calculation_id:
+            raise FactSetClientError("FI analytics accepted the calculation but returned no calculation id")
+        logger.debug(f"Submitted FI calculation {job.calculation_id} for {len(securities)} securities")
+        return job
+
+    def poll(self, job: FICalculationJob) -> bool:
+        """Poll a job's status once, fetching the result when it completes.
+
+        Args:
+            job: Job to poll
+
+        Returns:
+            True if the job is done
+        """
+        if job.done:
+            return True
+        response = self._request("GET", f"/calculations/{job.calculation_id}/status")
+
+        if response.status_code == 202:
+            hint = _max_age(response.headers.get("Cache-Control"))
+            job.poll_interval = min(
+                self.max_poll_interval, hint if hint is not None else job.poll_interval * self.backoff
+            )
+            job.next_poll = time.monotonic() + job.poll_interval
+            return False
+
+        payload = response.json() if response.content else {}
+        if payload.get("data") is not None:
+            job.result = payload["data"]
+        else:
+            job.result = self._request("GET", f"/calculations/{job.calculation_id}/result").json().get("data")
+        job.done = True
+        return True
+
+    def cancel(self, job: FICalculationJob) -> None:
+        """Cancel a pending calculation (errors are logged and ignored)."""
+        if job.done or not job.calculation_id:
+            return
+        try:
+            self._request("DELETE", f"/calculations/{job.calculation_id}")
+        except FactSetClientError as e:
+            logger.debug(f"Could not cancel FI calculation {job.calculation_id}: {e}")
+
+    def wait_all(self, jobs: Iterable[FICalculationJob]) -> Iterator[FICalculationJob]:
+        """Wait on many jobs at once, yielding each as it completes.
+
+        Args:
+            jobs: Submitted jobs
+
+        Yields:
+            Completed jobs, in completion order
+
+        Raises:
+            FactSetClientError: If jobs are still pending after max_wait
+                (they are cancelled first)
+        """
+        pending = []
+        for job in jobs:
+            if job.done:
+                yield job
+            else:
+                pending.append(job)
+
+        deadline = time.monotonic() + self.max_wait
+        while pending:
+            now = time.monotonic()
+            if now > deadline:
+                for job in pending:
+                    self.cancel(job)
+                raise FactSetClientError(f"{len(pending)} FI calculations still pending after {self.max_wait}s")
+
+            due = min(job.next_poll for job in pending)
+            if due > now:
+                time.sleep(min(due - now, deadline - now))
+                continue
+
+            still_pending = []
+            for job in pending:
+                if job.next_poll <= time.monotonic() and self.poll(job):
+                    yield job
+                else:
+                    still_pending.append(job)
+            pending = still_pending
+
+    def calculate(
+        self,
+        prices: Mapping[str, float],
+        calculations: Sequence[str],
+        as_of_date: str,
+        discount_curve: Optional[str] = None,
+        calc_from_method: str = "Price",
+    ) -> Iterator[Dict[str, Any]]:
+        """Calculate analytics for a bond sleeve, streaming rows as they arrive.
+
+        Cached rows are yielded first; the remaining bonds are submitted in
+        batches of batch_size and their rows yielded as each job completes.
+
+        Args:
+            prices: Symbol (CUSIP/ISIN) -> value the calculation starts from
+            calculations: Calculation names
+            as_of_date: As-of date
+            discount_curve: Optional discount curve name
+            calc_from_method: How calcFromValue is interpreted (e.g. "Price")
+
+        Yields:
+            One row per symbol: {symbol, as_of_date, discount_curve, <calculation>: value}
+        """
+        calculations = tuple(calculations)
+        curve = discount_curve or ""
+        missing = []
+        for symbol in dict.fromkeys(prices):
+            cached = self.cache.get((symbol, as_of_date, curve, calculations))
+            if cached is not None:
+                yield cached
+            else:
+                missing.append(symbol)
+        if not missing:
+            return
+
+        jobs = []
+        for start in range(0, len(missing), self.batch_size):
+            batch = missing[start : start + self.batch_size]
+            securities = []
+            for symbol in batch:
+                security = {
+                    "symbol": symbol,
+                    "calcFromValue": float(prices[symbol]),
+                    "calcFromMethod": calc_from_method,
+                }
+                if discount_curve:
+                    security["discountCurve"] = discount_curve
+                securities.append(security)
+            jobs.append(self.submit(securities, calculations, as_of_date))
+        logger.info(f"Submitted {len(jobs)} FI calculation jobs for {len(missing)} bonds")
+
+        for job in self.wait_all(jobs):
+            for symbol, values in _result_rows(job.result, job.symbols):
+                row = {"symbol": symbol, "as_of_date": as_of_date, "discount_curve": discount_curve, **values}
+                self.cache.put((symbol, as_of_date, curve, calculations), row)
+                yield row
+
+    def calculate_async(
+        self,
+        prices: Mapping[str, float],
+        calculations: Sequence[str],
+        as_of_date: str,
+        discount_curve: Optional[str] = None,
+        calc_from_method: str = "Price",
+    ) -> "Future[List[Dict[str, Any]]]":
+        """Run calculate() on a worker thread.
+
+        Args:
+            prices: Symbol -> value the calculation starts from
+            calculations: Calculation names
+            as_of_date: As-of date
+            discount_curve: Optional discount curve name
+            calc_from_method: How calcFromValue is interpreted
+
+        Returns:
+            Future resolving to the list of result rows
+        """
+        prices = dict(prices)
+        return self._executor.submit(
+            lambda: list(self.calculate(prices, calculations, as_of_date, discount_curve, calc_from_method))
+        )
+
+    @classmethod
+    def from_credentials_file(cls, credentials_file: str, **kwargs: Any) -> "FIAnalyticsClient":
+        """Create a client from an fds-api.key file.
+
+        Args:
+            credentials_file: Path to the credentials file
+            **kwargs: Further FIAnalyticsClient arguments
+
+        Returns:
+            FIAnalyticsClient
+        """
+        factset = FactSetClient.from_credentials_file(credentials_file)
+        return cls(factset.username, factset.api_key, **kwargs)
+
+
+def _max_age(cache_control: Optional[str]) -> Optional[float]:
+    """Parse max-age seconds from a Cache-Control header."""
+    if not cache_control:
+        return None
+    for part in str(cache_control).split(","):
+        name, _, value = part.strip().partition("=")
+        if name.lower() == "max-age":
+            try:
+                return float(value)
+            except ValueError:
+                return None
+    return None
+
+
+def _result_rows(data: Any, symbols: List[str]) -> Iterator[Tuple[str, Dict[str, Any]]]:
+    """Yield (symbol, values) from a SimplifiedRow result.
+
+    Rows carrying a symbol column are keyed by it; otherwise rows are
+    matched to the submitted securities in order.
+    """
+    rows = data.get("rows", []) if isinstance(data, dict) else (data or [])
+    for index, row in enumerate(rows):
+        if not isinstance(row, dict):
+            continue
+        key = next((k for k in row if k.lower() == "symbol"), None)
+        symbol = row[key] if key else (symbols[index] if index < len(symbols) else None)
+        if symbol is None:
+            continue
+        yield symbol, {k: v for k, v in row.items() if k != key}
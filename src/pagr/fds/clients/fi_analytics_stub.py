@@ -0,0 +1,162 @@
+"""Local stand-in for the FI analytics calculations API.
+
+FIAnalyticsStubServer serves /calculations, /calculations/{id}/status,
+/calculations/{id}/result and /discount-curves on localhost from a
+background thread, so FIAnalyticsClient can be exercised (in tests or a
+demo) without FactSet access. Each calculation reports 202 for a
+configurable number of status polls before completing; values are
+deterministic functions of the symbol, the calcFromValue and the
+calculation name.
+
+Example:
+    with FIAnalyticsStubServer(pending_polls=2) as server:
+        client = FIAnalyticsClient("user", "key", base_url=server.base_url)
+"""
+
+import hashlib
+import json
+import threading
+import uuid
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, List, Optional
+
+
+class FIAnalyticsStubServer:
+    """In-process HTTP server mimicking the FI analytics engine."""
+
+    def __init__(self, pending_polls: int = 1, immediate: bool = False, max_age: Optional[int] = None):
+        """Initialize stub server (call start() or use as a context manager).
+
+        Args:
+            pending_polls: Status polls answered with 202 before a job completes
+            immediate: Answer POST /calculations with 201 and the result
+            max_age: Optional Cache-Control max-age sent with 202 responses
+        """
+        self.pending_polls = pending_polls
+        self.immediate = immediate
+        self.max_age = max_age
+        self.jobs: Dict[str, Dict[str, Any]] = {}
+        self.requests: List[Dict[str, Any]] = []
+        self.cancelled: List[str] = []
+        self._lock = threading.Lock()
+        self._server: Optional[ThreadingHTTPServer] = None
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def base_url(self) -> str:
+        """Base URL to pass to FIAnalyticsClient."""
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self) -> "FIAnalyticsStubServer":
+        """Start serving on an ephemeral localhost port."""
+        self._server = ThreadingHTTPServer(("127.0.0.1", 0), self._handler())
+        self._thread = threading.Thread(
+            target=self._server.serve_forever, kwargs={"poll_interval": 0.05}, daemon=True
+        )
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        """Stop the server."""
+        if self._server is not None:
+            self._server.shutdown()
+            self._server.server_close()
+            self._server = None
+
+    def __enter__(self) -> "FIAnalyticsStubServer":
+        return self.start()
+
+    def __exit__(self, *exc_info) -> None:
+        self.stop()
+
+    @staticmethod
+    def value(symbol: str, calc_from_value: float, calculation: str) -> float:
+        """Deterministic stand-in value for one calculation."""
+        digest = hashlib.sha256(f"{symbol}|{calculation}".encode()).digest()
+        return round(int.from_bytes(digest[:4], "big") / 2**32 * 10 + calc_from_value / 100, 6)
+
+    def _result(self, parameters: Dict[str, Any]) -> List[Dict[str, Any]]:
+        """SimplifiedRow result rows for a calculation request."""
+        return [
+            {
+                "Symbol": security["symbol"],
+                **{
+                    name: self.value(security["symbol"], float(security.get("calcFromValue", 0)), name)
+                    for name in parameters.get("calculations", [])
+                },
+            }
+            for security in parameters.get("securities", [])
+        ]
+
+    def _handler(self):
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def log_message(self, format, *args):  # noqa: A002 - silence request logging
+                pass
+
+            def _send(self, status: int, payload: Any = None, headers: Optional[Dict[str, str]] = None):
+                body = json.dumps(payload).encode() if payload is not None else b""
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(body)))
+                for name, value in (headers or {}).items():
+                    self.send_header(name, value)
+                self.end_headers()
+                self.wfile.write(body)
+
+            def do_POST(self):
+                if self.path != "/calculations":
+                    return self._send(404, {"errors": [{"detail": "Not found"}]})
+                length = int(self.headers.get("Content-Length", 0))
+                body = json.loads(self.rfile.read(length) or b"{}")
+                parameters = body.get("data") or {}
+                if not parameters.get("securities") or not parameters.get("jobSettings", {}).get("asOfDate"):
+                    return self._send(400, {"errors": [{"detail": "securities and jobSettings.asOfDate are required"}]})
+
+                with stub._lock:
+                    stub.requests.append(parameters)
+                    if stub.immediate:
+                        return self._send(201, {"data": stub._result(parameters)})
+                    calculation_id = uuid.uuid4().hex
+                    stub.jobs[calculation_id] = {"parameters": parameters, "polls": 0}
+                self._send(
+                    202,
+                    {"data": {"calculationId": calculation_id}},
+                    {"Location": f"{stub.base_url}/calculations/{calculation_id}/status"},
+                )
+
+            def do_GET(self):
+                parts = self.path.strip("/").split("/")
+                if parts[0].startswith("discount-curves"):
+                    return self._send(200, {"data": {"UST": {"name": "UST", "category": "Treasury", "currency": "USD"}}})
+                if len(parts) != 3 or parts[0] != "calculations":
+                    return self._send(404, {"errors": [{"detail": "Not found"}]})
+
+                calculation_id, action = parts[1], parts[2]
+                with stub._lock:
+                    job = stub.jobs.get(calculation_id)
+                    if job is None:
+                        return self._send(404, {"errors": [{"detail": "Unknown calculation"}]})
+                    if action == "status":
+                        job["polls"] += 1
+                        if job["polls"] <= stub.pending_polls:
+                            headers = {"X-FactSet-Api-PickUp-Progress": f"{job['polls']}/{stub.pending_polls + 1}"}
+                            if stub.max_age is not None:
+                                headers["Cache-Control"] = f"max-age={stub.max_age}"
+                            return self._send(202, None, headers)
+                        return self._send(201, None)
+                    if action == "result" and job["polls"] > stub.pending_polls:
+                        return self._send(200, {"data": stub._result(job["parameters"])})
+                self._send(404, {"errors": [{"detail": "Result not ready"}]})
+
+            def do_DELETE(self):
+                parts = self.path.strip("/").split("/")
+                with stub._lock:
+                    if len(parts) == 2 and stub.jobs.pop(parts[1], None) is not None:
+                        stub.cancelled.append(parts[1])
+                        return self._send(204)
+                self._send(404, {"errors": [{"detail": "Unknown calculation"}]})
+
+        return Handler
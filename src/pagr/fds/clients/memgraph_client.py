@@ -165,6 +165,48 @@ class MemgraphClient:
             logger.error(f"Batch execution failed: {e}")
             raise MemgraphQueryError(f"Batch failed: {e}") from e
 
+    def execute_transactions(self, queries: List[str], batch_size: int = 1000) -> int:
+        """Execute Cypher queries in explicit transactions of up to batch_size queries.
+
+        Each transaction commits as a unit, so a failing query rolls back
+        only its own batch.
+
+        Args:
+            queries: List of Cypher query strings
+            batch_size: Queries per transaction
+
+        Returns:
+            Number of queries committed
+
+        Raises:
+            MemgraphQueryError: If a transaction fails
+        """
+        if not self.is_connected:
+            raise MemgraphConnectionError("Not connected to Memgraph. Call connect() first.")
+
+        if self._connection is None:
+            # Mock mode
+            logger.debug(f"Mock: Executing {len(queries)} queries in transactions")
+            return len(queries)
+
+        committed = 0
+        batch_size = max(1, batch_size)
+        try:
+            with self._connection.session() as session:
+                for start in range(0, len(queries), batch_size):
+                    batch = queries[start:start + batch_size]
+                    with session.begin_transaction() as tx:
+                        for query in batch:
+                            tx.run(query)
+                        tx.commit()
+                    committed += len(batch)
+            logger.info(f"Committed {committed} queries in transactions of {batch_size}")
+            return committed
+
+        except Exception as e:
+            logger.error(f"Transaction failed after {committed} committed queries: {e}")
+            raise MemgraphQueryError(f"Transaction failed after {committed} committed queries: {e}") from e
+
     def clear_database(self, confirm: bool = False) -> None:
         """Delete all data from database (WARNING: destructive operation).
 
@@ -0,0 +1,66 @@
+"""Thread-safe token bucket shared by FactSet API clients.
+
+FactSet enforces its request limit per credential, not per client object,
+so every client built from the same credentials (upload jobs running on
+background threads, price refreshes from the UI, FI analytics polling)
+should draw from one RateLimiter instead of sleeping independently.
+"""
+
+import threading
+import time
+from typing import Callable, Optional
+
+
+class RateLimiter:
+    """Token bucket allowing ``rate`` requests per second with bursts of ``burst``."""
+
+    def __init__(
+        self,
+        rate: float,
+        burst: Optional[int] = None,
+        clock: Callable[[], float] = time.monotonic,
+        sleep: Callable[[float], None] = time.sleep,
+    ):
+        """Initialize rate limiter.
+
+        Args:
+            rate: Sustained requests per second
+            burst: Bucket capacity (defaults to 1, i.e. evenly spaced requests)
+            clock: Monotonic clock, injectable for tests
+            sleep: Sleep function, injectable for tests
+
+        Raises:
+            ValueError: If rate or burst is not positive
+        """
+        if rate <= 0:
+            raise ValueError("rate must be positive")
+        self.rate = float(rate)
+        self.burst = burst or 1
+        if self.burst < 1:
+            raise ValueError("burst must be at least 1")
+
+        self._clock = clock
+        self._sleep = sleep
+        self._tokens = float(self.burst)
+        self._updated = clock()
+        self._lock = threading.Lock()
+
+    def acquire(self) -> float:
+        """Take one token, blocking until it is available.
+
+        Callers reserve their slot under the lock and sleep outside it, so
+        waiting threads are released in arrival order at the bucket rate.
+
+        Returns:
+            Seconds waited
+        """
+        with self._lock:
+            now = self._clock()
+            self._tokens = min(float(self.burst), self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+            self._tokens -= 1.0
+            wait = -self._tokens / self.rate if self._tokens < 0 else 0.0
+
+        if wait > 0:
+            self._sleep(wait)
+        return wait
@@ -2,7 +2,7 @@
 
 import os
 from pathlib import Path
-from typing import Any
+from typing import Any, Optional
 
 import yaml
 from pydantic import BaseModel, Field
@@ -30,6 +30,10 @@ class FactSetConfig(BaseModel):
     max_retries: int = Field(default=3, description="Maximum retry attempts")
     cache_enabled: bool = Field(default=False, description="Enable API response caching")
     cache_dir: str = Field(default="data/cache", description="Cache directory")
+    fi_analytics_url: str = Field(
+        default="https://api.factset.com/analytics/engines/fi/v3",
+        description="FI analytics calculations engine base URL",
+    )
 
 
 class PortfolioConfig(BaseModel):
@@ -37,7 +41,7 @@ class PortfolioConfig(BaseModel):
 
     default_file: str = Field(default="data/sample_portfolio.csv", description="Default portfolio file")
     supported_formats: list[str] = Field(
-        default=["csv", "xlsx"], description="Supported file formats"
+        default=["csv", "parquet", "arrow", "feather", "pagr"], description="Supported file formats"
     )
 
 
@@ -50,6 +54,72 @@ class FIBOConfig(BaseModel):
     )
     fetch_executives: bool = Field(default=True, description="Fetch executive data")
     fetch_geography: bool = Field(default=True, description="Fetch geographic data")
+    executives_batch_size: int = Field(
+        default=25, description="Entity IDs per officer profiles request"
+    )
+    hierarchy_max_depth: int = Field(
+        default=2, description="Maximum ownership hops crawled from portfolio issuers"
+    )
+    hierarchy_min_ownership: float = Field(
+        default=0.0, description="Minimum ownership % for a subsidiary edge to be followed"
+    )
+    hierarchy_batch_size: int = Field(
+        default=25, description="Entity IDs per entity-structures request"
+    )
+
+
+class PricesConfig(BaseModel):
+    """Price history configuration."""
+
+    store_path: str = Field(
+        default="data/prices.sqlite", description="SQLite file for the local price history store"
+    )
+
+
+class RegistryConfig(BaseModel):
+    """Entity registry configuration."""
+
+    store_path: str = Field(
+        default=":memory:", description="SQLite file to persist enriched entities to (:memory: keeps them per process)"
+    )
+    max_age_days: float = Field(default=7.0, description="Days before a cached entity is re-enriched")
+
+
+class FreshnessConfig(BaseModel):
+    """Per-type TTLs and batch limits for refreshing stale graph nodes."""
+
+    price_ttl_minutes: float = Field(default=15.0, description="Minutes before a security's price is stale")
+    profile_ttl_days: float = Field(default=14.0, description="Days before security/company profiles are stale")
+    hierarchy_ttl_days: float = Field(default=90.0, description="Days before a company's entity structure is stale")
+    max_refresh_per_run: int = Field(default=200, description="Most nodes of each type refreshed per run")
+
+
+class MaintenanceConfig(BaseModel):
+    """Portfolio deletion and orphan sweep configuration."""
+
+    delete_batch_size: int = Field(default=5000, description="Most nodes deleted per transaction")
+
+
+class JobsConfig(BaseModel):
+    """Background upload job configuration."""
+
+    store_path: str = Field(default="data/jobs.sqlite", description="SQLite file recording upload jobs")
+    max_workers: int = Field(default=1, description="Upload jobs processed concurrently")
+
+
+class RiskConfig(BaseModel):
+    """Monte Carlo VaR/ES configuration."""
+
+    model: str = Field(default="historical", description="Covariance model: historical or factor")
+    paths: int = Field(default=10000, description="Number of simulated paths")
+    chunk_size: int = Field(default=5000, description="Paths simulated per chunk (bounds memory)")
+    seed: Optional[int] = Field(default=None, description="Random seed for reproducible runs")
+    workers: int = Field(default=1, description="Threads used to simulate chunks in parallel")
+    horizon_days: int = Field(default=1, description="Risk horizon in trading days")
+    lookback_days: int = Field(default=365, description="Calendar days of price history used")
+    confidence_levels: list[float] = Field(
+        default=[0.95, 0.99], description="VaR/ES confidence levels"
+    )
 
 
 class LoggingConfig(BaseModel):
@@ -71,6 +141,12 @@ class AppConfig(BaseModel):
     factset: FactSetConfig = Field(default_factory=FactSetConfig)
     portfolio: PortfolioConfig = Field(default_factory=PortfolioConfig)
     fibo: FIBOConfig = Field(default_factory=FIBOConfig)
+    prices: PricesConfig = Field(default_factory=PricesConfig)
+    jobs: JobsConfig = Field(default_factory=JobsConfig)
+    registry: RegistryConfig = Field(default_factory=RegistryConfig)
+    freshness: FreshnessConfig = Field(default_factory=FreshnessConfig)
+    maintenance: MaintenanceConfig = Field(default_factory=MaintenanceConfig)
+    risk: RiskConfig = Field(default_factory=RiskConfig)
     logging: LoggingConfig = Field(default_factory=LoggingConfig)
 
 
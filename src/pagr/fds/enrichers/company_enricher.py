@@ -106,22 +106,9 @@ class CompanyEnricher:
 
             executives = []
             for officer in response["data"]:
-                name = officer.get("name")
-                title = officer.get("title")
-
-                if not name:
-                    continue
-
-                # Create Executive entity
-                exec_entity = Executive(
-                    fibo_id=f"fibo:person:{entity_id}:{name.lower().replace(' ', '-')}",
-                    name=name,
-                    title=title,
-                    start_date=officer.get("startDate"),
-                )
-
-                executives.append(exec_entity)
-                logger.debug(f"Found executive: {name} ({title})")
+                exec_entity = self._build_executive(entity_id, officer)
+                if exec_entity:
+                    executives.append(exec_entity)
 
             logger.info(f"Found {len(executives)} executives for {entity_id}")
             return executives
@@ -130,11 +117,61 @@ class CompanyEnricher:
             logger.error(f"Error enriching executives for {entity_id}: {e}")
             raise
 
-    def get_ceo(self, entity_id: str) -> Optional[Executive]:
+    def enrich_executives_bulk(
+        self, entity_ids: list[str], batch_size: int = 25
+    ) -> dict[str, list[Executive]]:
+        """Enrich executives for many companies with batched profile requests.
+
+        Officers are attributed to companies by the response's requestId; a
+        single-entity batch attributes every officer to that entity. A failed
+        batch is logged and skipped so the remaining batches still load.
+
+        Args:
+            entity_ids: FactSet entity IDs
+            batch_size: Maximum entity IDs per profiles request
+
+        Returns:
+            Dict of entity_id -> list of Executive entities
+        """
+        unique_ids = list(dict.fromkeys(eid for eid in entity_ids if eid))
+        executives: dict[str, list[Executive]] = {eid: [] for eid in unique_ids}
+        batch_size = max(1, batch_size)
+
+        logger.info(f"Enriching executives for {len(unique_ids)} entities in bulk")
+
+        for start in range(0, len(unique_ids), batch_size):
+            batch = unique_ids[start : start + batch_size]
+            try:
+                response = self.client.get_company_officers(batch)
+            except Exception as e:
+                logger.warning(f"Failed to fetch officers for {len(batch)} entities: {e}")
+                continue
+
+            for officer in response.get("data") or []:
+                entity_id = officer.get("requestId")
+                if entity_id not in executives:
+                    if len(batch) != 1:
+                        logger.debug(f"Skipping officer with unknown requestId: {entity_id}")
+                        continue
+                    entity_id = batch[0]
+
+                exec_entity = self._build_executive(entity_id, officer)
+                if exec_entity:
+                    executives[entity_id].append(exec_entity)
+
+        total = sum(len(execs) for execs in executives.values())
+        logger.info(f"Found {total} executives for {len(unique_ids)} entities")
+        return executives
+
+    def get_ceo(
+        self, entity_id: str, executives: Optional[list[Executive]] = None
+    ) -> Optional[Executive]:
         """Get CEO of a company.
 
         Args:
             entity_id: FactSet entity ID
+            executives: Already-fetched executives for the company; when given,
+                no API request is made
 
         Returns:
             CEO Executive entity or None if not found
@@ -142,12 +179,50 @@ class CompanyEnricher:
         Raises:
             Exception: If API call fails
         """
-        executives = self.enrich_executives(entity_id)
+        if executives is None:
+            executives = self.enrich_executives(entity_id)
 
         for exec_entity in executives:
-            if exec_entity.title and "chief executive" in exec_entity.title.lower():
+            if self.is_ceo(exec_entity):
                 logger.debug(f"Found CEO: {exec_entity.name}")
                 return exec_entity
 
         logger.debug(f"No CEO found for {entity_id}")
         return None
+
+    @staticmethod
+    def is_ceo(executive: Executive) -> bool:
+        """Check whether an executive's title is chief executive.
+
+        Args:
+            executive: Executive entity
+
+        Returns:
+            True if the title names a chief executive
+        """
+        return bool(executive.title and "chief executive" in executive.title.lower())
+
+    @staticmethod
+    def _build_executive(entity_id: str, officer: dict) -> Optional[Executive]:
+        """Build an Executive from an officer profile record.
+
+        Args:
+            entity_id: FactSet entity ID of the company
+            officer: Officer record from the profiles endpoint
+
+        Returns:
+            Executive entity, or None if the record has no name
+        """
+        name = officer.get("name")
+        if not name:
+            return None
+
+        title = officer.get("title")
+        logger.debug(f"Found executive: {name} ({title})")
+        return Executive(
+            fibo_id=f"fibo:person:{entity_id}:{name.lower().replace(' ', '-')}",
+            name=name,
+            title=title,
+            start_date=officer.get("startDate"),
+            company_fibo_id=f"fibo:company:{entity_id}",
+        )
@@ -0,0 +1,182 @@
+"""Breadth-first crawler for corporate entity hierarchies.
+
+Walks FactSet entity structures outward from a set of issuers, one frontier
+level at a time, issuing one batched entity-structures request per chunk of
+the frontier rather than one request per company.
+"""
+
+import logging
+from dataclasses import dataclass, field
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+from pagr.fds.clients.factset_client import FactSetClient
+from pagr.fds.models.fibo import Company, Relationship
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class HierarchyResult:
+    """Relationships and newly discovered entities from a crawl."""
+
+    relationships: List[Relationship] = field(default_factory=list)
+    companies: Dict[str, Company] = field(default_factory=dict)
+    # Entity IDs whose structures were fetched successfully
+    crawled: List[str] = field(default_factory=list)
+    entities_visited: int = 0
+    requests_made: int = 0
+
+
+class EntityHierarchyCrawler:
+    """Crawls parent/subsidiary structures breadth-first with a shared visited set.
+
+    The visited set lives on the crawler, so reusing one instance across
+    portfolios skips entities whose structure has already been fetched.
+    """
+
+    def __init__(
+        self,
+        factset_client: FactSetClient,
+        max_depth: int = 2,
+        min_ownership: float = 0.0,
+        batch_size: int = 25,
+    ):
+        """Initialize hierarchy crawler.
+
+        Args:
+            factset_client: FactSet API client
+            max_depth: Maximum ownership hops away from the seed issuers
+            min_ownership: Minimum ownership percentage (0-100) for an edge to be followed
+            batch_size: Maximum entity IDs per entity-structures request
+        """
+        self.client = factset_client
+        self.max_depth = max_depth
+        self.min_ownership = min_ownership
+        self.batch_size = max(1, batch_size)
+        self.visited: Set[str] = set()
+        self._seen_edges: Set[Tuple[str, str]] = set()
+
+    def reset(self) -> None:
+        """Forget visited entities, e.g. after the graph has been cleared."""
+        self.visited.clear()
+        self._seen_edges.clear()
+
+    def crawl(self, entity_ids: Iterable[str]) -> HierarchyResult:
+        """Crawl hierarchies starting from the given FactSet entity IDs.
+
+        Args:
+            entity_ids: Seed FactSet entity IDs (typically the portfolio's issuers)
+
+        Returns:
+            HierarchyResult with HAS_SUBSIDIARY relationships and stub companies
+            for entities discovered during the crawl
+        """
+        result = HierarchyResult()
+        seeds = set(entity_ids)
+        frontier = sorted(eid for eid in seeds if eid and eid not in self.visited)
+
+        depth = 0
+        while frontier and depth < self.max_depth:
+            logger.info(
+                f"Crawling entity structures: level {depth}, {len(frontier)} entities"
+            )
+            discovered: Set[str] = set()
+            for start in range(0, len(frontier), self.batch_size):
+                batch = frontier[start : start + self.batch_size]
+                items = self._fetch_structures(batch)
+                result.requests_made += 1
+                if items is None:
+                    # Left unvisited so a later crawl retries them
+                    continue
+                self.visited.update(batch)
+                result.entities_visited += len(batch)
+                result.crawled.extend(batch)
+                discovered.update(self._collect(items, set(batch), seeds, result))
+
+            depth += 1
+            frontier = sorted(discovered - self.visited)
+
+        logger.info(
+            f"Hierarchy crawl complete: {len(result.relationships)} relationships, "
+            f"{len(result.companies)} new entities, {result.requests_made} requests"
+        )
+        return result
+
+    def _fetch_structures(self, batch: List[str]) -> Optional[List[dict]]:
+        """Fetch entity structures for one batch, tolerating failures.
+
+        Args:
+            batch: FactSet entity IDs
+
+        Returns:
+            List of structure items, or None if the request failed
+        """
+        try:
+            response = self.client.get_entity_structure(batch)
+            return response.get("data") or []
+        except Exception as e:
+            logger.warning(f"Failed to fetch entity structures for {len(batch)} entities: {e}")
+            return None
+
+    def _collect(
+        self,
+        items: List[dict],
+        batch: Set[str],
+        seeds: Set[str],
+        result: HierarchyResult,
+    ) -> Set[str]:
+        """Turn structure items into relationships and return the next frontier.
+
+        Args:
+            items: Entity structure items from the API
+            batch: Entity IDs that were requested
+            seeds: Seed entity IDs (already present in the graph as full companies)
+            result: Result to accumulate into
+
+        Returns:
+            Entity IDs reached through followed edges
+        """
+        reached: Set[str] = set()
+
+        for item in items:
+            parent_id = item.get("parentId")
+            child_id = item.get("entityId")
+            if not parent_id or not child_id or parent_id == child_id:
+                continue
+            if parent_id not in batch and child_id not in batch:
+                continue
+
+            ownership_pct = item.get("ownershipPercentage")
+            if ownership_pct is not None and ownership_pct < self.min_ownership:
+                continue
+
+            reached.update((parent_id, child_id))
+            if (parent_id, child_id) in self._seen_edges:
+                continue
+            self._seen_edges.add((parent_id, child_id))
+
+            for entity_id, name in (
+                (parent_id, item.get("parentName")),
+                (child_id, item.get("entityName")),
+            ):
+                fibo_id = f"fibo:company:{entity_id}"
+                if entity_id not in seeds and fibo_id not in result.companies:
+                    result.companies[fibo_id] = Company(
+                        fibo_id=fibo_id,
+                        factset_id=entity_id,
+                        name=name or entity_id,
+                    )
+
+            properties = {"ownership_percentage": ownership_pct}
+            result.relationships.append(
+                Relationship(
+                    rel_type="HAS_SUBSIDIARY",
+                    source_fibo_id=f"fibo:company:{parent_id}",
+                    target_fibo_id=f"fibo:company:{child_id}",
+                    source_type="company",
+                    target_type="company",
+                    properties={k: v for k, v in properties.items() if v is not None},
+                )
+            )
+
+        return reached
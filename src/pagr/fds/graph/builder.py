@@ -1,12 +1,13 @@
 """Graph builder for constructing Cypher queries from FIBO entities.
 
 Transforms enriched portfolio and company data into graph nodes and relationships.
-Uses MERGE for entities (avoid duplicates) and CREATE for positions (unique per import).
+Uses MERGE throughout; positions are keyed by a deterministic position_id so
+re-running an import is idempotent.
 """
 
 import logging
-from typing import Dict, List, Optional, Tuple, Any
-from datetime import datetime
+from typing import Dict, Iterable, List, Optional, Tuple, Any
+from datetime import datetime, timezone
 
 from pagr.fds.models.portfolio import Portfolio, Position
 from pagr.fds.models.fibo import (
@@ -21,6 +22,7 @@ from pagr.fds.models.fibo import (
     RelationshipType,
 )
 from pagr.fds.graph.schema import NodeLabel, RelationshipType as SchemaRelType
+from pagr.fds.graph.queries import GraphQueries
 
 logger = logging.getLogger(__name__)
 
@@ -30,13 +32,26 @@ class GraphBuilder:
 
     Converts FIBO entities into Cypher CREATE/MERGE statements.
     Handles batching and performance optimization.
+
+    Enriched nodes (companies, countries, executives, stocks and bonds) are
+    stamped with ``source``, ``fetched_at``, ``created_at`` and ``updated_at``
+    so RefreshPlanner can tell how stale each one is.
     """
 
-    def __init__(self):
-        """Initialize graph builder."""
+    def __init__(self, source: str = "factset"):
+        """Initialize graph builder.
+
+        Args:
+            source: Data source recorded on enriched nodes
+        """
+        self.source = source
         self.node_statements: List[str] = []
         self.relationship_statements: List[str] = []
         self.merge_set_statements: Dict[str, List[str]] = {}
+        # fibo_id -> ISO fetched-at for entities enriched before this build
+        # (e.g. served from the entity registry); others use self.timestamp
+        self.fetched_at: Dict[str, str] = {}
+        self.timestamp = self._now()
         logger.debug("Initialized GraphBuilder")
 
     def clear(self) -> None:
@@ -44,6 +59,8 @@ class GraphBuilder:
         self.node_statements = []
         self.relationship_statements = []
         self.merge_set_statements = {}
+        self.fetched_at = {}
+        self.timestamp = self._now()
 
     def add_portfolio_nodes(self, portfolio: Portfolio) -> None:
         """Add portfolio node to graph.
@@ -56,11 +73,9 @@ class GraphBuilder:
         total_value = portfolio.total_value or 0.0
 
         query = (
-            f"MERGE (p:Portfolio {{"
-            f"name: '{name}', "
-            f"created_at: '{created_at}', "
-            f"total_value: {total_value}"
-            f"}}) "
+            f"MERGE (p:Portfolio {{name: '{name}'}}) "
+            f"SET p.created_at = '{created_at}', "
+            f"p.total_value = {total_value} "
             f"RETURN p;"
         )
         self.node_statements.append(query)
@@ -69,7 +84,9 @@ class GraphBuilder:
     def add_position_nodes(self, positions: List[Position], portfolio_name: str) -> None:
         """Add position nodes and CONTAINS relationships.
 
-        Positions are unique per portfolio import, so use CREATE not MERGE.
+        Positions are keyed by a deterministic position_id and written with
+        MERGE, so re-running an import updates nodes in place instead of
+        creating duplicates, and CONTAINS matches a single indexed node.
 
         Args:
             positions: List of Position instances
@@ -77,45 +94,43 @@ class GraphBuilder:
         """
         portfolio_name_escaped = self._escape_string(portfolio_name)
 
-        for pos in positions:
+        for pos, position_id in zip(positions, Position.position_ids(positions, portfolio_name)):
+            position_id = self._escape_string(position_id)
             # Handle None ticker (for bonds) - use empty string
             ticker = self._escape_string(pos.ticker) if pos.ticker else ""
-            ticker_var = (ticker or "None").replace("-", "_").replace(".", "_")  # Sanitize for use as Cypher variable
             quantity = pos.quantity
-            market_value = pos.market_value
             security_type = self._escape_string(pos.security_type or "Unknown")
             weight = pos.weight or 0.0
 
-            # Create position node
-            isin = f", isin: '{self._escape_string(pos.isin)}'" if pos.isin else ""
-            cusip = f", cusip: '{self._escape_string(pos.cusip)}'" if pos.cusip else ""
-            cost_basis = f", cost_basis: {pos.book_value}" if pos.book_value else ""
+            isin = f", pos.isin = '{self._escape_string(pos.isin)}'" if pos.isin else ""
+            cusip = f", pos.cusip = '{self._escape_string(pos.cusip)}'" if pos.cusip else ""
+            cost_basis = f", pos.cost_basis = {pos.book_value}" if pos.book_value else ""
             purchase_date = (
-                f", purchase_date: '{self._escape_string(pos.purchase_date)}'"
+                f", pos.purchase_date = '{self._escape_string(pos.purchase_date)}'"
                 if pos.purchase_date
                 else ""
             )
 
-            market_value_clause = f", market_value: {pos.market_value}" if pos.market_value is not None else ""
+            market_value_clause = f", pos.market_value = {pos.market_value}" if pos.market_value is not None else ""
 
             position_query = (
-                f"CREATE (pos_{ticker_var}:Position {{"
-                f"ticker: '{ticker}', "
-                f"quantity: {quantity}, "
-                f"security_type: '{security_type}', "
-                f"weight: {weight}"
+                f"MERGE (pos:Position {{position_id: '{position_id}'}}) "
+                f"SET pos.ticker = '{ticker}', "
+                f"pos.quantity = {quantity}, "
+                f"pos.security_type = '{security_type}', "
+                f"pos.weight = {weight}"
                 f"{isin}{cusip}{cost_basis}{purchase_date}"
-                f"{market_value_clause}"
-                f"}}) "
-                f"RETURN pos_{ticker_var};"
+                f"{market_value_clause} "
+                f"RETURN pos;"
             )
             self.node_statements.append(position_query)
 
             # Create CONTAINS relationship
             contains_query = (
                 f"MATCH (p:Portfolio {{name: '{portfolio_name_escaped}'}}), "
-                f"(pos:Position {{ticker: '{ticker}'}}) "
-                f"CREATE (p)-[:CONTAINS {{weight: {weight}}}]->(pos);"
+                f"(pos:Position {{position_id: '{position_id}'}}) "
+                f"MERGE (p)-[r:CONTAINS]->(pos) "
+                f"SET r.weight = {weight};"
             )
             self.relationship_statements.append(contains_query)
 
@@ -150,6 +165,7 @@ class GraphBuilder:
 
             query = (
                 f"MERGE (c:Company {{fibo_id: '{fibo_id}'}}) "
+                f"{self._created_clause('c')}"
                 f"SET c.name = '{name}', "
                 f"c.ticker = '{ticker_clean}' "
                 f"{factset_clause}"
@@ -157,13 +173,62 @@ class GraphBuilder:
                 f"{sector_clause}"
                 f"{industry_clause}"
                 f"{country_clause}"
-                f"{description_clause} "
+                f"{description_clause}"
+                f"{self._metadata_clause('c', company.fibo_id)} "
                 f"RETURN c;"
             )
             self.node_statements.append(query)
 
         logger.debug(f"Added {len(companies)} company nodes")
 
+    def add_company_stub_nodes(self, companies: Dict[str, Company]) -> None:
+        """Add placeholder nodes for companies discovered by hierarchy crawls.
+
+        Uses MERGE with ON CREATE SET so that a stub never overwrites the
+        properties of a fully enriched company node.
+
+        Args:
+            companies: Dict of fibo_id -> Company
+        """
+        for company in companies.values():
+            fibo_id = self._escape_string(company.fibo_id)
+            name = self._escape_string(company.name)
+            factset_clause = (
+                f", c.factset_id = '{self._escape_string(company.factset_id)}'"
+                if company.factset_id
+                else ""
+            )
+
+            query = (
+                f"MERGE (c:Company {{fibo_id: '{fibo_id}'}}) "
+                f"ON CREATE SET c.name = '{name}'{factset_clause}, "
+                f"c.source = '{self._escape_string(self.source)}', "
+                f"c.fetched_at = '{self.timestamp}', "
+                f"c.created_at = '{self.timestamp}', "
+                f"c.updated_at = '{self.timestamp}';"
+            )
+            self.node_statements.append(query)
+
+        logger.debug(f"Added {len(companies)} company stub nodes")
+
+    def add_hierarchy_refreshed(self, factset_ids: Iterable[str]) -> None:
+        """Stamp companies whose entity structures were just crawled.
+
+        Args:
+            factset_ids: FactSet entity IDs fetched by the hierarchy crawler
+        """
+        ids = sorted({self._escape_string(fid) for fid in factset_ids if fid})
+        if not ids:
+            return
+        id_list = ", ".join(f"'{fid}'" for fid in ids)
+        query = (
+            f"MATCH (c:Company) WHERE c.factset_id IN [{id_list}] "
+            f"SET c.hierarchy_fetched_at = '{self.timestamp}';"
+        )
+        # Runs after the stub MERGEs, so newly discovered parents are stamped too
+        self.node_statements.append(query)
+        logger.debug(f"Stamped hierarchy refresh on {len(ids)} companies")
+
     def add_country_nodes(self, countries: Dict[str, Country]) -> None:
         """Add country nodes.
 
@@ -183,9 +248,11 @@ class GraphBuilder:
 
             query = (
                 f"MERGE (c:Country {{fibo_id: '{fibo_id}'}}) "
+                f"{self._created_clause('c')}"
                 f"SET c.name = '{name}', "
-                f"c.iso_code = '{iso_clean}' "
+                f"c.iso_code = '{iso_clean}'"
                 # f"{region_clause} "
+                f"{self._metadata_clause('c', country.fibo_id)} "
                 f"RETURN c;"
             )
             self.node_statements.append(query)
@@ -206,14 +273,16 @@ class GraphBuilder:
             title = self._escape_string(executive.title) if executive.title else ""
             start_date = self._escape_string(executive.start_date) if executive.start_date else ""
 
-            title_clause = f", title: '{title}'" if title else ""
-            start_date_clause = f", start_date: '{start_date}'" if start_date else ""
+            title_clause = f", e.title = '{title}'" if title else ""
+            start_date_clause = f", e.start_date = '{start_date}'" if start_date else ""
 
             query = (
                 f"MERGE (e:Executive {{fibo_id: '{fibo_id_clean}'}}) "
-                f"SET e.name = '{name}' "
+                f"{self._created_clause('e')}"
+                f"SET e.name = '{name}'"
                 f"{title_clause}"
-                f"{start_date_clause} "
+                f"{start_date_clause}"
+                f"{self._metadata_clause('e', fibo_id)} "
                 f"RETURN e;"
             )
             self.node_statements.append(query)
@@ -240,19 +309,25 @@ class GraphBuilder:
             cusip = self._escape_string(stock.cusip) if stock.cusip else ""
             sedol = self._escape_string(stock.sedol) if stock.sedol else ""
 
-            isin_clause = f", isin: '{isin}'" if isin else ""
-            cusip_clause = f", cusip: '{cusip}'" if cusip else ""
-            sedol_clause = f", sedol: '{sedol}'" if sedol else ""
-            market_price_clause = f", market_price: {stock.market_price}" if stock.market_price is not None else ""
+            isin_clause = f", s.isin = '{isin}'" if isin else ""
+            cusip_clause = f", s.cusip = '{cusip}'" if cusip else ""
+            sedol_clause = f", s.sedol = '{sedol}'" if sedol else ""
+            market_price_clause = (
+                f", s.market_price = {stock.market_price}, s.priced_at = '{self.timestamp}'"
+                if stock.market_price is not None
+                else ""
+            )
 
             query = (
                 f"MERGE (s:Stock {{fibo_id: '{fibo_id}'}}) "
+                f"{self._created_clause('s')}"
                 f"SET s.ticker = '{ticker_clean}', "
-                f"s.security_type = '{security_type}' "
+                f"s.security_type = '{security_type}'"
                 f"{isin_clause}"
                 f"{cusip_clause}"
                 f"{sedol_clause}"
-                f"{market_price_clause} "
+                f"{market_price_clause}"
+                f"{self._metadata_clause('s', stock.fibo_id)} "
                 f"RETURN s;"
             )
             self.node_statements.append(query)
@@ -271,18 +346,24 @@ class GraphBuilder:
             cusip_clause = f", b.cusip = '{cusip}'" if cusip else ""
             coupon_clause = f", b.coupon = {coupon}" if coupon is not None else ""
             currency_clause = f", b.currency = '{currency}'"
-            market_price_clause = f", b.market_price = {market_price}" if market_price is not None else ""
+            market_price_clause = (
+                f", b.market_price = {market_price}, b.priced_at = '{self.timestamp}'"
+                if market_price is not None
+                else ""
+            )
             maturity_date_clause = f", b.maturity_date = '{maturity_date}'" if maturity_date else ""
 
             query = (
                 f"MERGE (b:Bond {{fibo_id: '{fibo_id}'}}) "
+                f"{self._created_clause('b')}"
                 f"SET b.security_type = '{security_type}' "
                 f"{isin_clause}"
                 f"{cusip_clause}"
                 f"{coupon_clause}"
                 f"{currency_clause}"
                 f"{market_price_clause}"
-                f"{maturity_date_clause} "
+                f"{maturity_date_clause}"
+                f"{self._metadata_clause('b', bond.fibo_id)} "
                 f"RETURN b;"
             )
             self.node_statements.append(query)
@@ -340,8 +421,9 @@ class GraphBuilder:
 
         Args:
             position_to_security: Dict where keys are either:
-                                  - str (ticker) for stocks, or
-                                  - tuple (ticker, quantity, book_value) for bonds
+                                  - str position_id (see Position.get_position_id), or
+                                  - tuple (ticker, quantity, book_value), a legacy
+                                    property match kept for older callers
                                   Values are (security_type, security_fibo_id) tuples
                                 security_type is 'stock' or 'bond'
         """
@@ -349,26 +431,24 @@ class GraphBuilder:
             sec_fibo_id_clean = self._escape_string(sec_fibo_id)
             label = "Stock" if sec_type.lower() == "stock" else "Bond"
 
-            # Handle both string keys (stocks) and tuple keys (bonds)
             if isinstance(pos_key, tuple):
-                # Bond position: match by (ticker, quantity, book_value)
+                # Legacy: match by (ticker, quantity, book_value)
                 pos_ticker, pos_qty, pos_book_value = pos_key
-                pos_ticker_clean = self._escape_string(pos_ticker)
-                query = (
-                    f"MATCH (pos:Position {{ticker: '{pos_ticker_clean}', "
+                pos_ticker_clean = self._escape_string(pos_ticker or "")
+                pos_match = (
+                    f"(pos:Position {{ticker: '{pos_ticker_clean}', "
                     f"quantity: {pos_qty}, "
-                    f"cost_basis: {pos_book_value}}}), "
-                    f"(s:{label} {{fibo_id: '{sec_fibo_id_clean}'}}) "
-                    f"CREATE (pos)-[:INVESTED_IN]->(s);"
+                    f"cost_basis: {pos_book_value}}})"
                 )
             else:
-                # Stock position: match by ticker only
-                pos_ticker_clean = self._escape_string(pos_key)
-                query = (
-                    f"MATCH (pos:Position {{ticker: '{pos_ticker_clean}'}}), "
-                    f"(s:{label} {{fibo_id: '{sec_fibo_id_clean}'}}) "
-                    f"CREATE (pos)-[:INVESTED_IN]->(s);"
-                )
+                position_id = self._escape_string(pos_key)
+                pos_match = f"(pos:Position {{position_id: '{position_id}'}})"
+
+            query = (
+                f"MATCH {pos_match}, "
+                f"(s:{label} {{fibo_id: '{sec_fibo_id_clean}'}}) "
+                f"MERGE (pos)-[:INVESTED_IN]->(s);"
+            )
             self.relationship_statements.append(query)
 
         logger.debug(f"Added {len(position_to_security)} INVESTED_IN relationships")
@@ -392,7 +472,7 @@ class GraphBuilder:
             query = (
                 f"MATCH (s:{label} {{fibo_id: '{sec_fibo_id_clean}'}}), "
                 f"(c:Company {{fibo_id: '{company_fibo_id_clean}'}}) "
-                f"CREATE (s)-[:ISSUED_BY]->(c);"
+                f"MERGE (s)-[:ISSUED_BY]->(c);"
             )
             self.relationship_statements.append(query)
 
@@ -413,7 +493,7 @@ class GraphBuilder:
             schema_rel_type = self._map_relationship_type(rel_type)
 
             # Build property clause if properties exist
-            properties = ""
+            set_clause = ""
             if rel.properties:
                 props = []
                 for key, value in rel.properties.items():
@@ -422,16 +502,17 @@ class GraphBuilder:
                     elif isinstance(value, (int, float)):
                         props.append(f"{key}: {value}")
                 if props:
-                    properties = f" {{{', '.join(props)}}}"
+                    set_clause = f" SET r += {{{', '.join(props)}}}"
 
             # Determine source and target node types
             source_label = self._get_entity_label(rel.source_type)
             target_label = self._get_entity_label(rel.target_type)
 
+            # MERGE so re-crawled hierarchies don't duplicate edges
             query = (
                 f"MATCH (s:{source_label} {{fibo_id: '{source_fibo_id}'}}), "
                 f"(t:{target_label} {{fibo_id: '{target_fibo_id}'}}) "
-                f"CREATE (s)-[:{schema_rel_type}{properties}]->(t);"
+                f"MERGE (s)-[r:{schema_rel_type}]->(t){set_clause};"
             )
             self.relationship_statements.append(query)
 
@@ -453,7 +534,7 @@ class GraphBuilder:
             query = (
                 f"MATCH (c:Company {{fibo_id: '{company_fibo_id_clean}'}}) "
                 f"MERGE (co:Country {{iso_code: '{country_iso_clean}'}}) "
-                f"CREATE (c)-[:HEADQUARTERED_IN]->(co);"
+                f"MERGE (c)-[:HEADQUARTERED_IN]->(co);"
             )
             self.relationship_statements.append(query)
 
@@ -472,12 +553,44 @@ class GraphBuilder:
             query = (
                 f"MATCH (e:Executive {{fibo_id: '{exec_fibo_id_clean}'}}), "
                 f"(c:Company {{fibo_id: '{company_fibo_id_clean}'}}) "
-                f"CREATE (e)-[:CEO_OF]->(c);"
+                f"MERGE (e)-[:CEO_OF]->(c);"
             )
             self.relationship_statements.append(query)
 
         logger.debug(f"Added {len(executive_to_company)} CEO_OF relationships")
 
+    def add_leads_relationships(self, executive_to_company: Dict[str, str]) -> None:
+        """Add LEADS relationships between non-CEO officers and companies.
+
+        Args:
+            executive_to_company: Dict of executive_fibo_id -> company_fibo_id
+        """
+        for exec_fibo_id, company_fibo_id in executive_to_company.items():
+            exec_fibo_id_clean = self._escape_string(exec_fibo_id)
+            company_fibo_id_clean = self._escape_string(company_fibo_id)
+
+            query = (
+                f"MATCH (e:Executive {{fibo_id: '{exec_fibo_id_clean}'}}), "
+                f"(c:Company {{fibo_id: '{company_fibo_id_clean}'}}) "
+                f"MERGE (e)-[:LEADS]->(c);"
+            )
+            self.relationship_statements.append(query)
+
+        logger.debug(f"Added {len(executive_to_company)} LEADS relationships")
+
+    def add_exposure_aggregates(self, portfolio_name: str) -> None:
+        """Add statements that rebuild the portfolio's materialized exposure aggregates.
+
+        Must be called after all position, security and company relationships
+        have been added, since the aggregates are computed from them.
+
+        Args:
+            portfolio_name: Name of portfolio
+        """
+        statements = GraphQueries.refresh_exposure_aggregates(portfolio_name)
+        self.relationship_statements.extend(statements)
+        logger.debug(f"Added {len(statements)} exposure aggregate statements for {portfolio_name}")
+
     def get_node_statements(self) -> List[str]:
         """Get all accumulated node creation statements.
 
@@ -513,6 +626,32 @@ class GraphBuilder:
             "relationships": self.relationship_statements,
         }
 
+    def _created_clause(self, var: str) -> str:
+        """ON CREATE SET clause stamping a newly merged node's creation time."""
+        return f"ON CREATE SET {var}.created_at = '{self.timestamp}' "
+
+    def _metadata_clause(self, var: str, fibo_id: Optional[str]) -> str:
+        """SET items recording where an enriched node's data came from and when.
+
+        Args:
+            var: Cypher variable of the node
+            fibo_id: Node fibo_id, used to look up an earlier fetch time
+
+        Returns:
+            Clause starting with a comma, to append to a SET list
+        """
+        fetched_at = self.fetched_at.get(fibo_id, self.timestamp)
+        return (
+            f", {var}.source = '{self._escape_string(self.source)}', "
+            f"{var}.fetched_at = '{fetched_at}', "
+            f"{var}.updated_at = '{self.timestamp}'"
+        )
+
+    @staticmethod
+    def _now() -> str:
+        """Current UTC time as an ISO string (comparable as text)."""
+        return datetime.now(timezone.utc).isoformat()
+
     @staticmethod
     def _escape_string(value: str) -> str:
         """Escape string for Cypher queries.
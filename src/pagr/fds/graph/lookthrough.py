@@ -0,0 +1,233 @@
+"""Look-through exposure across ownership and supply-chain edges.
+
+Loads the company-to-company edge set once, then propagates each portfolio's
+direct issuer exposure up ownership chains (to parents) and along supply
+chains (to customers) in-process, so every company's look-through exposure is
+produced by two queries instead of one round-trip per company.
+"""
+
+import logging
+from collections import defaultdict
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional, Set, Tuple
+
+from pagr.fds.graph.queries import GraphQueries
+
+logger = logging.getLogger(__name__)
+
+# Edge direction normalization: (rel_type) -> True if the edge points from the
+# company whose value is exposed to the company that carries the exposure.
+# Ownership exposure flows child -> parent, supply-chain exposure flows
+# supplier -> customer.
+OWNERSHIP_EDGES = {"HAS_SUBSIDIARY": False, "SUBSIDIARY_OF": True}
+SUPPLY_EDGES = {"SUPPLIES_TO": True, "CUSTOMER_OF": False}
+
+
+@dataclass
+class LookThroughExposure:
+    """Look-through exposure to a single company."""
+
+    fibo_id: str
+    company_name: Optional[str]
+    ticker: Optional[str]
+    direct_exposure: float = 0.0
+    subsidiary_exposure: float = 0.0
+    supplier_exposure: float = 0.0
+    total_exposure: float = 0.0
+
+    def __post_init__(self):
+        """Calculate total exposure."""
+        self.total_exposure = (
+            self.direct_exposure + self.subsidiary_exposure + self.supplier_exposure
+        )
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Convert to dictionary.
+
+        Returns:
+            Dict representation
+        """
+        return {
+            "fibo_id": self.fibo_id,
+            "company_name": self.company_name,
+            "ticker": self.ticker,
+            "direct_exposure": self.direct_exposure,
+            "subsidiary_exposure": self.subsidiary_exposure,
+            "supplier_exposure": self.supplier_exposure,
+            "total_exposure": self.total_exposure,
+        }
+
+
+class LookThroughEngine:
+    """Compute transitive parent/subsidiary and supply-chain exposure."""
+
+    def __init__(self, graph_client):
+        """Initialize look-through engine.
+
+        Args:
+            graph_client: Memgraph client or compatible graph database client
+        """
+        self.graph_client = graph_client
+        self._ownership: Optional[Dict[str, Dict[str, float]]] = None
+        self._supply: Optional[Dict[str, Dict[str, float]]] = None
+        self._companies: Dict[str, Tuple[Optional[str], Optional[str]]] = {}
+
+    def invalidate(self) -> None:
+        """Drop the cached adjacency so the next computation reloads edges."""
+        self._ownership = None
+        self._supply = None
+        self._companies = {}
+
+    def compute(
+        self, portfolio_name: str, max_depth: int = 3, min_weight: float = 0.01
+    ) -> List[LookThroughExposure]:
+        """Compute look-through exposure for every reachable company.
+
+        Args:
+            portfolio_name: Portfolio name
+            max_depth: Maximum number of hops to propagate
+            min_weight: Paths whose cumulative weight falls below this are pruned
+
+        Returns:
+            List of LookThroughExposure sorted by total exposure, descending
+        """
+        self._load_adjacency()
+
+        direct: Dict[str, float] = {}
+        for record in self.graph_client.execute_query(
+            GraphQueries.direct_company_exposure(portfolio_name)
+        ):
+            fibo_id = record.get("fibo_id")
+            if not fibo_id:
+                continue
+            direct[fibo_id] = direct.get(fibo_id, 0.0) + float(record.get("direct_exposure") or 0.0)
+            self._companies.setdefault(
+                fibo_id, (record.get("company_name"), record.get("ticker"))
+            )
+
+        subsidiary = self._propagate(direct, self._ownership, max_depth, min_weight)
+        supplier = self._propagate(direct, self._supply, max_depth, min_weight)
+
+        exposures = []
+        for fibo_id in set(direct) | set(subsidiary) | set(supplier):
+            name, ticker = self._companies.get(fibo_id, (None, None))
+            exposures.append(
+                LookThroughExposure(
+                    fibo_id=fibo_id,
+                    company_name=name,
+                    ticker=ticker,
+                    direct_exposure=direct.get(fibo_id, 0.0),
+                    subsidiary_exposure=subsidiary.get(fibo_id, 0.0),
+                    supplier_exposure=supplier.get(fibo_id, 0.0),
+                )
+            )
+
+        exposures.sort(key=lambda e: e.total_exposure, reverse=True)
+        logger.info(
+            f"Computed look-through exposure for {len(exposures)} companies "
+            f"in portfolio {portfolio_name}"
+        )
+        return exposures
+
+    def _load_adjacency(self) -> None:
+        """Load and normalize company edges, once per cache lifetime."""
+        if self._ownership is not None:
+            return
+
+        ownership: Dict[str, Dict[str, float]] = defaultdict(dict)
+        supply: Dict[str, Dict[str, float]] = defaultdict(dict)
+
+        records = self.graph_client.execute_query(GraphQueries.company_edges())
+        for record in records:
+            source_id = record.get("source_id")
+            target_id = record.get("target_id")
+            rel_type = record.get("rel_type")
+            if not source_id or not target_id or source_id == target_id:
+                continue
+
+            self._companies.setdefault(
+                source_id, (record.get("source_name"), record.get("source_ticker"))
+            )
+            self._companies.setdefault(
+                target_id, (record.get("target_name"), record.get("target_ticker"))
+            )
+
+            if rel_type in OWNERSHIP_EDGES:
+                adjacency, pct = ownership, record.get("ownership_percentage")
+                forward = OWNERSHIP_EDGES[rel_type]
+            elif rel_type in SUPPLY_EDGES:
+                adjacency, pct = supply, record.get("revenue_percentage")
+                forward = SUPPLY_EDGES[rel_type]
+            else:
+                continue
+
+            exposed, carrier = (source_id, target_id) if forward else (target_id, source_id)
+            # Both directions of a pair may be stored; keyed assignment dedupes them
+            adjacency[exposed][carrier] = self._edge_weight(pct)
+
+        self._ownership = dict(ownership)
+        self._supply = dict(supply)
+        logger.debug(f"Loaded look-through adjacency from {len(records)} company edges")
+
+    @staticmethod
+    def _edge_weight(percentage: Optional[float]) -> float:
+        """Convert a percentage edge property into a propagation weight.
+
+        Args:
+            percentage: Percentage (0-100) or None
+
+        Returns:
+            Weight in [0, 1]; missing percentages count in full
+        """
+        if percentage is None:
+            return 1.0
+        return min(max(float(percentage), 0.0), 100.0) / 100.0
+
+    @staticmethod
+    def _propagate(
+        direct: Dict[str, float],
+        adjacency: Dict[str, Dict[str, float]],
+        max_depth: int,
+        min_weight: float,
+    ) -> Dict[str, float]:
+        """Push direct exposure along adjacency, level by level.
+
+        The frontier is keyed by (origin, node) so that each origin's
+        cumulative path weight can be pruned independently. Each company is
+        credited at most once per origin, at the shallowest depth it is
+        reached (paths of equal length add up), so cycles - through the
+        origin or not - never inflate exposure.
+
+        Args:
+            direct: Direct exposure by company
+            adjacency: exposed company -> {carrier company: weight}
+            max_depth: Maximum number of hops
+            min_weight: Minimum cumulative path weight
+
+        Returns:
+            Indirect exposure by carrier company
+        """
+        indirect: Dict[str, float] = defaultdict(float)
+        frontier: Dict[Tuple[str, str], float] = {
+            (origin, origin): 1.0 for origin, value in direct.items() if value
+        }
+        reached: Set[Tuple[str, str]] = set(frontier)
+
+        for _ in range(max(0, max_depth)):
+            next_frontier: Dict[Tuple[str, str], float] = defaultdict(float)
+            for (origin, node), weight in frontier.items():
+                for carrier, edge_weight in adjacency.get(node, {}).items():
+                    path_weight = weight * edge_weight
+                    if (origin, carrier) in reached or path_weight < min_weight:
+                        continue
+                    next_frontier[(origin, carrier)] += path_weight
+
+            reached.update(next_frontier)
+            for (origin, carrier), weight in next_frontier.items():
+                indirect[carrier] += direct[origin] * weight
+
+            if not next_frontier:
+                break
+            frontier = next_frontier
+
+        return dict(indirect)
@@ -5,6 +5,7 @@ Implements Cypher queries for 5 business use cases.
 
 import logging
 from dataclasses import dataclass
+from datetime import datetime
 from typing import Any, Dict, List, Optional
 
 logger = logging.getLogger(__name__)
@@ -190,28 +191,71 @@ ORDER BY position_value DESC;
 """.strip()
 
     @staticmethod
-    def total_company_exposure(portfolio_name: str, company_ticker: str) -> str:
+    def total_company_exposure(
+        portfolio_name: str, company_ticker: str, max_depth: int = 3
+    ) -> str:
         """Query 5: Total exposure to a company including subsidiaries & suppliers.
 
-        Returns direct holdings, subsidiary holdings, and supplier exposure.
-        Uses new graph schema: Position -> INVESTED_IN -> Security -> ISSUED_BY -> Company
+        Returns direct holdings, look-through holdings in (transitive) subsidiaries
+        weighted by the product of ownership percentages along the chain, and
+        holdings in (transitive) suppliers weighted by the product of revenue
+        percentages. Either direction of each edge pair is accepted
+        (HAS_SUBSIDIARY/SUBSIDIARY_OF, CUSTOMER_OF/SUPPLIES_TO); edges without
+        a percentage count in full. When both directions of a pair are stored,
+        the paths through the same chain of companies are collapsed to one
+        (its highest weight) before summing, so each chain counts once.
 
         Args:
             portfolio_name: Name of portfolio
             company_ticker: Ticker of company
+            max_depth: Maximum number of hops to traverse
 
         Returns:
             Cypher query string
         """
+        portfolio = GraphQueries._escape(portfolio_name)
+        ticker = GraphQueries._escape(company_ticker)
+        depth = max(1, int(max_depth))
         return f"""
-MATCH (p:Portfolio {{name: '{portfolio_name}'}})-[:CONTAINS]->(pos:Position)-[:INVESTED_IN]->(sec)
-      -[:ISSUED_BY]->(c:Company {{ticker: '{company_ticker}'}})
+MATCH (target:Company {{ticker: '{ticker}'}})
+OPTIONAL MATCH (:Portfolio {{name: '{portfolio}'}})-[:CONTAINS]->(pos:Position)-[:INVESTED_IN]->()
+      -[:ISSUED_BY]->(target)
+WITH target, SUM(pos.market_value) AS direct_exposure
+OPTIONAL MATCH sub_path = (target)-[:HAS_SUBSIDIARY|SUBSIDIARY_OF*1..{depth}]-(sub:Company)
+WHERE sub <> target
+  AND ALL(i IN range(0, size(relationships(sub_path)) - 1) WHERE
+      (type(relationships(sub_path)[i]) = 'HAS_SUBSIDIARY'
+       AND startNode(relationships(sub_path)[i]) = nodes(sub_path)[i])
+      OR (type(relationships(sub_path)[i]) = 'SUBSIDIARY_OF'
+       AND endNode(relationships(sub_path)[i]) = nodes(sub_path)[i]))
+WITH target, direct_exposure, sub, nodes(sub_path) AS sub_chain,
+     max(reduce(w = 1.0, r IN relationships(sub_path) |
+         w * COALESCE(r.ownership_percentage, 100.0) / 100.0)) AS chain_weight
+WITH target, direct_exposure, sub, SUM(chain_weight) AS sub_weight
+OPTIONAL MATCH (:Portfolio {{name: '{portfolio}'}})-[:CONTAINS]->(sub_pos:Position)-[:INVESTED_IN]->()
+      -[:ISSUED_BY]->(sub)
+WITH target, direct_exposure, SUM(sub_pos.market_value * sub_weight) AS subsidiary_exposure
+OPTIONAL MATCH sup_path = (target)-[:CUSTOMER_OF|SUPPLIES_TO*1..{depth}]-(supplier:Company)
+WHERE supplier <> target
+  AND ALL(i IN range(0, size(relationships(sup_path)) - 1) WHERE
+      (type(relationships(sup_path)[i]) = 'CUSTOMER_OF'
+       AND startNode(relationships(sup_path)[i]) = nodes(sup_path)[i])
+      OR (type(relationships(sup_path)[i]) = 'SUPPLIES_TO'
+       AND endNode(relationships(sup_path)[i]) = nodes(sup_path)[i]))
+WITH target, direct_exposure, subsidiary_exposure, supplier, nodes(sup_path) AS sup_chain,
+     max(reduce(w = 1.0, r IN relationships(sup_path) |
+         w * COALESCE(r.revenue_percentage, 100.0) / 100.0)) AS chain_weight
+WITH target, direct_exposure, subsidiary_exposure, supplier, SUM(chain_weight) AS sup_weight
+OPTIONAL MATCH (:Portfolio {{name: '{portfolio}'}})-[:CONTAINS]->(sup_pos:Position)-[:INVESTED_IN]->()
+      -[:ISSUED_BY]->(supplier)
+WITH target, direct_exposure, subsidiary_exposure,
+     SUM(sup_pos.market_value * sup_weight) AS supplier_exposure
 RETURN
-    c.name AS company_name,
-    SUM(pos.market_value) AS direct_exposure,
-    0 AS subsidiary_exposure,
-    0 AS supplier_exposure,
-    SUM(pos.market_value) AS total_exposure;
+    target.name AS company_name,
+    direct_exposure,
+    subsidiary_exposure,
+    supplier_exposure,
+    (direct_exposure + subsidiary_exposure + supplier_exposure) AS total_exposure;
 """.strip()
 
     @staticmethod
@@ -292,6 +336,832 @@ ORDER BY market_value DESC;
 """.strip()
 
 
+    # Materialized exposure aggregates
+    #
+    # The ETL writes one ExposureAggregate node per (portfolio, kind, bucket)
+    # after the portfolio subgraph is built, so the dashboard reads
+    # O(#buckets) rows instead of re-traversing every position.
+
+    @staticmethod
+    def refresh_exposure_aggregates(portfolio_name: Optional[str] = None) -> List[str]:
+        """Statements that rebuild the materialized exposure aggregates.
+
+        Drops the existing ExposureAggregate nodes and recomputes sector,
+        country and issuer totals plus the portfolio position count. Must run
+        after positions, securities and ISSUED_BY relationships are written.
+
+        Args:
+            portfolio_name: Portfolio to refresh, or None to refresh all portfolios
+
+        Returns:
+            List of Cypher statements, to be executed in order
+        """
+        if portfolio_name is None:
+            portfolio_match = "(p:Portfolio)"
+            aggregate_match = "(a:ExposureAggregate)"
+        else:
+            name = GraphQueries._escape(portfolio_name)
+            portfolio_match = f"(p:Portfolio {{name: '{name}'}})"
+            aggregate_match = f"(a:ExposureAggregate {{portfolio: '{name}'}})"
+
+        aggregated_at = datetime.now().isoformat()
+        issuer_path = (
+            f"MATCH {portfolio_match}-[:CONTAINS]->(pos:Position)-[:INVESTED_IN]->(sec)"
+            f"-[:ISSUED_BY]->(c:Company)"
+        )
+
+        return [
+            f"MATCH {aggregate_match} DETACH DELETE a;",
+            f"""
+{issuer_path}
+WITH p, c.sector AS bucket,
+     SUM(pos.market_value) AS total_exposure,
+     SUM(pos.weight) AS total_weight,
+     COUNT(pos) AS num_positions
+CREATE (p)-[:HAS_AGGREGATE]->(:ExposureAggregate {{
+    portfolio: p.name, kind: 'sector', bucket: bucket, label: bucket,
+    total_exposure: total_exposure, total_weight: total_weight, num_positions: num_positions
+}});
+""".strip(),
+            f"""
+{issuer_path}-[:HEADQUARTERED_IN]->(country:Country)
+WITH p, country.iso_code AS bucket, country.name AS label,
+     SUM(pos.market_value) AS total_exposure,
+     SUM(pos.weight) AS total_weight,
+     COUNT(pos) AS num_positions
+CREATE (p)-[:HAS_AGGREGATE]->(:ExposureAggregate {{
+    portfolio: p.name, kind: 'country', bucket: bucket, label: label,
+    total_exposure: total_exposure, total_weight: total_weight, num_positions: num_positions
+}});
+""".strip(),
+            f"""
+{issuer_path}
+WITH p, c.fibo_id AS bucket, c.name AS label,
+     SUM(pos.market_value) AS total_exposure,
+     SUM(pos.weight) AS total_weight,
+     COUNT(pos) AS num_positions
+CREATE (p)-[:HAS_AGGREGATE]->(:ExposureAggregate {{
+    portfolio: p.name, kind: 'issuer', bucket: bucket, label: label,
+    total_exposure: total_exposure, total_weight: total_weight, num_positions: num_positions
+}});
+""".strip(),
+            f"""
+MATCH {portfolio_match}
+OPTIONAL MATCH (p)-[:CONTAINS]->(pos:Position)
+WITH p, COUNT(pos) AS position_count
+SET p.position_count = position_count, p.aggregated_at = '{aggregated_at}';
+""".strip(),
+        ]
+
+    @staticmethod
+    def sector_exposure_aggregate(portfolio_name: str) -> str:
+        """Materialized variant of sector_exposure.
+
+        Args:
+            portfolio_name: Name of portfolio
+
+        Returns:
+            Cypher query string
+        """
+        name = GraphQueries._escape(portfolio_name)
+        return f"""
+MATCH (a:ExposureAggregate {{portfolio: '{name}', kind: 'sector'}})
+RETURN
+    a.bucket AS sector,
+    a.total_exposure AS total_exposure,
+    a.total_weight AS total_weight,
+    a.num_positions AS num_positions
+ORDER BY total_exposure DESC;
+""".strip()
+
+    @staticmethod
+    def country_breakdown_aggregate(portfolio_name: str) -> str:
+        """Materialized variant of country_breakdown.
+
+        Args:
+            portfolio_name: Name of portfolio
+
+        Returns:
+            Cypher query string
+        """
+        name = GraphQueries._escape(portfolio_name)
+        return f"""
+MATCH (a:ExposureAggregate {{portfolio: '{name}', kind: 'country'}})
+RETURN
+    a.bucket AS country_code,
+    a.label AS country,
+    a.total_exposure AS total_exposure,
+    a.total_weight AS total_weight,
+    a.num_positions AS num_positions
+ORDER BY total_exposure DESC;
+""".strip()
+
+    @staticmethod
+    def executive_lookup_aggregate(portfolio_name: str) -> str:
+        """Materialized variant of executive_lookup (joins issuer totals to CEOs).
+
+        Args:
+            portfolio_name: Name of portfolio
+
+        Returns:
+            Cypher query string
+        """
+        name = GraphQueries._escape(portfolio_name)
+        return f"""
+MATCH (a:ExposureAggregate {{portfolio: '{name}', kind: 'issuer'}})
+MATCH (c:Company {{fibo_id: a.bucket}})<-[:CEO_OF]-(exec:Executive)
+RETURN
+    c.name AS company,
+    exec.name AS executive_name,
+    exec.title AS title,
+    a.total_exposure AS position_value
+ORDER BY position_value DESC;
+""".strip()
+
+    @staticmethod
+    def aggregated_portfolios() -> str:
+        """Portfolios among ``$names`` whose exposure aggregates have been built.
+
+        An aggregated portfolio can still have no rows of some kind (an
+        all-bond portfolio has no CEOs), so readers check aggregated_at
+        rather than treating an empty result as missing aggregates.
+
+        Returns:
+            Cypher query string
+        """
+        return """
+MATCH (p:Portfolio)
+WHERE p.name IN $names AND p.aggregated_at IS NOT NULL
+RETURN p.name AS name;
+""".strip()
+
+    @staticmethod
+    def direct_company_exposure(portfolio_name: str) -> str:
+        """Direct exposure per issuing company, used as look-through seeds.
+
+        Args:
+            portfolio_name: Name of portfolio
+
+        Returns:
+            Cypher query string
+        """
+        return f"""
+MATCH (p:Portfolio {{name: '{GraphQueries._escape(portfolio_name)}'}})-[:CONTAINS]->(pos:Position)
+      -[:INVESTED_IN]->(sec)-[:ISSUED_BY]->(c:Company)
+RETURN
+    c.fibo_id AS fibo_id,
+    c.name AS company_name,
+    c.ticker AS ticker,
+    SUM(pos.market_value) AS direct_exposure;
+""".strip()
+
+    @staticmethod
+    def company_edges() -> str:
+        """All ownership and supply-chain edges between companies.
+
+        Returns:
+            Cypher query string
+        """
+        return """
+MATCH (a:Company)-[r:HAS_SUBSIDIARY|SUBSIDIARY_OF|CUSTOMER_OF|SUPPLIES_TO]->(b:Company)
+RETURN
+    a.fibo_id AS source_id,
+    a.name AS source_name,
+    a.ticker AS source_ticker,
+    b.fibo_id AS target_id,
+    b.name AS target_name,
+    b.ticker AS target_ticker,
+    type(r) AS rel_type,
+    r.ownership_percentage AS ownership_percentage,
+    r.revenue_percentage AS revenue_percentage;
+""".strip()
+
+    @staticmethod
+    def scenario_exposures(portfolio_name: str) -> str:
+        """Every position with its security, issuer, sector and country.
+
+        Issuer and country are optional so unenriched positions still appear.
+
+        Args:
+            portfolio_name: Name of portfolio
+
+        Returns:
+            Cypher query string
+        """
+        return f"""
+MATCH (p:Portfolio {{name: '{GraphQueries._escape(portfolio_name)}'}})-[:CONTAINS]->(pos:Position)
+OPTIONAL MATCH (pos)-[:INVESTED_IN]->(sec)
+OPTIONAL MATCH (sec)-[:ISSUED_BY]->(c:Company)
+OPTIONAL MATCH (c)-[:HEADQUARTERED_IN]->(country:Country)
+RETURN
+    pos.position_id AS position_id,
+    pos.ticker AS ticker,
+    pos.cusip AS cusip,
+    pos.isin AS isin,
+    sec.fibo_id AS security_id,
+    c.fibo_id AS issuer_id,
+    c.ticker AS issuer_ticker,
+    c.name AS issuer_name,
+    c.sector AS sector,
+    country.iso_code AS country,
+    pos.market_value AS market_value;
+""".strip()
+
+    # Multi-portfolio
+    #
+    # Variants of the Holdings view queries over a ``$names`` list parameter,
+    # returning one row per portfolio and bucket (or position) with a
+    # portfolio column, so combining N portfolios is one round-trip.
+
+    @staticmethod
+    def positions_multi() -> str:
+        """Positions of the selected portfolios with their issuer, sector and country.
+
+        Expects a ``$names`` parameter. Issuer and country are optional so
+        unenriched positions still appear.
+
+        Returns:
+            Cypher query string
+        """
+        return """
+MATCH (p:Portfolio)-[:CONTAINS]->(pos:Position)
+WHERE p.name IN $names
+OPTIONAL MATCH (pos)-[:INVESTED_IN]->(sec)
+OPTIONAL MATCH (sec)-[:ISSUED_BY]->(c:Company)
+OPTIONAL MATCH (c)-[:HEADQUARTERED_IN]->(country:Country)
+RETURN
+    p.name AS portfolio,
+    pos.position_id AS position_id,
+    pos.ticker AS ticker,
+    pos.isin AS isin,
+    pos.cusip AS cusip,
+    pos.security_type AS security_type,
+    pos.quantity AS quantity,
+    pos.cost_basis AS book_value,
+    pos.market_value AS market_value,
+    pos.weight AS weight,
+    c.name AS company,
+    c.sector AS sector,
+    country.iso_code AS country_code
+ORDER BY portfolio, market_value DESC;
+""".strip()
+
+    @staticmethod
+    def sector_exposure_multi() -> str:
+        """Sector exposure per selected portfolio (live traversal).
+
+        Expects a ``$names`` parameter.
+
+        Returns:
+            Cypher query string
+        """
+        return """
+MATCH (p:Portfolio)-[:CONTAINS]->(pos:Position)-[:INVESTED_IN]->(sec)-[:ISSUED_BY]->(c:Company)
+WHERE p.name IN $names
+RETURN
+    p.name AS portfolio,
+    c.sector AS sector,
+    SUM(pos.market_value) AS total_exposure,
+    SUM(pos.weight) AS total_weight,
+    COUNT(pos) AS num_positions
+ORDER BY total_exposure DESC;
+""".strip()
+
+    @staticmethod
+    def sector_exposure_multi_aggregate() -> str:
+        """Materialized variant of sector_exposure_multi.
+
+        Returns:
+            Cypher query string
+        """
+        return """
+MATCH (a:ExposureAggregate {kind: 'sector'})
+WHERE a.portfolio IN $names
+RETURN
+    a.portfolio AS portfolio,
+    a.bucket AS sector,
+    a.total_exposure AS total_exposure,
+    a.total_weight AS total_weight,
+    a.num_positions AS num_positions
+ORDER BY total_exposure DESC;
+""".strip()
+
+    @staticmethod
+    def country_breakdown_multi() -> str:
+        """Country breakdown per selected portfolio (live traversal).
+
+        Expects a ``$names`` parameter.
+
+        Returns:
+            Cypher query string
+        """
+        return """
+MATCH (p:Portfolio)-[:CONTAINS]->(pos:Position)-[:INVESTED_IN]->(sec)
+      -[:ISSUED_BY]->(c:Company)-[:HEADQUARTERED_IN]->(country:Country)
+WHERE p.name IN $names
+RETURN
+    p.name AS portfolio,
+    country.iso_code AS country_code,
+    country.name AS country,
+    SUM(pos.market_value) AS total_exposure,
+    SUM(pos.weight) AS total_weight,
+    COUNT(pos) AS num_positions
+ORDER BY total_exposure DESC;
+""".strip()
+
+    @staticmethod
+    def country_breakdown_multi_aggregate() -> str:
+        """Materialized variant of country_breakdown_multi.
+
+        Returns:
+            Cypher query string
+        """
+        return """
+MATCH (a:ExposureAggregate {kind: 'country'})
+WHERE a.portfolio IN $names
+RETURN
+    a.portfolio AS portfolio,
+    a.bucket AS country_code,
+    a.label AS country,
+    a.total_exposure AS total_exposure,
+    a.total_weight AS total_weight,
+    a.num_positions AS num_positions
+ORDER BY total_exposure DESC;
+""".strip()
+
+    @staticmethod
+    def sector_positions_multi() -> str:
+        """Positions of the selected portfolios in one sector.
+
+        Expects ``$names`` and ``$sector`` parameters.
+
+        Returns:
+            Cypher query string
+        """
+        return """
+MATCH (p:Portfolio)-[:CONTAINS]->(pos:Position)-[:INVESTED_IN]->(sec)-[:ISSUED_BY]->(c:Company)
+WHERE p.name IN $names AND c.sector = $sector
+RETURN
+    p.name AS portfolio,
+    CASE WHEN sec:Stock THEN sec.ticker ELSE NULL END AS ticker,
+    c.name AS company,
+    pos.quantity AS quantity,
+    pos.market_value AS market_value,
+    pos.weight AS weight
+ORDER BY market_value DESC;
+""".strip()
+
+    @staticmethod
+    def country_positions_multi() -> str:
+        """Positions of the selected portfolios in companies headquartered in one country.
+
+        Expects ``$names`` and ``$country_iso`` parameters.
+
+        Returns:
+            Cypher query string
+        """
+        return """
+MATCH (p:Portfolio)-[:CONTAINS]->(pos:Position)-[:INVESTED_IN]->(sec)
+      -[:ISSUED_BY]->(c:Company)-[:HEADQUARTERED_IN]->(country:Country)
+WHERE p.name IN $names AND country.iso_code = $country_iso
+RETURN
+    p.name AS portfolio,
+    CASE WHEN sec:Stock THEN sec.ticker ELSE NULL END AS ticker,
+    c.name AS company,
+    pos.quantity AS quantity,
+    pos.market_value AS market_value,
+    pos.weight AS weight
+ORDER BY market_value DESC;
+""".strip()
+
+    # Reprice-only refresh
+    #
+    # Bulk reads of every priced security and position, and parameterized
+    # UNWIND writes that update prices, market values and weights in place.
+
+    @staticmethod
+    def priced_securities() -> str:
+        """All Stock and Bond nodes with the identifiers used for pricing.
+
+        Returns:
+            Cypher query string
+        """
+        return """
+MATCH (s:Stock)
+RETURN 'Stock' AS label, s.fibo_id AS fibo_id, s.ticker AS ticker, NULL AS cusip, NULL AS isin
+UNION ALL
+MATCH (b:Bond)
+RETURN 'Bond' AS label, b.fibo_id AS fibo_id, NULL AS ticker, b.cusip AS cusip, b.isin AS isin;
+""".strip()
+
+    @staticmethod
+    def positions_for_repricing() -> str:
+        """All positions across portfolios with quantities and current values.
+
+        Returns:
+            Cypher query string
+        """
+        return """
+MATCH (p:Portfolio)-[:CONTAINS]->(pos:Position)
+RETURN
+    p.name AS portfolio,
+    pos.position_id AS position_id,
+    pos.ticker AS ticker,
+    pos.cusip AS cusip,
+    pos.isin AS isin,
+    pos.quantity AS quantity,
+    pos.cost_basis AS book_value,
+    pos.market_value AS market_value;
+""".strip()
+
+    @staticmethod
+    def update_security_prices(label: str) -> str:
+        """UNWIND write of market prices onto Stock or Bond nodes.
+
+        Expects a ``$rows`` parameter of {fibo_id, price, date} and a
+        ``$priced_at`` ISO timestamp.
+
+        Args:
+            label: "Stock" or "Bond"
+
+        Returns:
+            Cypher query string
+        """
+        if label not in ("Stock", "Bond"):
+            raise ValueError(f"Invalid security label: {label}")
+        return f"""
+UNWIND $rows AS row
+MATCH (s:{label} {{fibo_id: row.fibo_id}})
+SET s.market_price = row.price, s.price_date = row.date, s.priced_at = $priced_at;
+""".strip()
+
+    @staticmethod
+    def update_position_values() -> str:
+        """UNWIND write of position market values and weights.
+
+        Expects a ``$rows`` parameter of {portfolio, position_id, market_value, weight}.
+
+        Returns:
+            Cypher query string
+        """
+        return """
+UNWIND $rows AS row
+MATCH (p:Portfolio {name: row.portfolio})-[r:CONTAINS]->(pos:Position {position_id: row.position_id})
+SET pos.market_value = row.market_value, pos.weight = row.weight, r.weight = row.weight;
+""".strip()
+
+    @staticmethod
+    def update_portfolio_totals() -> str:
+        """UNWIND write of portfolio total values.
+
+        Expects a ``$rows`` parameter of {name, total_value, priced_at}.
+
+        Returns:
+            Cypher query string
+        """
+        return """
+UNWIND $rows AS row
+MATCH (p:Portfolio {name: row.name})
+SET p.total_value = row.total_value, p.priced_at = row.priced_at;
+""".strip()
+
+    # Entity registry
+
+    @staticmethod
+    def entity_fibo_ids() -> str:
+        """fibo_ids of every enriched reference entity node.
+
+        Company stubs from hierarchy crawls (no ticker) are excluded, so
+        enriching such a company still writes its full node.
+
+        Returns:
+            Cypher query string
+        """
+        return """
+MATCH (n)
+WHERE n:Stock OR n:Bond OR n:Country OR n:Executive OR (n:Company AND n.ticker IS NOT NULL)
+RETURN n.fibo_id AS fibo_id;
+""".strip()
+
+    # Freshness (RefreshPlanner)
+
+    @staticmethod
+    def stale_securities(timestamp_property: str) -> str:
+        """Stock and Bond nodes whose timestamp is missing or older than a cutoff.
+
+        Expects ``$cutoff`` (ISO timestamp) and ``$limit`` parameters. Oldest
+        first, with never-stamped nodes ahead of everything else.
+
+        Args:
+            timestamp_property: "priced_at" (prices) or "fetched_at" (profiles)
+
+        Returns:
+            Cypher query string
+        """
+        if timestamp_property not in ("priced_at", "fetched_at"):
+            raise ValueError(f"Invalid freshness property: {timestamp_property}")
+        return f"""
+MATCH (s)
+WHERE (s:Stock OR s:Bond) AND (s.{timestamp_property} IS NULL OR s.{timestamp_property} < $cutoff)
+RETURN CASE WHEN s:Stock THEN 'Stock' ELSE 'Bond' END AS label,
+       s.fibo_id AS fibo_id, s.ticker AS ticker, s.cusip AS cusip, s.isin AS isin,
+       s.{timestamp_property} AS refreshed_at
+ORDER BY coalesce(s.{timestamp_property}, '') ASC
+LIMIT $limit;
+""".strip()
+
+    @staticmethod
+    def stale_hierarchies() -> str:
+        """Enriched companies whose entity structure was never or long ago crawled.
+
+        Expects ``$cutoff`` (ISO timestamp) and ``$limit`` parameters.
+
+        Returns:
+            Cypher query string
+        """
+        return """
+MATCH (c:Company)
+WHERE c.ticker IS NOT NULL AND c.factset_id IS NOT NULL
+  AND (c.hierarchy_fetched_at IS NULL OR c.hierarchy_fetched_at < $cutoff)
+RETURN c.fibo_id AS fibo_id, c.factset_id AS factset_id, c.hierarchy_fetched_at AS refreshed_at
+ORDER BY coalesce(c.hierarchy_fetched_at, '') ASC
+LIMIT $limit;
+""".strip()
+
+    # Portfolio reconstruction (PortfolioManager)
+    #
+    # Every write to the graph stamps a single GraphState node with a new
+    # version; rebuilt Portfolio objects are cached against that version.
+
+    @staticmethod
+    def graph_version() -> str:
+        """Current graph version stamp (no rows if the graph was never stamped).
+
+        Returns:
+            Cypher query string
+        """
+        return """
+MATCH (g:GraphState {key: 'version'})
+RETURN g.version AS version;
+""".strip()
+
+    @staticmethod
+    def stamp_graph_version() -> str:
+        """Set the graph version stamp. Expects a ``$version`` parameter.
+
+        Returns:
+            Cypher query string
+        """
+        return """
+MERGE (g:GraphState {key: 'version'})
+SET g.version = $version;
+""".strip()
+
+    @staticmethod
+    def portfolio_summaries() -> str:
+        """Every portfolio with its position count, market value and last update.
+
+        last_updated is the last reprice time, falling back to the last
+        aggregate refresh and then the creation time.
+
+        Returns:
+            Cypher query string
+        """
+        return """
+MATCH (p:Portfolio)
+OPTIONAL MATCH (p)-[:CONTAINS]->(pos:Position)
+WITH p, count(pos) AS position_count, sum(pos.market_value) AS total_market_value
+RETURN p.name AS name, p.created_at AS created_at, position_count, total_market_value,
+       coalesce(p.priced_at, p.aggregated_at, p.created_at) AS last_updated
+ORDER BY name;
+""".strip()
+
+    @staticmethod
+    def count_portfolios() -> str:
+        """Number of Portfolio nodes.
+
+        Returns:
+            Cypher query string
+        """
+        return """
+MATCH (p:Portfolio)
+RETURN count(p) AS count;
+""".strip()
+
+    @staticmethod
+    def portfolio_positions() -> str:
+        """Positions of the portfolios in ``$names``, one record per portfolio.
+
+        Each record carries the positions as a list of rows in
+        PortfolioManager.POSITION_COLUMNS order, ordered by ticker. Rows are lists
+        rather than per-field collects because collect() drops nulls, which
+        would misalign the columns.
+
+        Returns:
+            Cypher query string
+        """
+        return """
+MATCH (p:Portfolio)-[:CONTAINS]->(pos:Position)
+WHERE p.name IN $names
+WITH p, pos
+ORDER BY pos.ticker
+RETURN p.name AS name, p.created_at AS created_at,
+       collect([pos.ticker, pos.isin, pos.cusip, pos.security_type, pos.purchase_date,
+                pos.quantity, coalesce(pos.cost_basis, pos.book_value, 0), pos.market_value]) AS positions;
+""".strip()
+
+    # Deletion and compaction (OrphanSweeper)
+    #
+    # Every delete takes a ``$limit`` parameter and returns the number of
+    # nodes removed, so callers repeat it until a batch comes back short
+    # instead of deleting an unbounded subgraph in one transaction.
+
+    @staticmethod
+    def delete_portfolio_positions() -> str:
+        """Delete up to ``$limit`` positions of the portfolio named ``$name``.
+
+        Returns:
+            Cypher query string
+        """
+        return """
+MATCH (:Portfolio {name: $name})-[:CONTAINS]->(pos:Position)
+WITH pos LIMIT $limit
+DETACH DELETE pos
+RETURN count(*) AS deleted;
+""".strip()
+
+    @staticmethod
+    def delete_portfolio_node() -> str:
+        """Delete the portfolio named ``$name`` and its exposure aggregates.
+
+        Run after its positions are gone; a portfolio has at most one
+        aggregate per bucket, so this stays small.
+
+        Returns:
+            Cypher query string
+        """
+        return """
+MATCH (p:Portfolio {name: $name})
+OPTIONAL MATCH (p)-[:HAS_AGGREGATE]->(a:ExposureAggregate)
+WITH p, collect(a) AS aggregates
+FOREACH (a IN aggregates | DETACH DELETE a)
+DETACH DELETE p
+RETURN count(*) AS deleted;
+""".strip()
+
+    @staticmethod
+    def replace_portfolio(portfolio_name: str) -> List[str]:
+        """Statements that clear a portfolio ahead of re-writing it.
+
+        Unlike delete_portfolio_positions these take no parameters, so they
+        can lead the first write transaction of an upload: if that
+        transaction fails, the old portfolio is left as it was.
+
+        Args:
+            portfolio_name: Name of portfolio being re-written
+
+        Returns:
+            List of Cypher statements, to be executed in order
+        """
+        name = GraphQueries._escape(portfolio_name)
+        return [
+            f"MATCH (:Portfolio {{name: '{name}'}})-[:CONTAINS]->(pos:Position) DETACH DELETE pos;",
+            f"MATCH (a:ExposureAggregate {{portfolio: '{name}'}}) DETACH DELETE a;",
+            f"MATCH (p:Portfolio {{name: '{name}'}}) DETACH DELETE p;",
+        ]
+
+    @staticmethod
+    def delete_orphans(kind: str, company_depth: int = 2) -> str:
+        """Delete up to ``$limit`` unreferenced nodes of one kind.
+
+        Kinds, in the order they should be swept:
+
+        - positions: Position nodes no portfolio contains
+        - securities: Stock/Bond nodes no position is invested in
+        - companies: companies that issue no security and are not within
+          company_depth hierarchy/supply-chain hops of one that does
+        - executives, countries: nodes left without any relationship
+        - aggregates: ExposureAggregate nodes whose portfolio is gone
+
+        Args:
+            kind: One of orphan_sweeper.ORPHAN_KINDS
+            company_depth: Hops of company relationships that keep a company
+                linked to an issuer (the hierarchy crawl depth)
+
+        Returns:
+            Cypher query string
+
+        Raises:
+            ValueError: If kind is unknown
+        """
+        depth = max(1, int(company_depth))
+        company_edges = "HAS_SUBSIDIARY|SUBSIDIARY_OF|CUSTOMER_OF|SUPPLIES_TO"
+        matches = {
+            "positions": "MATCH (n:Position) WHERE NOT ()-[:CONTAINS]->(n)",
+            "securities": "MATCH (n) WHERE (n:Stock OR n:Bond) AND NOT (:Position)-[:INVESTED_IN]->(n)",
+            "companies": (
+                "MATCH (n:Company) WHERE NOT ()-[:ISSUED_BY]->(n) "
+                f"AND NOT exists((n)-[:{company_edges} *1..{depth}]-(:Company)<-[:ISSUED_BY]-())"
+            ),
+            "executives": "MATCH (n:Executive) WHERE NOT (n)--()",
+            "countries": "MATCH (n:Country) WHERE NOT (n)--()",
+            "aggregates": "MATCH (n:ExposureAggregate) WHERE NOT (:Portfolio)-[:HAS_AGGREGATE]->(n)",
+        }
+        if kind not in matches:
+            raise ValueError(f"Unknown orphan kind: {kind}")
+        return f"""
+{matches[kind]}
+WITH n LIMIT $limit
+DETACH DELETE n
+RETURN count(*) AS deleted;
+""".strip()
+
+    # Bond analytics
+
+    @staticmethod
+    def bonds_for_analytics(scoped: bool = False) -> str:
+        """Bonds with the terms needed for yield and duration.
+
+        Args:
+            scoped: Only bonds held by the portfolios in a ``$names`` parameter
+
+        Returns:
+            Cypher query string
+        """
+        match = (
+            "MATCH (p:Portfolio)-[:CONTAINS]->(:Position)-[:INVESTED_IN]->(b:Bond)\nWHERE p.name IN $names AND"
+            if scoped
+            else "MATCH (b:Bond)\nWHERE"
+        )
+        return f"""
+{match} b.coupon IS NOT NULL AND b.maturity_date IS NOT NULL AND b.market_price IS NOT NULL
+RETURN DISTINCT b.fibo_id AS fibo_id, b.coupon AS coupon, b.maturity_date AS maturity_date,
+       b.market_price AS market_price;
+""".strip()
+
+    @staticmethod
+    def update_bond_analytics() -> str:
+        """UNWIND write of computed analytics onto Bond nodes.
+
+        Expects a ``$rows`` parameter of {fibo_id, as_of, accrued_interest,
+        dirty_price, ytm, macaulay_duration, modified_duration, convexity, dv01}.
+
+        Returns:
+            Cypher query string
+        """
+        return """
+UNWIND $rows AS row
+MATCH (b:Bond {fibo_id: row.fibo_id})
+SET b.accrued_interest = row.accrued_interest,
+    b.dirty_price = row.dirty_price,
+    b.ytm = row.ytm,
+    b.macaulay_duration = row.macaulay_duration,
+    b.modified_duration = row.modified_duration,
+    b.convexity = row.convexity,
+    b.dv01 = row.dv01,
+    b.analytics_as_of = row.as_of;
+""".strip()
+
+    @staticmethod
+    def portfolio_bond_risk(portfolio_name: str) -> str:
+        """Value-weighted duration and total DV01 of a portfolio's bonds.
+
+        Weights use dirty value (quantity x dirty price); DV01 is the value
+        change for a 1bp parallel yield move.
+
+        Args:
+            portfolio_name: Name of portfolio
+
+        Returns:
+            Cypher query string
+        """
+        return f"""
+MATCH (p:Portfolio {{name: '{GraphQueries._escape(portfolio_name)}'}})-[:CONTAINS]->(pos:Position)
+      -[:INVESTED_IN]->(b:Bond)
+WHERE b.modified_duration IS NOT NULL
+WITH pos, b, pos.quantity * b.dirty_price AS dirty_value
+RETURN
+    COUNT(pos) AS num_bonds,
+    SUM(dirty_value) AS dirty_value,
+    SUM(dirty_value * b.modified_duration) / SUM(dirty_value) AS modified_duration,
+    SUM(dirty_value * b.convexity) / SUM(dirty_value) AS convexity,
+    SUM(dirty_value * b.ytm) / SUM(dirty_value) AS ytm,
+    SUM(pos.quantity * b.dv01) AS dv01;
+""".strip()
+
+    @staticmethod
+    def _escape(value: str) -> str:
+        """Escape single quotes for inline Cypher string literals.
+
+        Args:
+            value: String to escape
+
+        Returns:
+            Escaped string
+        """
+        return str(value).replace("'", "''")
+
+
 class QueryService:
     """Service for executing graph queries."""
 
@@ -302,14 +1172,19 @@ class QueryService:
             graph_client: Memgraph client or compatible graph database client
         """
         self.graph_client = graph_client
+        self._lookthrough = None
+        self._scenarios = None
         logger.info("Initialized QueryService")
 
-    def execute_query(self, query_name: str, cypher: str) -> QueryResult:
+    def execute_query(
+        self, query_name: str, cypher: str, params: Optional[Dict[str, Any]] = None
+    ) -> QueryResult:
         """Execute a Cypher query.
 
         Args:
             query_name: Name of query for logging
             cypher: Cypher query string
+            params: Optional query parameters
 
         Returns:
             QueryResult with records and metadata
@@ -319,7 +1194,10 @@ class QueryService:
         """
         try:
             logger.debug(f"Executing query: {query_name}")
-            records = self.graph_client.execute_query(cypher)
+            if params is None:
+                records = self.graph_client.execute_query(cypher)
+            else:
+                records = self.graph_client.execute_query(cypher, params)
             logger.debug(f"Query returned {len(records)} records")
             return QueryResult(query_name=query_name, cypher=cypher, records=records)
 
@@ -327,6 +1205,96 @@ class QueryService:
             logger.error(f"Query execution failed: {query_name} - {str(e)}")
             raise
 
+    def execute_with_fallback(
+        self, query_name: str, aggregate_cypher: str, live_cypher: str, portfolio_name: str
+    ) -> QueryResult:
+        """Read materialized aggregates, falling back to a live traversal.
+
+        Portfolios written before aggregates existed (or whose refresh failed)
+        have no aggregated_at stamp; those are served by the live query. An
+        empty result for an aggregated portfolio is returned as is.
+
+        Args:
+            query_name: Name of query for logging
+            aggregate_cypher: Query over ExposureAggregate nodes
+            live_cypher: Equivalent traversal query
+            portfolio_name: Portfolio the queries are about
+
+        Returns:
+            QueryResult with records and metadata
+        """
+        result = self.execute_query(query_name, aggregate_cypher)
+        if result.records or self._aggregated([portfolio_name]):
+            return result
+
+        logger.debug(f"No materialized aggregates for {query_name}, using live traversal")
+        return self.execute_query(query_name, live_cypher)
+
+    def execute_multi_with_fallback(
+        self, query_name: str, aggregate_cypher: str, live_cypher: str, portfolio_names: List[str]
+    ) -> QueryResult:
+        """Read materialized aggregates for several portfolios.
+
+        Only portfolios without ExposureAggregate rows whose aggregates were
+        never built are re-queried with the live traversal, so the usual cost
+        is a single round-trip.
+
+        Args:
+            query_name: Name of query for logging
+            aggregate_cypher: Query over ExposureAggregate nodes (``$names``)
+            live_cypher: Equivalent traversal query (``$names``)
+            portfolio_names: Portfolios to combine
+
+        Returns:
+            QueryResult with a portfolio column in every record
+        """
+        names = list(dict.fromkeys(portfolio_names))
+        if not names:
+            return QueryResult(query_name=query_name, cypher=aggregate_cypher, records=[])
+
+        result = self.execute_query(query_name, aggregate_cypher, {"names": names})
+        covered = {record.get("portfolio") for record in result.records}
+        missing = [name for name in names if name not in covered]
+        if missing:
+            aggregated = self._aggregated(missing)
+            missing = [name for name in missing if name not in aggregated]
+        if not missing:
+            return result
+
+        logger.debug(f"No materialized aggregates for {len(missing)} portfolios in {query_name}, using live traversal")
+        live = self.execute_query(query_name, live_cypher, {"names": missing})
+        records = sorted(
+            result.records + live.records, key=lambda record: record.get("total_exposure") or 0.0, reverse=True
+        )
+        return QueryResult(query_name=query_name, cypher=aggregate_cypher, records=records)
+
+    def _aggregated(self, portfolio_names: List[str]) -> set:
+        """Names of the given portfolios whose exposure aggregates have been built."""
+        records = self.graph_client.execute_query(
+            GraphQueries.aggregated_portfolios(), {"names": list(portfolio_names)}
+        )
+        return {record.get("name") for record in records}
+
+    def refresh_exposure_aggregates(self, portfolio_name: Optional[str] = None) -> None:
+        """Recompute materialized exposure aggregates.
+
+        The delete and rebuild run as one transaction, so readers never see a
+        portfolio stamped with aggregated_at but missing its aggregate rows.
+
+        Args:
+            portfolio_name: Portfolio to refresh, or None for all portfolios
+        """
+        statements = GraphQueries.refresh_exposure_aggregates(portfolio_name)
+        self.graph_client.execute_transactions(statements, batch_size=len(statements))
+        logger.info(f"Refreshed exposure aggregates for {portfolio_name or 'all portfolios'}")
+
+    def invalidate_caches(self) -> None:
+        """Drop cached graph data held by this service (e.g. look-through adjacency)."""
+        if self._lookthrough is not None:
+            self._lookthrough.invalidate()
+        if self._scenarios is not None:
+            self._scenarios.invalidate()
+
     def sector_exposure(self, portfolio_name: str) -> QueryResult:
         """Execute sector exposure query.
 
@@ -336,8 +1304,12 @@ class QueryService:
         Returns:
             QueryResult with sector exposure data
         """
-        cypher = GraphQueries.sector_exposure(portfolio_name)
-        return self.execute_query("sector_exposure", cypher)
+        return self.execute_with_fallback(
+            "sector_exposure",
+            GraphQueries.sector_exposure_aggregate(portfolio_name),
+            GraphQueries.sector_exposure(portfolio_name),
+            portfolio_name,
+        )
 
     def country_exposure(self, portfolio_name: str, country_iso: str) -> QueryResult:
         """Execute country exposure query.
@@ -404,24 +1376,93 @@ class QueryService:
         Returns:
             QueryResult with executive data
         """
-        cypher = GraphQueries.executive_lookup(portfolio_name)
-        return self.execute_query("executive_lookup", cypher)
+        return self.execute_with_fallback(
+            "executive_lookup",
+            GraphQueries.executive_lookup_aggregate(portfolio_name),
+            GraphQueries.executive_lookup(portfolio_name),
+            portfolio_name,
+        )
 
     def total_company_exposure(
-        self, portfolio_name: str, company_ticker: str
+        self, portfolio_name: str, company_ticker: str, max_depth: int = 3
     ) -> QueryResult:
         """Execute total company exposure query.
 
         Args:
             portfolio_name: Portfolio name
             company_ticker: Company ticker
+            max_depth: Maximum subsidiary / supply-chain hops
 
         Returns:
             QueryResult with total exposure data
         """
-        cypher = GraphQueries.total_company_exposure(portfolio_name, company_ticker)
+        cypher = GraphQueries.total_company_exposure(
+            portfolio_name, company_ticker, max_depth
+        )
         return self.execute_query("total_company_exposure", cypher)
 
+    def look_through_exposure(
+        self, portfolio_name: str, max_depth: int = 3, min_weight: float = 0.01
+    ) -> QueryResult:
+        """Look-through exposure for every company reachable from the portfolio.
+
+        Args:
+            portfolio_name: Portfolio name
+            max_depth: Maximum subsidiary / supply-chain hops
+            min_weight: Paths whose cumulative weight falls below this are pruned
+
+        Returns:
+            QueryResult with one record per company
+        """
+        from pagr.fds.graph.lookthrough import LookThroughEngine
+
+        if self._lookthrough is None:
+            self._lookthrough = LookThroughEngine(self.graph_client)
+        exposures = self._lookthrough.compute(
+            portfolio_name, max_depth=max_depth, min_weight=min_weight
+        )
+        return QueryResult(
+            query_name="look_through_exposure",
+            cypher=GraphQueries.direct_company_exposure(portfolio_name),
+            records=[exposure.to_dict() for exposure in exposures],
+        )
+
+    def scenario_analysis(self, portfolio_name: str, scenarios: List[Any]) -> QueryResult:
+        """Evaluate shock scenarios against a portfolio.
+
+        The portfolio's exposure matrix is loaded once and cached until
+        invalidate_caches() is called.
+
+        Args:
+            portfolio_name: Portfolio name
+            scenarios: Scenarios to evaluate (see pagr.fds.graph.scenario)
+
+        Returns:
+            QueryResult with one record per scenario
+        """
+        from pagr.fds.graph.scenario import ScenarioEngine
+
+        if self._scenarios is None:
+            self._scenarios = ScenarioEngine(self.graph_client)
+        results = self._scenarios.run(portfolio_name, scenarios)
+        return QueryResult(
+            query_name="scenario_analysis",
+            cypher=GraphQueries.scenario_exposures(portfolio_name),
+            records=[result.to_dict() for result in results],
+        )
+
+    def portfolio_bond_risk(self, portfolio_name: str) -> QueryResult:
+        """Execute portfolio duration / DV01 query.
+
+        Args:
+            portfolio_name: Portfolio name
+
+        Returns:
+            QueryResult with one aggregate record
+        """
+        cypher = GraphQueries.portfolio_bond_risk(portfolio_name)
+        return self.execute_query("portfolio_bond_risk", cypher)
+
     def sector_positions(self, portfolio_name: str, sector: str) -> QueryResult:
         """Execute sector positions query.
 
@@ -444,8 +1485,12 @@ class QueryService:
         Returns:
             QueryResult with country breakdown data
         """
-        cypher = GraphQueries.country_breakdown(portfolio_name)
-        return self.execute_query("country_breakdown", cypher)
+        return self.execute_with_fallback(
+            "country_breakdown",
+            GraphQueries.country_breakdown_aggregate(portfolio_name),
+            GraphQueries.country_breakdown(portfolio_name),
+            portfolio_name,
+        )
 
     def country_positions(self, portfolio_name: str, country_iso: str) -> QueryResult:
         """Execute country positions query.
@@ -460,6 +1505,83 @@ class QueryService:
         cypher = GraphQueries.country_positions(portfolio_name, country_iso)
         return self.execute_query("country_positions", cypher)
 
+    def positions_multi(self, portfolio_names: List[str]) -> QueryResult:
+        """Positions across several portfolios, with a portfolio column.
+
+        Args:
+            portfolio_names: Portfolio names
+
+        Returns:
+            QueryResult with one record per position
+        """
+        return self.execute_query(
+            "positions_multi", GraphQueries.positions_multi(), {"names": list(portfolio_names)}
+        )
+
+    def sector_exposure_multi(self, portfolio_names: List[str]) -> QueryResult:
+        """Sector exposure per portfolio for several portfolios.
+
+        Args:
+            portfolio_names: Portfolio names
+
+        Returns:
+            QueryResult with one record per portfolio and sector
+        """
+        return self.execute_multi_with_fallback(
+            "sector_exposure_multi",
+            GraphQueries.sector_exposure_multi_aggregate(),
+            GraphQueries.sector_exposure_multi(),
+            portfolio_names,
+        )
+
+    def country_breakdown_multi(self, portfolio_names: List[str]) -> QueryResult:
+        """Country breakdown per portfolio for several portfolios.
+
+        Args:
+            portfolio_names: Portfolio names
+
+        Returns:
+            QueryResult with one record per portfolio and country
+        """
+        return self.execute_multi_with_fallback(
+            "country_breakdown_multi",
+            GraphQueries.country_breakdown_multi_aggregate(),
+            GraphQueries.country_breakdown_multi(),
+            portfolio_names,
+        )
+
+    def sector_positions_multi(self, portfolio_names: List[str], sector: str) -> QueryResult:
+        """Positions in a sector across several portfolios.
+
+        Args:
+            portfolio_names: Portfolio names
+            sector: Sector name
+
+        Returns:
+            QueryResult with one record per position
+        """
+        return self.execute_query(
+            "sector_positions_multi",
+            GraphQueries.sector_positions_multi(),
+            {"names": list(portfolio_names), "sector": sector},
+        )
+
+    def country_positions_multi(self, portfolio_names: List[str], country_iso: str) -> QueryResult:
+        """Positions in companies headquartered in a country across several portfolios.
+
+        Args:
+            portfolio_names: Portfolio names
+            country_iso: Country ISO code
+
+        Returns:
+            QueryResult with one record per position
+        """
+        return self.execute_query(
+            "country_positions_multi",
+            GraphQueries.country_positions_multi(),
+            {"names": list(portfolio_names), "country_iso": country_iso},
+        )
+
     def format_result_table(self, result: QueryResult) -> str:
         """Format query result as ASCII table.
 
@@ -0,0 +1,307 @@
+"""Vectorized scenario shocks over a portfolio's exposure matrix.
+
+The engine loads each portfolio's positions with their security, issuer,
+sector and country once (a single query), encodes every dimension as an
+integer code per position, and evaluates scenarios as NumPy gathers: a batch
+of S scenarios becomes an S x N matrix of position returns, so hundreds of
+scenarios cost a handful of array operations rather than a Cypher query per
+shock.
+"""
+
+import logging
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+
+from pagr.fds.graph.queries import GraphQueries
+
+logger = logging.getLogger(__name__)
+
+SHOCK_KINDS = ("security", "issuer", "sector", "country")
+
+ADDITIVE = "additive"
+MULTIPLICATIVE = "multiplicative"
+
+# Price-request identifier type for each label source: ticker, cusip, isin, security_id
+LABEL_ID_TYPES = (None, "CUSIP", "ISIN", None)
+
+
+@dataclass
+class Shock:
+    """A price change applied to every position matching a target.
+
+    Attributes:
+        kind: One of "security", "issuer", "sector" or "country"
+        target: Security ticker/CUSIP/ISIN/FIBO id, issuer FIBO id/ticker/name,
+            sector name, or country ISO code
+        change: Fractional price change (e.g. -0.2 for a 20% drop)
+    """
+
+    kind: str
+    target: str
+    change: float
+
+    def __post_init__(self):
+        """Validate the shock kind."""
+        if self.kind not in SHOCK_KINDS:
+            raise ValueError(f"Unknown shock kind '{self.kind}'. Expected one of: {', '.join(SHOCK_KINDS)}")
+
+
+@dataclass
+class Scenario:
+    """A named set of shocks.
+
+    Attributes:
+        name: Scenario name
+        shocks: Shocks to apply
+        composition: How shocks hitting the same position combine:
+            "additive" sums the changes, "multiplicative" compounds them
+    """
+
+    name: str
+    shocks: List[Shock] = field(default_factory=list)
+    composition: str = ADDITIVE
+
+    def __post_init__(self):
+        """Validate the composition rule."""
+        if self.composition not in (ADDITIVE, MULTIPLICATIVE):
+            raise ValueError(
+                f"Unknown composition '{self.composition}'. Expected '{ADDITIVE}' or '{MULTIPLICATIVE}'"
+            )
+
+
+@dataclass
+class ScenarioResult:
+    """P&L of one scenario."""
+
+    scenario: str
+    total_pnl: float
+    total_value: float
+    position_ids: List[Optional[str]]
+    labels: List[str]
+    position_pnl: np.ndarray
+    unmatched: List[Shock] = field(default_factory=list)
+
+    @property
+    def pnl_pct(self) -> float:
+        """Total P&L as a percentage of portfolio value."""
+        if not self.total_value:
+            return 0.0
+        return self.total_pnl / self.total_value * 100
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Convert to dictionary.
+
+        Returns:
+            Dict representation with per-position P&L for shocked positions
+        """
+        return {
+            "scenario": self.scenario,
+            "total_pnl": self.total_pnl,
+            "pnl_pct": self.pnl_pct,
+            "positions": [
+                {"position_id": position_id, "label": label, "pnl": float(pnl)}
+                for position_id, label, pnl in zip(self.position_ids, self.labels, self.position_pnl)
+                if pnl
+            ],
+            "unmatched_shocks": [f"{s.kind}:{s.target}" for s in self.unmatched],
+        }
+
+
+class ExposureMatrix:
+    """Positions of one portfolio encoded by security, issuer, sector and country."""
+
+    def __init__(self, records: Sequence[Dict[str, Any]]):
+        """Build the matrix from GraphQueries.scenario_exposures records.
+
+        Args:
+            records: One record per position (duplicates by position_id are dropped)
+        """
+        data = pd.DataFrame.from_records(
+            list(records),
+            columns=[
+                "position_id", "ticker", "cusip", "isin", "security_id", "issuer_id",
+                "issuer_ticker", "issuer_name", "sector", "country", "market_value",
+            ],
+        )
+        has_id = data["position_id"].notna()
+        data = data[~(has_id & data["position_id"].duplicated())].reset_index(drop=True)
+
+        self.position_ids: List[Optional[str]] = [
+            None if pd.isna(v) else v for v in data["position_id"].astype(object)
+        ]
+        # Label per position (ticker, else CUSIP, ISIN, security id) and the
+        # identifier type price requests need for it (None for tickers)
+        labelled = [
+            next(
+                ((str(v), id_type) for v, id_type in zip(values, LABEL_ID_TYPES) if isinstance(v, str) and v),
+                ("", None),
+            )
+            for values in zip(data["ticker"], data["cusip"], data["isin"], data["security_id"])
+        ]
+        self.labels: List[str] = [label for label, _ in labelled]
+        self.label_id_types: List[Optional[str]] = [id_type for _, id_type in labelled]
+        self.market_value = np.nan_to_num(
+            pd.to_numeric(data["market_value"], errors="coerce").to_numpy(dtype="float64")
+        )
+
+        # Per dimension: integer code per position (-1 = none), bucket names by
+        # code, and target -> code lookup
+        self.codes: Dict[str, np.ndarray] = {}
+        self.buckets: Dict[str, List[str]] = {}
+        self.lookup: Dict[str, Dict[str, int]] = {}
+
+        security_key = data["security_id"].where(data["security_id"].notna(), data["position_id"])
+        self._encode("security", security_key, aliases=[data["ticker"], data["cusip"], data["isin"]])
+        self._encode("issuer", data["issuer_id"], aliases=[data["issuer_ticker"], data["issuer_name"]])
+        self._encode("sector", data["sector"])
+        self._encode("country", data["country"].astype(object).str.upper())
+
+    def __len__(self) -> int:
+        return len(self.market_value)
+
+    @property
+    def total_value(self) -> float:
+        """Sum of position market values."""
+        return float(self.market_value.sum())
+
+    def _encode(self, kind: str, keys: pd.Series, aliases: Sequence[pd.Series] = ()) -> None:
+        """Factorize a dimension and index its keys (and aliases) by code."""
+        codes, uniques = pd.factorize(keys.astype(object))
+        self.codes[kind] = codes
+        self.buckets[kind] = [str(key) for key in uniques]
+        lookup = {str(key): code for code, key in enumerate(uniques)}
+        for alias in aliases:
+            for value, code in zip(alias.astype(object), codes):
+                if code >= 0 and isinstance(value, str) and value:
+                    lookup.setdefault(value, code)
+        self.lookup[kind] = lookup
+
+    def _resolve(self, shock: Shock) -> Optional[int]:
+        """Code of the shock target within its dimension, or None if absent."""
+        target = shock.target.upper() if shock.kind == "country" else shock.target
+        return self.lookup[shock.kind].get(target)
+
+    def returns(self, scenarios: Sequence[Scenario]) -> Tuple[np.ndarray, List[List[Shock]]]:
+        """Position returns for a batch of scenarios.
+
+        Args:
+            scenarios: Scenarios to evaluate
+
+        Returns:
+            Tuple of (S x N array of fractional returns, unmatched shocks per scenario)
+        """
+        n_scenarios = len(scenarios)
+        unmatched: List[List[Shock]] = [[] for _ in scenarios]
+        compound = np.array([s.composition == MULTIPLICATIVE for s in scenarios], dtype=bool)
+        total = np.zeros((n_scenarios, len(self)), dtype="float64")
+
+        for kind in SHOCK_KINDS:
+            codes = self.codes[kind]
+            n_buckets = int(codes.max(initial=-1)) + 1
+            # One extra column absorbs positions with no bucket (code -1)
+            bucket = np.zeros((n_scenarios, n_buckets + 1), dtype="float64")
+            touched = False
+
+            for row, scenario in enumerate(scenarios):
+                for shock in scenario.shocks:
+                    if shock.kind != kind:
+                        continue
+                    code = self._resolve(shock)
+                    if code is None:
+                        unmatched[row].append(shock)
+                        continue
+                    change = float(shock.change)
+                    if compound[row]:
+                        bucket[row, code] += np.log1p(change)
+                    else:
+                        bucket[row, code] += change
+                    touched = True
+
+            if touched:
+                total += bucket[:, codes]
+
+        if compound.any():
+            total[compound] = np.expm1(total[compound])
+        return total, unmatched
+
+    def evaluate(self, scenarios: Sequence[Scenario]) -> List[ScenarioResult]:
+        """P&L of each scenario.
+
+        Args:
+            scenarios: Scenarios to evaluate
+
+        Returns:
+            One ScenarioResult per scenario, in order
+        """
+        returns, unmatched = self.returns(scenarios)
+        pnl = returns * self.market_value
+        totals = pnl.sum(axis=1)
+        total_value = self.total_value
+        return [
+            ScenarioResult(
+                scenario=scenario.name,
+                total_pnl=float(totals[row]),
+                total_value=total_value,
+                position_ids=self.position_ids,
+                labels=self.labels,
+                position_pnl=pnl[row],
+                unmatched=unmatched[row],
+            )
+            for row, scenario in enumerate(scenarios)
+        ]
+
+
+class ScenarioEngine:
+    """Evaluate shock scenarios against portfolios in the graph."""
+
+    def __init__(self, graph_client):
+        """Initialize scenario engine.
+
+        Args:
+            graph_client: Memgraph client or compatible graph database client
+        """
+        self.graph_client = graph_client
+        self._matrices: Dict[str, ExposureMatrix] = {}
+
+    def invalidate(self, portfolio_name: Optional[str] = None) -> None:
+        """Drop cached exposure matrices.
+
+        Args:
+            portfolio_name: Portfolio to drop, or None for all portfolios
+        """
+        if portfolio_name is None:
+            self._matrices.clear()
+        else:
+            self._matrices.pop(portfolio_name, None)
+
+    def exposure_matrix(self, portfolio_name: str) -> ExposureMatrix:
+        """Load (once) the exposure matrix for a portfolio.
+
+        Args:
+            portfolio_name: Portfolio name
+
+        Returns:
+            ExposureMatrix for the portfolio
+        """
+        if portfolio_name not in self._matrices:
+            records = self.graph_client.execute_query(GraphQueries.scenario_exposures(portfolio_name))
+            self._matrices[portfolio_name] = ExposureMatrix(records)
+            logger.debug(f"Loaded exposure matrix for {portfolio_name}: {len(records)} positions")
+        return self._matrices[portfolio_name]
+
+    def run(self, portfolio_name: str, scenarios: Sequence[Scenario]) -> List[ScenarioResult]:
+        """Evaluate scenarios against a portfolio.
+
+        Args:
+            portfolio_name: Portfolio name
+            scenarios: Scenarios to evaluate
+
+        Returns:
+            One ScenarioResult per scenario, in order
+        """
+        results = self.exposure_matrix(portfolio_name).evaluate(scenarios)
+        logger.info(f"Evaluated {len(results)} scenarios for portfolio {portfolio_name}")
+        return results
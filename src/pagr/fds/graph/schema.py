@@ -17,6 +17,7 @@ class NodeLabel:
     STOCK = "Stock"
     BOND = "Bond"
     DERIVATIVE = "Derivative"
+    EXPOSURE_AGGREGATE = "ExposureAggregate"
 
 
 class RelationshipType:
@@ -52,6 +53,9 @@ class RelationshipType:
     # Geographic structure
     PART_OF = "PART_OF"  # Country -> Region
 
+    # Materialized aggregates
+    HAS_AGGREGATE = "HAS_AGGREGATE"  # Portfolio -> ExposureAggregate
+
 
 class IndexDefinition:
     """Index definitions for performance optimization."""
@@ -64,23 +68,39 @@ class IndexDefinition:
             List of Cypher index creation statements
         """
         return [
+            # Portfolio indexes
+            "CREATE INDEX ON :Portfolio(name);",
             # Company indexes
+            "CREATE INDEX ON :Company(fibo_id);",
             "CREATE INDEX ON :Company(factset_id);",
             "CREATE INDEX ON :Company(ticker);",
             "CREATE INDEX ON :Company(name);",
             "CREATE INDEX ON :Company(sector);",
             "CREATE INDEX ON :Company(country);",
             # Country indexes
+            "CREATE INDEX ON :Country(fibo_id);",
             "CREATE INDEX ON :Country(iso_code);",
             "CREATE INDEX ON :Country(name);",
             # Position indexes
+            "CREATE INDEX ON :Position(position_id);",
             "CREATE INDEX ON :Position(ticker);",
             # Executive indexes
+            "CREATE INDEX ON :Executive(fibo_id);",
             "CREATE INDEX ON :Executive(name);",
             # Stock/Bond indexes
+            "CREATE INDEX ON :Stock(fibo_id);",
             "CREATE INDEX ON :Stock(isin);",
             "CREATE INDEX ON :Stock(ticker);",
+            "CREATE INDEX ON :Bond(fibo_id);",
             "CREATE INDEX ON :Bond(isin);",
+            # Freshness indexes (RefreshPlanner)
+            "CREATE INDEX ON :Stock(priced_at);",
+            "CREATE INDEX ON :Bond(priced_at);",
+            "CREATE INDEX ON :Stock(fetched_at);",
+            "CREATE INDEX ON :Bond(fetched_at);",
+            "CREATE INDEX ON :Company(hierarchy_fetched_at);",
+            # Materialized aggregate indexes
+            "CREATE INDEX ON :ExposureAggregate(portfolio);",
         ]
 
 
@@ -104,6 +124,16 @@ class ConstraintDefinition:
 class NodeProperties:
     """Property definitions for each node type."""
 
+    @staticmethod
+    def provenance():
+        """Source and freshness properties set on every enriched node."""
+        return {
+            "source": "string",  # Data source (e.g. factset)
+            "fetched_at": "string",  # ISO timestamp (UTC) the data was fetched
+            "created_at": "string",  # ISO timestamp
+            "updated_at": "string",  # ISO timestamp
+        }
+
     @staticmethod
     def portfolio():
         """Portfolio node properties."""
@@ -111,12 +141,15 @@ class NodeProperties:
             "name": "string",  # Portfolio name
             "created_at": "string",  # ISO timestamp
             "total_value": "float",  # Total portfolio value
+            "position_count": "int",  # Number of positions (materialized)
+            "aggregated_at": "string",  # ISO timestamp of last aggregate refresh
         }
 
     @staticmethod
     def position():
         """Position node properties."""
         return {
+            "position_id": "string",  # Deterministic ID (portfolio + identifier + lot)
             "ticker": "string",  # Security ticker
             "quantity": "float",  # Number of shares
             "market_value": "float",  # Market value in USD
@@ -141,8 +174,8 @@ class NodeProperties:
             "market_cap": "float",  # Market capitalization (USD)
             "description": "string",  # Business description
             "country": "string",  # Headquarters country
-            "created_at": "string",  # ISO timestamp
-            "updated_at": "string",  # ISO timestamp
+            "hierarchy_fetched_at": "string",  # ISO timestamp of last entity-structure crawl
+            **NodeProperties.provenance(),
         }
 
     @staticmethod
@@ -153,6 +186,7 @@ class NodeProperties:
             "name": "string",  # Country name
             "iso_code": "string",  # ISO 3166-1 alpha-2 code
             "region": "string",  # Geographic region
+            **NodeProperties.provenance(),
         }
 
     @staticmethod
@@ -172,6 +206,7 @@ class NodeProperties:
             "name": "string",  # Full name
             "title": "string",  # Job title
             "start_date": "string",  # Start date (ISO format)
+            **NodeProperties.provenance(),
         }
 
     @staticmethod
@@ -185,6 +220,8 @@ class NodeProperties:
             "cusip": "string",  # CUSIP identifier
             "sedol": "string",  # SEDOL identifier
             "market_price": "float",  # Last close market price in USD
+            "priced_at": "string",  # ISO timestamp (UTC) market_price was fetched
+            **NodeProperties.provenance(),
         }
 
     @staticmethod
@@ -199,6 +236,21 @@ class NodeProperties:
             "currency": "string",  # Bond currency
             "market_price": "float",  # Clean price (excludes accrued interest) in USD
             "maturity_date": "string",  # Maturity date (ISO format)
+            "priced_at": "string",  # ISO timestamp (UTC) market_price was fetched
+            **NodeProperties.provenance(),
+        }
+
+    @staticmethod
+    def exposure_aggregate():
+        """ExposureAggregate node properties (one per portfolio/kind/bucket)."""
+        return {
+            "portfolio": "string",  # Owning portfolio name
+            "kind": "string",  # sector, country or issuer
+            "bucket": "string",  # Sector name, country ISO code or company fibo_id
+            "label": "string",  # Display name (country name, company name)
+            "total_exposure": "float",  # Sum of position market values
+            "total_weight": "float",  # Sum of position weights (%)
+            "num_positions": "int",  # Number of positions in bucket
         }
 
 
@@ -270,6 +322,7 @@ class SchemaInitializer:
             NodeLabel.STOCK,
             NodeLabel.BOND,
             NodeLabel.DERIVATIVE,
+            NodeLabel.EXPOSURE_AGGREGATE,
         ]
 
     @staticmethod
@@ -294,6 +347,7 @@ class SchemaInitializer:
             RelationshipType.CEO_OF,
             RelationshipType.LEADS,
             RelationshipType.PART_OF,
+            RelationshipType.HAS_AGGREGATE,
         ]
 
     @staticmethod
@@ -0,0 +1,188 @@
+"""Incremental reader for the ``.pagr`` JSON portfolio format.
+
+A ``.pagr`` file is a JSON object with header fields (``portfolio_name``,
+``currency``, ``last_updated``) and a ``positions`` array::
+
+    {
+      "portfolio_name": "PAGR Portfolio",
+      "currency": "USD",
+      "positions": [
+        { "ticker": "AAPL", "quantity": 100, "book_value": 4460.50 }
+      ]
+    }
+
+The file is read in fixed-size chunks and the ``positions`` array is decoded
+one element at a time, so the raw text is never held in memory in full.
+"""
+
+import json
+import logging
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+WHITESPACE = " \t\n\r"
+
+
+class PagrFormatError(ValueError):
+    """Raised when a .pagr file is not a valid portfolio document."""
+
+    pass
+
+
+class PagrReader:
+    """Streams header fields and positions out of a .pagr file."""
+
+    def __init__(self, file_path: str, chunk_size: int = 1 << 16):
+        """Initialize reader.
+
+        Args:
+            file_path: Path to .pagr file
+            chunk_size: Number of characters read from disk at a time
+        """
+        self.file_path = Path(file_path)
+        self.chunk_size = max(1, chunk_size)
+        self.header: Dict[str, Any] = {}
+
+    def iter_positions(self) -> Iterator[Dict[str, Any]]:
+        """Yield position objects in file order.
+
+        Header fields are collected into ``self.header`` as they are passed;
+        fields after the ``positions`` array are only available once the
+        iterator is exhausted.
+
+        Yields:
+            One dict per element of the ``positions`` array
+
+        Raises:
+            PagrFormatError: If the document is malformed
+        """
+        with open(self.file_path, "r", encoding="utf-8") as f:
+            stream = _TokenStream(f, self.chunk_size)
+            stream.expect("{")
+
+            if stream.peek() == "}":
+                return
+            while True:
+                key = stream.decode()
+                if not isinstance(key, str):
+                    raise PagrFormatError(f"Expected object key, got {key!r}")
+                stream.expect(":")
+
+                if key == "positions":
+                    yield from self._iter_array(stream)
+                else:
+                    self.header[key] = stream.decode()
+
+                if stream.next_of(",}") == "}":
+                    break
+
+    def columns(self) -> Tuple[Dict[str, List[Any]], int]:
+        """Read every position into per-field column lists.
+
+        Returns:
+            Tuple of (columns keyed by field name, number of positions). Fields
+            missing from a position are filled with None.
+
+        Raises:
+            PagrFormatError: If the document is malformed or a position is not an object
+        """
+        columns: Dict[str, List[Any]] = {}
+        count = 0
+
+        for position in self.iter_positions():
+            if not isinstance(position, dict):
+                raise PagrFormatError(f"Position {count + 1} is not a JSON object")
+            for key, value in position.items():
+                column = columns.get(key)
+                if column is None:
+                    column = columns[key] = [None] * count
+                column.append(value)
+            count += 1
+            for column in columns.values():
+                if len(column) < count:
+                    column.append(None)
+
+        logger.debug(f"Read {count} positions with fields {list(columns)} from {self.file_path}")
+        return columns, count
+
+    @property
+    def portfolio_name(self) -> Optional[str]:
+        """Portfolio name from the file header, if present."""
+        name = self.header.get("portfolio_name")
+        return str(name) if name else None
+
+    @staticmethod
+    def _iter_array(stream: "_TokenStream") -> Iterator[Any]:
+        """Yield the elements of a JSON array one at a time."""
+        stream.expect("[")
+        if stream.peek() == "]":
+            stream.next_of("]")
+            return
+        while True:
+            yield stream.decode()
+            if stream.next_of(",]") == "]":
+                return
+
+
+class _TokenStream:
+    """Sliding character buffer over a text file with incremental JSON decoding."""
+
+    def __init__(self, f, chunk_size: int):
+        self._file = f
+        self._chunk_size = chunk_size
+        self._decoder = json.JSONDecoder()
+        self._buffer = ""
+        self._pos = 0
+        self._eof = False
+
+    def _fill(self) -> bool:
+        """Read another chunk, dropping consumed text. Returns False at EOF."""
+        if self._eof:
+            return False
+        chunk = self._file.read(self._chunk_size)
+        if not chunk:
+            self._eof = True
+            return False
+        self._buffer = self._buffer[self._pos :] + chunk
+        self._pos = 0
+        return True
+
+    def peek(self) -> str:
+        """Return the next non-whitespace character without consuming it."""
+        while True:
+            while self._pos < len(self._buffer) and self._buffer[self._pos] in WHITESPACE:
+                self._pos += 1
+            if self._pos < len(self._buffer):
+                return self._buffer[self._pos]
+            if not self._fill():
+                raise PagrFormatError("Unexpected end of file")
+
+    def next_of(self, allowed: str) -> str:
+        """Consume and return the next non-whitespace character, which must be in allowed."""
+        char = self.peek()
+        if char not in allowed:
+            raise PagrFormatError(f"Expected one of {allowed!r}, got {char!r}")
+        self._pos += 1
+        return char
+
+    def expect(self, char: str) -> None:
+        """Consume the next non-whitespace character, which must be char."""
+        self.next_of(char)
+
+    def decode(self) -> Any:
+        """Decode the next JSON value, reading more input as needed."""
+        self.peek()
+        while True:
+            try:
+                value, end = self._decoder.raw_decode(self._buffer, self._pos)
+            except json.JSONDecodeError as e:
+                if self._fill():
+                    continue
+                raise PagrFormatError(f"Invalid JSON: {e}") from e
+
+            # A number at the end of the buffer may continue in the next chunk
+            if end < len(self._buffer) or not self._fill():
+                self._pos = end
+                return value
@@ -1,11 +1,15 @@
-"""Portfolio loader for CSV files."""
+"""Portfolio loader for CSV, Parquet, Arrow IPC and .pagr JSON files."""
 
 import csv
 import logging
 from pathlib import Path
 from typing import Optional
 
+import pandas as pd
+
 from pagr.fds.models.portfolio import Portfolio, Position
+from pagr.fds.models.portfolio_frame import PortfolioFrame
+from pagr.fds.loaders.pagr_reader import PagrReader
 from pagr.fds.loaders.validator import PositionValidator, ValidationError
 
 logger = logging.getLogger(__name__)
@@ -18,9 +22,10 @@ class PortfolioLoaderError(Exception):
 
 
 class PortfolioLoader:
-    """Loads portfolio data from CSV files."""
+    """Loads portfolio data from CSV, Parquet, Arrow IPC and .pagr JSON files."""
 
-    SUPPORTED_FORMATS = {"csv"}
+    SUPPORTED_FORMATS = {"csv", "parquet", "arrow", "feather", "ipc", "pagr"}
+    COLUMNAR_FORMATS = {"parquet", "arrow", "feather", "ipc"}
 
     def __init__(self):
         """Initialize portfolio loader."""
@@ -28,7 +33,14 @@ class PortfolioLoader:
 
     @classmethod
     def load(cls, file_path: str, portfolio_name: Optional[str] = None) -> Portfolio:
-        """Load portfolio from CSV file.
+        """Load portfolio from a CSV, Parquet, Arrow IPC or .pagr file.
+
+        The format is chosen from the file extension. Parquet and Arrow files
+        carry the same columns as the CSV format and are read with pyarrow
+        (install the ``arrow`` extra); the ``pagr.portfolio`` schema metadata
+        written by PortfolioWriter is used as the name when no name is given.
+        ``.pagr`` files are JSON documents with a ``positions`` array, which
+        is parsed incrementally; their ``portfolio_name`` is used likewise.
 
         CSV format (supports both stocks and bonds):
             ticker,quantity,book_value,security_type,isin,cusip
@@ -38,7 +50,7 @@ class PortfolioLoader:
             ,300,30000.00,Treasury Bond,US912828Z772,
 
         Args:
-            file_path: Path to CSV file
+            file_path: Path to portfolio file
             portfolio_name: Optional name for portfolio
 
         Returns:
@@ -54,26 +66,36 @@ class PortfolioLoader:
         if not path.exists():
             raise FileNotFoundError(f"Portfolio file not found: {file_path}")
 
-        if path.suffix.lower() != ".csv":
-            raise PortfolioLoaderError(f"Unsupported file format: {path.suffix}. Expected: .csv")
+        file_format = path.suffix.lower().lstrip(".")
+        if file_format not in cls.SUPPORTED_FORMATS:
+            expected = ", ".join(f".{fmt}" for fmt in sorted(cls.SUPPORTED_FORMATS))
+            raise PortfolioLoaderError(
+                f"Unsupported file format: {path.suffix}. Expected: {expected}"
+            )
 
         logger.info(f"Loading portfolio from {file_path}")
 
+        file_portfolio_name = None
         try:
-            positions = cls._read_csv(path)
+            if file_format in cls.COLUMNAR_FORMATS:
+                positions, file_portfolio_name = cls._read_columnar(path, file_format)
+            elif file_format == "pagr":
+                positions, file_portfolio_name = cls._read_pagr(path)
+            else:
+                positions = cls._read_csv(path)
         except ValidationError as e:
             raise PortfolioLoaderError(f"Validation error: {e}") from e
+        except PortfolioLoaderError:
+            raise
         except Exception as e:
-            raise PortfolioLoaderError(f"Error reading CSV file: {e}") from e
+            raise PortfolioLoaderError(f"Error reading {file_format.upper()} file: {e}") from e
 
-        # Create portfolio
-        portfolio = Portfolio(
-            name=portfolio_name or path.stem,
+        # Create portfolio; positions arrive validated with weights already set
+        portfolio = Portfolio.model_construct(
+            name=portfolio_name or file_portfolio_name or path.stem,
             positions=positions,
         )
-
-        # Calculate weights
-        portfolio.calculate_weights()
+        portfolio.total_value = portfolio.calculate_total_value()
 
         logger.info(
             f"Successfully loaded portfolio with {len(positions)} positions. "
@@ -86,6 +108,9 @@ class PortfolioLoader:
     def _read_csv(file_path: Path) -> list[Position]:
         """Read and parse CSV file.
 
+        The file is read column-wise with pandas (all values as strings),
+        headers are normalized once and the whole frame is validated in bulk.
+
         Args:
             file_path: Path to CSV file
 
@@ -95,95 +120,153 @@ class PortfolioLoader:
         Raises:
             ValidationError: If data invalid
         """
-        positions = []
-
-        with open(file_path, "r", encoding="utf-8") as f:
-            reader = csv.DictReader(f)
-
-            if reader.fieldnames is None:
-                raise PortfolioLoaderError("CSV file is empty")
-
-            # Normalize and validate headers
-            # Replace spaces with underscores and convert to lowercase
-            headers = [h.strip().lower().replace(" ", "_") for h in reader.fieldnames]
-            logger.debug(f"Normalized headers: {headers}")
-            PositionValidator.validate_headers(headers)
-
-            for row_num, row in enumerate(reader, start=2):  # Start at 2 (header is 1)
-                try:
-                    # Normalize keys to lowercase and replace spaces with underscores
-                    normalized_row = {k.strip().lower().replace(" ", "_"): v.strip() for k, v in row.items() if k}
-
-                    # Validate position
-                    PositionValidator.validate_position(normalized_row, row_num)
-
-                    # Create Position object
-                    # Support both book_value and market_value columns
-                    # Prefer book_value, fall back to market_value if present
-                    if "book_value" in normalized_row and normalized_row["book_value"]:
-                        book_value = float(normalized_row["book_value"])
-                    elif "market_value" in normalized_row and normalized_row["market_value"]:
-                        book_value = float(normalized_row["market_value"])
-                        logger.info(f"Row {row_num}: Using market_value as book_value")
-                    else:
-                        raise ValueError(f"Row {row_num}: Must have either 'book_value' or 'market_value'")
-
-                    # Handle ticker (may be empty/None for bonds)
-                    ticker_str = normalized_row.get("ticker", "").strip()
-                    # Treat N/A, null, and empty string as None
-                    ticker = None
-                    if ticker_str and ticker_str.lower() not in ["n/a", "null"]:
-                        ticker = ticker_str.upper()
-
-                    # Get identifiers
-                    isin = normalized_row.get("isin", "").strip() or None
-                    cusip = normalized_row.get("cusip", "").strip() or None
-
-                    # Clean up N/A values
-                    if isin and isin.lower() == "n/a":
-                        isin = None
-                    if cusip and cusip.lower() == "n/a":
-                        cusip = None
-
-                    position = Position(
-                        ticker=ticker,
-                        quantity=float(normalized_row["quantity"]),
-                        book_value=book_value,
-                        security_type=normalized_row.get("security_type", "Common Stock").strip(),
-                        isin=isin,
-                        cusip=cusip,
-                        market_value=(
-                            float(normalized_row["market_value"])
-                            if normalized_row.get("market_value") and "market_value" != "book_value"
-                            else None
-                        ),
-                        purchase_date=normalized_row.get("purchase_date", "").strip() or None,
-                    )
-
-                    positions.append(position)
-
-                    # Log with primary identifier for clarity
-                    id_type, id_value = position.get_primary_identifier()
-                    logger.debug(
-                        f"Row {row_num}: Loaded {id_type}:{id_value} - "
-                        f"{position.quantity} units @ ${position.book_value:,.2f} book value"
-                    )
-
-                except ValidationError:
-                    raise
-                except Exception as e:
-                    raise ValidationError(f"Row {row_num}: Error parsing row: {e}") from e
-
-        # Check for duplicates
-        PositionValidator.validate_no_duplicates(positions)
-
-        if not positions:
-            raise PortfolioLoaderError("No positions found in CSV file")
-
-        logger.info(f"Parsed {len(positions)} positions from CSV")
+        try:
+            frame = pd.read_csv(
+                file_path,
+                dtype=str,
+                keep_default_na=False,
+                encoding="utf-8",
+            )
+        except pd.errors.EmptyDataError:
+            raise PortfolioLoaderError("CSV file is empty")
+
+        return PortfolioLoader._positions_from_frame(frame)
+
+    @staticmethod
+    def _read_columnar(file_path: Path, file_format: str) -> tuple[list[Position], Optional[str]]:
+        """Read and parse a Parquet or Arrow IPC file.
+
+        The file is memory-mapped and read straight into Arrow buffers, then
+        handed to pandas without a round trip through text. Typed numeric
+        columns are validated as-is.
+
+        Args:
+            file_path: Path to Parquet or Arrow IPC file
+            file_format: File extension without the dot
+
+        Returns:
+            Tuple of (list of Position objects, portfolio name from the schema
+            metadata, if any)
+
+        Raises:
+            PortfolioLoaderError: If pyarrow is not installed
+            ValidationError: If data invalid
+        """
+        pa = _import_pyarrow()
+
+        if file_format == "parquet":
+            import pyarrow.parquet as pq
+
+            table = pq.read_table(file_path, memory_map=True)
+        else:
+            import pyarrow.ipc as ipc
+
+            source = pa.memory_map(str(file_path), "r")
+            try:
+                table = ipc.open_file(source).read_all()
+            except pa.ArrowInvalid:
+                # Not in file format; fall back to the streaming format
+                source.seek(0)
+                table = ipc.open_stream(source).read_all()
+
+        logger.debug(f"Read {table.num_rows} rows x {table.num_columns} columns from {file_path}")
+        name = (table.schema.metadata or {}).get(b"pagr.portfolio")
+        frame = table.to_pandas(split_blocks=True, self_destruct=True)
+        del table
+
+        positions = PortfolioLoader._positions_from_frame(frame)
+        return positions, name.decode("utf-8") if name else None
+
+    @staticmethod
+    def _read_pagr(file_path: Path) -> tuple[list[Position], Optional[str]]:
+        """Read and parse a .pagr JSON file.
+
+        Positions are decoded one at a time straight into column lists, so
+        the JSON text is never held in memory alongside the parsed data.
+        Error rows are numbered by position (the first position is row 1).
+
+        Args:
+            file_path: Path to .pagr file
+
+        Returns:
+            Tuple of (list of Position objects, portfolio name from the file header)
+
+        Raises:
+            ValidationError: If data invalid
+            PagrFormatError: If the file is not a valid .pagr document
+        """
+        reader = PagrReader(str(file_path))
+        columns, count = reader.columns()
+        if count == 0:
+            raise PortfolioLoaderError("No positions found in portfolio file")
+        frame = pd.DataFrame(columns, index=pd.RangeIndex(count))
+
+        positions = PortfolioLoader._positions_from_frame(frame, first_row=1)
+        return positions, reader.portfolio_name
+
+    @staticmethod
+    def normalize_headers(frame: pd.DataFrame) -> pd.DataFrame:
+        """Normalize column names and drop unnamed columns.
+
+        Replaces spaces with underscores and converts to lowercase.
+
+        Args:
+            frame: Raw frame as read from the source file
+
+        Returns:
+            Frame with normalized column names
+        """
+        columns = [str(h).strip().lower().replace(" ", "_") for h in frame.columns]
+        frame = frame.set_axis(columns, axis=1)
+        keep = [bool(c) and not c.startswith("unnamed:") for c in columns]
+        return frame.loc[:, keep]
+
+    @staticmethod
+    def _positions_from_frame(frame: pd.DataFrame, first_row: int = 2) -> list[Position]:
+        """Validate a raw string frame and build positions from it.
+
+        Args:
+            frame: Raw string frame, one row per position
+            first_row: File row number of the first record (header is row 1)
+
+        Returns:
+            List of Position objects
+
+        Raises:
+            ValidationError: If data invalid
+            PortfolioLoaderError: If the frame has no positions
+        """
+        frame = PortfolioLoader.normalize_headers(frame)
+        logger.debug(f"Normalized headers: {list(frame.columns)}")
+        PositionValidator.validate_headers(list(frame.columns))
+
+        if frame.empty:
+            raise PortfolioLoaderError("No positions found in portfolio file")
+
+        typed = PositionValidator.validate_frame(frame, first_row=first_row)
+        positions = PortfolioLoader.build_positions(typed)
 
+        logger.info(f"Parsed {len(positions)} positions")
         return positions
 
+    @staticmethod
+    def build_positions(typed: pd.DataFrame) -> list[Position]:
+        """Build Position objects from a frame returned by validate_frame.
+
+        Rows have already been validated column-wise, so per-object pydantic
+        validation is skipped. Weights are computed on a PortfolioFrame with
+        the same rules as Portfolio.calculate_weights.
+
+        Args:
+            typed: Validated, typed position frame
+
+        Returns:
+            List of Position objects with weights set
+        """
+        frame = PortfolioFrame.from_dataframe(typed)
+        frame.recalculate_weights()
+        return frame.to_positions()
+
     @staticmethod
     def create_sample_csv(file_path: str = "data/sample_portfolio.csv") -> None:
         """Create a sample portfolio CSV file with stocks and bonds.
@@ -210,3 +293,21 @@ class PortfolioLoader:
             writer.writerows(sample_data)
 
         logger.info(f"Created sample portfolio CSV at {file_path} (includes stocks and bonds)")
+
+
+def _import_pyarrow():
+    """Import pyarrow, which is only needed for Parquet/Arrow portfolios.
+
+    Returns:
+        The pyarrow module
+
+    Raises:
+        PortfolioLoaderError: If pyarrow is not installed
+    """
+    try:
+        import pyarrow
+    except ImportError as e:
+        raise PortfolioLoaderError(
+            "Parquet/Arrow portfolios require pyarrow. Install with: pip install 'pagr[arrow]'"
+        ) from e
+    return pyarrow
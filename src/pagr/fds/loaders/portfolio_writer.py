@@ -0,0 +1,138 @@
+"""Portfolio writer for CSV, Parquet, Arrow IPC and .pagr files."""
+
+import json
+import logging
+from pathlib import Path
+
+import pandas as pd
+
+from pagr.fds.loaders.portfolio_loader import PortfolioLoader, PortfolioLoaderError, _import_pyarrow
+from pagr.fds.models.portfolio import Portfolio, Position
+
+logger = logging.getLogger(__name__)
+
+
+class PortfolioWriter:
+    """Exports portfolios, including enrichment results, to files.
+
+    Written files use the loader's column names, so anything exported here can
+    be loaded back with PortfolioLoader.
+    """
+
+    SUPPORTED_FORMATS = PortfolioLoader.SUPPORTED_FORMATS
+
+    COLUMNS = [
+        "position_id",
+        "ticker",
+        "quantity",
+        "book_value",
+        "market_value",
+        "weight",
+        "security_type",
+        "isin",
+        "cusip",
+        "purchase_date",
+    ]
+
+    @classmethod
+    def to_frame(cls, portfolio: Portfolio) -> pd.DataFrame:
+        """Convert a portfolio to a typed position frame.
+
+        Args:
+            portfolio: Portfolio to convert (e.g. from ETLPipeline.execute or
+                PortfolioManager.reconstruct_portfolio_from_database)
+
+        Returns:
+            DataFrame with one row per position and the columns in COLUMNS
+        """
+        positions = portfolio.positions
+        name = portfolio.name
+        frame = pd.DataFrame(
+            {
+                "position_id": Position.position_ids(positions, name),
+                "ticker": [p.ticker for p in positions],
+                "quantity": pd.Series([p.quantity for p in positions], dtype="float64"),
+                "book_value": pd.Series([p.book_value for p in positions], dtype="float64"),
+                "market_value": pd.Series([p.market_value for p in positions], dtype="float64"),
+                "weight": pd.Series([p.weight for p in positions], dtype="float64"),
+                "security_type": [p.security_type for p in positions],
+                "isin": [p.isin for p in positions],
+                "cusip": [p.cusip for p in positions],
+                "purchase_date": [p.purchase_date for p in positions],
+            },
+            columns=cls.COLUMNS,
+        )
+        return frame
+
+    @classmethod
+    def write(cls, portfolio: Portfolio, file_path: str) -> Path:
+        """Write a portfolio to a CSV, Parquet, Arrow IPC or .pagr file.
+
+        The format is chosen from the file extension. Parquet and Arrow output
+        requires pyarrow (install the ``arrow`` extra). ``.pagr`` output is the
+        JSON document read by PagrReader.
+
+        Args:
+            portfolio: Portfolio to write
+            file_path: Destination path
+
+        Returns:
+            Path of the written file
+
+        Raises:
+            PortfolioLoaderError: If the format is unsupported or pyarrow is missing
+        """
+        path = Path(file_path)
+        file_format = path.suffix.lower().lstrip(".")
+        if file_format not in cls.SUPPORTED_FORMATS:
+            expected = ", ".join(f".{fmt}" for fmt in sorted(cls.SUPPORTED_FORMATS))
+            raise PortfolioLoaderError(
+                f"Unsupported file format: {path.suffix}. Expected: {expected}"
+            )
+
+        frame = cls.to_frame(portfolio)
+        path.parent.mkdir(parents=True, exist_ok=True)
+
+        if file_format == "csv":
+            frame.to_csv(path, index=False, encoding="utf-8")
+        elif file_format == "pagr":
+            cls._write_pagr(frame, path, portfolio.name)
+        else:
+            pa = _import_pyarrow()
+            table = pa.Table.from_pandas(frame, preserve_index=False)
+            table = table.replace_schema_metadata(
+                {**(table.schema.metadata or {}), b"pagr.portfolio": portfolio.name.encode("utf-8")}
+            )
+
+            if file_format == "parquet":
+                import pyarrow.parquet as pq
+
+                pq.write_table(table, path)
+            else:
+                import pyarrow.ipc as ipc
+
+                with ipc.new_file(str(path), table.schema) as writer:
+                    writer.write_table(table)
+
+        logger.info(f"Wrote portfolio '{portfolio.name}' ({len(frame)} positions) to {path}")
+        return path
+
+    @staticmethod
+    def _write_pagr(frame: pd.DataFrame, path: Path, name: str) -> None:
+        """Write a position frame as a .pagr JSON document.
+
+        Positions are written one per line with missing fields omitted, so
+        only one position is serialized at a time.
+
+        Args:
+            frame: Frame from to_frame
+            path: Destination path
+            name: Portfolio name stored in the ``portfolio_name`` header
+        """
+        records = frame.astype(object).where(frame.notna(), None).itertuples(index=False)
+        with open(path, "w", encoding="utf-8") as f:
+            f.write(f'{{\n  "portfolio_name": {json.dumps(name)},\n  "positions": [')
+            for i, row in enumerate(records):
+                position = {k: v for k, v in zip(frame.columns, row) if v is not None}
+                f.write(("," if i else "") + "\n    " + json.dumps(position))
+            f.write("\n  ]\n}\n")
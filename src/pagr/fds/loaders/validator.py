@@ -3,6 +3,8 @@
 import logging
 from typing import List, Optional
 
+import pandas as pd
+
 logger = logging.getLogger(__name__)
 
 
@@ -27,6 +29,12 @@ class PositionValidator:
     # All valid columns
     VALID_COLUMNS = REQUIRED_COLUMNS | IDENTIFIER_COLUMNS | VALUE_COLUMNS | OPTIONAL_COLUMNS
 
+    # Placeholder values treated as a missing identifier
+    MISSING_MARKERS = {"n/a", "null"}
+
+    # Maximum row errors listed in a bulk ValidationError message
+    MAX_REPORTED_ERRORS = 20
+
     @classmethod
     def validate_headers(cls, headers: List[str]) -> None:
         """Validate CSV headers.
@@ -181,6 +189,175 @@ class PositionValidator:
                     f"Row {row_number}: Cost basis '{cost_basis}' is not a valid number"
                 )
 
+    @classmethod
+    def validate_frame(cls, frame: pd.DataFrame, first_row: int = 2) -> pd.DataFrame:
+        """Validate every position in a frame at once.
+
+        Column-wise equivalent of validate_position: identifiers, quantity and
+        value columns are checked with vectorized operations and every failing
+        row is reported in a single ValidationError.
+
+        Args:
+            frame: Frame with normalized headers; columns are raw strings
+                (CSV) or already typed (Parquet/Arrow numeric columns)
+            first_row: File row number of the frame's first record (for error reporting)
+
+        Returns:
+            Typed frame with columns ticker, isin, cusip, quantity, book_value,
+            market_value, security_type and purchase_date (missing values as None/NaN)
+
+        Raises:
+            ValidationError: If any row is invalid or identifiers are duplicated
+        """
+        n = len(frame)
+        empty = pd.Series([""] * n, index=frame.index, dtype=object)
+
+        def text(column: str) -> pd.Series:
+            if column not in frame.columns:
+                return empty
+            return frame[column].fillna("").astype(str).str.strip()
+
+        # (present mask, float values, raw values for messages); typed
+        # numeric columns from Parquet/Arrow skip the string round trip
+        def number(column: str) -> tuple[pd.Series, pd.Series, pd.Series]:
+            if column in frame.columns and pd.api.types.is_numeric_dtype(frame[column]):
+                values = frame[column].astype("float64")
+                return values.notna(), values, values
+            raw = text(column)
+            return raw != "", cls._to_float(raw), raw
+
+        def identifier(column: str) -> pd.Series:
+            values = text(column)
+            return values.mask(values.str.lower().isin(cls.MISSING_MARKERS), "")
+
+        errors: dict[int, str] = {}
+
+        def flag(mask: pd.Series, message) -> None:
+            for idx in mask[mask].index:
+                if idx not in errors:
+                    row_num = first_row + frame.index.get_loc(idx)
+                    errors[idx] = f"Row {row_num}: {message(idx)}"
+
+        ticker = identifier("ticker")
+        isin = identifier("isin")
+        cusip = identifier("cusip")
+
+        # Required fields
+        has_quantity, quantity, quantity_raw = number("quantity")
+        flag(~has_quantity, lambda idx: "Missing required field 'quantity'")
+
+        # Identifiers: at least one of ticker, isin, cusip
+        flag(
+            (ticker == "") & (isin == "") & (cusip == ""),
+            lambda idx: "Must provide at least one identifier: ticker, isin, or cusip",
+        )
+
+        # Quantity
+        flag(
+            has_quantity & quantity.isna(),
+            lambda idx: f"Quantity '{quantity_raw[idx]}' is not a valid number",
+        )
+        flag(quantity <= 0, lambda idx: f"Quantity must be positive, got {quantity[idx]}")
+
+        # Value columns: book_value OR market_value
+        has_book, book_value, book_raw = number("book_value")
+        has_market, market_value, market_raw = number("market_value")
+        flag(
+            ~has_book & ~has_market,
+            lambda idx: "Must have either 'book_value' or 'market_value'",
+        )
+
+        numeric_checks = [
+            ("Book value", has_book, book_raw, book_value),
+            ("Market value", has_market, market_raw, market_value),
+        ]
+        if "cost_basis" in frame.columns:
+            numeric_checks.append(("Cost basis", *number("cost_basis")))
+
+        for label, present, raw, values in numeric_checks:
+            flag(
+                present & values.isna(),
+                lambda idx, label=label, raw=raw: f"{label} '{raw[idx]}' is not a valid number",
+            )
+            flag(
+                values < 0,
+                lambda idx, label=label, values=values: (
+                    f"{label} cannot be negative, got {values[idx]}"
+                ),
+            )
+
+        if errors:
+            messages = [errors[idx] for idx in frame.index if idx in errors]
+            shown = messages[: cls.MAX_REPORTED_ERRORS]
+            more = len(messages) - len(shown)
+            suffix = f"\n... and {more} more invalid rows" if more else ""
+            raise ValidationError("\n".join(shown) + suffix)
+
+        # Ticker format warning, summarized instead of logged per row
+        odd_tickers = ticker[(ticker != "") & ~ticker.str.contains("-", regex=False)]
+        if len(odd_tickers):
+            logger.warning(
+                f"{len(odd_tickers)} tickers may be in invalid format "
+                f"(e.g. {', '.join(odd_tickers.head(5))}). "
+                f"Expected format: TICKER-EXCHANGE (e.g., AAPL-US)"
+            )
+
+        # Duplicates on primary identifier (CUSIP > ISIN > ticker)
+        primary = ("cusip:" + cusip).where(
+            cusip != "", ("isin:" + isin).where(isin != "", "ticker:" + ticker.str.upper())
+        )
+        duplicated = primary[primary.duplicated()]
+        if len(duplicated):
+            raise ValidationError(
+                f"Duplicate identifiers found: {', '.join(sorted(set(duplicated)))}. "
+                f"Each security identifier must appear only once in the portfolio."
+            )
+
+        # Prefer book_value, fall back to market_value if present
+        fallback = ~has_book
+        if fallback.any():
+            logger.info(f"{int(fallback.sum())} rows: Using market_value as book_value")
+
+        security_type = (
+            text("security_type") if "security_type" in frame.columns
+            else pd.Series(["Common Stock"] * n, index=frame.index, dtype=object)
+        )
+        purchase_date = text("purchase_date")
+
+        def blank_to_none(values: pd.Series) -> pd.Series:
+            return values.astype(object).where(values != "", None)
+
+        return pd.DataFrame(
+            {
+                "ticker": blank_to_none(ticker.str.upper()),
+                "isin": blank_to_none(isin),
+                "cusip": blank_to_none(cusip),
+                "quantity": quantity.astype(float),
+                "book_value": book_value.where(~fallback, market_value).astype(float),
+                "market_value": market_value.astype(float),
+                "security_type": security_type.astype(object),
+                "purchase_date": blank_to_none(purchase_date),
+            },
+            index=frame.index,
+        )
+
+    @staticmethod
+    def _to_float(raw: pd.Series) -> pd.Series:
+        """Parse a stripped string column to floats, blanks and bad values as NaN.
+
+        Args:
+            raw: String column
+
+        Returns:
+            float64 column
+        """
+        blanks_as_nan = raw.mask(raw == "")
+        try:
+            # Fast path: a straight cast succeeds for clean columns
+            return blanks_as_nan.astype("float64")
+        except (ValueError, TypeError):
+            return pd.to_numeric(blanks_as_nan, errors="coerce").astype("float64")
+
     @classmethod
     def validate_no_duplicates(cls, positions: List) -> None:
         """Check for duplicate identifiers in portfolio.
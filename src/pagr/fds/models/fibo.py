@@ -209,6 +209,9 @@ class Executive(BaseModel):
     name: str = Field(..., description="Full name")
     title: Optional[str] = Field(default=None, description="Job title")
     start_date: Optional[str] = Field(default=None, description="Start date (ISO format)")
+    company_fibo_id: Optional[str] = Field(
+        default=None, description="FIBO ID of the company the executive leads"
+    )
 
 
 class Relationship(BaseModel):
@@ -1,9 +1,10 @@
 """Portfolio and position data models."""
 
+import hashlib
 from datetime import datetime
 from typing import Optional
 
-from pydantic import BaseModel, ConfigDict, Field, model_validator
+from pydantic import BaseModel, ConfigDict, Field, PrivateAttr, model_validator
 
 
 class Position(BaseModel):
@@ -44,6 +45,44 @@ class Position(BaseModel):
     purchase_date: Optional[str] = Field(default=None, description="Purchase date (ISO format)")
     weight: Optional[float] = Field(default=None, description="Portfolio weight (%)")
 
+    @classmethod
+    def construct_many(cls, **columns: list) -> list["Position"]:
+        """Build many positions from already-validated columns.
+
+        No validation is performed; callers must validate first (see
+        PositionValidator.validate_frame). Instances are assembled directly
+        from each row's field dict, which skips the per-row keyword handling
+        of model_construct but leaves the same pydantic state behind.
+
+        Args:
+            **columns: Equal-length lists keyed by field name; omitted fields
+                take their defaults
+
+        Returns:
+            List of Position objects
+        """
+        names = [name for name in cls.model_fields if name in columns]
+        # Defaults in declaration order; each row's values overwrite in place
+        template = {
+            name: None if name in columns else field.get_default(call_default_factory=True)
+            for name, field in cls.model_fields.items()
+            if name in columns or not field.is_required()
+        }
+        fields_set = frozenset(names)
+        new = cls.__new__
+        setattr_ = object.__setattr__
+        positions = []
+        for row in zip(*(columns[name] for name in names)):
+            position = new(cls)
+            values = template.copy()
+            values.update(zip(names, row))
+            setattr_(position, "__dict__", values)
+            setattr_(position, "__pydantic_fields_set__", set(fields_set))
+            setattr_(position, "__pydantic_extra__", None)
+            setattr_(position, "__pydantic_private__", None)
+            positions.append(position)
+        return positions
+
     @model_validator(mode='after')
     def validate_identifiers(self):
         """Validate that at least one identifier is provided: ticker, isin, or cusip."""
@@ -65,6 +104,58 @@ class Position(BaseModel):
             return ("ticker", self.ticker)
         return (None, None)
 
+    def get_position_id(self, portfolio_name: str, occurrence: int = 0) -> str:
+        """Return a deterministic position ID for graph writes.
+
+        Derived from the portfolio name, the primary identifier and the lot
+        (purchase date, quantity, book value), so reloading the same file
+        yields the same IDs while separate lots of one security stay distinct.
+        Identical lots within a portfolio are told apart by their occurrence
+        (see position_ids).
+
+        Args:
+            portfolio_name: Name of the owning portfolio
+            occurrence: How many identical lots precede this one in the portfolio
+
+        Returns:
+            Position ID string (e.g. "pos:3f2a...")
+        """
+        id_type, id_value = self.get_primary_identifier()
+        parts = [
+            portfolio_name,
+            f"{id_type}:{id_value}",
+            self.purchase_date or "",
+            repr(float(self.quantity)),
+            repr(float(self.book_value)),
+        ]
+        if occurrence:
+            parts.append(f"#{occurrence}")
+        key = "|".join(parts)
+        return "pos:" + hashlib.sha1(key.encode("utf-8")).hexdigest()[:20]
+
+    @staticmethod
+    def position_ids(positions: list["Position"], portfolio_name: str) -> list[str]:
+        """Return the position IDs of a portfolio's positions, in order.
+
+        Repeated identical lots get successive occurrence numbers, so each
+        keeps its own ID (and its own graph node).
+
+        Args:
+            positions: Positions in portfolio order
+            portfolio_name: Name of the owning portfolio
+
+        Returns:
+            One position ID per position
+        """
+        seen: dict[str, int] = {}
+        ids = []
+        for position in positions:
+            base = position.get_position_id(portfolio_name)
+            occurrence = seen.get(base, 0)
+            seen[base] = occurrence + 1
+            ids.append(base if occurrence == 0 else position.get_position_id(portfolio_name, occurrence))
+        return ids
+
 
 class Portfolio(BaseModel):
     """A portfolio containing multiple positions."""
@@ -110,6 +201,15 @@ class Portfolio(BaseModel):
     positions: list[Position] = Field(default=[], description="List of positions")
     total_value: Optional[float] = Field(default=None, description="Total portfolio value")
 
+    # ticker -> row index for get_position, kept current by the mutators below
+    _ticker_index: Optional[dict[str, int]] = PrivateAttr(default=None)
+
+    def __setattr__(self, name, value):
+        """Drop the ticker index when the positions list is replaced."""
+        super().__setattr__(name, value)
+        if name == "positions":
+            self._ticker_index = None
+
     def calculate_weights(self) -> None:
         """Calculate portfolio weights.
 
@@ -119,57 +219,84 @@ class Portfolio(BaseModel):
             self.total_value = 0
             return
 
-        # Check if we should use market value (if at least one position has it)
-        # Ideally we want all, but we'll sum what we have
-        has_market_value = any(p.market_value is not None for p in self.positions)
-
-        if has_market_value:
-            # Use market value where available, fallback to book_value?
-            # Mixing them is dangerous. Let's assume if we have market values we use them.
-            # If a position is missing market value, it contributes 0 to total market value.
-            self.total_value = sum((p.market_value or 0.0) for p in self.positions)
-            
-            if self.total_value > 0:
-                for position in self.positions:
-                    val = position.market_value or 0.0
-                    position.weight = (val / self.total_value) * 100
-            else:
-                for position in self.positions:
-                    position.weight = 0
+        if self.uses_market_value():
+            values = [p.market_value or 0.0 for p in self.positions]
         else:
             # Fallback to book value
-            self.total_value = sum(p.book_value for p in self.positions)
+            values = [p.book_value for p in self.positions]
+        self.total_value = sum(values)
 
-            if self.total_value > 0:
-                for position in self.positions:
-                    position.weight = (position.book_value / self.total_value) * 100
-            else:
-                for position in self.positions:
-                    position.weight = 0
+        total = self.total_value
+        for position, val in zip(self.positions, values):
+            position.weight = (val / total) * 100 if total > 0 else 0
 
-    def add_position(self, position: Position) -> None:
+    def uses_market_value(self) -> bool:
+        """Whether weights are based on market value rather than book value.
+
+        Returns:
+            True if at least one position has a market value
+        """
+        return any(p.market_value is not None for p in self.positions)
+
+    def calculate_total_value(self) -> float:
+        """Calculate total portfolio value without touching position weights.
+
+        If any position has a market value, market values are summed and a
+        position missing one contributes 0 (mixing market and book values
+        would be misleading). Otherwise book values are summed.
+
+        Returns:
+            Total value
+        """
+        if self.uses_market_value():
+            return sum((p.market_value or 0.0) for p in self.positions)
+        return sum(p.book_value for p in self.positions)
+
+    def add_position(self, position: Position, recalculate: bool = True) -> None:
         """Add a position to the portfolio.
 
         Args:
             position: Position to add
+            recalculate: Whether to recompute weights; pass False when adding
+                many positions and call calculate_weights once at the end
         """
-        self.positions.append(position)
-        self.calculate_weights()
+        self.add_positions([position], recalculate=recalculate)
 
-    def remove_position(self, ticker: str) -> bool:
+    def add_positions(self, positions: list[Position], recalculate: bool = True) -> None:
+        """Add several positions, recomputing weights once.
+
+        Args:
+            positions: Positions to add
+            recalculate: Whether to recompute weights
+        """
+        start = len(self.positions)
+        self.positions.extend(positions)
+        if self._ticker_index is not None:
+            for row, position in enumerate(positions, start):
+                if position.ticker is not None:
+                    self._ticker_index.setdefault(position.ticker, row)
+        if recalculate:
+            self.calculate_weights()
+
+    def remove_position(self, ticker: str, recalculate: bool = True) -> bool:
         """Remove a position by ticker.
 
         Args:
             ticker: Ticker to remove
+            recalculate: Whether to recompute weights if a position was removed
 
         Returns:
             True if position was removed, False if not found
         """
-        original_length = len(self.positions)
-        self.positions = [p for p in self.positions if p.ticker != ticker]
-        removed = len(self.positions) < original_length
-
+        if self._ticker_index is not None and ticker not in self._ticker_index:
+            return False
+        remaining = [p for p in self.positions if p.ticker != ticker]
+        removed = len(remaining) < len(self.positions)
         if removed:
+            # Rows shift, so assigning the list drops the ticker index
+            self.positions = remaining
+
+        if removed and recalculate:
             self.calculate_weights()
 
         return removed
@@ -177,13 +304,36 @@ class Portfolio(BaseModel):
     def get_position(self, ticker: str) -> Optional[Position]:
         """Get a position by ticker.
 
+        Lookups go through a ticker index built on first use and kept current
+        by add_position, add_positions, remove_position and assignment of
+        ``positions``. Changes made directly on the list are not seen; call
+        reindex() after them.
+
         Args:
             ticker: Ticker to find
 
         Returns:
             Position if found, None otherwise
         """
-        for position in self.positions:
-            if position.ticker == ticker:
-                return position
-        return None
+        if self._ticker_index is None:
+            self.reindex()
+        row = self._ticker_index.get(ticker)
+        return self.positions[row] if row is not None else None
+
+    def reindex(self) -> None:
+        """Rebuild the ticker index used by get_position."""
+        index: dict[str, int] = {}
+        for row, position in enumerate(self.positions):
+            if position.ticker is not None:
+                index.setdefault(position.ticker, row)
+        self._ticker_index = index
+
+    def to_frame(self):
+        """Return an array-backed PortfolioFrame copy of this portfolio.
+
+        Returns:
+            PortfolioFrame
+        """
+        from pagr.fds.models.portfolio_frame import PortfolioFrame
+
+        return PortfolioFrame.from_portfolio(self)
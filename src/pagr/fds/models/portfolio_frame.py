@@ -0,0 +1,352 @@
+"""Columnar, array-backed portfolio representation.
+
+PortfolioFrame holds one NumPy array per numeric field plus an
+identifier-to-row index, so weight and value math runs vectorized and lookups
+are O(1). It converts to and from Portfolio at the edges (loading, graph
+building, UI).
+"""
+
+from typing import Dict, Iterable, List, Mapping, Optional, Union
+
+import numpy as np
+import pandas as pd
+
+from pagr.fds.models.portfolio import Portfolio, Position
+
+
+class PortfolioFrame:
+    """Array-backed positions of a single portfolio.
+
+    Numeric fields (quantity, book_value, market_value, weight) are float64
+    arrays with NaN for missing values. Text fields (ticker, isin, cusip,
+    security_type, purchase_date) are object arrays with None for missing
+    values. Rows keep the order of the source positions.
+    """
+
+    NUMERIC_FIELDS = ("quantity", "book_value", "market_value", "weight")
+    TEXT_FIELDS = ("ticker", "isin", "cusip", "security_type", "purchase_date")
+
+    def __init__(self, name: str = "Portfolio", created_at: Optional[str] = None, **columns):
+        """Initialize from column sequences.
+
+        Args:
+            name: Portfolio name
+            created_at: Portfolio creation timestamp (ISO format)
+            **columns: Equal-length sequences keyed by field name; quantity and
+                book_value are required, other fields default to missing
+                (security_type defaults to "Common Stock")
+
+        Raises:
+            ValueError: If columns are missing, unknown or have different lengths
+        """
+        if "quantity" not in columns or "book_value" not in columns:
+            raise ValueError("PortfolioFrame requires quantity and book_value columns")
+
+        self.name = name
+        self.created_at = created_at
+        n = len(columns["quantity"])
+
+        for field, values in columns.items():
+            if field not in self.NUMERIC_FIELDS + self.TEXT_FIELDS:
+                raise ValueError(f"Unknown PortfolioFrame column '{field}'")
+            if values is not None and len(values) != n:
+                raise ValueError(f"Column '{field}' has {len(values)} rows, expected {n}")
+
+        for field in self.NUMERIC_FIELDS:
+            values = columns.get(field)
+            # np.array copies and maps None to NaN for float64
+            setattr(self, field, np.full(n, np.nan) if values is None else np.array(values, dtype="float64"))
+
+        for field in self.TEXT_FIELDS:
+            values = columns.get(field)
+            if values is None:
+                default = "Common Stock" if field == "security_type" else None
+                values = [default] * n
+            array = np.empty(n, dtype=object)
+            array[:] = list(values)
+            setattr(self, field, array)
+
+        self._index: Optional[Dict[str, int]] = None
+
+    # Conversion
+
+    @classmethod
+    def from_positions(cls, positions: Iterable[Position], name: str = "Portfolio") -> "PortfolioFrame":
+        """Build a frame from Position objects.
+
+        Args:
+            positions: Positions in portfolio order
+            name: Portfolio name
+
+        Returns:
+            PortfolioFrame
+        """
+        rows = [p.__dict__ for p in positions]
+        return cls(
+            name=name,
+            **{field: [row.get(field) for row in rows] for field in cls.NUMERIC_FIELDS + cls.TEXT_FIELDS},
+        )
+
+    @classmethod
+    def from_portfolio(cls, portfolio: Portfolio) -> "PortfolioFrame":
+        """Build a frame from a Portfolio.
+
+        Args:
+            portfolio: Source portfolio
+
+        Returns:
+            PortfolioFrame
+        """
+        frame = cls.from_positions(portfolio.positions, name=portfolio.name)
+        frame.created_at = portfolio.created_at
+        return frame
+
+    @classmethod
+    def from_dataframe(cls, data: pd.DataFrame, name: str = "Portfolio") -> "PortfolioFrame":
+        """Build a frame from a validated pandas frame (see PositionValidator.validate_frame).
+
+        Args:
+            data: Typed position frame
+            name: Portfolio name
+
+        Returns:
+            PortfolioFrame
+        """
+        columns = {}
+        for field in cls.NUMERIC_FIELDS:
+            if field in data.columns:
+                columns[field] = data[field].to_numpy(dtype="float64", na_value=np.nan)
+        for field in cls.TEXT_FIELDS:
+            if field in data.columns:
+                values = data[field]
+                columns[field] = values.astype(object).where(values.notna(), None).to_numpy()
+        return cls(name=name, **columns)
+
+    def to_positions(self) -> List[Position]:
+        """Build Position objects from the frame's rows.
+
+        Values are taken as-is without pydantic validation.
+
+        Returns:
+            List of Position objects
+        """
+        return Position.construct_many(
+            **{field: self._column(field) for field in self.NUMERIC_FIELDS + self.TEXT_FIELDS}
+        )
+
+    def to_portfolio(self) -> Portfolio:
+        """Build a Portfolio from the frame.
+
+        Returns:
+            Portfolio with positions, weights and total value set
+        """
+        portfolio = Portfolio.model_construct(
+            name=self.name,
+            created_at=self.created_at,
+            positions=self.to_positions(),
+        )
+        portfolio.total_value = self.total_value()
+        return portfolio
+
+    def apply_to(self, positions: List[Position]) -> None:
+        """Write market values and weights back onto existing Position objects.
+
+        Args:
+            positions: Positions this frame was built from, in the same order
+
+        Raises:
+            ValueError: If the number of positions does not match
+        """
+        if len(positions) != len(self):
+            raise ValueError(f"Expected {len(self)} positions, got {len(positions)}")
+        for position, market_value, weight in zip(
+            positions, self._column("market_value"), self._column("weight")
+        ):
+            position.market_value = market_value
+            position.weight = weight
+
+    def to_dataframe(self) -> pd.DataFrame:
+        """Return the positions as a pandas DataFrame.
+
+        Returns:
+            DataFrame with one column per field
+        """
+        return pd.DataFrame(
+            {field: getattr(self, field) for field in self.TEXT_FIELDS + self.NUMERIC_FIELDS}
+        )
+
+    def _column(self, field: str) -> list:
+        """Return a field as a list with missing values as None."""
+        array = getattr(self, field)
+        if field in self.NUMERIC_FIELDS:
+            return [None if v != v else v for v in array.tolist()]
+        return array.tolist()
+
+    # Lookup
+
+    def __len__(self) -> int:
+        return len(self.quantity)
+
+    @property
+    def index(self) -> Dict[str, int]:
+        """Identifier-to-row index over tickers, ISINs and CUSIPs.
+
+        The first row carrying an identifier wins, matching Portfolio.get_position.
+        """
+        if self._index is None:
+            index: Dict[str, int] = {}
+            for field in ("cusip", "isin", "ticker"):
+                for row, value in enumerate(getattr(self, field).tolist()):
+                    if value and value not in index:
+                        index[value] = row
+            self._index = index
+        return self._index
+
+    def row(self, identifier: str) -> Optional[int]:
+        """Return the row of a ticker, ISIN or CUSIP.
+
+        Args:
+            identifier: Ticker, ISIN or CUSIP
+
+        Returns:
+            Row number, or None if not present
+        """
+        return self.index.get(identifier)
+
+    def primary_identifiers(self) -> np.ndarray:
+        """Return each row's primary identifier value (CUSIP > ISIN > ticker).
+
+        Returns:
+            Object array of identifier values
+        """
+        primary = self.ticker.copy()
+        has_isin = pd.notna(self.isin) & (self.isin != "")
+        primary[has_isin] = self.isin[has_isin]
+        has_cusip = pd.notna(self.cusip) & (self.cusip != "")
+        primary[has_cusip] = self.cusip[has_cusip]
+        return primary
+
+    # Value and weight math
+
+    def uses_market_value(self) -> bool:
+        """Whether weights are based on market value (any position has one)."""
+        return bool(np.any(~np.isnan(self.market_value)))
+
+    def values(self) -> np.ndarray:
+        """Per-position values used for weights.
+
+        Market values (missing ones as zero) if any position has one,
+        otherwise book values, as in Portfolio.calculate_weights.
+
+        Returns:
+            float64 array
+        """
+        if self.uses_market_value():
+            return np.nan_to_num(self.market_value, nan=0.0)
+        return self.book_value
+
+    def total_value(self) -> float:
+        """Total portfolio value (see values)."""
+        return float(self.values().sum())
+
+    def recalculate_weights(self) -> float:
+        """Recompute all weights (%) in one vectorized pass.
+
+        Returns:
+            Total portfolio value
+        """
+        values = self.values()
+        total = float(values.sum())
+        self.weight = values / total * 100 if total > 0 else np.zeros(len(self))
+        return total
+
+    def largest_weight(self) -> Optional[float]:
+        """Largest position weight (%), or None if no weights are set."""
+        weights = self.weight[~np.isnan(self.weight) & (self.weight != 0)]
+        return float(weights.max()) if len(weights) else None
+
+    # Bulk updates
+
+    def apply_prices(self, prices: Union[Mapping[str, float], pd.Series], recalculate: bool = True) -> int:
+        """Set market value = quantity x price for every priced position.
+
+        Each row is priced by its ticker if present in prices, otherwise by
+        its primary identifier (CUSIP > ISIN > ticker).
+
+        Args:
+            prices: Price per ticker, CUSIP or ISIN (a mapping, or a Series
+                indexed by identifier such as a latest_prices table column)
+            recalculate: Whether to recompute weights afterwards
+
+        Returns:
+            Number of positions updated
+        """
+        if isinstance(prices, pd.Series):
+            lookup = prices.astype("float64")
+        else:
+            lookup = pd.Series(dict(prices), dtype="float64")
+        price = pd.Series(self.ticker).map(lookup)
+        price = price.fillna(pd.Series(self.primary_identifiers()).map(lookup))
+        price = price.to_numpy(dtype="float64", na_value=np.nan)
+
+        priced = ~np.isnan(price)
+        self.market_value = np.where(priced, self.quantity * price, self.market_value)
+        if recalculate:
+            self.recalculate_weights()
+        return int(priced.sum())
+
+    def set_market_values(self, market_values: Mapping[str, float], recalculate: bool = True) -> int:
+        """Set market values by identifier.
+
+        Args:
+            market_values: Market value per ticker, CUSIP or ISIN
+            recalculate: Whether to recompute weights afterwards
+
+        Returns:
+            Number of positions updated
+        """
+        rows = [(self.index[key], value) for key, value in market_values.items() if key in self.index]
+        if rows:
+            positions, values = zip(*rows)
+            self.market_value[list(positions)] = values
+        if recalculate:
+            self.recalculate_weights()
+        return len(rows)
+
+    def extend(self, positions: Iterable[Position], recalculate: bool = True) -> None:
+        """Append positions in bulk.
+
+        Args:
+            positions: Positions to append
+            recalculate: Whether to recompute weights afterwards
+        """
+        other = PortfolioFrame.from_positions(positions)
+        for field in self.NUMERIC_FIELDS + self.TEXT_FIELDS:
+            setattr(self, field, np.concatenate([getattr(self, field), getattr(other, field)]))
+        self._index = None
+        if recalculate:
+            self.recalculate_weights()
+
+    def remove(self, identifiers: Iterable[str], recalculate: bool = True) -> int:
+        """Remove every position matching any of the given tickers, ISINs or CUSIPs.
+
+        Args:
+            identifiers: Tickers, ISINs or CUSIPs to remove
+            recalculate: Whether to recompute weights afterwards
+
+        Returns:
+            Number of positions removed
+        """
+        targets = set(identifiers)
+        drop = np.zeros(len(self), dtype=bool)
+        for field in ("ticker", "isin", "cusip"):
+            drop |= pd.Series(getattr(self, field)).isin(targets).to_numpy()
+        removed = int(drop.sum())
+        if removed:
+            keep = ~drop
+            for field in self.NUMERIC_FIELDS + self.TEXT_FIELDS:
+                setattr(self, field, getattr(self, field)[keep])
+            self._index = None
+            if recalculate:
+                self.recalculate_weights()
+        return removed
@@ -0,0 +1,265 @@
+"""Batch ETL over many portfolio files.
+
+Running ETLPipeline once per file repeats every FactSet request for
+securities the portfolios have in common. BatchPipeline instead loads all
+files first, prices and enriches the union of their identifiers once,
+crawls hierarchies once, and builds one set of graph statements in which
+shared securities, issuers, countries and executives appear once and each
+portfolio adds only its own portfolio, position and aggregate statements.
+"""
+
+import logging
+import time
+from dataclasses import dataclass, field
+from datetime import date
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+from pagr.fds.loaders.portfolio_loader import PortfolioLoader
+from pagr.fds.models.portfolio import Portfolio, Position
+from pagr.fds.services.pipeline import ETLPipeline, PipelineStatistics
+
+logger = logging.getLogger(__name__)
+
+# Stages reported to execute()'s progress callback, in order
+BATCH_STAGES = ["load", "prices", "enrich", "hierarchy", "graph"]
+
+
+@dataclass
+class BatchItem:
+    """Outcome of loading one portfolio file."""
+
+    path: str
+    portfolio: Optional[str] = None
+    positions: int = 0
+    priced: int = 0
+    error: Optional[str] = None
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Convert to dictionary."""
+        return {
+            "path": self.path,
+            "portfolio": self.portfolio,
+            "positions": self.positions,
+            "priced": self.priced,
+            "error": self.error,
+        }
+
+
+@dataclass
+class BatchResult:
+    """Portfolios, graph statements and statistics from a batch run."""
+
+    portfolios: List[Portfolio] = field(default_factory=list)
+    statements: List[str] = field(default_factory=list)
+    stats: PipelineStatistics = field(default_factory=PipelineStatistics)
+    items: List[BatchItem] = field(default_factory=list)
+    unique_identifiers: int = 0
+    duration_seconds: float = 0.0
+
+    @property
+    def failed(self) -> List[BatchItem]:
+        """Files that could not be loaded."""
+        return [item for item in self.items if item.error]
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Machine-readable report of the run."""
+        return {
+            "portfolios": [item.to_dict() for item in self.items],
+            "portfolios_failed": len(self.failed),
+            "unique_identifiers": self.unique_identifiers,
+            "statements": len(self.statements),
+            "duration_seconds": round(self.duration_seconds, 3),
+            "stats": self.stats.to_dict(),
+        }
+
+
+def discover_portfolio_files(sources: Iterable[str]) -> List[str]:
+    """Expand directories and manifests into portfolio file paths.
+
+    A directory contributes every file with a supported portfolio extension
+    (not recursive, sorted by name). A ``.txt`` or ``.lst`` manifest lists
+    one path per line, relative to the manifest; blank lines and ``#``
+    comments are ignored. Any other path is taken as a portfolio file.
+
+    Args:
+        sources: Directories, manifests or portfolio files
+
+    Returns:
+        Deduplicated list of portfolio file paths, in discovery order
+
+    Raises:
+        FileNotFoundError: If a source does not exist
+    """
+    files: List[str] = []
+    for source in sources:
+        path = Path(source)
+        if path.is_dir():
+            files.extend(
+                str(child)
+                for child in sorted(path.iterdir())
+                if child.is_file() and child.suffix.lower().lstrip(".") in PortfolioLoader.SUPPORTED_FORMATS
+            )
+        elif path.suffix.lower() in (".txt", ".lst"):
+            for line in path.read_text().splitlines():
+                entry = line.split("#", 1)[0].strip()
+                if entry:
+                    files.append(str(path.parent / entry) if not Path(entry).is_absolute() else entry)
+        elif path.exists():
+            files.append(str(path))
+        else:
+            raise FileNotFoundError(f"Portfolio source not found: {source}")
+    return list(dict.fromkeys(files))
+
+
+class BatchPipeline:
+    """Runs one ETLPipeline over many portfolios, enriching shared identifiers once."""
+
+    def __init__(self, pipeline: ETLPipeline):
+        """Initialize batch pipeline.
+
+        Args:
+            pipeline: Pipeline whose clients, loader, builder and stats are used
+        """
+        self.pipeline = pipeline
+
+    def execute(
+        self,
+        portfolio_files: Iterable[str],
+        progress: Optional[Callable[[str, PipelineStatistics], None]] = None,
+    ) -> BatchResult:
+        """Load, enrich and build graph statements for many portfolio files.
+
+        Files that fail to load are recorded in the result and skipped; the
+        rest of the batch still runs.
+
+        Args:
+            portfolio_files: Portfolio file paths
+            progress: Optional callback invoked with each BATCH_STAGES name
+                and the running statistics as that stage starts
+
+        Returns:
+            BatchResult
+        """
+        started = time.perf_counter()
+        pipeline = self.pipeline
+        stats = pipeline.stats
+        result = BatchResult(stats=stats)
+
+        def report(stage: str) -> None:
+            if progress is not None:
+                progress(stage, stats)
+
+        # Step 1: Load every portfolio
+        report("load")
+        for path in portfolio_files:
+            item = BatchItem(path=str(path))
+            errors_before = len(stats.errors)
+            portfolio = pipeline.load_portfolio(str(path))
+            if portfolio is None:
+                item.error = stats.errors[-1] if len(stats.errors) > errors_before else "Failed to load portfolio"
+            else:
+                item.portfolio = portfolio.name
+                item.positions = len(portfolio.positions)
+                result.portfolios.append(portfolio)
+            result.items.append(item)
+        stats.portfolios_loaded = len(result.portfolios)
+        stats.positions_loaded = sum(len(p.positions) for p in result.portfolios)
+
+        if not result.portfolios:
+            logger.error("Batch failed: no portfolio could be loaded")
+            result.duration_seconds = time.perf_counter() - started
+            return result
+
+        unique = unique_positions(p for portfolio in result.portfolios for p in portfolio.positions)
+        result.unique_identifiers = len(unique)
+        logger.info(
+            f"Loaded {len(result.portfolios)} portfolios with {stats.positions_loaded} positions "
+            f"({len(unique)} unique securities)"
+        )
+
+        # Step 2: Price the union once and apply to every portfolio
+        report("prices")
+        price_history = self._fetch_prices(unique)
+        by_name = {item.portfolio: item for item in result.items if item.portfolio}
+        for portfolio in result.portfolios:
+            pipeline.enrich_prices(portfolio, price_history=price_history)
+            by_name[portfolio.name].priced = sum(1 for p in portfolio.positions if p.market_value is not None)
+
+        # Step 3: Enrich the union of securities once
+        report("enrich")
+        stocks, bonds, companies, countries, executives = pipeline.enrich_positions(unique)
+
+        # Step 4: Crawl hierarchies once for every issuer in the batch
+        report("hierarchy")
+        hierarchy = pipeline.enrich_hierarchies(companies)
+
+        # Step 5: Shared entities once, then each portfolio's holdings
+        report("graph")
+        result.statements = self._build_graph(result.portfolios, stocks, bonds, companies, countries, executives, hierarchy)
+
+        result.duration_seconds = time.perf_counter() - started
+        logger.info(
+            f"Batch complete: {len(result.portfolios)} portfolios, {len(result.statements)} statements "
+            f"in {result.duration_seconds:.1f}s"
+        )
+        return result
+
+    def _fetch_prices(self, positions: List[Position]):
+        """Fetch and store prices for the batch's unique positions."""
+        pipeline = self.pipeline
+        price_history = pipeline.price_fetcher.fetch(positions)
+        for error in pipeline.price_fetcher.errors:
+            pipeline.stats.add_error(error)
+        if pipeline.price_store is not None:
+            pipeline.price_store.upsert(price_history, as_of=date.today().isoformat())
+        return price_history
+
+    def _build_graph(self, portfolios: List[Portfolio], stocks, bonds, companies, countries, executives, hierarchy) -> List[str]:
+        """Build statements for all portfolios sharing one set of reference entities.
+
+        The first portfolio goes through ETLPipeline.build_graph, which adds the
+        shared securities, companies, countries, executives and hierarchy; the
+        others add only their portfolio, positions, INVESTED_IN links and
+        aggregates. The builder emits all node statements before relationship
+        statements, so the result is valid regardless of portfolio order.
+        """
+        pipeline = self.pipeline
+        builder = pipeline.graph_builder
+        first, rest = portfolios[0], portfolios[1:]
+        pipeline.build_graph(first, stocks, bonds, companies, countries, executives, hierarchy)
+
+        for portfolio in rest:
+            try:
+                builder.add_portfolio_nodes(portfolio)
+                builder.add_position_nodes(portfolio.positions, portfolio.name)
+                pipeline.stats.graph_nodes_created += 1 + len(portfolio.positions)
+                pipeline.stats.graph_relationships_created += len(portfolio.positions)
+
+                position_to_security = pipeline.position_securities(portfolio, stocks, bonds)
+                if position_to_security:
+                    builder.add_invested_in_relationships(position_to_security)
+                    pipeline.stats.graph_relationships_created += len(position_to_security)
+
+                builder.add_exposure_aggregates(portfolio.name)
+            except Exception as e:
+                error_msg = f"Failed to build graph for {portfolio.name}: {e}"
+                logger.error(error_msg)
+                pipeline.stats.add_error(error_msg)
+
+        return builder.get_all_statements()
+
+
+def unique_positions(positions: Iterable[Position]) -> List[Position]:
+    """One position per security, keyed by its primary identifier.
+
+    Args:
+        positions: Positions from any number of portfolios
+
+    Returns:
+        First position seen for each (identifier type, identifier)
+    """
+    unique: Dict[Tuple[str, str], Position] = {}
+    for position in positions:
+        unique.setdefault(position.get_primary_identifier(), position)
+    return list(unique.values())
@@ -0,0 +1,241 @@
+"""Vectorized fixed-income analytics for Bond nodes.
+
+Bonds are processed as arrays: every bond's remaining cash flows are laid
+out in one padded (bonds x periods) matrix, yields are solved for all bonds
+at once with Newton's method, and duration, convexity, accrued interest and
+dirty price follow from the same discount factors. Conventions: prices are
+clean and quoted per 100 face, coupons are annual percentages, dates use
+30/360 and coupons are paid ``frequency`` times a year, aligned to maturity.
+
+BondAnalyticsService writes the results back onto Bond nodes; portfolio
+duration and DV01 are then read with GraphQueries.portfolio_bond_risk.
+"""
+
+import logging
+from dataclasses import dataclass
+from datetime import date
+from typing import Any, Dict, List, Optional, Sequence
+
+import numpy as np
+import pandas as pd
+
+from pagr.fds.graph.queries import GraphQueries
+
+logger = logging.getLogger(__name__)
+
+FACE = 100.0
+ANALYTICS_COLUMNS = [
+    "accrued_interest",
+    "dirty_price",
+    "ytm",
+    "macaulay_duration",
+    "modified_duration",
+    "convexity",
+    "dv01",
+]
+
+
+@dataclass
+class CashFlowSchedule:
+    """Remaining cash flows of a set of bonds, padded to a common width.
+
+    Attributes:
+        periods: Bonds x K time of each cash flow in coupon periods from settlement
+        amounts: Bonds x K cash flow per 100 face (0 in padding)
+        accrued_fraction: Fraction of the current coupon period already accrued
+        valid: Bonds with a coupon and a maturity after settlement
+    """
+
+    periods: np.ndarray
+    amounts: np.ndarray
+    accrued_fraction: np.ndarray
+    valid: np.ndarray
+
+
+def cash_flow_schedule(
+    coupon: Sequence[Optional[float]],
+    maturity_date: Sequence[Optional[str]],
+    settlement: Optional[date] = None,
+    frequency: int = 2,
+) -> CashFlowSchedule:
+    """Build the remaining cash-flow schedule for many bonds.
+
+    Args:
+        coupon: Annual coupon rate (%) per bond
+        maturity_date: Maturity date per bond (ISO strings or dates)
+        settlement: Settlement date (defaults to today)
+        frequency: Coupons per year
+
+    Returns:
+        CashFlowSchedule; invalid bonds carry a single zero cash flow
+    """
+    settlement = settlement or date.today()
+    coupon = _numeric(coupon)
+    maturity = pd.to_datetime(pd.Series(list(maturity_date), dtype=object), errors="coerce")
+
+    # 30/360 days from settlement to maturity
+    days = (
+        360.0 * (maturity.dt.year - settlement.year)
+        + 30.0 * (maturity.dt.month - settlement.month)
+        + (np.minimum(maturity.dt.day, 30) - min(settlement.day, 30))
+    ).to_numpy(dtype="float64", na_value=np.nan)
+
+    valid = np.isfinite(coupon) & (days > 0)
+    period_days = 360.0 / frequency
+    n = np.where(valid, np.ceil(np.where(valid, days, 1.0) / period_days), 1).astype(int)
+    to_next = np.where(valid, days - (n - 1) * period_days, period_days)
+    accrued_fraction = 1.0 - to_next / period_days
+
+    k = np.arange(int(n.max(initial=1)))
+    live = k < n[:, None]
+    periods = np.where(live, (1.0 - accrued_fraction)[:, None] + k, 0.0)
+    coupon_amount = np.where(valid, coupon, 0.0)[:, None] / frequency
+    amounts = np.where(live, coupon_amount, 0.0) + np.where((k == n[:, None] - 1) & valid[:, None], FACE, 0.0)
+
+    return CashFlowSchedule(periods=periods, amounts=amounts, accrued_fraction=accrued_fraction, valid=valid)
+
+
+def bond_analytics(
+    coupon: Sequence[Optional[float]],
+    maturity_date: Sequence[Optional[str]],
+    clean_price: Sequence[Optional[float]],
+    settlement: Optional[date] = None,
+    frequency: int = 2,
+    tolerance: float = 1e-12,
+    max_iterations: int = 50,
+) -> pd.DataFrame:
+    """Yield, duration, convexity, accrued interest and dirty price for many bonds.
+
+    Args:
+        coupon: Annual coupon rate (%) per bond
+        maturity_date: Maturity date per bond
+        clean_price: Clean price per 100 face per bond
+        settlement: Settlement date (defaults to today)
+        frequency: Coupons per year
+        tolerance: Newton convergence tolerance on the yield
+        max_iterations: Newton iteration cap
+
+    Returns:
+        DataFrame with ANALYTICS_COLUMNS, one row per bond in input order.
+        ytm is an annual percentage (like coupon); durations are in years;
+        dv01 is the price change per 100 face for a 1bp yield move. Rows
+        without a coupon, price or future maturity are NaN.
+    """
+    schedule = cash_flow_schedule(coupon, maturity_date, settlement, frequency)
+    price = _numeric(clean_price)
+    valid = schedule.valid & np.isfinite(price) & (price > 0)
+
+    periods, amounts = schedule.periods, schedule.amounts
+    coupon_rate = _numeric(coupon)
+    accrued = np.where(valid, np.nan_to_num(coupon_rate) / frequency * schedule.accrued_fraction, np.nan)
+    dirty = price + accrued
+    target = np.where(valid, dirty, FACE)
+
+    # Newton's method on the periodic yield, all bonds at once
+    y = np.where(valid, np.nan_to_num(coupon_rate) / 100.0, 0.0)
+    active = valid.copy()
+    for _ in range(max_iterations):
+        base = 1.0 + y[active, None] / frequency
+        discount = base ** -periods[active]
+        value = (amounts[active] * discount).sum(axis=1)
+        slope = -(amounts[active] * periods[active] * discount / base).sum(axis=1) / frequency
+        step = (value - target[active]) / slope
+        updated = np.maximum(y[active] - step, -0.99 * frequency)
+        y[active] = updated
+        converged = np.abs(step) < tolerance
+        if converged.all():
+            break
+        active[np.flatnonzero(active)[converged]] = False
+    else:
+        logger.warning(f"Yield solve did not converge for {int(active.sum())} bonds")
+
+    base = 1.0 + y[:, None] / frequency
+    discount = base ** -periods
+    pv = amounts * discount
+    # Invalid bonds have no cash flows; divide by 1 and mask them afterwards
+    value = np.where(valid, pv.sum(axis=1), 1.0)
+    macaulay = (pv * periods).sum(axis=1) / value / frequency
+    modified = macaulay / base[:, 0]
+    convexity = (pv * periods * (periods + 1)).sum(axis=1) / (value * frequency**2 * base[:, 0] ** 2)
+
+    result = pd.DataFrame(
+        {
+            "accrued_interest": accrued,
+            "dirty_price": dirty,
+            "ytm": y * 100.0,
+            "macaulay_duration": macaulay,
+            "modified_duration": modified,
+            "convexity": convexity,
+            "dv01": modified * dirty * 1e-4,
+        }
+    )
+    result.loc[~valid, :] = np.nan
+    return result
+
+
+class BondAnalyticsService:
+    """Computes analytics for every Bond node and writes them back."""
+
+    def __init__(self, graph_client, frequency: int = 2):
+        """Initialize bond analytics service.
+
+        Args:
+            graph_client: Memgraph client (must accept query parameters)
+            frequency: Coupons per year assumed for all bonds
+        """
+        self.graph_client = graph_client
+        self.frequency = frequency
+
+    def refresh(self, settlement: Optional[date] = None, portfolio_names: Optional[List[str]] = None) -> int:
+        """Recompute analytics for all priced bonds in the graph.
+
+        Args:
+            settlement: Settlement date (defaults to today)
+            portfolio_names: Only recompute bonds held by these portfolios
+
+        Returns:
+            Number of bonds updated
+        """
+        settlement = settlement or date.today()
+        if portfolio_names is None:
+            bonds = self.graph_client.execute_query(GraphQueries.bonds_for_analytics())
+        else:
+            bonds = self.graph_client.execute_query(
+                GraphQueries.bonds_for_analytics(scoped=True), {"names": list(portfolio_names)}
+            )
+        if not bonds:
+            return 0
+
+        analytics = bond_analytics(
+            [b.get("coupon") for b in bonds],
+            [b.get("maturity_date") for b in bonds],
+            [b.get("market_price") for b in bonds],
+            settlement=settlement,
+            frequency=self.frequency,
+        )
+        rows = self._rows(bonds, analytics, settlement)
+        if rows:
+            self.graph_client.execute_query(GraphQueries.update_bond_analytics(), {"rows": rows})
+
+        skipped = len(bonds) - len(rows)
+        if skipped:
+            logger.debug(f"Skipped {skipped} bonds with matured or unparseable terms")
+        logger.info(f"Updated analytics for {len(rows)} bonds")
+        return len(rows)
+
+    @staticmethod
+    def _rows(bonds: List[Dict[str, Any]], analytics: pd.DataFrame, settlement: date) -> List[Dict[str, Any]]:
+        """UNWIND rows for bonds whose analytics could be computed."""
+        computed = analytics["ytm"].notna().to_numpy()
+        as_of = settlement.isoformat()
+        values = analytics.to_dict("records")
+        return [
+            {"fibo_id": bond["fibo_id"], "as_of": as_of, **row}
+            for bond, row, ok in zip(bonds, values, computed)
+            if ok and bond.get("fibo_id")
+        ]
+
+
+def _numeric(values: Sequence[Any]) -> np.ndarray:
+    """Float array with NaN for missing or unparseable values."""
+    return pd.to_numeric(pd.Series(list(values), dtype=object), errors="coerce").to_numpy(dtype="float64")
@@ -0,0 +1,209 @@
+"""Registry of enriched FIBO entities shared across pipeline runs.
+
+ETLPipeline consults the registry before calling FactSet: a ticker or bond
+identifier enriched within ``max_age`` is served from the registry together
+with its issuer company and country, and officers are only fetched for
+issuers without fresh cached executives. The registry also tracks which
+entity fibo_ids are known to exist in the graph, so build_graph links to
+them instead of MERGE-ing their nodes again.
+
+Entries live in memory for the run and can optionally be persisted to
+SQLite, so later runs (e.g. the next overnight batch) reuse them too.
+"""
+
+import json
+import logging
+import sqlite3
+import threading
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+from pagr.fds.models.fibo import Bond, Company, Country, Executive, Stock
+
+logger = logging.getLogger(__name__)
+
+STOCK = "stock"
+BOND = "bond"
+EXECUTIVES = "executives"
+
+SCHEMA = """
+    CREATE TABLE IF NOT EXISTS entities (
+        kind TEXT NOT NULL,
+        key TEXT NOT NULL,
+        payload TEXT NOT NULL,
+        enriched_at TEXT NOT NULL,
+        PRIMARY KEY (kind, key)
+    ) WITHOUT ROWID
+"""
+
+
+@dataclass
+class RegistryEntry:
+    """Enrichment result for one security, or the officers of one issuer.
+
+    Attributes:
+        security: Enriched Stock or Bond (None for executive entries)
+        company: Issuer company, if resolved
+        countries: Countries created for the issuer, keyed as the pipeline keys them
+        executives: Officers (executive entries only)
+        enriched_at: When the entry was enriched
+    """
+
+    security: Optional[object] = None
+    company: Optional[Company] = None
+    countries: Dict[str, Country] = field(default_factory=dict)
+    executives: List[Executive] = field(default_factory=list)
+    enriched_at: datetime = field(default_factory=lambda: datetime.now(timezone.utc))
+
+    def to_json(self) -> str:
+        """Serialize the entry's entities."""
+        return json.dumps(
+            {
+                "security": self.security.model_dump() if self.security is not None else None,
+                "company": self.company.model_dump() if self.company is not None else None,
+                "countries": {key: country.model_dump() for key, country in self.countries.items()},
+                "executives": [executive.model_dump() for executive in self.executives],
+            }
+        )
+
+    @classmethod
+    def from_json(cls, kind: str, payload: str, enriched_at: datetime) -> "RegistryEntry":
+        """Rebuild an entry serialized with to_json."""
+        data = json.loads(payload)
+        security_model = {STOCK: Stock, BOND: Bond}.get(kind)
+        return cls(
+            security=security_model(**data["security"]) if security_model and data["security"] else None,
+            company=Company(**data["company"]) if data["company"] else None,
+            countries={key: Country(**value) for key, value in data["countries"].items()},
+            executives=[Executive(**value) for value in data["executives"]],
+            enriched_at=enriched_at,
+        )
+
+
+class EntityRegistry:
+    """Fresh enrichment results and graph membership for FIBO entities."""
+
+    def __init__(self, path: Optional[str] = None, max_age_days: float = 7.0):
+        """Initialize entity registry.
+
+        Args:
+            path: Optional SQLite file to persist entries to (":memory:" or
+                None keeps them for this process only)
+            max_age_days: Entries older than this are re-enriched
+        """
+        self.max_age = timedelta(days=max_age_days)
+        self._entries: Dict[Tuple[str, str], RegistryEntry] = {}
+        self._in_graph: Set[str] = set()
+        self._lock = threading.Lock()
+        self._conn: Optional[sqlite3.Connection] = None
+        self.hits = 0
+        self.misses = 0
+
+        if path and path != ":memory:":
+            Path(path).parent.mkdir(parents=True, exist_ok=True)
+            self._conn = sqlite3.connect(path, check_same_thread=False)
+            with self._conn:
+                self._conn.execute(SCHEMA)
+            self._load()
+
+    def close(self) -> None:
+        """Close the persistence connection, if any."""
+        if self._conn is not None:
+            self._conn.close()
+            self._conn = None
+
+    def get(self, kind: str, key: Optional[str]) -> Optional[RegistryEntry]:
+        """Return a fresh entry, or None if absent or stale.
+
+        Args:
+            kind: STOCK, BOND or EXECUTIVES
+            key: Ticker, bond primary identifier or issuer FactSet ID
+
+        Returns:
+            RegistryEntry or None
+        """
+        if not key:
+            return None
+        with self._lock:
+            entry = self._entries.get((kind, key))
+            if entry is not None and datetime.now(timezone.utc) - entry.enriched_at <= self.max_age:
+                self.hits += 1
+                return entry
+            self.misses += 1
+            return None
+
+    def put(self, kind: str, key: Optional[str], entry: RegistryEntry) -> None:
+        """Record an enrichment result.
+
+        Args:
+            kind: STOCK, BOND or EXECUTIVES
+            key: Ticker, bond primary identifier or issuer FactSet ID
+            entry: Enriched entities
+        """
+        if not key:
+            return
+        with self._lock:
+            self._entries[(kind, key)] = entry
+            if self._conn is not None:
+                with self._conn:
+                    self._conn.execute(
+                        "INSERT OR REPLACE INTO entities (kind, key, payload, enriched_at) VALUES (?, ?, ?, ?)",
+                        (kind, key, entry.to_json(), entry.enriched_at.isoformat()),
+                    )
+
+    def in_graph(self, fibo_id: Optional[str]) -> bool:
+        """True if the entity node is known to exist in the graph."""
+        with self._lock:
+            return fibo_id in self._in_graph
+
+    def mark_in_graph(self, fibo_ids: Iterable[str]) -> None:
+        """Record entity nodes that have been written to the graph."""
+        with self._lock:
+            self._in_graph.update(fid for fid in fibo_ids if fid)
+
+    def forget_graph(self) -> None:
+        """Forget graph membership, e.g. after the graph has been cleared.
+
+        Cached enrichment results are kept; only node creation is re-enabled.
+        """
+        with self._lock:
+            self._in_graph.clear()
+
+    def sync_from_graph(self, graph_client) -> int:
+        """Load the fibo_ids of entity nodes already in the graph.
+
+        Args:
+            graph_client: Memgraph client
+
+        Returns:
+            Number of entity nodes found
+        """
+        from pagr.fds.graph.queries import GraphQueries
+
+        rows = graph_client.execute_query(GraphQueries.entity_fibo_ids())
+        ids = [row["fibo_id"] for row in rows if row.get("fibo_id")]
+        with self._lock:
+            self._in_graph = set(ids)
+        logger.info(f"Entity registry synced {len(ids)} graph entities")
+        return len(ids)
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def _load(self) -> None:
+        """Load persisted entries that are still fresh."""
+        cutoff = datetime.now(timezone.utc) - self.max_age
+        loaded = 0
+        for kind, key, payload, enriched_at in self._conn.execute(
+            "SELECT kind, key, payload, enriched_at FROM entities WHERE enriched_at >= ?", (cutoff.isoformat(),)
+        ):
+            try:
+                self._entries[(kind, key)] = RegistryEntry.from_json(
+                    kind, payload, datetime.fromisoformat(enriched_at)
+                )
+                loaded += 1
+            except (ValueError, TypeError, KeyError) as e:
+                logger.debug(f"Skipping unreadable registry entry {kind}:{key}: {e}")
+        logger.info(f"Loaded {loaded} entities from registry")
@@ -0,0 +1,328 @@
+"""Background runner for portfolio upload jobs.
+
+Uploads are processed on worker threads instead of the Streamlit request
+thread. Each job's status, current stage, progress and running pipeline
+statistics are persisted in SQLite, so any session (including one that
+reconnected after the upload was submitted) can poll a job by id. Jobs that
+were queued or running when the process stopped are marked failed on
+start-up, since their uploaded bytes only lived in memory.
+"""
+
+import json
+import logging
+import sqlite3
+import threading
+import uuid
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+logger = logging.getLogger(__name__)
+
+QUEUED = "queued"
+RUNNING = "running"
+SUCCEEDED = "succeeded"
+FAILED = "failed"
+
+SCHEMA = """
+    CREATE TABLE IF NOT EXISTS jobs (
+        job_id TEXT PRIMARY KEY,
+        filename TEXT NOT NULL,
+        owner TEXT,
+        status TEXT NOT NULL,
+        stage TEXT,
+        progress REAL NOT NULL DEFAULT 0,
+        stats TEXT,
+        error TEXT,
+        created_at TEXT NOT NULL,
+        updated_at TEXT NOT NULL
+    )
+"""
+
+JOB_COLUMNS = ["job_id", "filename", "owner", "status", "stage", "progress", "stats", "error", "created_at", "updated_at"]
+
+# handler(filename, data, report) -> (result, stats); report(stage, stats)
+ProgressCallback = Callable[[str, Any], None]
+JobHandler = Callable[[str, bytes, ProgressCallback], Tuple[Any, Any]]
+
+
+@dataclass
+class Job:
+    """Persisted state of one upload job."""
+
+    job_id: str
+    filename: str
+    status: str
+    owner: Optional[str] = None
+    stage: Optional[str] = None
+    progress: float = 0.0
+    stats: Dict[str, Any] = field(default_factory=dict)
+    error: Optional[str] = None
+    created_at: str = ""
+    updated_at: str = ""
+
+    @property
+    def done(self) -> bool:
+        """True once the job has succeeded or failed."""
+        return self.status in (SUCCEEDED, FAILED)
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Convert to dictionary."""
+        return {name: getattr(self, name) for name in JOB_COLUMNS}
+
+
+class JobStore:
+    """SQLite table of upload jobs, safe to share between threads."""
+
+    def __init__(self, path: str = ":memory:"):
+        """Open (or create) a job store.
+
+        Args:
+            path: SQLite database file, or ":memory:" for a transient store
+        """
+        if path != ":memory:":
+            Path(path).parent.mkdir(parents=True, exist_ok=True)
+        self.path = path
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        if path != ":memory:":
+            self._conn.execute("PRAGMA journal_mode=WAL")
+        with self._conn:
+            self._conn.execute(SCHEMA)
+
+    def close(self) -> None:
+        """Close the underlying database connection."""
+        self._conn.close()
+
+    def create(self, filename: str, owner: Optional[str] = None) -> Job:
+        """Insert a new queued job.
+
+        Args:
+            filename: Uploaded file name
+            owner: Optional submitter (e.g. a session id) for filtering
+
+        Returns:
+            The new Job
+        """
+        now = _now()
+        job = Job(job_id=uuid.uuid4().hex, filename=filename, owner=owner, status=QUEUED, created_at=now, updated_at=now)
+        with self._lock, self._conn:
+            self._conn.execute(
+                f"INSERT INTO jobs ({', '.join(JOB_COLUMNS)}) VALUES ({', '.join('?' * len(JOB_COLUMNS))})",
+                self._row(job),
+            )
+        return job
+
+    def update(self, job_id: str, **fields: Any) -> None:
+        """Update some columns of a job.
+
+        Args:
+            job_id: Job to update
+            **fields: Column values (stats may be a dict)
+
+        Raises:
+            ValueError: If a field is not a job column
+        """
+        unknown = set(fields) - set(JOB_COLUMNS)
+        if unknown:
+            raise ValueError(f"Unknown job fields: {sorted(unknown)}")
+        if "stats" in fields:
+            fields["stats"] = json.dumps(fields["stats"] or {}, default=str)
+        fields["updated_at"] = _now()
+        assignments = ", ".join(f"{name} = ?" for name in fields)
+        with self._lock, self._conn:
+            self._conn.execute(f"UPDATE jobs SET {assignments} WHERE job_id = ?", [*fields.values(), job_id])
+
+    def get(self, job_id: str) -> Optional[Job]:
+        """Return a job by id, or None if unknown."""
+        with self._lock:
+            row = self._conn.execute(
+                f"SELECT {', '.join(JOB_COLUMNS)} FROM jobs WHERE job_id = ?", (job_id,)
+            ).fetchone()
+        return self._job(row) if row else None
+
+    def list(self, owner: Optional[str] = None, limit: int = 50) -> List[Job]:
+        """Return the most recent jobs, newest first.
+
+        Args:
+            owner: Only return jobs submitted by this owner
+            limit: Maximum number of jobs
+
+        Returns:
+            List of Job
+        """
+        query = f"SELECT {', '.join(JOB_COLUMNS)} FROM jobs"
+        params: List[Any] = []
+        if owner is not None:
+            query += " WHERE owner = ?"
+            params.append(owner)
+        query += " ORDER BY created_at DESC, rowid DESC LIMIT ?"
+        params.append(limit)
+        with self._lock:
+            rows = self._conn.execute(query, params).fetchall()
+        return [self._job(row) for row in rows]
+
+    def fail_interrupted(self) -> int:
+        """Mark queued and running jobs as failed (used at start-up).
+
+        Returns:
+            Number of jobs marked failed
+        """
+        with self._lock, self._conn:
+            cursor = self._conn.execute(
+                "UPDATE jobs SET status = ?, error = ?, updated_at = ? WHERE status IN (?, ?)",
+                (FAILED, "Interrupted by application restart", _now(), QUEUED, RUNNING),
+            )
+        return cursor.rowcount
+
+    @staticmethod
+    def _row(job: Job) -> List[Any]:
+        values = job.to_dict()
+        values["stats"] = json.dumps(values["stats"] or {}, default=str)
+        return [values[name] for name in JOB_COLUMNS]
+
+    @staticmethod
+    def _job(row: Sequence[Any]) -> Job:
+        values = dict(zip(JOB_COLUMNS, row))
+        values["stats"] = json.loads(values["stats"]) if values["stats"] else {}
+        return Job(**values)
+
+
+class JobRunner:
+    """Runs upload jobs on a thread pool and records their progress.
+
+    The handler receives the file name, the uploaded bytes and a
+    report(stage, stats) callback; progress is the position of the reported
+    stage in ``stages``. Handler return values are kept in memory for the
+    most recent ``keep_results`` jobs so the submitting session can pick up
+    objects (such as the loaded Portfolio) that are not persisted.
+    """
+
+    def __init__(
+        self,
+        handler: JobHandler,
+        store: Optional[JobStore] = None,
+        stages: Sequence[str] = (),
+        max_workers: int = 1,
+        keep_results: int = 20,
+    ):
+        """Initialize job runner.
+
+        Args:
+            handler: Function processing one upload, returning (result, stats)
+            store: Job store (an in-memory one is created if omitted)
+            stages: Ordered stage names the handler reports, for progress
+            max_workers: Jobs processed concurrently
+            keep_results: Number of finished jobs whose results are kept
+        """
+        self.handler = handler
+        self.store = store or JobStore()
+        self.stages = list(stages)
+        self.keep_results = keep_results
+        self._results: "OrderedDict[str, Any]" = OrderedDict()
+        self._futures: Dict[str, Future] = {}
+        self._lock = threading.Lock()
+        self._executor = ThreadPoolExecutor(max_workers=max(1, max_workers), thread_name_prefix="pagr-job")
+
+        interrupted = self.store.fail_interrupted()
+        if interrupted:
+            logger.warning(f"Marked {interrupted} interrupted upload job(s) as failed")
+
+    def submit(self, filename: str, data: bytes, owner: Optional[str] = None) -> str:
+        """Queue an upload for background processing.
+
+        Args:
+            filename: Uploaded file name (its extension selects the reader)
+            data: Uploaded file contents
+            owner: Optional submitter, e.g. a session id
+
+        Returns:
+            Job id to poll with get()
+        """
+        job = self.store.create(filename, owner)
+        with self._lock:
+            self._futures = {key: future for key, future in self._futures.items() if not future.done()}
+            self._futures[job.job_id] = self._executor.submit(self._run, job.job_id, filename, data)
+        logger.info(f"Queued upload job {job.job_id} for {filename}")
+        return job.job_id
+
+    def get(self, job_id: str) -> Optional[Job]:
+        """Return the current state of a job."""
+        return self.store.get(job_id)
+
+    def list_jobs(self, owner: Optional[str] = None, limit: int = 50) -> List[Job]:
+        """Return recent jobs, newest first."""
+        return self.store.list(owner=owner, limit=limit)
+
+    def result(self, job_id: str) -> Optional[Tuple[Any, Any]]:
+        """Return the handler's (result, stats) for a succeeded job, if still held."""
+        with self._lock:
+            return self._results.get(job_id)
+
+    def wait(self, job_id: str, timeout: Optional[float] = None) -> Optional[Job]:
+        """Block until a job submitted by this runner finishes.
+
+        Args:
+            job_id: Job to wait for
+            timeout: Seconds to wait (None waits indefinitely)
+
+        Returns:
+            Final job state
+
+        Raises:
+            TimeoutError: If the job does not finish in time
+        """
+        with self._lock:
+            future = self._futures.get(job_id)
+        if future is not None:
+            future.result(timeout=timeout)
+        return self.get(job_id)
+
+    def shutdown(self, wait: bool = True) -> None:
+        """Stop accepting jobs and shut down the worker threads."""
+        self._executor.shutdown(wait=wait)
+
+    def _run(self, job_id: str, filename: str, data: bytes) -> None:
+        """Process one job, recording progress, statistics and outcome."""
+        self.store.update(job_id, status=RUNNING)
+
+        def report(stage: str, stats: Any = None) -> None:
+            fields: Dict[str, Any] = {"stage": stage, "progress": self._progress(stage)}
+            if stats is not None:
+                fields["stats"] = _stats_dict(stats)
+            self.store.update(job_id, **fields)
+
+        try:
+            result, stats = self.handler(filename, data, report)
+        except Exception as e:
+            logger.exception(f"Upload job {job_id} failed: {e}")
+            self.store.update(job_id, status=FAILED, error=str(e))
+        else:
+            with self._lock:
+                self._results[job_id] = (result, stats)
+                while len(self._results) > self.keep_results:
+                    self._results.popitem(last=False)
+            self.store.update(job_id, status=SUCCEEDED, stage="done", progress=1.0, stats=_stats_dict(stats))
+            logger.info(f"Upload job {job_id} succeeded")
+
+    def _progress(self, stage: str) -> float:
+        """Fraction of stages completed when ``stage`` starts."""
+        if stage not in self.stages:
+            return 0.0
+        return self.stages.index(stage) / len(self.stages)
+
+
+def _stats_dict(stats: Any) -> Dict[str, Any]:
+    """Statistics as a JSON-friendly dict."""
+    if stats is None:
+        return {}
+    if hasattr(stats, "to_dict"):
+        return stats.to_dict()
+    return dict(stats)
+
+
+def _now() -> str:
+    return datetime.now(timezone.utc).isoformat(timespec="milliseconds")
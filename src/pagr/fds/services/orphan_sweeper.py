@@ -0,0 +1,154 @@
+"""Batched portfolio deletion and garbage collection of unreferenced nodes.
+
+Deleting only a Portfolio node leaves its Position nodes behind, and
+securities, issuers, officers and countries that no remaining portfolio
+refers to stay in the graph, inflating every label scan. OrphanSweeper
+deletes a portfolio's positions and then sweeps nodes that are no longer
+referenced, kind by kind in dependency order. Every delete is bounded to
+``batch_size`` nodes per transaction and repeated until a batch comes back
+short, so large portfolios never produce one giant transaction.
+"""
+
+import logging
+import time
+from dataclasses import dataclass, field
+from typing import Dict, Iterable, Optional
+
+from pagr.fds.graph.queries import GraphQueries
+
+logger = logging.getLogger(__name__)
+
+# Sweep order: each kind can only become unreferenced once the previous ones are gone
+ORPHAN_KINDS = ["positions", "securities", "companies", "executives", "countries", "aggregates"]
+
+
+@dataclass
+class SweepResult:
+    """Nodes deleted by a portfolio deletion and/or orphan sweep."""
+
+    portfolio: Optional[str] = None
+    portfolio_deleted: bool = False
+    positions_deleted: int = 0
+    orphans_deleted: Dict[str, int] = field(default_factory=dict)
+    batches: int = 0
+    duration_seconds: float = 0.0
+
+    @property
+    def total_deleted(self) -> int:
+        """Total nodes deleted."""
+        return int(self.portfolio_deleted) + self.positions_deleted + sum(self.orphans_deleted.values())
+
+    def to_dict(self) -> Dict:
+        """Convert to dictionary.
+
+        Returns:
+            Dict representation of the result
+        """
+        return {
+            "portfolio": self.portfolio,
+            "portfolio_deleted": self.portfolio_deleted,
+            "positions_deleted": self.positions_deleted,
+            "orphans_deleted": self.orphans_deleted,
+            "total_deleted": self.total_deleted,
+            "batches": self.batches,
+            "duration_seconds": self.duration_seconds,
+        }
+
+
+class OrphanSweeper:
+    """Deletes portfolios and unreferenced graph nodes in bounded batches."""
+
+    def __init__(self, graph_client, batch_size: int = 5000, company_depth: int = 2):
+        """Initialize orphan sweeper.
+
+        Args:
+            graph_client: Memgraph client (must accept query parameters)
+            batch_size: Most nodes deleted per transaction
+            company_depth: Hierarchy/supply-chain hops that keep a company
+                linked to an issuer held by some portfolio
+        """
+        if batch_size < 1:
+            raise ValueError("batch_size must be at least 1")
+        self.graph_client = graph_client
+        self.batch_size = batch_size
+        self.company_depth = company_depth
+
+    def delete_portfolio(self, portfolio_name: str, sweep: bool = True) -> SweepResult:
+        """Delete a portfolio, its positions and aggregates.
+
+        Args:
+            portfolio_name: Name of portfolio to delete
+            sweep: Also sweep the nodes the deletion left unreferenced
+
+        Returns:
+            SweepResult; portfolio_deleted is False if it did not exist
+        """
+        started = time.perf_counter()
+        result = SweepResult(portfolio=portfolio_name)
+        params = {"name": portfolio_name}
+
+        result.positions_deleted = self._delete_in_batches(
+            GraphQueries.delete_portfolio_positions(), params, result
+        )
+        rows = self.graph_client.execute_query(GraphQueries.delete_portfolio_node(), params)
+        result.batches += 1
+        result.portfolio_deleted = bool(rows and rows[0].get("deleted"))
+
+        if sweep:
+            self._sweep(ORPHAN_KINDS, result)
+
+        result.duration_seconds = time.perf_counter() - started
+        logger.info(
+            f"Deleted portfolio '{portfolio_name}': {result.positions_deleted} positions, "
+            f"{sum(result.orphans_deleted.values())} orphaned nodes in {result.batches} batches"
+        )
+        return result
+
+    def sweep(self, kinds: Optional[Iterable[str]] = None) -> SweepResult:
+        """Delete every unreferenced node (standalone compaction).
+
+        Args:
+            kinds: Subset of ORPHAN_KINDS (all if omitted); always swept in
+                ORPHAN_KINDS order
+
+        Returns:
+            SweepResult with deletions per kind
+
+        Raises:
+            ValueError: If an unknown kind is requested
+        """
+        kinds = set(ORPHAN_KINDS if kinds is None else kinds)
+        unknown = kinds - set(ORPHAN_KINDS)
+        if unknown:
+            raise ValueError(f"Unknown orphan kinds: {sorted(unknown)}")
+
+        started = time.perf_counter()
+        result = SweepResult()
+        self._sweep([kind for kind in ORPHAN_KINDS if kind in kinds], result)
+        result.duration_seconds = time.perf_counter() - started
+        logger.info(
+            f"Orphan sweep deleted {result.total_deleted} nodes in {result.batches} batches: "
+            f"{result.orphans_deleted}"
+        )
+        return result
+
+    def _sweep(self, kinds: Iterable[str], result: SweepResult) -> None:
+        """Sweep the given kinds in order, recording deletions on result."""
+        for kind in kinds:
+            query = GraphQueries.delete_orphans(kind, company_depth=self.company_depth)
+            result.orphans_deleted[kind] = self._delete_in_batches(query, {}, result)
+
+    def _delete_in_batches(self, query: str, params: Dict, result: SweepResult) -> int:
+        """Run a bounded delete until a batch removes fewer than batch_size nodes.
+
+        Returns:
+            Number of nodes deleted
+        """
+        total = 0
+        while True:
+            rows = self.graph_client.execute_query(query, {**params, "limit": self.batch_size})
+            result.batches += 1
+            deleted = rows[0].get("deleted", 0) if rows else 0
+            total += deleted
+            if deleted < self.batch_size:
+                return total
@@ -5,7 +5,10 @@ Coordinates loading, enriching, and building graph from portfolio data.
 
 import logging
 from dataclasses import dataclass, field
-from typing import Dict, List, Optional, Tuple
+from datetime import date
+from typing import Any, Callable, Dict, List, Optional, Set, Tuple
+
+import pandas as pd
 
 from pagr.fds.loaders.portfolio_loader import PortfolioLoader
 from pagr.fds.clients.factset_client import (
@@ -17,12 +20,21 @@ from pagr.fds.clients.factset_client import (
 from pagr.fds.enrichers.company_enricher import CompanyEnricher
 from pagr.fds.enrichers.bond_enricher import BondEnricher
 from pagr.fds.enrichers.relationship_enricher import RelationshipEnricher
+from pagr.fds.enrichers.hierarchy_crawler import EntityHierarchyCrawler, HierarchyResult
+from pagr.fds.config import FIBOConfig
 from pagr.fds.graph.builder import GraphBuilder
 from pagr.fds.models.portfolio import Portfolio, Position
+from pagr.fds.models.portfolio_frame import PortfolioFrame
 from pagr.fds.models.fibo import Company, Country, Executive, Stock, Bond
+from pagr.fds.services.entity_registry import BOND, EXECUTIVES, STOCK, EntityRegistry, RegistryEntry
+from pagr.fds.services.price_store import PriceStore
+from pagr.fds.services.pricing import PriceFetcher, empty_price_table, latest_prices
 
 logger = logging.getLogger(__name__)
 
+# Stages reported to execute()'s progress callback, in order
+PIPELINE_STAGES = ["load", "prices", "enrich", "hierarchy", "graph"]
+
 
 @dataclass
 class PipelineStatistics:
@@ -37,6 +49,8 @@ class PipelineStatistics:
     bonds_failed: int = 0
     executives_enriched: int = 0
     countries_enriched: int = 0
+    hierarchy_relationships: int = 0
+    entities_reused: int = 0
     graph_nodes_created: int = 0
     graph_relationships_created: int = 0
     errors: List[str] = field(default_factory=list)
@@ -65,6 +79,8 @@ class PipelineStatistics:
             "bonds_failed": self.bonds_failed,
             "executives_enriched": self.executives_enriched,
             "countries_enriched": self.countries_enriched,
+            "hierarchy_relationships": self.hierarchy_relationships,
+            "entities_reused": self.entities_reused,
             "graph_nodes_created": self.graph_nodes_created,
             "graph_relationships_created": self.graph_relationships_created,
             "total_errors": len(self.errors),
@@ -79,6 +95,11 @@ class ETLPipeline:
         factset_client: FactSetClient,
         portfolio_loader: PortfolioLoader,
         graph_builder: GraphBuilder,
+        fibo_config: Optional[FIBOConfig] = None,
+        hierarchy_crawler: Optional[EntityHierarchyCrawler] = None,
+        price_fetcher: Optional[PriceFetcher] = None,
+        price_store: Optional[PriceStore] = None,
+        entity_registry: Optional[EntityRegistry] = None,
     ):
         """Initialize ETL pipeline.
 
@@ -86,10 +107,32 @@ class ETLPipeline:
             factset_client: FactSet API client
             portfolio_loader: Portfolio loader
             graph_builder: Graph builder
+            fibo_config: FIBO enrichment options (defaults used if omitted)
+            hierarchy_crawler: Shared crawler, so visited entities carry across
+                portfolios (one is created from fibo_config if omitted)
+            price_fetcher: Price fetcher (one is created for factset_client if omitted)
+            price_store: Optional price history store that fetched prices are saved to
+            entity_registry: Optional registry of enriched entities shared across
+                runs; fresh entries are reused instead of calling FactSet, and
+                nodes it knows are in the graph are linked rather than re-MERGEd
         """
         self.factset_client = factset_client
         self.portfolio_loader = portfolio_loader
         self.graph_builder = graph_builder
+        self.fibo_config = fibo_config or FIBOConfig()
+        self.hierarchy_crawler = hierarchy_crawler or EntityHierarchyCrawler(
+            factset_client,
+            max_depth=self.fibo_config.hierarchy_max_depth,
+            min_ownership=self.fibo_config.hierarchy_min_ownership,
+            batch_size=self.fibo_config.hierarchy_batch_size,
+        )
+        self.price_fetcher = price_fetcher or PriceFetcher(factset_client)
+        self.price_store = price_store
+        self.entity_registry = entity_registry
+        # fibo_ids of the entity nodes present in the graph once the built
+        # statements have been executed (see EntityRegistry.mark_in_graph)
+        self.graph_entity_ids: Set[str] = set()
+        self.price_history = empty_price_table()
         self.stats = PipelineStatistics()
         logger.info("Initialized ETL pipeline")
 
@@ -157,6 +200,9 @@ class ETLPipeline:
                 f"[{idx+1}/{len(positions)}] Enriching position: {primary_id_type}={primary_id}"
             )
 
+            if self._from_registry(position, stocks, bonds, companies, countries):
+                continue
+
             try:
                 # Route to stock or bond enrichment based on identifier type
                 if position.ticker:
@@ -169,7 +215,6 @@ class ETLPipeline:
                         stocks,
                         companies,
                         countries,
-                        executives,
                     )
                 else:
                     # Bond enrichment (new flow)
@@ -193,6 +238,10 @@ class ETLPipeline:
                 else:
                     self.stats.bonds_failed += 1
 
+        # Fetch officers for all resolved issuers in batched requests
+        if self.fibo_config.fetch_executives:
+            executives.update(self.enrich_executives(company_enricher, companies))
+
         logger.info(
             f"Enrichment complete: "
             f"{self.stats.stocks_enriched} stocks, "
@@ -203,6 +252,58 @@ class ETLPipeline:
         )
         return stocks, bonds, companies, countries, executives
 
+    def _from_registry(
+        self,
+        position: Position,
+        stocks: Dict[str, Stock],
+        bonds: Dict[str, Bond],
+        companies: Dict[str, Company],
+        countries: Dict[str, Country],
+    ) -> bool:
+        """Fill the accumulators from a fresh registry entry, if there is one.
+
+        Args:
+            position: Position to look up
+            stocks: Dict to accumulate Stock objects
+            bonds: Dict to accumulate Bond objects
+            companies: Dict to accumulate Company objects
+            countries: Dict to accumulate Country objects
+
+        Returns:
+            True if the position was served from the registry
+        """
+        if self.entity_registry is None:
+            return False
+
+        if position.ticker:
+            entry = self.entity_registry.get(STOCK, position.ticker)
+            if entry is None:
+                return False
+            stocks[position.ticker] = entry.security
+            if entry.company is not None:
+                companies[position.ticker] = entry.company
+        else:
+            _, primary_id = position.get_primary_identifier()
+            entry = self.entity_registry.get(BOND, primary_id)
+            if entry is None:
+                return False
+            bonds[primary_id] = entry.security
+            if entry.company is not None:
+                companies.setdefault(entry.company.name, entry.company)
+
+        for key, country in entry.countries.items():
+            countries.setdefault(key, country)
+        self._record_fetched_at(entry, [entry.security, entry.company, *entry.countries.values()])
+        self.stats.entities_reused += 1
+        return True
+
+    def _record_fetched_at(self, entry: RegistryEntry, entities: List[Any]) -> None:
+        """Keep the original fetch time on nodes built from a registry entry."""
+        fetched_at = entry.enriched_at.isoformat()
+        for entity in entities:
+            if entity is not None:
+                self.graph_builder.fetched_at.setdefault(entity.fibo_id, fetched_at)
+
     def _enrich_stock_position(
         self,
         position: Position,
@@ -212,10 +313,11 @@ class ETLPipeline:
         stocks: Dict[str, Stock],
         companies: Dict[str, Company],
         countries: Dict[str, Country],
-        executives: Dict[str, Executive],
     ) -> None:
         """Enrich a single stock position.
 
+        Executives are fetched afterwards in bulk by enrich_executives.
+
         Args:
             position: Position object
             ticker: Stock ticker
@@ -224,7 +326,6 @@ class ETLPipeline:
             stocks: Dict to accumulate Stock objects
             companies: Dict to accumulate Company objects
             countries: Dict to accumulate Country objects
-            executives: Dict to accumulate Executive objects
         """
         try:
             # Enrich company data
@@ -248,18 +349,6 @@ class ETLPipeline:
                 self.stats.stocks_enriched += 1
                 logger.debug(f"  Created Stock entity for {ticker}")
 
-                # Enrich executives for this company
-                try:
-                    company_executives = company_enricher.enrich_executives(
-                        company.fibo_id
-                    )
-                    for exec_obj in company_executives:
-                        executives[exec_obj.fibo_id] = exec_obj
-                        self.stats.executives_enriched += 1
-                    logger.debug(f"  Enriched {len(company_executives)} executives")
-                except Exception as e:
-                    logger.warning(f"  Failed to enrich executives for {ticker}: {e}")
-
                 # Enrich geography data
                 if company.country:
                     try:
@@ -283,6 +372,13 @@ class ETLPipeline:
                         logger.warning(
                             f"  Failed to enrich geography for {ticker}: {e}"
                         )
+                if self.entity_registry is not None:
+                    country = countries.get(company.country) if company.country else None
+                    self.entity_registry.put(
+                        STOCK, ticker,
+                        RegistryEntry(security=stock, company=company,
+                                      countries={company.country: country} if country else {}),
+                    )
             else:
                 self.stats.companies_failed += 1
                 logger.warning(f"Failed to enrich company for {ticker}")
@@ -299,6 +395,57 @@ class ETLPipeline:
             logger.warning(f"Ticker not found: {ticker} ({str(e)})")
             self.stats.companies_failed += 1
 
+    def enrich_executives(
+        self, company_enricher: CompanyEnricher, companies: Dict[str, Company]
+    ) -> Dict[str, Executive]:
+        """Enrich executives for all resolved issuers with batched officer requests.
+
+        Args:
+            company_enricher: CompanyEnricher instance
+            companies: Enriched companies (stock tickers and bond issuers)
+
+        Returns:
+            Dict of executive fibo_id -> Executive (company_fibo_id set)
+        """
+        entity_ids = [c.factset_id for c in companies.values() if c.factset_id]
+        if not entity_ids:
+            return {}
+
+        executives: Dict[str, Executive] = {}
+        if self.entity_registry is not None:
+            to_fetch = []
+            for entity_id in dict.fromkeys(entity_ids):
+                entry = self.entity_registry.get(EXECUTIVES, entity_id)
+                if entry is None:
+                    to_fetch.append(entity_id)
+                    continue
+                for exec_obj in entry.executives:
+                    executives[exec_obj.fibo_id] = exec_obj
+                self._record_fetched_at(entry, entry.executives)
+            if not to_fetch:
+                return executives
+        else:
+            to_fetch = entity_ids
+
+        try:
+            by_entity = company_enricher.enrich_executives_bulk(
+                to_fetch, batch_size=self.fibo_config.executives_batch_size
+            )
+        except Exception as e:
+            logger.warning(f"Failed to enrich executives: {e}")
+            return executives
+
+        for company_executives in by_entity.values():
+            for exec_obj in company_executives:
+                executives[exec_obj.fibo_id] = exec_obj
+        if self.entity_registry is not None:
+            for entity_id in to_fetch:
+                self.entity_registry.put(EXECUTIVES, entity_id, RegistryEntry(executives=list(by_entity.get(entity_id, []))))
+
+        self.stats.executives_enriched += len(executives)
+        logger.debug(f"Enriched {len(executives)} executives for {len(entity_ids)} companies")
+        return executives
+
     def _enrich_bond_position(
         self,
         position: Position,
@@ -332,6 +479,8 @@ class ETLPipeline:
                 logger.debug(f"  Enriched bond: {primary_id_type}={primary_id}")
 
                 # Try to resolve and enrich issuer company
+                issuer_company = None
+                issuer_resolved = False
                 try:
                     issuer_company = bond_enricher.resolve_issuer(
                         position.cusip, position.isin
@@ -367,9 +516,19 @@ class ETLPipeline:
                             )
                     else:
                         logger.debug(f"  Could not resolve issuer for bond")
+                    issuer_resolved = True
                 except Exception as e:
                     logger.warning(f"  Failed to enrich bond issuer: {e}")
 
+                # Only cache complete results, so a failed issuer lookup is retried
+                if self.entity_registry is not None and issuer_resolved:
+                    iso_code = issuer_company.country[:2].upper() if issuer_company and issuer_company.country else None
+                    self.entity_registry.put(
+                        BOND, primary_id,
+                        RegistryEntry(security=bond, company=issuer_company,
+                                      countries={iso_code: countries[iso_code]} if iso_code in countries else {}),
+                    )
+
             else:
                 self.stats.bonds_failed += 1
                 primary_id_type, primary_id = position.get_primary_identifier()
@@ -381,6 +540,29 @@ class ETLPipeline:
             self.stats.add_error(error_msg)
             self.stats.bonds_failed += 1
 
+    def enrich_hierarchies(self, companies: Dict[str, Company]) -> HierarchyResult:
+        """Crawl parent/subsidiary structures for the portfolio's issuers.
+
+        Args:
+            companies: Enriched companies whose FactSet IDs seed the crawl
+
+        Returns:
+            HierarchyResult (empty if subsidiary fetching is disabled)
+        """
+        if not self.fibo_config.fetch_subsidiaries:
+            return HierarchyResult()
+
+        entity_ids = [c.factset_id for c in companies.values() if c.factset_id]
+        try:
+            hierarchy = self.hierarchy_crawler.crawl(entity_ids)
+        except Exception as e:
+            logger.warning(f"Hierarchy crawl failed: {e}")
+            self.stats.add_error(f"Hierarchy crawl failed: {e}")
+            return HierarchyResult()
+
+        self.stats.hierarchy_relationships = len(hierarchy.relationships)
+        return hierarchy
+
     def build_graph(
         self,
         portfolio: Portfolio,
@@ -389,6 +571,7 @@ class ETLPipeline:
         companies: Dict[str, Company],
         countries: Dict[str, Country],
         executives: Dict[str, Executive],
+        hierarchy: Optional[HierarchyResult] = None,
     ) -> List[str]:
         """Build graph nodes and relationships for mixed stock/bond portfolio.
 
@@ -397,6 +580,9 @@ class ETLPipeline:
         - Position -[INVESTED_IN]-> Stock/Bond
         - Stock/Bond -[ISSUED_BY]-> Company
         - Company -[HEADQUARTERED_IN]-> Country
+        - Executive -[CEO_OF|LEADS]-> Company
+        - Company -[HAS_SUBSIDIARY]-> Company (from the hierarchy crawl)
+        - Portfolio -[HAS_AGGREGATE]-> ExposureAggregate (materialized totals)
 
         Args:
             portfolio: Portfolio instance
@@ -405,6 +591,7 @@ class ETLPipeline:
             companies: Dictionary of enriched companies
             countries: Dictionary of enriched countries
             executives: Dictionary of enriched executives
+            hierarchy: Optional crawled corporate hierarchy
 
         Returns:
             List of all Cypher statements
@@ -421,94 +608,34 @@ class ETLPipeline:
             self.stats.graph_nodes_created += len(portfolio.positions)
             self.stats.graph_relationships_created += len(portfolio.positions)
 
-            # Add security nodes (stocks and bonds)
-            if stocks or bonds:
-                self.graph_builder.add_security_nodes(stocks, bonds)
-                self.stats.graph_nodes_created += len(stocks) + len(bonds)
-
-            # Add company nodes
-            if companies:
-                self.graph_builder.add_company_nodes(companies)
-                self.stats.graph_nodes_created += len(companies)
-
-            # Add country nodes
-            if countries:
-                self.graph_builder.add_country_nodes(countries)
-                self.stats.graph_nodes_created += len(countries)
-
-            # Add executive nodes
-            if executives:
-                self.graph_builder.add_executive_nodes(executives)
-                self.stats.graph_nodes_created += len(executives)
+            # Add security, company, country and executive nodes and their links
+            self._add_entities(stocks, bonds, companies, countries, executives)
 
             # Build Position -> Security mappings for INVESTED_IN relationships
-            # Maps: (position_ticker, position_quantity, position_book_value) -> (security_type, security_fibo_id)
-            position_to_security: Dict[tuple, Tuple[str, str]] = {}
-            for position in portfolio.positions:
-                if position.ticker and position.ticker in stocks:
-                    # Stock position - use ticker as position key
-                    stock_fibo_id = stocks[position.ticker].fibo_id
-                    position_to_security[(position.ticker, position.quantity, position.book_value)] = ("stock", stock_fibo_id)
-                elif position.cusip or position.isin:
-                    # Bond position - look up by CUSIP/ISIN, but use position properties as key
-                    primary_id_type, primary_id = position.get_primary_identifier()
-                    if primary_id in bonds:
-                        bond_fibo_id = bonds[primary_id].fibo_id
-                        # Use (ticker, quantity, book_value) as unique position key
-                        pos_key = (position.ticker or "", position.quantity, position.book_value)
-                        position_to_security[pos_key] = ("bond", bond_fibo_id)
+            position_to_security = self.position_securities(portfolio, stocks, bonds)
 
             # Add INVESTED_IN relationships (Position -> Security)
             if position_to_security:
                 self.graph_builder.add_invested_in_relationships(position_to_security)
                 self.stats.graph_relationships_created += len(position_to_security)
 
-            # Build Security -> Company mappings for ISSUED_BY relationships
-            security_to_company: Dict[str, Tuple[str, str]] = {}
-
-            # Stocks -> Companies
-            for ticker, stock in stocks.items():
-                if ticker in companies:
-                    company_fibo_id = companies[ticker].fibo_id
-                    security_to_company[stock.fibo_id] = ("stock", company_fibo_id)
-
-            # Bonds -> Companies (by issuer)
-            for bond_id, bond in bonds.items():
-                # Find issuer company - check if it's in companies dict by issuer name
-                for company_name, company in companies.items():
-                    # If this company was created from bond enrichment, use it
-                    # We match by name since bond issuers are identified by name
-                    if company.name and bond_id not in security_to_company:
-                        # This is a simplified approach - in reality you'd want better matching
-                        # For now, we assume each bond has one issuer that's in companies
-                        security_to_company[bond.fibo_id] = ("bond", company.fibo_id)
-                        break
-
-            # Add ISSUED_BY relationships (Security -> Company)
-            if security_to_company:
-                self.graph_builder.add_security_issued_by_relationships(
-                    security_to_company
-                )
-                self.stats.graph_relationships_created += len(security_to_company)
-
-            # Add HEADQUARTERED_IN relationships (company -> country)
-            company_to_country = {}
-            for company_id, company in companies.items():
-                if company.country:
-                    # Try to find ISO code from countries dict
-                    iso_code = None
-                    for country_name, country_obj in countries.items():
-                        if country_name.lower() == company.country.lower():
-                            iso_code = country_obj.iso_code
-                            break
-                    if not iso_code:
-                        # Fallback: use first 2 characters of country name
-                        iso_code = company.country[:2].upper()
-                    company_to_country[company.fibo_id] = iso_code
-
-            if company_to_country:
-                self.graph_builder.add_headquartered_in_relationships(company_to_country)
-                self.stats.graph_relationships_created += len(company_to_country)
+            # Add crawled corporate hierarchy (stub nodes first so edges can MATCH)
+            if hierarchy and hierarchy.relationships:
+                self.graph_builder.add_company_stub_nodes(hierarchy.companies)
+                self.graph_builder.add_company_relationships(hierarchy.relationships)
+                self.stats.graph_nodes_created += len(hierarchy.companies)
+                self.stats.graph_relationships_created += len(hierarchy.relationships)
+            if hierarchy and hierarchy.crawled:
+                self.graph_builder.add_hierarchy_refreshed(hierarchy.crawled)
+
+            # Materialize sector/country/issuer aggregates once the subgraph is complete
+            self.graph_builder.add_exposure_aggregates(portfolio.name)
+
+            self.graph_entity_ids.update(
+                entity.fibo_id
+                for entities in (stocks, bonds, companies, countries, executives)
+                for entity in entities.values()
+            )
 
             # Get all statements
             statements = self.graph_builder.get_all_statements()
@@ -525,159 +652,265 @@ class ETLPipeline:
             self.stats.add_error(error_msg)
             return []
 
-    def enrich_prices(self, portfolio: Portfolio) -> None:
+    def build_entity_graph(
+        self,
+        stocks: Dict[str, Stock],
+        bonds: Dict[str, Bond],
+        companies: Dict[str, Company],
+        countries: Dict[str, Country],
+        executives: Dict[str, Executive],
+    ) -> List[str]:
+        """Build nodes and relationships for enriched entities outside any portfolio.
+
+        Used to re-enrich reference data in place: existing nodes are
+        updated by MERGE and positions keep their INVESTED_IN links.
+
+        Args:
+            stocks: Dictionary of enriched stocks
+            bonds: Dictionary of enriched bonds
+            companies: Dictionary of enriched companies
+            countries: Dictionary of enriched countries
+            executives: Dictionary of enriched executives
+
+        Returns:
+            List of all Cypher statements
+        """
+        try:
+            self._add_entities(stocks, bonds, companies, countries, executives)
+        except Exception as e:
+            error_msg = f"Failed to build entity graph: {str(e)}"
+            logger.error(error_msg)
+            self.stats.add_error(error_msg)
+            return []
+
+        self.graph_entity_ids.update(
+            entity.fibo_id
+            for entities in (stocks, bonds, companies, countries, executives)
+            for entity in entities.values()
+        )
+        return self.graph_builder.get_all_statements()
+
+    def _add_entities(
+        self,
+        stocks: Dict[str, Stock],
+        bonds: Dict[str, Bond],
+        companies: Dict[str, Company],
+        countries: Dict[str, Country],
+        executives: Dict[str, Executive],
+    ) -> None:
+        """Add entity nodes with their ISSUED_BY, HEADQUARTERED_IN and officer links.
+
+        Entities the registry knows to be in the graph are skipped; see
+        build_graph for the arguments.
+        """
+        # Entities already in the graph are linked to, not written again
+        new_stocks, new_bonds, new_companies, new_countries, new_executives = (
+            self._new_entities(entities) for entities in (stocks, bonds, companies, countries, executives)
+        )
+
+        # Add security nodes (stocks and bonds)
+        if new_stocks or new_bonds:
+            self.graph_builder.add_security_nodes(new_stocks, new_bonds)
+            self.stats.graph_nodes_created += len(new_stocks) + len(new_bonds)
+
+        # Add company nodes
+        if new_companies:
+            self.graph_builder.add_company_nodes(new_companies)
+            self.stats.graph_nodes_created += len(new_companies)
+
+        # Add country nodes
+        if new_countries:
+            self.graph_builder.add_country_nodes(new_countries)
+            self.stats.graph_nodes_created += len(new_countries)
+
+        # Add executive nodes
+        if new_executives:
+            self.graph_builder.add_executive_nodes(new_executives)
+            self.stats.graph_nodes_created += len(new_executives)
+
+        # Build Security -> Company mappings for ISSUED_BY relationships
+        security_to_company: Dict[str, Tuple[str, str]] = {}
+
+        # Stocks -> Companies
+        for ticker, stock in new_stocks.items():
+            if ticker in companies:
+                company_fibo_id = companies[ticker].fibo_id
+                security_to_company[stock.fibo_id] = ("stock", company_fibo_id)
+
+        # Bonds -> Companies (by issuer)
+        for bond_id, bond in new_bonds.items():
+            # Find issuer company - check if it's in companies dict by issuer name
+            for company_name, company in companies.items():
+                # If this company was created from bond enrichment, use it
+                # We match by name since bond issuers are identified by name
+                if company.name and bond_id not in security_to_company:
+                    # This is a simplified approach - in reality you'd want better matching
+                    # For now, we assume each bond has one issuer that's in companies
+                    security_to_company[bond.fibo_id] = ("bond", company.fibo_id)
+                    break
+
+        # Add ISSUED_BY relationships (Security -> Company)
+        if security_to_company:
+            self.graph_builder.add_security_issued_by_relationships(
+                security_to_company
+            )
+            self.stats.graph_relationships_created += len(security_to_company)
+
+        # Add HEADQUARTERED_IN relationships (company -> country)
+        company_to_country = {}
+        for company_id, company in new_companies.items():
+            if company.country:
+                # Try to find ISO code from countries dict
+                iso_code = None
+                for country_name, country_obj in countries.items():
+                    if country_name.lower() == company.country.lower():
+                        iso_code = country_obj.iso_code
+                        break
+                if not iso_code:
+                    # Fallback: use first 2 characters of country name
+                    iso_code = company.country[:2].upper()
+                company_to_country[company.fibo_id] = iso_code
+
+        if company_to_country:
+            self.graph_builder.add_headquartered_in_relationships(company_to_country)
+            self.stats.graph_relationships_created += len(company_to_country)
+
+        # Add CEO_OF / LEADS relationships (executive -> company)
+        ceo_of: Dict[str, str] = {}
+        leads: Dict[str, str] = {}
+        for exec_fibo_id, executive in new_executives.items():
+            if not executive.company_fibo_id:
+                continue
+            if CompanyEnricher.is_ceo(executive):
+                ceo_of[exec_fibo_id] = executive.company_fibo_id
+            else:
+                leads[exec_fibo_id] = executive.company_fibo_id
+
+        if ceo_of:
+            self.graph_builder.add_ceo_of_relationships(ceo_of)
+        if leads:
+            self.graph_builder.add_leads_relationships(leads)
+        self.stats.graph_relationships_created += len(ceo_of) + len(leads)
+
+    def _new_entities(self, entities: Dict[str, Any]) -> Dict[str, Any]:
+        """Entities whose nodes the registry does not know to be in the graph."""
+        if self.entity_registry is None:
+            return entities
+        return {key: entity for key, entity in entities.items() if not self.entity_registry.in_graph(entity.fibo_id)}
+
+    @staticmethod
+    def position_securities(
+        portfolio: Portfolio, stocks: Dict[str, Stock], bonds: Dict[str, Bond]
+    ) -> Dict[str, Tuple[str, str]]:
+        """Map each of a portfolio's positions to its enriched security.
+
+        Args:
+            portfolio: Portfolio instance
+            stocks: Enriched stocks keyed by ticker
+            bonds: Enriched bonds keyed by primary identifier
+
+        Returns:
+            Dict of position_id -> (security_type, security_fibo_id)
+        """
+        position_to_security: Dict[str, Tuple[str, str]] = {}
+        position_ids = Position.position_ids(portfolio.positions, portfolio.name)
+        for position, position_id in zip(portfolio.positions, position_ids):
+            if position.ticker and position.ticker in stocks:
+                position_to_security[position_id] = ("stock", stocks[position.ticker].fibo_id)
+            elif position.cusip or position.isin:
+                primary_id_type, primary_id = position.get_primary_identifier()
+                if primary_id in bonds:
+                    position_to_security[position_id] = ("bond", bonds[primary_id].fibo_id)
+        return position_to_security
+
+    def enrich_prices(self, portfolio: Portfolio, price_history: Optional[pd.DataFrame] = None) -> None:
         """Enrich portfolio positions with market prices.
 
         Handles both stock prices (by ticker) and bond prices (by ISIN/CUSIP).
+        Every fetched price is kept in ``self.price_history`` (see
+        pagr.fds.services.pricing); the latest price per identifier is joined
+        onto the positions in one vectorized step.
 
         Args:
             portfolio: Portfolio to enrich
+            price_history: Price table already fetched (e.g. for a batch of
+                portfolios); prices are fetched if omitted
         """
         logger.info(f"Enriching prices for {len(portfolio.positions)} positions")
 
         try:
-            # Separate stocks and bonds
-            stock_positions = [p for p in portfolio.positions if p.ticker]
-            bond_positions = [p for p in portfolio.positions if p.cusip or p.isin]
-
-            price_map = {}
-
-            # Enrich stock prices
-            if stock_positions:
-                try:
-                    tickers = [p.ticker for p in stock_positions]
-                    logger.debug(f"Fetching prices for {len(tickers)} stocks")
-                    response = self.factset_client.get_last_close_prices(tickers)
-
-                    if "data" in response:
-                        for item in response["data"]:
-                            ticker = item.get("requestId")
-                            price = item.get("price")
-                            date_str = item.get("date")
-
-                            if ticker and price is not None:
-                                # If we already have a price for this ticker, check if newer
-                                if ticker in price_map:
-                                    existing_date, _ = price_map[ticker]
-                                    if not date_str or date_str > existing_date:
-                                        price_map[ticker] = (date_str, float(price))
-                                else:
-                                    price_map[ticker] = (date_str, float(price))
-                except Exception as e:
-                    logger.warning(f"Failed to fetch stock prices: {e}")
-                    self.stats.add_error(f"Stock price enrichment failed: {e}")
-
-            # Enrich bond prices using Formula API with batch processing
-            if bond_positions:
-                try:
-                    logger.debug(f"Fetching prices for {len(bond_positions)} bonds via Formula API")
-
-                    # Group bonds by CUSIP (preferred) and ISIN
-                    cusip_positions = [p for p in bond_positions if p.cusip]
-                    isin_positions = [p for p in bond_positions if not p.cusip and p.isin]
-
-                    # Process CUSIP bonds in batches (up to 10 per request)
-                    if cusip_positions:
-                        batch_size = 10
-                        for i in range(0, len(cusip_positions), batch_size):
-                            batch = cusip_positions[i : i + batch_size]
-                            cusips = [p.cusip for p in batch]
-                            try:
-                                response = self.factset_client.get_bond_prices_formula_api(cusips)
-
-                                # Extract prices from Formula API response
-                                data = response.get("data", {})
-                                for position in batch:
-                                    if position.cusip in data:
-                                        price = data[position.cusip].get("price")
-                                        if price is not None:
-                                            price_map[position.cusip] = (None, float(price))
-                                            logger.debug(f"Got Formula API price for {position.cusip}: {price}")
-                            except Exception as e:
-                                logger.warning(f"Formula API batch call failed for CUSIPs: {e}. Falling back to individual Global Prices calls.")
-                                # Fallback: try Global Prices API for this batch
-                                for position in batch:
-                                    try:
-                                        response = self.factset_client.get_bond_prices([position.cusip], id_type="CUSIP")
-                                        if "data" in response and len(response["data"]) > 0:
-                                            bond_data = response["data"][0]
-                                            price = bond_data.get("price")
-                                            if price is not None:
-                                                price_map[position.cusip] = (None, float(price))
-                                    except Exception as e2:
-                                        logger.debug(f"Could not fetch price for CUSIP {position.cusip}: {e2}")
-
-                    # Process ISIN bonds individually (less common)
-                    for position in isin_positions:
-                        try:
-                            response = self.factset_client.get_bond_prices([position.isin], id_type="ISIN")
-                            if "data" in response and len(response["data"]) > 0:
-                                bond_data = response["data"][0]
-                                price = bond_data.get("price")
-                                if price is not None:
-                                    price_map[position.isin] = (None, float(price))
-                        except Exception as e:
-                            logger.debug(f"Could not fetch price for ISIN {position.isin}: {e}")
+            if price_history is None:
+                # One table of every fetched price, including the history window
+                self.price_history = self.price_fetcher.fetch(portfolio.positions)
+                for error in self.price_fetcher.errors:
+                    self.stats.add_error(error)
+                if self.price_store is not None:
+                    self.price_store.upsert(self.price_history, as_of=date.today().isoformat())
+            else:
+                self.price_history = price_history
+            prices = latest_prices(self.price_history)
 
-                except Exception as e:
-                    logger.warning(f"Failed to enrich bond prices: {e}")
-                    self.stats.add_error(f"Bond price enrichment failed: {e}")
-
-            # Update positions with prices
-            updated_count = 0
-            for position in portfolio.positions:
-                # Get the identifier to look up in price_map
-                if position.ticker and position.ticker in price_map:
-                    _, price = price_map[position.ticker]
-                    position.market_value = position.quantity * price
-                    updated_count += 1
-                elif position.cusip or position.isin:
-                    primary_id_type, primary_id = position.get_primary_identifier()
-                    if primary_id in price_map:
-                        _, price = price_map[primary_id]
-                        position.market_value = position.quantity * price
-                        updated_count += 1
+            # Update market values and weights column-wise, then write back
+            frame = PortfolioFrame.from_portfolio(portfolio)
+            updated_count = frame.apply_prices(prices.set_index("identifier")["price"])
+            frame.apply_to(portfolio.positions)
+            portfolio.total_value = frame.total_value()
 
             logger.info(f"Updated market values for {updated_count}/{len(portfolio.positions)} positions")
 
-            # Recalculate weights
-            portfolio.calculate_weights()
-
         except Exception as e:
             error_msg = f"Unexpected error enriching prices: {e}"
             logger.error(error_msg)
             self.stats.add_error(error_msg)
 
-    def execute(self, portfolio_file: str) -> Tuple[Optional[Portfolio], List[str], PipelineStatistics]:
+    def execute(
+        self,
+        portfolio_file: str,
+        progress: Optional[Callable[[str, PipelineStatistics], None]] = None,
+    ) -> Tuple[Optional[Portfolio], List[str], PipelineStatistics]:
         """Execute full ETL pipeline for mixed stock/bond portfolios.
 
         Args:
             portfolio_file: Path to portfolio CSV file
+            progress: Optional callback invoked with each PIPELINE_STAGES name
+                and the running statistics as that stage starts
 
         Returns:
             Tuple of (Portfolio, Cypher statements, statistics)
         """
+        def report(stage: str) -> None:
+            if progress is not None:
+                progress(stage, self.stats)
+
         logger.info("=" * 70)
         logger.info("Starting ETL Pipeline")
         logger.info("=" * 70)
 
         # Step 1: Load portfolio
+        report("load")
         portfolio = self.load_portfolio(portfolio_file)
         if not portfolio:
             logger.error("Pipeline failed: Could not load portfolio")
             return None, [], self.stats
 
         # Step 2: Enrich prices
+        report("prices")
         self.enrich_prices(portfolio)
 
         # Step 3: Enrich positions (stocks, bonds, companies, countries, executives)
+        report("enrich")
         stocks, bonds, companies, countries, executives = self.enrich_positions(
             portfolio.positions
         )
 
-        # Step 4: Build graph with new schema
+        # Step 4: Crawl corporate hierarchies for the portfolio's issuers
+        report("hierarchy")
+        hierarchy = self.enrich_hierarchies(companies)
+
+        # Step 5: Build graph with new schema
+        report("graph")
         statements = self.build_graph(
-            portfolio, stocks, bonds, companies, countries, executives
+            portfolio, stocks, bonds, companies, countries, executives, hierarchy
         )
 
         logger.info("=" * 70)
@@ -691,4 +924,5 @@ class ETLPipeline:
         """Reset pipeline state for new execution."""
         self.stats = PipelineStatistics()
         self.graph_builder.clear()
+        self.graph_entity_ids = set()
         logger.debug("Pipeline state reset")
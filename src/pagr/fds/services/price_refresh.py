@@ -0,0 +1,221 @@
+"""Reprice-only refresh of market values already in the graph.
+
+Re-uploading a portfolio clears the database and repeats company, officer
+and bond enrichment. PriceRefreshService only touches prices: it prices every
+Stock and Bond node in bulk (each identifier once, across all portfolios),
+recomputes position market values and weights per portfolio with
+PortfolioFrame, writes everything back with UNWIND statements and refreshes
+the cached exposures.
+"""
+
+import logging
+import time
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from typing import Dict, List, Optional
+
+import pandas as pd
+
+from pagr.fds.graph.queries import GraphQueries, QueryService
+from pagr.fds.models.portfolio_frame import PortfolioFrame
+from pagr.fds.services.pricing import PriceFetcher, latest_prices
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class PriceRefreshResult:
+    """Outcome of a price refresh."""
+
+    securities_priced: int = 0
+    positions_updated: int = 0
+    portfolios_updated: int = 0
+    duration_seconds: float = 0.0
+    errors: List[str] = field(default_factory=list)
+
+    def to_dict(self) -> Dict:
+        """Convert to dictionary.
+
+        Returns:
+            Dict representation of the result
+        """
+        return {
+            "securities_priced": self.securities_priced,
+            "positions_updated": self.positions_updated,
+            "portfolios_updated": self.portfolios_updated,
+            "duration_seconds": self.duration_seconds,
+            "total_errors": len(self.errors),
+        }
+
+
+class PriceRefreshService:
+    """Updates prices, market values and weights without re-running the ETL."""
+
+    def __init__(
+        self,
+        graph_client,
+        price_fetcher: PriceFetcher,
+        query_service: Optional[QueryService] = None,
+    ):
+        """Initialize price refresh service.
+
+        Args:
+            graph_client: Memgraph client (must accept query parameters)
+            price_fetcher: Fetcher used for the bulk price requests
+            query_service: Query service whose caches and exposure aggregates
+                are refreshed afterwards (one is created if omitted)
+        """
+        self.graph_client = graph_client
+        self.price_fetcher = price_fetcher
+        self.query_service = query_service or QueryService(graph_client)
+        self.prices = pd.DataFrame()
+
+    def refresh(self, securities: Optional[List[Dict]] = None) -> PriceRefreshResult:
+        """Reprice securities in the graph and the positions holding them.
+
+        Args:
+            securities: Records shaped like GraphQueries.priced_securities rows
+                to reprice (every Stock and Bond node if omitted); positions
+                in other securities keep their market values
+
+        Returns:
+            PriceRefreshResult with counts and any errors
+        """
+        started = time.perf_counter()
+        result = PriceRefreshResult()
+
+        if securities is None:
+            securities = self.graph_client.execute_query(GraphQueries.priced_securities())
+        if not securities:
+            logger.info("No securities in the graph to reprice")
+            return result
+
+        table = self.price_fetcher.fetch_identifiers(
+            tickers=[s.get("ticker") for s in securities if s.get("label") == "Stock"],
+            cusips=[s.get("cusip") for s in securities if s.get("label") == "Bond"],
+            isins=[s.get("isin") for s in securities if s.get("label") == "Bond" and not s.get("cusip")],
+        )
+        result.errors.extend(self.price_fetcher.errors)
+        self.prices = latest_prices(table)
+        if self.prices.empty:
+            logger.warning("Price refresh fetched no prices; graph left unchanged")
+            result.duration_seconds = time.perf_counter() - started
+            return result
+
+        price = self.prices.set_index("identifier")["price"]
+        price_date = self.prices.set_index("identifier")["date"]
+
+        # Security nodes, stamped for RefreshPlanner
+        priced_at = datetime.now(timezone.utc).isoformat()
+        for label in ("Stock", "Bond"):
+            rows = self._security_rows(securities, label, price, price_date)
+            if rows:
+                self.graph_client.execute_query(
+                    GraphQueries.update_security_prices(label), {"rows": rows, "priced_at": priced_at}
+                )
+                result.securities_priced += len(rows)
+
+        # Positions and portfolio totals
+        positions = self.graph_client.execute_query(GraphQueries.positions_for_repricing())
+        position_rows, portfolio_rows = self._reprice_positions(positions, price)
+        if position_rows:
+            self.graph_client.execute_query(GraphQueries.update_position_values(), {"rows": position_rows})
+        if portfolio_rows:
+            self.graph_client.execute_query(GraphQueries.update_portfolio_totals(), {"rows": portfolio_rows})
+        result.positions_updated = len(position_rows)
+        result.portfolios_updated = len(portfolio_rows)
+
+        # Exposures derived from market values are now stale
+        try:
+            self.query_service.refresh_exposure_aggregates()
+        except Exception as e:
+            logger.warning(f"Failed to refresh exposure aggregates after repricing: {e}")
+            result.errors.append(f"Exposure aggregate refresh failed: {e}")
+        self.query_service.invalidate_caches()
+
+        result.duration_seconds = time.perf_counter() - started
+        logger.info(
+            f"Price refresh complete: {result.securities_priced} securities, "
+            f"{result.positions_updated} positions, {result.portfolios_updated} portfolios "
+            f"in {result.duration_seconds:.2f}s"
+        )
+        return result
+
+    @staticmethod
+    def _security_rows(
+        securities: List[Dict], label: str, price: pd.Series, price_date: pd.Series
+    ) -> List[Dict]:
+        """Build UNWIND rows for one security label.
+
+        Stocks are priced by ticker; bonds by CUSIP, then ISIN.
+        """
+        rows = []
+        for security in securities:
+            if security.get("label") != label or not security.get("fibo_id"):
+                continue
+            keys = ("ticker",) if label == "Stock" else ("cusip", "isin")
+            identifier = next(
+                (security[k] for k in keys if security.get(k) and security[k] in price.index), None
+            )
+            if identifier is None:
+                continue
+            date = price_date[identifier]
+            rows.append({
+                "fibo_id": security["fibo_id"],
+                "price": float(price[identifier]),
+                "date": None if pd.isna(date) else date,
+            })
+        return rows
+
+    @staticmethod
+    def _reprice_positions(positions: List[Dict], price: pd.Series) -> tuple[List[Dict], List[Dict]]:
+        """Recompute market values and weights per portfolio.
+
+        Args:
+            positions: Records from GraphQueries.positions_for_repricing
+            price: Latest price per identifier
+
+        Returns:
+            Tuple of (position rows, portfolio rows) for the UNWIND writes
+        """
+        if not positions:
+            return [], []
+
+        data = pd.DataFrame.from_records(positions)
+        data = data[data["position_id"].notna()]
+        skipped = len(positions) - len(data)
+        if skipped:
+            logger.warning(f"Skipping {skipped} positions without position_id (reload to reprice them)")
+
+        priced_at = datetime.now().isoformat()
+        position_rows: List[Dict] = []
+        portfolio_rows: List[Dict] = []
+
+        for portfolio_name, group in data.groupby("portfolio", sort=False):
+            frame = PortfolioFrame(
+                name=portfolio_name,
+                quantity=group["quantity"].fillna(0.0).tolist(),
+                book_value=group["book_value"].fillna(0.0).tolist(),
+                market_value=group["market_value"].tolist(),
+                # Bonds are stored with an empty ticker
+                ticker=[t or None for t in group["ticker"].tolist()],
+                isin=group["isin"].tolist(),
+                cusip=group["cusip"].tolist(),
+            )
+            frame.apply_prices(price, recalculate=False)
+            total = frame.recalculate_weights()
+
+            market_values = frame.market_value.tolist()
+            weights = frame.weight.tolist()
+            position_rows.extend(
+                {
+                    "portfolio": portfolio_name,
+                    "position_id": position_id,
+                    "market_value": None if mv != mv else mv,
+                    "weight": w,
+                }
+                for position_id, mv, w in zip(group["position_id"].tolist(), market_values, weights)
+            )
+            portfolio_rows.append({"name": portfolio_name, "total_value": total, "priced_at": priced_at})
+
+        return position_rows, portfolio_rows
@@ -0,0 +1,318 @@
+"""Local time-series store of daily close prices.
+
+Prices are kept in SQLite, keyed by (identifier, date) so range lookups hit
+the primary key index. The store also records which date range has been
+fetched per identifier, so fill() only requests dates it does not have yet
+(weekends and holidays included). Lookups return pandas objects for
+vectorized P&L, return and volatility calculations.
+"""
+
+import logging
+import sqlite3
+from datetime import date, timedelta
+from pathlib import Path
+from typing import Dict, Iterable, List, Mapping, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from pagr.fds.services.pricing import PRICE_COLUMNS, PriceFetcher
+
+logger = logging.getLogger(__name__)
+
+SCHEMA = [
+    """
+    CREATE TABLE IF NOT EXISTS prices (
+        identifier TEXT NOT NULL,
+        date TEXT NOT NULL,
+        price REAL NOT NULL,
+        currency TEXT,
+        source TEXT,
+        PRIMARY KEY (identifier, date)
+    ) WITHOUT ROWID
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS coverage (
+        identifier TEXT PRIMARY KEY,
+        start_date TEXT NOT NULL,
+        end_date TEXT NOT NULL
+    )
+    """,
+]
+
+
+class PriceStore:
+    """SQLite-backed daily price history."""
+
+    def __init__(self, path: str = ":memory:"):
+        """Open (or create) a price store.
+
+        Args:
+            path: SQLite database file, or ":memory:" for a transient store
+        """
+        if path != ":memory:":
+            Path(path).parent.mkdir(parents=True, exist_ok=True)
+        self.path = path
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        if path != ":memory:":
+            self._conn.execute("PRAGMA journal_mode=WAL")
+        with self._conn:
+            for statement in SCHEMA:
+                self._conn.execute(statement)
+
+    def close(self) -> None:
+        """Close the underlying database connection."""
+        self._conn.close()
+
+    def upsert(self, table: pd.DataFrame, as_of: Optional[str] = None) -> int:
+        """Insert or replace prices from a price table.
+
+        Args:
+            table: Price table with PRICE_COLUMNS (see pagr.fds.services.pricing)
+            as_of: Date assigned to undated rows (e.g. Formula API prices);
+                undated rows are dropped if omitted
+
+        Returns:
+            Number of rows written
+        """
+        if table.empty:
+            return 0
+        data = table.reindex(columns=PRICE_COLUMNS)
+        dates = data["date"].where(data["date"].notna(), as_of)
+        data = data.assign(date=dates)
+        data = data[data["date"].notna() & data["price"].notna()]
+
+        rows = list(
+            zip(
+                data["identifier"].astype(str).tolist(),
+                data["date"].astype(str).str.slice(0, 10).tolist(),
+                data["price"].astype(float).tolist(),
+                data["currency"].astype(object).where(data["currency"].notna(), None).tolist(),
+                data["source"].astype(object).where(data["source"].notna(), None).tolist(),
+            )
+        )
+        with self._conn:
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO prices (identifier, date, price, currency, source) "
+                "VALUES (?, ?, ?, ?, ?)",
+                rows,
+            )
+        logger.debug(f"Stored {len(rows)} prices")
+        return len(rows)
+
+    def coverage(self, identifiers: Iterable[str]) -> Dict[str, Tuple[str, str]]:
+        """Return the fetched (start_date, end_date) range per identifier.
+
+        Args:
+            identifiers: Identifiers to look up
+
+        Returns:
+            Dict of identifier -> (start_date, end_date); identifiers never
+            fetched are absent
+        """
+        ids = list(dict.fromkeys(identifiers))
+        result = {}
+        for chunk in _chunks(ids, 500):
+            placeholders = ",".join("?" * len(chunk))
+            for identifier, start, end in self._conn.execute(
+                f"SELECT identifier, start_date, end_date FROM coverage WHERE identifier IN ({placeholders})",
+                chunk,
+            ):
+                result[identifier] = (start, end)
+        return result
+
+    def missing_ranges(
+        self, identifiers: Iterable[str], start_date: str, end_date: str
+    ) -> Dict[Tuple[str, str], List[str]]:
+        """Date ranges that still need fetching, grouped so each range is one request.
+
+        Coverage per identifier is a single contiguous range. A window before
+        or after it is fetched together with the gap up to the coverage, so
+        the merged coverage never spans dates that were not fetched.
+
+        Args:
+            identifiers: Identifiers wanted
+            start_date: First date (YYYY-MM-DD)
+            end_date: Last date (YYYY-MM-DD)
+
+        Returns:
+            Dict of (start_date, end_date) -> identifiers missing that range
+        """
+        covered = self.coverage(identifiers)
+        missing: Dict[Tuple[str, str], List[str]] = {}
+
+        for identifier in dict.fromkeys(identifiers):
+            if identifier not in covered:
+                missing.setdefault((start_date, end_date), []).append(identifier)
+                continue
+            have_start, have_end = covered[identifier]
+            # Not clamped to the window: a disjoint window also fetches the gap
+            if start_date < have_start:
+                missing.setdefault((start_date, _shift(have_start, -1)), []).append(identifier)
+            if end_date > have_end:
+                missing.setdefault((_shift(have_end, 1), end_date), []).append(identifier)
+
+        return missing
+
+    def mark_covered(self, identifiers: Iterable[str], start_date: str, end_date: str) -> None:
+        """Record that [start_date, end_date] has been fetched for identifiers.
+
+        The new range is merged with existing coverage. Callers must only
+        pass ranges that touch or overlap the existing coverage (as
+        missing_ranges produces), so coverage stays contiguous.
+
+        Args:
+            identifiers: Identifiers fetched
+            start_date: First date fetched
+            end_date: Last date fetched
+        """
+        with self._conn:
+            self._conn.executemany(
+                "INSERT INTO coverage (identifier, start_date, end_date) VALUES (?, ?, ?) "
+                "ON CONFLICT(identifier) DO UPDATE SET "
+                "start_date = MIN(start_date, excluded.start_date), "
+                "end_date = MAX(end_date, excluded.end_date)",
+                [(identifier, start_date, end_date) for identifier in identifiers],
+            )
+
+    def fill(
+        self,
+        fetcher: PriceFetcher,
+        identifiers: Iterable[str],
+        start_date: str,
+        end_date: str,
+        id_type: Optional[str] = None,
+        batch_size: int = 50,
+    ) -> int:
+        """Fetch and store only the prices the store does not have yet.
+
+        Dates from today onwards are fetched but never marked as covered,
+        since today's close may not be final.
+
+        Args:
+            fetcher: Price fetcher used for the history requests
+            identifiers: Tickers (or ISINs/CUSIPs with id_type)
+            start_date: First date (YYYY-MM-DD)
+            end_date: Last date (YYYY-MM-DD)
+            id_type: Optional identifier type for bonds ("ISIN" or "CUSIP")
+            batch_size: Identifiers per request
+
+        Returns:
+            Number of price rows written
+        """
+        last_final = _shift(date.today().isoformat(), -1)
+        written = 0
+
+        for (range_start, range_end), ids in self.missing_ranges(identifiers, start_date, end_date).items():
+            for batch in _chunks(ids, max(1, batch_size)):
+                table = fetcher.fetch_history(batch, range_start, range_end, id_type=id_type)
+                if fetcher.errors:
+                    # Leave coverage untouched so the range is retried next time
+                    logger.warning(f"Price history fetch failed for {len(batch)} ids: {fetcher.errors[-1]}")
+                    continue
+                written += self.upsert(table)
+                covered_end = min(range_end, last_final)
+                if range_start <= covered_end:
+                    self.mark_covered(batch, range_start, covered_end)
+
+        logger.info(f"Price store fill wrote {written} prices")
+        return written
+
+    def get_prices(self, identifiers: Iterable[str], start_date: str, end_date: str) -> pd.DataFrame:
+        """Stored prices for identifiers within a date range (inclusive).
+
+        Args:
+            identifiers: Identifiers to look up
+            start_date: First date (YYYY-MM-DD)
+            end_date: Last date (YYYY-MM-DD)
+
+        Returns:
+            Price table with PRICE_COLUMNS, ordered by identifier and date
+        """
+        ids = list(dict.fromkeys(identifiers))
+        frames = []
+        for chunk in _chunks(ids, 500):
+            placeholders = ",".join("?" * len(chunk))
+            frames.append(
+                pd.read_sql_query(
+                    f"SELECT identifier, date, price, currency, source FROM prices "
+                    f"WHERE identifier IN ({placeholders}) AND date BETWEEN ? AND ? "
+                    f"ORDER BY identifier, date",
+                    self._conn,
+                    params=[*chunk, start_date, end_date],
+                )
+            )
+        if not frames:
+            return pd.DataFrame(columns=PRICE_COLUMNS)
+        return pd.concat(frames, ignore_index=True)
+
+    def price_matrix(self, identifiers: Iterable[str], start_date: str, end_date: str) -> pd.DataFrame:
+        """Prices as a date x identifier matrix.
+
+        Args:
+            identifiers: Identifiers (become columns, in the given order)
+            start_date: First date (YYYY-MM-DD)
+            end_date: Last date (YYYY-MM-DD)
+
+        Returns:
+            DataFrame indexed by date (DatetimeIndex); NaN where no price is stored
+        """
+        ids = list(dict.fromkeys(identifiers))
+        prices = self.get_prices(ids, start_date, end_date)
+        matrix = prices.pivot(index="date", columns="identifier", values="price")
+        matrix.index = pd.to_datetime(matrix.index)
+        return matrix.reindex(columns=ids).sort_index().astype("float64")
+
+
+def daily_returns(matrix: pd.DataFrame) -> pd.DataFrame:
+    """Simple daily returns from a price matrix.
+
+    Args:
+        matrix: Date x identifier price matrix (see PriceStore.price_matrix)
+
+    Returns:
+        Returns matrix (first date dropped)
+    """
+    return (matrix / matrix.shift(1) - 1).iloc[1:]
+
+
+def annualized_volatility(matrix: pd.DataFrame, periods_per_year: int = 252) -> pd.Series:
+    """Annualized volatility of daily returns per identifier.
+
+    Args:
+        matrix: Date x identifier price matrix
+        periods_per_year: Trading periods per year
+
+    Returns:
+        Volatility per identifier (as a fraction, e.g. 0.25 for 25%)
+    """
+    return daily_returns(matrix).std(ddof=1) * np.sqrt(periods_per_year)
+
+
+def position_pnl(quantities: Mapping[str, float], matrix: pd.DataFrame) -> pd.Series:
+    """Price P&L per identifier over the matrix's date range.
+
+    Uses the first and last available price of each identifier.
+
+    Args:
+        quantities: Quantity held per identifier
+        matrix: Date x identifier price matrix
+
+    Returns:
+        P&L per identifier (NaN where no price is available)
+    """
+    quantity = pd.Series(quantities, dtype="float64").reindex(matrix.columns)
+    first = matrix.bfill().iloc[0] if len(matrix) else pd.Series(np.nan, index=matrix.columns)
+    last = matrix.ffill().iloc[-1] if len(matrix) else pd.Series(np.nan, index=matrix.columns)
+    return (last - first) * quantity
+
+
+def _shift(iso_date: str, days: int) -> str:
+    """Shift a YYYY-MM-DD date string by a number of days."""
+    return (date.fromisoformat(iso_date) + timedelta(days=days)).isoformat()
+
+
+def _chunks(items: List[str], size: int) -> Iterable[List[str]]:
+    """Yield consecutive slices of items."""
+    for start in range(0, len(items), size):
+        yield items[start : start + size]
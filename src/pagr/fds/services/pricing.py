@@ -0,0 +1,246 @@
+"""Price fetching into a columnar price table.
+
+PriceFetcher collects every price the FactSet endpoints return (the global
+prices endpoint returns a multi-day window) into one DataFrame with the
+columns in PRICE_COLUMNS. latest_prices reduces it to one price per
+identifier, which PortfolioFrame.apply_prices joins onto positions in a
+single vectorized operation.
+"""
+
+import logging
+from typing import Iterable, List, Optional
+
+import pandas as pd
+
+from pagr.fds.clients.factset_client import FactSetClient
+from pagr.fds.models.portfolio import Position
+
+logger = logging.getLogger(__name__)
+
+PRICE_COLUMNS = ["identifier", "date", "price", "currency", "source"]
+
+SOURCE_GLOBAL_PRICES = "global_prices"
+SOURCE_FORMULA_API = "formula_api"
+
+
+def empty_price_table() -> pd.DataFrame:
+    """Return an empty price table with the standard columns."""
+    return pd.DataFrame(
+        {
+            "identifier": pd.Series(dtype=object),
+            "date": pd.Series(dtype=object),
+            "price": pd.Series(dtype="float64"),
+            "currency": pd.Series(dtype=object),
+            "source": pd.Series(dtype=object),
+        }
+    )
+
+
+def latest_prices(table: pd.DataFrame) -> pd.DataFrame:
+    """Reduce a price table to the most recent price per identifier.
+
+    Dated prices are ordered by date (ISO strings); an undated price (e.g.
+    from the Formula API) is treated as current and wins.
+
+    Args:
+        table: Price table with PRICE_COLUMNS
+
+    Returns:
+        Price table with one row per identifier
+    """
+    if table.empty:
+        return table.copy()
+    ordered = table.sort_values("date", na_position="last", kind="stable")
+    return ordered.drop_duplicates("identifier", keep="last").reset_index(drop=True)
+
+
+class PriceFetcher:
+    """Fetches stock and bond prices as a price table."""
+
+    def __init__(self, factset_client: FactSetClient, bond_batch_size: int = 10):
+        """Initialize price fetcher.
+
+        Args:
+            factset_client: FactSet API client
+            bond_batch_size: CUSIPs per Formula API request
+        """
+        self.client = factset_client
+        self.bond_batch_size = max(1, bond_batch_size)
+        self.errors: List[str] = []
+
+    def fetch(self, positions: Iterable[Position]) -> pd.DataFrame:
+        """Fetch prices for all positions.
+
+        Stocks are priced by ticker via the global prices endpoint. Bonds are
+        priced by CUSIP via the Formula API (falling back to global prices per
+        CUSIP) and by ISIN via global prices. Failures are logged and recorded
+        in ``self.errors``; whatever was fetched is still returned.
+
+        Args:
+            positions: Positions to price
+
+        Returns:
+            Price table with PRICE_COLUMNS, including the full history window
+        """
+        positions = list(positions)
+        return self.fetch_identifiers(
+            tickers=[p.ticker for p in positions if p.ticker],
+            cusips=[p.cusip for p in positions if p.cusip],
+            isins=[p.isin for p in positions if not p.cusip and p.isin],
+        )
+
+    def fetch_identifiers(
+        self,
+        tickers: Iterable[str] = (),
+        cusips: Iterable[str] = (),
+        isins: Iterable[str] = (),
+    ) -> pd.DataFrame:
+        """Fetch prices for deduplicated stock tickers and bond identifiers.
+
+        Args:
+            tickers: Stock tickers
+            cusips: Bond CUSIPs
+            isins: ISINs of bonds without a CUSIP
+
+        Returns:
+            Price table with PRICE_COLUMNS
+        """
+        self.errors = []
+        tickers = list(dict.fromkeys(t for t in tickers if t))
+        cusips = list(dict.fromkeys(c for c in cusips if c))
+        isins = list(dict.fromkeys(i for i in isins if i))
+
+        frames = []
+        if tickers:
+            frames.append(self.fetch_stock_prices(tickers))
+        if cusips or isins:
+            frames.append(self.fetch_bond_prices(cusips, isins))
+
+        frames = [f for f in frames if not f.empty]
+        if not frames:
+            return empty_price_table()
+        return pd.concat(frames, ignore_index=True)
+
+    def fetch_stock_prices(self, tickers: List[str]) -> pd.DataFrame:
+        """Fetch the daily close window for tickers.
+
+        Args:
+            tickers: Tickers
+
+        Returns:
+            Price table (empty if the request failed)
+        """
+        logger.debug(f"Fetching prices for {len(tickers)} stocks")
+        try:
+            response = self.client.get_last_close_prices(tickers)
+        except Exception as e:
+            logger.warning(f"Failed to fetch stock prices: {e}")
+            self.errors.append(f"Stock price enrichment failed: {e}")
+            return empty_price_table()
+
+        return self._global_prices_table(response.get("data") or [])
+
+    def fetch_history(
+        self,
+        ids: List[str],
+        start_date: str,
+        end_date: str,
+        id_type: Optional[str] = None,
+    ) -> pd.DataFrame:
+        """Fetch daily closes for an explicit date range.
+
+        Failures are logged and recorded in ``self.errors``.
+
+        Args:
+            ids: Tickers (or ISINs/CUSIPs with id_type)
+            start_date: First date (YYYY-MM-DD)
+            end_date: Last date (YYYY-MM-DD)
+            id_type: Optional identifier type ("ISIN" or "CUSIP")
+
+        Returns:
+            Price table (empty if the request failed)
+        """
+        self.errors = []
+        try:
+            response = self.client.get_price_history(ids, start_date, end_date, id_type=id_type)
+        except Exception as e:
+            logger.warning(f"Failed to fetch price history: {e}")
+            self.errors.append(f"Price history fetch failed: {e}")
+            return empty_price_table()
+
+        return self._global_prices_table(response.get("data") or [])
+
+    def fetch_bond_prices(self, cusips: List[str], isins: List[str]) -> pd.DataFrame:
+        """Fetch bond prices by CUSIP (batched Formula API) and ISIN.
+
+        Args:
+            cusips: CUSIPs
+            isins: ISINs of bonds without a CUSIP
+
+        Returns:
+            Price table
+        """
+        logger.debug(f"Fetching prices for {len(cusips) + len(isins)} bonds")
+        rows = []
+
+        for start in range(0, len(cusips), self.bond_batch_size):
+            batch = cusips[start : start + self.bond_batch_size]
+            try:
+                data = self.client.get_bond_prices_formula_api(batch).get("data", {})
+                for cusip in batch:
+                    price = (data.get(cusip) or {}).get("price")
+                    if price is not None:
+                        rows.append((cusip, None, float(price), None, SOURCE_FORMULA_API))
+            except Exception as e:
+                logger.warning(
+                    f"Formula API batch call failed for CUSIPs: {e}. "
+                    f"Falling back to individual Global Prices calls."
+                )
+                for cusip in batch:
+                    rows.extend(self._global_bond_rows(cusip, "CUSIP"))
+
+        for isin in isins:
+            rows.extend(self._global_bond_rows(isin, "ISIN"))
+
+        if not rows:
+            return empty_price_table()
+        return pd.DataFrame(rows, columns=PRICE_COLUMNS)
+
+    def _global_bond_rows(self, identifier: str, id_type: str) -> list:
+        """Fetch one bond's global prices window as rows keyed by identifier."""
+        try:
+            response = self.client.get_bond_prices([identifier], id_type=id_type)
+        except Exception as e:
+            logger.debug(f"Could not fetch price for {id_type} {identifier}: {e}")
+            return []
+        return [
+            (identifier, item.get("date"), float(item["price"]), item.get("currency"), SOURCE_GLOBAL_PRICES)
+            for item in response.get("data") or []
+            if item.get("price") is not None
+        ]
+
+    @staticmethod
+    def _global_prices_table(items: list) -> pd.DataFrame:
+        """Build a price table from global prices items.
+
+        Args:
+            items: Response items (requestId, date, price, currency)
+
+        Returns:
+            Price table
+        """
+        if not items:
+            return empty_price_table()
+        raw = pd.DataFrame.from_records(items)
+        table = pd.DataFrame(
+            {
+                "identifier": raw["requestId"] if "requestId" in raw else None,
+                "date": raw["date"] if "date" in raw else None,
+                "price": pd.to_numeric(raw["price"], errors="coerce") if "price" in raw else float("nan"),
+                "currency": raw["currency"] if "currency" in raw else None,
+                "source": SOURCE_GLOBAL_PRICES,
+            },
+            index=raw.index,
+        )
+        table = table[table["identifier"].notna() & table["price"].notna()]
+        return table.astype({"identifier": object, "date": object, "currency": object}).reset_index(drop=True)
@@ -0,0 +1,291 @@
+"""Targeted refresh of graph nodes whose data has outlived its TTL.
+
+Enriched nodes carry ``priced_at`` (Stock/Bond prices), ``fetched_at``
+(security and company profiles) and ``hierarchy_fetched_at`` (crawled
+companies). RefreshPlanner selects, per type, only the nodes past their TTL,
+oldest first and at most ``max_refresh_per_run`` of each, and refreshes them
+in batches: prices through PriceRefreshService, profiles by re-enriching the
+securities, hierarchies by re-crawling entity structures. API load per run
+is bounded by those limits rather than by the size of the graph.
+"""
+
+import logging
+import time
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta, timezone
+from typing import Dict, Iterable, List, Optional
+
+from pagr.fds.config import FreshnessConfig
+from pagr.fds.graph.queries import GraphQueries
+from pagr.fds.models.portfolio import Position
+from pagr.fds.services.pipeline import ETLPipeline
+from pagr.fds.services.price_refresh import PriceRefreshService
+
+logger = logging.getLogger(__name__)
+
+PRICES = "prices"
+PROFILES = "profiles"
+HIERARCHY = "hierarchy"
+REFRESH_KINDS = [PRICES, PROFILES, HIERARCHY]
+
+
+@dataclass
+class RefreshPlan:
+    """Stale nodes selected for refresh, per type, oldest first."""
+
+    prices: List[Dict] = field(default_factory=list)
+    profiles: List[Dict] = field(default_factory=list)
+    hierarchy: List[Dict] = field(default_factory=list)
+    planned_at: str = ""
+
+    def __len__(self) -> int:
+        return len(self.prices) + len(self.profiles) + len(self.hierarchy)
+
+    def to_dict(self) -> Dict:
+        """Convert to dictionary.
+
+        Returns:
+            Dict with the number of stale nodes per type
+        """
+        return {
+            "planned_at": self.planned_at,
+            PRICES: len(self.prices),
+            PROFILES: len(self.profiles),
+            HIERARCHY: len(self.hierarchy),
+        }
+
+
+@dataclass
+class RefreshResult:
+    """Outcome of executing a refresh plan."""
+
+    plan: RefreshPlan = field(default_factory=RefreshPlan)
+    prices_refreshed: int = 0
+    profiles_refreshed: int = 0
+    hierarchies_refreshed: int = 0
+    statements_executed: int = 0
+    duration_seconds: float = 0.0
+    errors: List[str] = field(default_factory=list)
+
+    def to_dict(self) -> Dict:
+        """Convert to dictionary.
+
+        Returns:
+            Dict representation of the result
+        """
+        return {
+            "planned": self.plan.to_dict(),
+            "prices_refreshed": self.prices_refreshed,
+            "profiles_refreshed": self.profiles_refreshed,
+            "hierarchies_refreshed": self.hierarchies_refreshed,
+            "statements_executed": self.statements_executed,
+            "duration_seconds": self.duration_seconds,
+            "total_errors": len(self.errors),
+            "errors": self.errors,
+        }
+
+
+class RefreshPlanner:
+    """Plans and runs bounded refreshes of stale prices, profiles and hierarchies."""
+
+    def __init__(
+        self,
+        graph_client,
+        pipeline: ETLPipeline,
+        price_refresh: PriceRefreshService,
+        config: Optional[FreshnessConfig] = None,
+        transaction_size: int = 1000,
+    ):
+        """Initialize refresh planner.
+
+        Args:
+            graph_client: Memgraph client (must accept query parameters)
+            pipeline: Pipeline used to re-enrich profiles; it should have no
+                entity registry, so refreshed nodes are always rewritten, and
+                its hierarchy crawler is reset before each re-crawl
+            price_refresh: Service used to reprice stale securities
+            config: TTLs and per-run limits (defaults used if omitted)
+            transaction_size: Statements per write transaction
+        """
+        self.graph_client = graph_client
+        self.pipeline = pipeline
+        self.price_refresh = price_refresh
+        self.config = config or FreshnessConfig()
+        self.transaction_size = transaction_size
+
+    def plan(self, kinds: Optional[Iterable[str]] = None, now: Optional[datetime] = None) -> RefreshPlan:
+        """Select the nodes past their TTL.
+
+        Args:
+            kinds: Subset of REFRESH_KINDS to plan (all if omitted)
+            now: Reference time (defaults to the current UTC time)
+
+        Returns:
+            RefreshPlan with at most max_refresh_per_run nodes per type
+
+        Raises:
+            ValueError: If an unknown kind is requested
+        """
+        kinds = set(REFRESH_KINDS if kinds is None else kinds)
+        unknown = kinds - set(REFRESH_KINDS)
+        if unknown:
+            raise ValueError(f"Unknown refresh kinds: {sorted(unknown)}")
+
+        now = now or datetime.now(timezone.utc)
+        plan = RefreshPlan(planned_at=now.isoformat())
+
+        def stale(query: str, ttl: timedelta) -> List[Dict]:
+            params = {"cutoff": (now - ttl).isoformat(), "limit": self.config.max_refresh_per_run}
+            return self.graph_client.execute_query(query, params) or []
+
+        if PRICES in kinds:
+            plan.prices = stale(
+                GraphQueries.stale_securities("priced_at"), timedelta(minutes=self.config.price_ttl_minutes)
+            )
+        if PROFILES in kinds:
+            plan.profiles = stale(
+                GraphQueries.stale_securities("fetched_at"), timedelta(days=self.config.profile_ttl_days)
+            )
+        if HIERARCHY in kinds and self.pipeline.fibo_config.fetch_subsidiaries:
+            plan.hierarchy = stale(
+                GraphQueries.stale_hierarchies(), timedelta(days=self.config.hierarchy_ttl_days)
+            )
+
+        logger.info(
+            f"Refresh plan: {len(plan.prices)} prices, {len(plan.profiles)} profiles, "
+            f"{len(plan.hierarchy)} hierarchies past their TTL"
+        )
+        return plan
+
+    def execute(self, plan: RefreshPlan) -> RefreshResult:
+        """Refresh the planned nodes.
+
+        Each type is refreshed independently; a failure is recorded and the
+        remaining types still run.
+
+        Args:
+            plan: Plan from plan()
+
+        Returns:
+            RefreshResult with counts and any errors
+        """
+        started = time.perf_counter()
+        result = RefreshResult(plan=plan)
+
+        if plan.prices:
+            try:
+                priced = self.price_refresh.refresh(plan.prices)
+                result.prices_refreshed = priced.securities_priced
+                result.errors.extend(priced.errors)
+            except Exception as e:
+                logger.error(f"Price refresh failed: {e}")
+                result.errors.append(f"Price refresh failed: {e}")
+
+        graph_changed = False
+        if plan.profiles:
+            try:
+                graph_changed |= self._refresh_profiles(plan.profiles, result)
+            except Exception as e:
+                logger.error(f"Profile refresh failed: {e}")
+                result.errors.append(f"Profile refresh failed: {e}")
+
+        if plan.hierarchy:
+            try:
+                graph_changed |= self._refresh_hierarchies(plan.hierarchy, result)
+            except Exception as e:
+                logger.error(f"Hierarchy refresh failed: {e}")
+                result.errors.append(f"Hierarchy refresh failed: {e}")
+
+        if graph_changed:
+            # Sectors, countries and issuers feed the materialized exposures
+            query_service = self.price_refresh.query_service
+            try:
+                query_service.refresh_exposure_aggregates()
+            except Exception as e:
+                logger.warning(f"Failed to refresh exposure aggregates after refresh: {e}")
+                result.errors.append(f"Exposure aggregate refresh failed: {e}")
+            query_service.invalidate_caches()
+
+        result.duration_seconds = time.perf_counter() - started
+        logger.info(
+            f"Refresh complete: {result.prices_refreshed} prices, {result.profiles_refreshed} profiles, "
+            f"{result.hierarchies_refreshed} hierarchies in {result.duration_seconds:.2f}s"
+        )
+        return result
+
+    def refresh(self, kinds: Optional[Iterable[str]] = None) -> RefreshResult:
+        """Plan and execute in one step.
+
+        Args:
+            kinds: Subset of REFRESH_KINDS (all if omitted)
+
+        Returns:
+            RefreshResult
+        """
+        return self.execute(self.plan(kinds))
+
+    def _refresh_profiles(self, securities: List[Dict], result: RefreshResult) -> bool:
+        """Re-enrich stale securities and rewrite their entity subgraph.
+
+        Returns:
+            True if statements were written
+        """
+        positions = self.positions_for(securities)
+        self.pipeline.reset()
+        stocks, bonds, companies, countries, executives = self.pipeline.enrich_positions(positions)
+        result.errors.extend(self.pipeline.stats.errors)
+
+        statements = self.pipeline.build_entity_graph(stocks, bonds, companies, countries, executives)
+        if not statements:
+            return False
+        result.statements_executed += self.graph_client.execute_transactions(statements, self.transaction_size)
+        result.profiles_refreshed = len(stocks) + len(bonds)
+        return True
+
+    def _refresh_hierarchies(self, companies: List[Dict], result: RefreshResult) -> bool:
+        """Re-crawl the entity structures of stale companies.
+
+        Returns:
+            True if statements were written
+        """
+        entity_ids = [c["factset_id"] for c in companies if c.get("factset_id")]
+        crawler = self.pipeline.hierarchy_crawler
+        # Force the seeds to be fetched again; MERGE keeps existing edges intact
+        crawler.reset()
+        hierarchy = crawler.crawl(entity_ids)
+
+        self.pipeline.reset()
+        builder = self.pipeline.graph_builder
+        builder.add_company_stub_nodes(hierarchy.companies)
+        builder.add_company_relationships(hierarchy.relationships)
+        builder.add_hierarchy_refreshed(hierarchy.crawled)
+        statements = builder.get_all_statements()
+        if not statements:
+            return False
+        result.statements_executed += self.graph_client.execute_transactions(statements, self.transaction_size)
+        result.hierarchies_refreshed = len(set(entity_ids) & set(hierarchy.crawled))
+        return True
+
+    @staticmethod
+    def positions_for(securities: List[Dict]) -> List[Position]:
+        """Turn stale security records into positions the pipeline can enrich.
+
+        Only the identifiers matter; quantity and book value are placeholders.
+
+        Args:
+            securities: Records from GraphQueries.stale_securities
+
+        Returns:
+            List of Position
+        """
+        positions = []
+        for security in securities:
+            if security.get("label") == "Stock":
+                identifiers = {"ticker": security.get("ticker")}
+            else:
+                identifiers = {"cusip": security.get("cusip"), "isin": security.get("isin")}
+            if not any(identifiers.values()):
+                logger.debug(f"Skipping {security.get('fibo_id')}: no identifier to re-enrich by")
+                continue
+            positions.append(Position(quantity=1, book_value=0.0, **identifiers))
+        return positions
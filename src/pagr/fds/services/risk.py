@@ -0,0 +1,414 @@
+"""Monte Carlo value-at-risk and expected shortfall.
+
+A covariance model is estimated from the local price history (see
+pagr.fds.services.price_store), either directly over every holding or as a
+sector/country factor model whose loadings come from the graph. Correlated
+returns are simulated in fixed-size chunks, each with its own seed spawned
+from the configured seed, so results are reproducible whatever the number of
+workers and memory stays bounded by the chunk size. Losses are kept per
+portfolio and per sector/country bucket to report VaR and ES for each.
+"""
+
+import logging
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from datetime import date, timedelta
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+
+from pagr.fds.config import RiskConfig
+from pagr.fds.graph.scenario import ExposureMatrix, ScenarioEngine
+from pagr.fds.services.price_store import PriceStore, daily_returns
+from pagr.fds.services.pricing import PriceFetcher
+
+logger = logging.getLogger(__name__)
+
+HISTORICAL = "historical"
+FACTOR = "factor"
+
+
+@dataclass
+class CovarianceModel:
+    """Square-root covariance of position returns.
+
+    Simulated daily returns are ``z @ loadings.T`` for standard normal ``z``
+    with one column per loading factor.
+
+    Attributes:
+        loadings: N x K matrix (positions x independent factors)
+        kind: "historical" or "factor"
+        observations: Number of return dates used in the estimate
+        missing: Identifiers with no usable price history
+    """
+
+    loadings: np.ndarray
+    kind: str
+    observations: int
+    missing: List[str] = field(default_factory=list)
+
+    @property
+    def covariance(self) -> np.ndarray:
+        """N x N covariance matrix of daily returns."""
+        return self.loadings @ self.loadings.T
+
+    @classmethod
+    def historical(cls, returns: pd.DataFrame, identifiers: Sequence[str]) -> "CovarianceModel":
+        """Sample covariance over every holding.
+
+        Pairwise-complete observations are used; the result is projected onto
+        the nearest positive semi-definite matrix. Holdings without history
+        get zero variance.
+
+        Args:
+            returns: Date x identifier daily returns
+            identifiers: Identifier per position (may repeat)
+
+        Returns:
+            CovarianceModel
+        """
+        returns = returns.reindex(columns=list(dict.fromkeys(identifiers)))
+        covariance = returns.cov(min_periods=2).reindex(index=identifiers, columns=identifiers)
+        missing = [i for i in dict.fromkeys(identifiers) if returns[i].count() < 2]
+        return cls(
+            loadings=_psd_sqrt(covariance.fillna(0.0).to_numpy()),
+            kind=HISTORICAL,
+            observations=len(returns),
+            missing=missing,
+        )
+
+    @classmethod
+    def factor(
+        cls,
+        returns: pd.DataFrame,
+        identifiers: Sequence[str],
+        sector_codes: np.ndarray,
+        country_codes: np.ndarray,
+    ) -> "CovarianceModel":
+        """Sector plus country factor model.
+
+        Sector factor returns are the mean return of each sector's holdings;
+        country factor returns are the mean of what remains. Idiosyncratic
+        variance is the residual variance per holding; holdings without
+        history take the median residual variance but keep their sector and
+        country exposure.
+
+        Args:
+            returns: Date x identifier daily returns
+            identifiers: Identifier per position (may repeat)
+            sector_codes: Sector code per position (-1 = none)
+            country_codes: Country code per position (-1 = none)
+
+        Returns:
+            CovarianceModel
+        """
+        r = returns.reindex(columns=list(identifiers)).to_numpy(dtype="float64")
+        observed = ~np.isnan(r)
+
+        sector_onehot = _onehot(sector_codes)
+        country_onehot = _onehot(country_codes)
+
+        sector_returns = _group_mean(r, observed, sector_onehot)
+        residual = r - sector_returns @ sector_onehot.T
+        country_returns = _group_mean(residual, observed, country_onehot)
+        residual = residual - country_returns @ country_onehot.T
+
+        factor_returns = np.hstack([sector_returns, country_returns])
+        loadings = np.hstack([sector_onehot, country_onehot])
+        if len(factor_returns) >= 2 and factor_returns.shape[1]:
+            factor_cov = np.atleast_2d(np.cov(factor_returns, rowvar=False))
+        else:
+            factor_cov = np.zeros((loadings.shape[1], loadings.shape[1]))
+
+        counts = observed.sum(axis=0)
+        idio = np.full(len(counts), np.nan)
+        enough = counts >= 2
+        if enough.any():
+            centered = np.where(observed, residual, 0.0)[:, enough]
+            means = centered.sum(axis=0) / counts[enough]
+            squares = np.where(observed[:, enough], (centered - means) ** 2, 0.0)
+            idio[enough] = squares.sum(axis=0) / (counts[enough] - 1)
+        fill = float(np.median(idio[enough])) if enough.any() else 0.0
+        idio = np.where(np.isnan(idio), fill, idio)
+
+        return cls(
+            loadings=np.hstack([loadings @ _psd_sqrt(factor_cov), np.diag(np.sqrt(idio))]),
+            kind=FACTOR,
+            observations=len(r),
+            missing=[i for i, n in zip(identifiers, counts) if n < 2],
+        )
+
+
+@dataclass
+class RiskMeasure:
+    """VaR and ES of one portfolio or bucket, as positive loss amounts."""
+
+    kind: str
+    bucket: str
+    value: float
+    var: Dict[float, float]
+    es: Dict[float, float]
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Convert to dictionary.
+
+        Returns:
+            Dict with one var_/es_ entry per confidence level (e.g. var_99)
+        """
+        result = {"kind": self.kind, "bucket": self.bucket, "value": self.value}
+        for level in self.var:
+            label = f"{level * 100:g}".replace(".", "_")
+            result[f"var_{label}"] = self.var[level]
+            result[f"es_{label}"] = self.es[level]
+        return result
+
+
+@dataclass
+class RiskReport:
+    """Monte Carlo risk of a portfolio."""
+
+    portfolio: str
+    model: str
+    paths: int
+    horizon_days: int
+    total: RiskMeasure
+    buckets: List[RiskMeasure] = field(default_factory=list)
+    missing_history: List[str] = field(default_factory=list)
+    duration_seconds: float = 0.0
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Convert to dictionary.
+
+        Returns:
+            Dict representation
+        """
+        return {
+            "portfolio": self.portfolio,
+            "model": self.model,
+            "paths": self.paths,
+            "horizon_days": self.horizon_days,
+            "total": self.total.to_dict(),
+            "buckets": [bucket.to_dict() for bucket in self.buckets],
+            "missing_history": self.missing_history,
+            "duration_seconds": self.duration_seconds,
+        }
+
+
+class MonteCarloSimulator:
+    """Simulates correlated position returns and summarizes losses."""
+
+    def __init__(self, config: Optional[RiskConfig] = None):
+        """Initialize simulator.
+
+        Args:
+            config: Path count, seed, chunk size, workers, horizon and
+                confidence levels (defaults used if omitted)
+        """
+        self.config = config or RiskConfig()
+
+    def simulate(
+        self, model: CovarianceModel, values: np.ndarray, groups: Optional[np.ndarray] = None
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """Simulate portfolio and bucket P&L.
+
+        Args:
+            model: Covariance model over the positions
+            values: Market value per position
+            groups: Optional N x G matrix mapping positions to buckets
+
+        Returns:
+            Tuple of (P&L per path, paths x G bucket P&L)
+        """
+        paths = max(1, self.config.paths)
+        chunk_size = max(1, min(self.config.chunk_size, paths))
+        groups = np.zeros((len(values), 0)) if groups is None else groups
+
+        loadings = model.loadings * np.sqrt(max(1, self.config.horizon_days))
+        # P&L is linear in returns, so project onto values and buckets up front
+        value_loadings = loadings.T @ values
+        group_loadings = loadings.T @ (groups * values[:, None])
+
+        sizes = [min(chunk_size, paths - start) for start in range(0, paths, chunk_size)]
+        seeds = np.random.SeedSequence(self.config.seed).spawn(len(sizes))
+
+        def run(chunk: Tuple[int, np.random.SeedSequence]) -> Tuple[np.ndarray, np.ndarray]:
+            size, seed = chunk
+            z = np.random.default_rng(seed).standard_normal((size, loadings.shape[1]))
+            return z @ value_loadings, z @ group_loadings
+
+        workers = self.config.workers
+        if workers > 1 and len(sizes) > 1:
+            # Matrix products release the GIL, so threads scale across cores
+            with ThreadPoolExecutor(max_workers=workers) as executor:
+                chunks = list(executor.map(run, zip(sizes, seeds)))
+        else:
+            chunks = [run(chunk) for chunk in zip(sizes, seeds)]
+
+        total = np.concatenate([c[0] for c in chunks])
+        by_group = np.concatenate([c[1] for c in chunks])
+        return total, by_group
+
+    def measure(self, pnl: np.ndarray, kind: str, bucket: str, value: float) -> RiskMeasure:
+        """VaR and ES at each configured confidence level.
+
+        Args:
+            pnl: Simulated P&L per path
+            kind: Measure kind ("portfolio", "sector" or "country")
+            bucket: Bucket name
+            value: Current market value of the bucket
+
+        Returns:
+            RiskMeasure with losses as positive numbers
+        """
+        losses = -pnl
+        var, es = {}, {}
+        for level in self.config.confidence_levels:
+            threshold = float(np.quantile(losses, level))
+            tail = losses[losses >= threshold]
+            var[level] = threshold
+            es[level] = float(tail.mean()) if len(tail) else threshold
+        return RiskMeasure(kind=kind, bucket=bucket, value=value, var=var, es=es)
+
+
+class RiskService:
+    """Portfolio VaR/ES from the graph and the local price history."""
+
+    def __init__(
+        self,
+        graph_client,
+        price_store: PriceStore,
+        config: Optional[RiskConfig] = None,
+        price_fetcher: Optional[PriceFetcher] = None,
+        scenario_engine: Optional[ScenarioEngine] = None,
+    ):
+        """Initialize risk service.
+
+        Args:
+            graph_client: Memgraph client or compatible graph database client
+            price_store: Price history store
+            config: Simulation settings (defaults used if omitted)
+            price_fetcher: If given, missing history is fetched into the store first
+            scenario_engine: Engine whose cached exposure matrices are reused
+        """
+        self.price_store = price_store
+        self.config = config or RiskConfig()
+        self.price_fetcher = price_fetcher
+        self.scenario_engine = scenario_engine or ScenarioEngine(graph_client)
+        self.simulator = MonteCarloSimulator(self.config)
+
+    def portfolio_risk(
+        self, portfolio_name: str, model: Optional[str] = None, as_of: Optional[str] = None
+    ) -> RiskReport:
+        """Simulate VaR/ES for a portfolio and its sector/country buckets.
+
+        Args:
+            portfolio_name: Portfolio name
+            model: "historical" or "factor" (config default if omitted)
+            as_of: Last history date (YYYY-MM-DD, defaults to today)
+
+        Returns:
+            RiskReport
+
+        Raises:
+            ValueError: If the model kind is unknown
+        """
+        started = time.perf_counter()
+        model = model or self.config.model
+        if model not in (HISTORICAL, FACTOR):
+            raise ValueError(f"Unknown risk model '{model}'. Expected '{HISTORICAL}' or '{FACTOR}'")
+
+        exposures = self.scenario_engine.exposure_matrix(portfolio_name)
+        identifiers = exposures.labels
+        returns = self._returns(identifiers, as_of, exposures.label_id_types)
+
+        if model == FACTOR:
+            covariance = CovarianceModel.factor(
+                returns, identifiers, exposures.codes["sector"], exposures.codes["country"]
+            )
+        else:
+            covariance = CovarianceModel.historical(returns, identifiers)
+        if covariance.missing:
+            logger.warning(
+                f"No price history for {len(covariance.missing)} holdings in {portfolio_name}"
+            )
+
+        groups, names = self._bucket_groups(exposures)
+        total, by_group = self.simulator.simulate(covariance, exposures.market_value, groups)
+
+        bucket_values = exposures.market_value @ groups
+        report = RiskReport(
+            portfolio=portfolio_name,
+            model=model,
+            paths=len(total),
+            horizon_days=self.config.horizon_days,
+            total=self.simulator.measure(total, "portfolio", portfolio_name, exposures.total_value),
+            buckets=[
+                self.simulator.measure(by_group[:, g], kind, bucket, float(bucket_values[g]))
+                for g, (kind, bucket) in enumerate(names)
+            ],
+            missing_history=covariance.missing,
+        )
+        report.duration_seconds = time.perf_counter() - started
+        logger.info(
+            f"Simulated {report.paths} paths for {portfolio_name} ({model}) "
+            f"in {report.duration_seconds:.2f}s"
+        )
+        return report
+
+    def _returns(
+        self,
+        identifiers: List[str],
+        as_of: Optional[str],
+        id_types: Optional[Sequence[Optional[str]]] = None,
+    ) -> pd.DataFrame:
+        """Daily returns over the configured lookback window.
+
+        Missing history is fetched with one fill per identifier type, so bond
+        CUSIPs and ISINs are not requested as tickers.
+        """
+        end = as_of or date.today().isoformat()
+        start = (date.fromisoformat(end) - timedelta(days=self.config.lookback_days)).isoformat()
+        wanted = [i for i in dict.fromkeys(identifiers) if i]
+        if self.price_fetcher is not None:
+            by_type: Dict[Optional[str], List[str]] = {}
+            for identifier, id_type in dict.fromkeys(zip(identifiers, id_types or [None] * len(identifiers))):
+                if identifier:
+                    by_type.setdefault(id_type, []).append(identifier)
+            for id_type, ids in by_type.items():
+                self.price_store.fill(self.price_fetcher, ids, start, end, id_type=id_type)
+        return daily_returns(self.price_store.price_matrix(wanted, start, end))
+
+    @staticmethod
+    def _bucket_groups(exposures: ExposureMatrix) -> Tuple[np.ndarray, List[Tuple[str, str]]]:
+        """One-hot position -> bucket matrix over sectors, then countries."""
+        blocks, names = [], []
+        for kind in ("sector", "country"):
+            blocks.append(_onehot(exposures.codes[kind], len(exposures.buckets[kind])))
+            names.extend((kind, bucket) for bucket in exposures.buckets[kind])
+        return np.hstack(blocks), names
+
+
+def _onehot(codes: np.ndarray, n: Optional[int] = None) -> np.ndarray:
+    """N x n indicator matrix for integer codes (-1 rows are all zero)."""
+    n = int(codes.max(initial=-1)) + 1 if n is None else n
+    matrix = np.zeros((len(codes), n))
+    rows = np.flatnonzero(codes >= 0)
+    matrix[rows, codes[rows]] = 1.0
+    return matrix
+
+
+def _group_mean(values: np.ndarray, observed: np.ndarray, onehot: np.ndarray) -> np.ndarray:
+    """Per-date mean of observed values within each group (0 where none observed)."""
+    sums = np.where(observed, values, 0.0) @ onehot
+    counts = observed.astype("float64") @ onehot
+    return np.divide(sums, counts, out=np.zeros_like(sums), where=counts > 0)
+
+
+def _psd_sqrt(covariance: np.ndarray) -> np.ndarray:
+    """Square root L (L @ L.T = covariance) after clipping negative eigenvalues."""
+    if covariance.size == 0:
+        return np.zeros(covariance.shape)
+    eigenvalues, eigenvectors = np.linalg.eigh((covariance + covariance.T) / 2)
+    return eigenvectors * np.sqrt(np.clip(eigenvalues, 0.0, None))
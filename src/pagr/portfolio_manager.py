@@ -1,34 +1,57 @@
 """Portfolio management and CRUD operations."""
 
 import logging
-from typing import List, Dict, Any, Optional
+import threading
+import uuid
+from typing import List, Dict, Any, Optional, Tuple
 from datetime import datetime
 
+from pagr.fds.graph.queries import GraphQueries
+from pagr.fds.services.orphan_sweeper import OrphanSweeper
+
 logger = logging.getLogger(__name__)
 
 
 class PortfolioManager:
     """Manages portfolio operations including listing and deletion."""
 
-    def __init__(self, memgraph_client):
+    # Row layout of GraphQueries.portfolio_positions
+    POSITION_COLUMNS = (
+        "ticker", "isin", "cusip", "security_type", "purchase_date",
+        "quantity", "book_value", "market_value",
+    )
+
+    def __init__(self, memgraph_client, sweeper: Optional[OrphanSweeper] = None):
         """Initialize portfolio manager with Memgraph client.
 
         Args:
             memgraph_client: MemgraphClient instance for database operations
+            sweeper: Deleter used by delete_portfolio (defaults to an
+                OrphanSweeper over memgraph_client)
         """
         self.memgraph_client = memgraph_client
+        self.sweeper = sweeper or OrphanSweeper(memgraph_client)
+        # portfolio name -> (graph version, Portfolio)
+        self._cache: Dict[str, Tuple[Optional[str], Any]] = {}
+        # (graph version, list_portfolios result)
+        self._summaries: Optional[Tuple[Optional[str], List[Dict[str, Any]]]] = None
+        self._cache_lock = threading.Lock()
 
     def list_portfolios(self) -> List[Dict[str, Any]]:
-        """Query all portfolios from database.
+        """Query all portfolios with summary statistics from database.
+
+        The list is cached against the graph version stamp, so reruns that
+        find the graph unchanged cost one version read.
 
         Returns:
-            List of portfolio dicts with keys: name, created_at, node_count
+            List of portfolio dicts with keys: name, created_at, position_count,
+            total_market_value, last_updated
             Empty list if no portfolios or error occurs
 
         Example:
             [
-                {"name": "Portfolio1", "created_at": "2024-01-15T10:30:00", "node_count": 25},
-                {"name": "Portfolio2", "created_at": "2024-01-16T14:20:00", "node_count": 18}
+                {"name": "Portfolio1", "created_at": "2024-01-15T10:30:00", "position_count": 25,
+                 "total_market_value": 1250000.0, "last_updated": "2024-01-16T09:00:00+00:00"},
             ]
         """
         try:
@@ -36,40 +59,28 @@ class PortfolioManager:
             if not self.memgraph_client.is_connected:
                 self.memgraph_client.connect()
 
-            # Query to get all portfolios with metadata
-            query = """
-            MATCH (p:Portfolio)
-            RETURN p.name AS name, p.created_at AS created_at
-            ORDER BY p.name
-            """
+            version = self.graph_version()
+            with self._cache_lock:
+                cached = self._summaries
+            if cached is None or cached[0] != version:
+                results = self.memgraph_client.execute_query(GraphQueries.portfolio_summaries())
+                summaries = [
+                    {
+                        "name": record.get("name") or "Unknown",
+                        "created_at": record.get("created_at") or "",
+                        "position_count": record.get("position_count") or 0,
+                        "total_market_value": record.get("total_market_value") or 0.0,
+                        "last_updated": record.get("last_updated") or "",
+                    }
+                    for record in results or []
+                ]
+                cached = (version, summaries)
+                with self._cache_lock:
+                    self._summaries = cached
+                logger.info(f"Listed {len(summaries)} portfolios from database")
 
-            results = self.memgraph_client.execute_query(query)
-            logger.debug(f"Query results type: {type(results)}, length: {len(results) if results else 0}")
-
-            # Convert results to list of dicts
-            portfolios = []
-            for i, record in enumerate(results):
-                logger.debug(f"Record {i}: type={type(record)}, content={record}")
-
-                # Handle both dict and record-like objects
-                if isinstance(record, dict):
-                    name = record.get("name", "Unknown")
-                    created_at = record.get("created_at", "")
-                else:
-                    # Try to access as record attributes
-                    name = getattr(record, "name", record.get("name", "Unknown") if hasattr(record, "get") else "Unknown")
-                    created_at = getattr(record, "created_at", record.get("created_at", "") if hasattr(record, "get") else "")
-
-                portfolio = {
-                    "name": name,
-                    "created_at": created_at,
-                    "position_count": 0
-                }
-                portfolios.append(portfolio)
-                logger.debug(f"Added portfolio: {portfolio}")
-
-            logger.info(f"Listed {len(portfolios)} portfolios from database: {portfolios}")
-            return portfolios
+            # Copies, so callers can't alter the cached list
+            return [dict(summary) for summary in cached[1]]
 
         except Exception as e:
             logger.error(f"Failed to list portfolios: {e}")
@@ -78,6 +89,10 @@ class PortfolioManager:
     def delete_portfolio(self, portfolio_name: str) -> bool:
         """Delete portfolio and all related data from database.
 
+        Positions are deleted in bounded batches, then securities, issuers,
+        officers and countries no other portfolio refers to are swept (see
+        OrphanSweeper).
+
         Args:
             portfolio_name: Name of portfolio to delete
 
@@ -89,17 +104,17 @@ class PortfolioManager:
             if not self.memgraph_client.is_connected:
                 self.memgraph_client.connect()
 
-            # Query to delete portfolio and all related nodes/relationships
-            # This uses DETACH DELETE to cascade delete all relationships
-            query = """
-                MATCH (p:Portfolio {name: $portfolio_name})
-                DETACH DELETE p
-            """
+            result = self.sweeper.delete_portfolio(portfolio_name)
+            self.memgraph_client.execute_query(
+                GraphQueries.stamp_graph_version(), {"version": uuid.uuid4().hex}
+            )
+            self.invalidate(portfolio_name)
 
-            parameters = {"portfolio_name": portfolio_name}
-            self.memgraph_client.execute_query(query, parameters)
+            if not result.portfolio_deleted:
+                logger.warning(f"Portfolio not found: {portfolio_name}")
+                return False
 
-            logger.info(f"Successfully deleted portfolio: {portfolio_name}")
+            logger.info(f"Successfully deleted portfolio: {portfolio_name} ({result.total_deleted} nodes)")
             return True
 
         except Exception as e:
@@ -163,12 +178,42 @@ class PortfolioManager:
             Number of portfolios, or 0 if error
         """
         try:
-            portfolios = self.list_portfolios()
-            return len(portfolios)
+            if not self.memgraph_client.is_connected:
+                self.memgraph_client.connect()
+
+            with self._cache_lock:
+                cached = self._summaries
+            if cached is not None and cached[0] == self.graph_version():
+                return len(cached[1])
+
+            results = self.memgraph_client.execute_query(GraphQueries.count_portfolios())
+            return results[0].get("count", 0) if results else 0
         except Exception as e:
             logger.error(f"Failed to count portfolios: {e}")
             return 0
 
+    def graph_version(self) -> Optional[str]:
+        """Read the graph version stamp written after every change to the graph.
+
+        Returns:
+            Version stamp, or None if the graph was never stamped
+        """
+        results = self.memgraph_client.execute_query(GraphQueries.graph_version())
+        return results[0].get("version") if results else None
+
+    def invalidate(self, portfolio_name: Optional[str] = None) -> None:
+        """Drop cached reconstructions and the cached portfolio list.
+
+        Args:
+            portfolio_name: Portfolio to drop, or None for all
+        """
+        with self._cache_lock:
+            self._summaries = None
+            if portfolio_name is None:
+                self._cache.clear()
+            else:
+                self._cache.pop(portfolio_name, None)
+
     def reconstruct_portfolio_from_database(self, portfolio_name: str):
         """Reconstruct a full Portfolio object from the database.
 
@@ -181,106 +226,138 @@ class PortfolioManager:
         Returns:
             Portfolio object, or None if not found
 
-        Note: This is a simplified reconstruction. For full reconstruction with all
-        enriched data, we would need to traverse the entire graph and rebuild objects.
-        For now, this creates a basic Portfolio with position data from the graph.
+        Note: This is a simplified reconstruction with position data only; it
+        does not rebuild the enriched entities. See reconstruct_portfolios for
+        caching.
         """
-        try:
-            from pagr.fds.models.portfolio import Portfolio, Position
+        return self.reconstruct_portfolios([portfolio_name]).get(portfolio_name)
 
-            logger.info(f"Starting reconstruction of portfolio: {portfolio_name}")
+    def reconstruct_portfolios(self, portfolio_names: List[str]) -> Dict[str, Any]:
+        """Reconstruct several portfolios, reusing cached objects where possible.
 
-            # Ensure connection is established
+        Rebuilt portfolios are cached against the graph version stamp, so
+        switching between portfolios costs one small version read until the
+        graph is written again. Portfolios not cached at the current version
+        are loaded together in one query and built column-wise, without
+        per-row validation.
+
+        Cached Portfolio objects are shared between callers; treat them as
+        read-only.
+
+        Args:
+            portfolio_names: Names of portfolios to reconstruct
+
+        Returns:
+            Dict of portfolio name to Portfolio; portfolios that do not exist
+            or have no positions are omitted. Empty if the database fails.
+        """
+        names = list(dict.fromkeys(portfolio_names))
+        if not names:
+            return {}
+
+        try:
             if not self.memgraph_client.is_connected:
-                logger.debug("Memgraph not connected, establishing connection...")
                 self.memgraph_client.connect()
 
-            # Query to get portfolio and its positions
-            # Get all positions for the portfolio (don't filter by security presence)
-            query = """
-            MATCH (p:Portfolio {name: $portfolio_name})-[:CONTAINS]->(pos:Position)
-            OPTIONAL MATCH (pos)-[:INVESTED_IN]->(sec)
-            RETURN
-                p.name AS portfolio_name,
-                p.created_at AS created_at,
-                pos.ticker AS ticker,
-                pos.quantity AS quantity,
-                pos.cost_basis AS cost_basis,
-                pos.market_value AS market_value,
-                pos.security_type AS security_type,
-                pos.isin AS isin,
-                pos.cusip AS cusip,
-                pos.purchase_date AS purchase_date,
-                sec.market_price AS market_price
-            ORDER BY pos.ticker
-            """
+            version = self.graph_version()
+            portfolios = {}
+            with self._cache_lock:
+                for name in names:
+                    cached = self._cache.get(name)
+                    if cached is not None and cached[0] == version:
+                        portfolios[name] = cached[1]
+
+            missing = [name for name in names if name not in portfolios]
+            if missing:
+                results = self.memgraph_client.execute_query(
+                    GraphQueries.portfolio_positions(), {"names": missing}
+                )
+                loaded = {}
+                for record in results or []:
+                    portfolio = self._build_portfolio(record)
+                    if portfolio is not None:
+                        loaded[portfolio.name] = portfolio
+                with self._cache_lock:
+                    for name, portfolio in loaded.items():
+                        self._cache[name] = (version, portfolio)
+                portfolios.update(loaded)
+
+                for name in missing:
+                    if name not in loaded:
+                        logger.warning(f"No portfolio data found for: {name}")
+                logger.info(
+                    f"Reconstructed {len(loaded)} portfolio(s) from database, "
+                    f"{len(names) - len(missing)} from cache"
+                )
 
-            logger.debug(f"Executing reconstruction query with parameter: portfolio_name={portfolio_name}")
-            parameters = {"portfolio_name": portfolio_name}
-            results = self.memgraph_client.execute_query(query, parameters)
-            logger.debug(f"Query returned {len(results) if results else 0} results")
+            return portfolios
 
-            if not results:
-                logger.warning(f"No portfolio data found for: {portfolio_name}")
-                return None
+        except Exception as e:
+            logger.error(f"Failed to reconstruct portfolios {names}: {e}")
+            return {}
 
-            # Create Portfolio object
-            portfolio = Portfolio(name=portfolio_name)
-            portfolio.created_at = results[0].get("created_at", "") if results else ""
-
-            # Extract positions from results
-            positions = []
-            logger.debug(f"Processing {len(results)} records from database query")
-
-            for i, record in enumerate(results):
-                try:
-                    logger.debug(f"Record {i}: {record}")
-
-                    # Build position data with required fields having defaults
-                    # Use cost_basis if available, fallback to book_value, then default to 0
-                    cost_basis = record.get("cost_basis")
-                    book_value = record.get("book_value")
-                    final_book_value = cost_basis if cost_basis is not None else (book_value if book_value is not None else 0)
-
-                    position_data = {
-                        "ticker": record.get("ticker") or None,  # Can be None for bonds
-                        "quantity": record.get("quantity", 0),
-                        "book_value": final_book_value,
-                        "security_type": record.get("security_type", "Unknown"),
-                    }
+    def _build_portfolio(self, record: Dict[str, Any]):
+        """Build a Portfolio from one portfolio_positions record.
 
-                    # Add optional fields only if they have values
-                    if record.get("isin"):
-                        position_data["isin"] = record.get("isin")
-                    if record.get("cusip"):
-                        position_data["cusip"] = record.get("cusip")
-                    if record.get("purchase_date"):
-                        position_data["purchase_date"] = record.get("purchase_date")
-                    if record.get("market_value") is not None:
-                        position_data["market_value"] = record.get("market_value")
-
-                    logger.debug(f"Position data: {position_data}")
-                    logger.debug(f"About to create Position with: ticker={position_data.get('ticker')}, isin={position_data.get('isin')}, cusip={position_data.get('cusip')}, qty={position_data.get('quantity')}, book_value={position_data.get('book_value')}")
-
-                    position = Position(**position_data)
-                    positions.append(position)
-                    logger.debug(f"Successfully created Position object: ticker={position.ticker}, qty={position.quantity}, book_value={position.book_value}")
-                except ValueError as ve:
-                    logger.error(f"ValueError creating Position from record {i}: {ve}. Data was: {position_data}", exc_info=True)
-                    continue
-                except Exception as e:
-                    logger.error(f"Error reconstructing position from record {i}: {e}. Record: {record}", exc_info=True)
-                    continue
-
-            portfolio.positions = positions
-            logger.debug(f"Portfolio has {len(positions)} positions before calculate_weights()")
-
-            portfolio.calculate_weights()
-            logger.debug(f"Portfolio has {len(portfolio.positions)} positions after calculate_weights()")
-
-            logger.info(f"Reconstructed portfolio '{portfolio_name}' with {len(positions)} positions from database")
-            return portfolio
+        Rows that would fail Position validation (no identifier, non-positive
+        quantity, negative book value) are dropped.
 
-        except Exception as e:
-            logger.error(f"Failed to reconstruct portfolio '{portfolio_name}': {e}")
+        Args:
+            record: Record with name, created_at and positions
+
+        Returns:
+            Portfolio with weights and total value set, or None if no valid
+            positions remain
+        """
+        from pagr.fds.models.portfolio_frame import PortfolioFrame
+
+        name = record.get("name")
+        rows = record.get("positions") or []
+        if not rows:
+            return None
+
+        columns = {
+            field: list(values) for field, values in zip(self.POSITION_COLUMNS, zip(*rows))
+        }
+        for field in ("ticker", "isin", "cusip", "purchase_date"):
+            columns[field] = [value or None for value in columns[field]]
+        columns["security_type"] = [value or "Unknown" for value in columns["security_type"]]
+
+        frame = PortfolioFrame(name=name, created_at=record.get("created_at") or "", **columns)
+        has_identifier = (
+            frame.ticker.astype(bool) | frame.isin.astype(bool) | frame.cusip.astype(bool)
+        )
+        valid = has_identifier & (frame.quantity > 0) & (frame.book_value >= 0)
+        if not valid.all():
+            logger.warning(f"Skipping {int((~valid).sum())} invalid position(s) in portfolio '{name}'")
+            frame = PortfolioFrame(
+                name=name,
+                created_at=frame.created_at,
+                **{field: getattr(frame, field)[valid] for field in frame.NUMERIC_FIELDS + frame.TEXT_FIELDS},
+            )
+        if not len(frame):
             return None
+
+        frame.recalculate_weights()
+        return frame.to_portfolio()
+
+    def export_portfolio(self, portfolio_name: str, file_path: str):
+        """Export a portfolio from the database to a CSV, Parquet or Arrow file.
+
+        Args:
+            portfolio_name: Name of portfolio to export
+            file_path: Destination path; the extension selects the format
+
+        Returns:
+            Path of the written file, or None if the portfolio was not found
+
+        Raises:
+            PortfolioLoaderError: If the format is unsupported or pyarrow is missing
+        """
+        from pagr.fds.loaders.portfolio_writer import PortfolioWriter
+
+        portfolio = self.reconstruct_portfolio_from_database(portfolio_name)
+        if portfolio is None:
+            return None
+
+        return PortfolioWriter.write(portfolio, file_path)
@@ -40,6 +40,8 @@ class SessionManager:
             st.session_state.query_service = None
         if "current_file" not in st.session_state:
             st.session_state.current_file = None
+        if "upload_job_id" not in st.session_state:
+            st.session_state.upload_job_id = None
 
         # NEW: Connection testing state
         if "connection_status" not in st.session_state:
@@ -106,6 +108,16 @@ class SessionManager:
         """Get current file name from session state."""
         return st.session_state.get("current_file")
 
+    @staticmethod
+    def set_upload_job(job_id: Optional[str]):
+        """Set the id of the background upload job this session is following."""
+        st.session_state.upload_job_id = job_id
+
+    @staticmethod
+    def get_upload_job() -> Optional[str]:
+        """Get the id of the background upload job this session is following."""
+        return st.session_state.get("upload_job_id")
+
     @staticmethod
     def clear():
         """Clear all session state variables."""
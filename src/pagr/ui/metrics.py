@@ -2,18 +2,20 @@
 
 import streamlit as st
 from pagr.fds.models.portfolio import Portfolio
+from pagr.fds.models.portfolio_frame import PortfolioFrame
 
 
 def display_portfolio_metrics(portfolio: Portfolio):
     """Display portfolio summary metrics in 3-column layout."""
     col1, col2, col3 = st.columns(3)
+    frame = PortfolioFrame.from_portfolio(portfolio)
 
     # Total portfolio value (Market Value)
     with col1:
         total_value = portfolio.total_value if hasattr(portfolio, 'total_value') else 0.0
         # If total_value is None or 0, try to sum book values as fallback
         if not total_value:
-            total_value = sum(p.book_value for p in portfolio.positions)
+            total_value = float(frame.book_value.sum())
             label = "Total Book Value"
         else:
             label = "Total Market Value"
@@ -25,16 +27,12 @@ def display_portfolio_metrics(portfolio: Portfolio):
 
     # Number of positions
     with col2:
-        st.metric("Positions", len(portfolio.positions) if portfolio.positions else 0)
+        st.metric("Positions", len(frame))
 
     # Largest position weight
     with col3:
-        if portfolio.positions:
-            weights = [p.weight for p in portfolio.positions if hasattr(p, 'weight') and p.weight]
-            if weights:
-                max_weight = max(weights)
-                st.metric("Largest Position", f"{max_weight:.1f}%")
-            else:
-                st.metric("Largest Position", "N/A")
+        max_weight = frame.largest_weight() if len(frame) else None
+        if max_weight is not None:
+            st.metric("Largest Position", f"{max_weight:.1f}%")
         else:
             st.metric("Largest Position", "N/A")
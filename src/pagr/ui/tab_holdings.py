@@ -7,7 +7,7 @@ from typing import List
 from pagr.session_manager import SessionManager
 from pagr.portfolio_manager import PortfolioManager
 from pagr.ui.metrics import display_portfolio_metrics
-from pagr.ui.tabular import display_tabular_view
+from pagr.ui.tabular import display_combined_tabular_view, display_tabular_view
 from pagr.ui.graph_view import display_graph_view
 
 logger = logging.getLogger(__name__)
@@ -23,15 +23,22 @@ def display_holdings_tab(etl_manager, portfolio_manager: PortfolioManager):
     # Load current portfolio from session (loaded when CSV was uploaded)
     current_portfolio = SessionManager.get_portfolio()
 
-    logger.info(f"Holdings View loading - current_portfolio type: {type(current_portfolio)}, value: {current_portfolio}")
+    logger.info(f"Holdings View loading - current portfolio: {current_portfolio.name if current_portfolio else None}")
+
+    # Portfolio summaries are cached by PortfolioManager until the graph
+    # changes, so one call per render is cheap
+    try:
+        portfolios = portfolio_manager.list_portfolios()
+    except Exception as e:
+        logger.error(f"Error loading portfolios: {e}")
+        st.warning(f"Could not load portfolio list: {e}")
+        portfolios = []
 
     # If no portfolio in session, try to load the first one from database
     if current_portfolio is None:
         logger.info("No portfolio in session, attempting to load from database...")
 
-        # Get portfolios from database
         try:
-            portfolios = portfolio_manager.list_portfolios()
             if portfolios:
                 first_portfolio_name = portfolios[0].get("name")
                 logger.info(f"Found {len(portfolios)} portfolio(s) in database. Reconstructing: {first_portfolio_name}")
@@ -76,23 +83,12 @@ def display_holdings_tab(etl_manager, portfolio_manager: PortfolioManager):
         except Exception as e:
             logger.warning(f"Could not initialize query service on tab load: {e}")
 
-    # Always refresh available portfolios from database
-    available_portfolios = []
-    try:
-        portfolios = portfolio_manager.list_portfolios()
-        logger.info(f"Query returned {len(portfolios)} portfolios: {portfolios}")
-
-        if portfolios:
-            SessionManager.set_available_portfolios(portfolios)
-            available_portfolios = portfolios
-        else:
-            logger.warning("Query returned no portfolios, using session state fallback")
-            available_portfolios = SessionManager.get_available_portfolios()
-
-        logger.info(f"Available portfolios in Holdings View: {available_portfolios}")
-    except Exception as e:
-        logger.error(f"Error loading portfolios: {e}")
-        st.warning(f"Could not load portfolio list: {e}")
+    # Keep the session's list in step with the database
+    if portfolios:
+        SessionManager.set_available_portfolios(portfolios)
+        available_portfolios = portfolios
+    else:
+        logger.warning("Query returned no portfolios, using session state fallback")
         available_portfolios = SessionManager.get_available_portfolios()
 
     # Ensure we at least have the current portfolio
@@ -157,8 +153,10 @@ def display_holdings_tab(etl_manager, portfolio_manager: PortfolioManager):
                 ):
                     new_selected.append(portfolio_name)
 
+                caption = f"{position_count} positions"
                 if created_at:
-                    st.caption(f"Created: {created_at[:10]}")
+                    caption += f" | Created: {created_at[:10]}"
+                st.caption(caption)
                 st.divider()
 
             # Update selected portfolios if changed
@@ -174,40 +172,32 @@ def display_holdings_tab(etl_manager, portfolio_manager: PortfolioManager):
             st.info("Please select at least one portfolio to view holdings.")
             return
 
-        # For single portfolio: show all details (backward compatible)
-        # For multiple portfolios: show first portfolio for now with TODO
-        display_portfolio_name = selected_portfolios[0]
+        # A single portfolio is shown from memory (reconstructions are cached
+        # until the graph changes, so switching is cheap); several are
+        # combined in the graph with one query per section
         is_multiple = len(selected_portfolios) > 1
-
-        # Determine which portfolio object to display
-        # If it's the current portfolio, use that
-        # Otherwise, we would need to reconstruct from database (TODO for multi-portfolio)
-        if display_portfolio_name == current_portfolio.name:
-            display_portfolio = current_portfolio
-        else:
-            # TODO: Implement multi-portfolio support - reconstruct from database
-            st.warning(
-                f"⚠️ Multi-portfolio view is not yet fully implemented. "
-                f"Showing first selected portfolio: {display_portfolio_name}"
-            )
-            display_portfolio = current_portfolio
+        if not is_multiple and (current_portfolio is None or selected_portfolios[0] != current_portfolio.name):
+            selected = portfolio_manager.reconstruct_portfolio_from_database(selected_portfolios[0])
+            if selected is not None:
+                current_portfolio = selected
+                SessionManager.set_portfolio(current_portfolio, None)
+        show_current = (
+            not is_multiple
+            and current_portfolio is not None
+            and selected_portfolios[0] == current_portfolio.name
+        )
 
         # Portfolio header
         if is_multiple:
             header = f"Combined Portfolio View ({len(selected_portfolios)} portfolios selected)"
         else:
-            header = f"Portfolio: {display_portfolio.name}"
+            header = f"Portfolio: {selected_portfolios[0]}"
 
         st.subheader(header)
 
-        # Display portfolio metrics
-        display_portfolio_metrics(display_portfolio)
-
-        # DEBUG: Log portfolio state
-        logger.info(f"Display portfolio object: name={display_portfolio.name}, positions count={len(display_portfolio.positions) if display_portfolio.positions else 0}")
-        if display_portfolio.positions:
-            for i, pos in enumerate(display_portfolio.positions[:3]):  # Log first 3 positions
-                logger.debug(f"Position {i}: ticker={pos.ticker}, qty={pos.quantity}, book_value={pos.book_value}")
+        if show_current:
+            # Display portfolio metrics (the combined view shows its own)
+            display_portfolio_metrics(current_portfolio)
 
         st.divider()
 
@@ -229,8 +219,10 @@ def display_holdings_tab(etl_manager, portfolio_manager: PortfolioManager):
         if view_selection == "Tabular Analysis":
             if query_service:
                 try:
-                    logger.debug(f"Calling display_tabular_view with portfolio: {display_portfolio.name}, positions: {len(display_portfolio.positions) if display_portfolio.positions else 0}")
-                    display_tabular_view(display_portfolio, query_service)
+                    if show_current:
+                        display_tabular_view(current_portfolio, query_service)
+                    else:
+                        display_combined_tabular_view(selected_portfolios, query_service)
                 except Exception as e:
                     st.error(f"Error displaying tabular view: {str(e)}")
                     logger.exception(f"Tabular view error: {e}")
@@ -238,8 +230,11 @@ def display_holdings_tab(etl_manager, portfolio_manager: PortfolioManager):
                 st.error("Query service not initialized. Please reload the portfolio.")
 
         elif view_selection == "Graph Visualization":
+            if not show_current:
+                st.info("Graph visualization shows one portfolio at a time. Select a single loaded portfolio to view its graph.")
+                return
             try:
-                display_graph_view(display_portfolio, etl_manager.memgraph_client)
+                display_graph_view(current_portfolio, etl_manager.memgraph_client)
             except Exception as e:
                 st.error(f"Error displaying graph view: {str(e)}")
                 logger.exception(f"Graph view error: {e}")
@@ -5,6 +5,7 @@ import logging
 
 from pagr.session_manager import SessionManager
 from pagr.portfolio_manager import PortfolioManager
+from pagr.fds.services.job_runner import FAILED, Job
 
 logger = logging.getLogger(__name__)
 
@@ -45,9 +46,9 @@ def display_portfolio_selection_tab(etl_manager, portfolio_manager: PortfolioMan
 
         # File uploader
         uploaded_file = st.file_uploader(
-            "Upload Portfolio CSV",
-            type="csv",
-            help="CSV format: ticker,quantity,book_value,security_type (optional),isin (optional),cusip (optional)"
+            "Upload Portfolio",
+            type=["csv", "parquet", "arrow", "feather", "pagr"],
+            help="CSV, Parquet, Arrow or .pagr JSON with columns: ticker,quantity,book_value,security_type (optional),isin (optional),cusip (optional)"
         )
 
         if uploaded_file is not None:
@@ -56,52 +57,27 @@ def display_portfolio_selection_tab(etl_manager, portfolio_manager: PortfolioMan
             if current_file != uploaded_file.name:
                 SessionManager.set_current_file(uploaded_file.name)
 
-                with st.spinner("Processing portfolio through ETL pipeline..."):
-                    try:
-                        # Check Memgraph connection
-                        if not etl_manager.check_connection():
-                            st.error(
-                                "Cannot connect to Memgraph database. "
-                                "Please ensure Memgraph is running on 127.0.0.1:7687"
-                            )
-                        else:
-                            # Process CSV
-                            portfolio, stats = etl_manager.process_uploaded_csv(uploaded_file)
-                            logger.info(f"Portfolio object created: name={portfolio.name}, positions={len(portfolio.positions)}")
-
-                            SessionManager.set_portfolio(portfolio, stats)
-                            SessionManager.set_query_service(etl_manager.query_service)
-
-                            logger.info(f"Portfolio stored in session state. Retrieving to verify...")
-                            stored_portfolio = SessionManager.get_portfolio()
-                            logger.info(f"Verification: retrieved portfolio = {stored_portfolio.name if stored_portfolio else 'NONE'}")
-
-                            # Show success message
-                            st.success(f"✅ Portfolio '{portfolio.name}' successfully loaded!")
-
-                            # Show pipeline statistics in expander
-                            with st.expander("Pipeline Statistics", expanded=False):
-                                col1, col2 = st.columns(2)
-                                with col1:
-                                    st.metric("Positions Loaded", stats.positions_loaded)
-                                    st.metric("Companies Enriched", stats.companies_enriched)
-                                    st.metric("Companies Failed", stats.companies_failed)
-                                with col2:
-                                    st.metric("Executives", stats.executives_enriched)
-                                    st.metric("Countries", stats.countries_enriched)
-                                    st.metric("Graph Nodes", stats.graph_nodes_created)
-
-                                if stats.errors:
-                                    with st.expander("Errors"):
-                                        for error in stats.errors[:5]:
-                                            st.warning(error)
-
-                            # Refresh portfolio list
-                            _refresh_portfolio_list(portfolio_manager)
-
-                    except Exception as e:
-                        st.error(f"Error processing portfolio: {str(e)}")
-                        logger.exception(f"Portfolio processing error: {e}")
+                # Check Memgraph connection
+                if not etl_manager.check_connection():
+                    st.error(
+                        "Cannot connect to Memgraph database. "
+                        "Please ensure Memgraph is running on 127.0.0.1:7687"
+                    )
+                else:
+                    # Process in the background so this session stays responsive
+                    job_id = etl_manager.submit_upload(uploaded_file)
+                    SessionManager.set_upload_job(job_id)
+                    logger.info(f"Submitted upload job {job_id} for {uploaded_file.name}")
+
+        job_id = SessionManager.get_upload_job()
+        if job_id:
+            job = etl_manager.job_runner.get(job_id)
+            if job is not None and not job.done:
+                _poll_upload_job(etl_manager, job_id)
+            elif job is not None:
+                _display_upload_result(etl_manager, portfolio_manager, job)
+
+        _display_recent_uploads(etl_manager)
 
     else:  # OFDB from FactSet
         st.warning("🚧 OFDB import from FactSet is not implemented yet. This feature will be available in a future release.")
@@ -111,21 +87,33 @@ def display_portfolio_selection_tab(etl_manager, portfolio_manager: PortfolioMan
     # Portfolio Management Section
     st.subheader("Manage Portfolios")
 
-    # Refresh button
+    # Refresh button (drops cached summaries, e.g. after external writes)
     if st.button("🔄 Refresh Portfolio List", use_container_width=True):
+        portfolio_manager.invalidate()
         _refresh_portfolio_list(portfolio_manager)
         st.rerun()
 
+    # Reprice-only refresh (no re-enrichment)
+    if st.button("💲 Refresh Prices", use_container_width=True,
+                 help="Fetch latest prices for all portfolios and update market values and weights"):
+        with st.spinner("Refreshing prices..."):
+            try:
+                result = etl_manager.refresh_prices()
+                st.success(
+                    f"Repriced {result.positions_updated} positions across "
+                    f"{result.portfolios_updated} portfolio(s) in {result.duration_seconds:.1f}s"
+                )
+                for error in result.errors[:5]:
+                    st.warning(error)
+            except Exception as e:
+                st.error(f"Error refreshing prices: {str(e)}")
+                logger.exception(f"Price refresh error: {e}")
+
     st.divider()
 
-    # Get and display available portfolios
+    # Display available portfolios (refreshed on tab load)
     available_portfolios = SessionManager.get_available_portfolios()
 
-    if not available_portfolios:
-        # Try to refresh if empty
-        _refresh_portfolio_list(portfolio_manager)
-        available_portfolios = SessionManager.get_available_portfolios()
-
     if available_portfolios:
         st.write(f"**Found {len(available_portfolios)} portfolio(s):**")
 
@@ -136,9 +124,14 @@ def display_portfolio_selection_tab(etl_manager, portfolio_manager: PortfolioMan
                 portfolio_name = portfolio.get("name", "Unknown")
                 created_at = portfolio.get("created_at", "N/A")
                 position_count = portfolio.get("position_count", 0)
+                market_value = portfolio.get("total_market_value") or 0.0
+                last_updated = portfolio.get("last_updated") or "N/A"
 
                 st.write(f"**{portfolio_name}**")
-                st.caption(f"Positions: {position_count} | Created: {created_at}")
+                st.caption(
+                    f"Positions: {position_count} | Market value: ${market_value:,.0f} | "
+                    f"Created: {created_at} | Updated: {last_updated}"
+                )
 
             with col2:
                 st.empty()  # Spacer
@@ -185,6 +178,110 @@ def display_portfolio_selection_tab(etl_manager, portfolio_manager: PortfolioMan
         st.info("📌 No portfolios found. Upload a CSV portfolio to get started!")
 
 
+@st.fragment(run_every=2)
+def _poll_upload_job(etl_manager, job_id: str):
+    """Show progress of a running upload job, re-rendering until it finishes.
+
+    Args:
+        etl_manager: ETLManager instance
+        job_id: Upload job to follow
+    """
+    job = etl_manager.job_runner.get(job_id)
+    if job is None or job.done:
+        # Rerun the whole page so the result is shown outside the fragment
+        st.rerun()
+
+    st.progress(job.progress, text=f"Processing '{job.filename}': {job.stage or job.status}...")
+    if job.stats:
+        st.caption(
+            f"Positions loaded: {job.stats.get('positions_loaded', 0)} | "
+            f"Companies enriched: {job.stats.get('companies_enriched', 0)} | "
+            f"Errors: {len(job.stats.get('errors', []))}"
+        )
+
+
+def _display_upload_result(etl_manager, portfolio_manager: PortfolioManager, job: Job):
+    """Show the outcome of a finished upload job and load its portfolio.
+
+    Args:
+        etl_manager: ETLManager instance
+        portfolio_manager: PortfolioManager instance
+        job: Finished upload job
+    """
+    if job.status == FAILED:
+        st.error(f"Error processing portfolio: {job.error}")
+        return
+
+    if st.session_state.get("loaded_upload_job") != job.job_id:
+        st.session_state.loaded_upload_job = job.job_id
+        held = etl_manager.job_runner.result(job.job_id)
+        if held is not None:
+            portfolio, stats = held
+            logger.info(f"Portfolio object created: name={portfolio.name}, positions={len(portfolio.positions)}")
+            SessionManager.set_portfolio(portfolio, stats)
+            SessionManager.set_query_service(etl_manager.query_service)
+        _refresh_portfolio_list(portfolio_manager)
+
+    portfolio = SessionManager.get_portfolio()
+    name = portfolio.name if portfolio else job.filename
+    st.success(f"✅ Portfolio '{name}' successfully loaded!")
+
+    # Show pipeline statistics in expander
+    stats = job.stats
+    with st.expander("Pipeline Statistics", expanded=False):
+        col1, col2 = st.columns(2)
+        with col1:
+            st.metric("Positions Loaded", stats.get("positions_loaded", 0))
+            st.metric("Companies Enriched", stats.get("companies_enriched", 0))
+            st.metric("Companies Failed", stats.get("companies_failed", 0))
+        with col2:
+            st.metric("Executives", stats.get("executives_enriched", 0))
+            st.metric("Countries", stats.get("countries_enriched", 0))
+            st.metric("Graph Nodes", stats.get("graph_nodes_created", 0))
+
+        errors = stats.get("errors", [])
+        if errors:
+            with st.expander("Errors"):
+                for error in errors[:5]:
+                    st.warning(error)
+
+
+def _display_recent_uploads(etl_manager):
+    """List recent upload jobs from all sessions.
+
+    Jobs are persisted, so uploads submitted before a browser reconnect
+    (or by other users) remain visible here.
+
+    Args:
+        etl_manager: ETLManager instance
+    """
+    try:
+        jobs = etl_manager.job_runner.list_jobs(limit=10)
+    except Exception as e:
+        logger.warning(f"Could not list upload jobs: {e}")
+        return
+    if not jobs:
+        return
+
+    with st.expander("Recent Uploads", expanded=any(not job.done for job in jobs)):
+        st.dataframe(
+            [
+                {
+                    "File": job.filename,
+                    "Status": job.status,
+                    "Stage": job.stage or "",
+                    "Progress": f"{job.progress:.0%}",
+                    "Positions": job.stats.get("positions_loaded", 0),
+                    "Updated": job.updated_at,
+                    "Error": job.error or "",
+                }
+                for job in jobs
+            ],
+            use_container_width=True,
+            hide_index=True,
+        )
+
+
 def _refresh_portfolio_list(portfolio_manager: PortfolioManager):
     """Refresh the list of available portfolios from database.
 
@@ -307,3 +307,161 @@ def display_tabular_view(portfolio: Portfolio, query_service: QueryService):
             st.warning(f"Could not fetch geographic data: {str(e)[:100]}")
 
 
+
+
+def combine_exposures(records, key: str) -> pd.DataFrame:
+    """Sum per-portfolio exposure rows into one row per bucket.
+
+    Weights are recomputed against the combined market value, since
+    per-portfolio weights do not add up across portfolios.
+
+    Args:
+        records: Records from a *_multi exposure query (with a portfolio column)
+        key: Bucket column, e.g. 'sector' or 'country_code'
+
+    Returns:
+        DataFrame with key, total_exposure, total_weight and num_positions
+    """
+    df = pd.DataFrame([dict(record) for record in records])
+    if df.empty:
+        return pd.DataFrame(columns=[key, "total_exposure", "total_weight", "num_positions"])
+    combined = (
+        df.groupby(key, dropna=False)[["total_exposure", "num_positions"]]
+        .sum(min_count=1)
+        .reset_index()
+        .sort_values("total_exposure", ascending=False)
+    )
+    total = combined["total_exposure"].sum()
+    combined["total_weight"] = combined["total_exposure"] / total * 100 if total else 0.0
+    return combined
+
+
+def _display_multi_positions(title: str, records) -> None:
+    """Show a drill-down table of positions with a Portfolio column."""
+    df = pd.DataFrame([dict(record) for record in records])
+    df["ticker"] = df["ticker"].apply(lambda t: t if pd.notnull(t) and t != "" else "Bond")
+    df["market_value"] = df["market_value"].apply(lambda x: f"${x:,.2f}" if pd.notnull(x) else "N/A")
+    df["weight"] = df["weight"].apply(lambda x: f"{x:.2f}%" if pd.notnull(x) else "0.00%")
+    df = df.rename(columns={
+        'portfolio': 'Portfolio',
+        'ticker': 'Security',
+        'company': 'Company',
+        'quantity': 'Quantity',
+        'market_value': 'Market Value',
+        'weight': 'Weight'
+    })
+    st.write(f"**{title}**")
+    st.dataframe(df, use_container_width=True, hide_index=True)
+
+
+def _display_multi_exposure(
+    label: str, key: str, result, portfolio_names, drilldown, select_key: str
+) -> None:
+    """Combined exposure table, stacked bar chart and drill-down for one dimension.
+
+    Args:
+        label: Dimension label, e.g. 'Sector'
+        key: Bucket column in the records
+        result: QueryResult from a *_multi exposure query
+        portfolio_names: Selected portfolios
+        drilldown: Callable(portfolio_names, bucket) returning position records
+        select_key: Streamlit widget key for the bucket selector
+    """
+    if not result or not result.records:
+        st.info(f"No {label.lower()} data. Portfolios may not be enriched with FactSet data yet.")
+        return
+
+    combined = combine_exposures(result.records, key)
+    display_df = combined.drop(columns=["num_positions"]).copy()
+    display_df["total_exposure"] = display_df["total_exposure"].apply(lambda x: f"${x:,.2f}" if pd.notnull(x) else "$0.00")
+    display_df["total_weight"] = display_df["total_weight"].apply(lambda x: f"{x:.2f}%" if pd.notnull(x) else "0.00%")
+    display_df = display_df.rename(columns={key: label, 'total_exposure': 'Exposure', 'total_weight': 'Weight'})
+    st.write(f"**{label} Breakdown**")
+    st.dataframe(_pad_dataframe_to_height(display_df, max_rows=10), use_container_width=True, hide_index=True)
+
+    # Bars stack per portfolio, so each bar's height is the combined exposure
+    fig = px.bar(
+        pd.DataFrame([dict(record) for record in result.records]),
+        x=key,
+        y='total_exposure',
+        color='portfolio',
+        title=f'Exposure by {label}',
+        labels={'total_exposure': 'Market Exposure ($)', key: label, 'portfolio': 'Portfolio'}
+    )
+    fig.update_layout(height=400, barmode='stack', xaxis={'categoryorder': 'total descending'})
+    st.plotly_chart(fig, use_container_width=True)
+
+    buckets = sorted(combined[key].dropna().unique().tolist())
+    selected = st.selectbox(f"Select {label} to View Positions", buckets, key=select_key)
+    if selected:
+        positions = drilldown(portfolio_names, selected)
+        if positions and positions.records:
+            _display_multi_positions(f"Positions in {selected}", positions.records)
+        else:
+            st.info(f"No positions found in {selected}.")
+
+
+def display_combined_tabular_view(portfolio_names, query_service: QueryService):
+    """Display positions and exposures combined across several portfolios.
+
+    Each section is a single query over all selected portfolios.
+
+    Args:
+        portfolio_names: Selected portfolio names
+        query_service: Query service
+    """
+    st.subheader("Positions")
+    try:
+        positions = query_service.positions_multi(portfolio_names)
+        if positions.records:
+            df = pd.DataFrame([dict(record) for record in positions.records])
+            total_value = df["market_value"].sum()
+            col1, col2, col3 = st.columns(3)
+            col1.metric("Total Market Value", f"${total_value:,.2f}")
+            col2.metric("Positions", len(df))
+            col3.metric("Portfolios", df["portfolio"].nunique())
+
+            df["security"] = [
+                ticker or (f"{cusip} (Bond)" if cusip else f"{isin} (Bond)" if isin else "Unknown")
+                for ticker, cusip, isin in zip(df["ticker"], df["cusip"], df["isin"])
+            ]
+            display_df = pd.DataFrame({
+                "Portfolio": df["portfolio"],
+                "Security": df["security"],
+                "Type": df["security_type"].fillna("Unknown"),
+                "Quantity": df["quantity"],
+                "Book Value": df["book_value"].apply(lambda x: f"${x:,.2f}" if pd.notnull(x) else "N/A"),
+                "Market Value (Last Close)": df["market_value"].apply(lambda x: f"${x:,.2f}" if pd.notnull(x) else "N/A"),
+                "Weight (%)": df["weight"].apply(lambda x: f"{x:.2f}%" if pd.notnull(x) and x else "N/A"),
+            })
+            st.dataframe(display_df, use_container_width=True, hide_index=True)
+        else:
+            st.info("No positions to display")
+    except Exception as e:
+        error = UIRenderError(str(e), component="Positions Table")
+        error.log_error()
+        st.error(f"❌ Error displaying positions: {error.message}")
+
+    col1, col2 = st.columns([1, 1])
+
+    with col1:
+        st.subheader("Sector Exposure")
+        try:
+            _display_multi_exposure(
+                "Sector", "sector", query_service.sector_exposure_multi(portfolio_names),
+                portfolio_names, query_service.sector_positions_multi, "multi_sector_select",
+            )
+        except Exception as e:
+            logger.error(f"Error displaying combined sector exposure: {e}")
+            st.warning(f"Could not fetch sector data: {str(e)[:100]}")
+
+    with col2:
+        st.subheader("Geographic Exposure")
+        try:
+            _display_multi_exposure(
+                "Country", "country_code", query_service.country_breakdown_multi(portfolio_names),
+                portfolio_names, query_service.country_positions_multi, "multi_country_select",
+            )
+        except Exception as e:
+            logger.error(f"Error displaying combined geographic exposure: {e}")
+            st.warning(f"Could not fetch geographic data: {str(e)[:100]}")
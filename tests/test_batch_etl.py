@@ -0,0 +1,133 @@
+"""Tests for batch ETL over many portfolio files and the pagr CLI."""
+
+import json
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from pagr import cli
+from pagr.fds.graph.builder import GraphBuilder
+from pagr.fds.loaders.portfolio_loader import PortfolioLoader
+from pagr.fds.models.fibo import Stock
+from pagr.fds.services.batch import BatchPipeline, BatchResult, discover_portfolio_files, unique_positions
+from pagr.fds.services.pipeline import ETLPipeline
+from pagr.fds.services.pricing import empty_price_table
+from pagr.fds.enrichers.hierarchy_crawler import HierarchyResult
+
+
+@pytest.fixture
+def portfolio_dir(tmp_path):
+    """Two overlapping portfolios and a file that is not a portfolio."""
+    (tmp_path / "acct_a.csv").write_text("ticker,quantity,book_value\nAAPL,10,1000\nMSFT,5,500\n")
+    (tmp_path / "acct_b.csv").write_text("ticker,quantity,book_value\nAAPL,20,2000\nNVDA,1,100\n")
+    (tmp_path / "notes.md").write_text("not a portfolio")
+    return tmp_path
+
+
+def make_pipeline():
+    """Pipeline with real loader and builder and mocked FactSet enrichment."""
+    pipeline = ETLPipeline(
+        MagicMock(), PortfolioLoader(), GraphBuilder(),
+        hierarchy_crawler=MagicMock(), price_fetcher=MagicMock(errors=[]),
+    )
+    pipeline.price_fetcher.fetch.return_value = empty_price_table()
+    pipeline.enrich_positions = MagicMock(side_effect=lambda positions: (
+        {p.ticker: Stock(fibo_id=f"fibo:stock:{p.ticker}", ticker=p.ticker, security_type="Common Stock")
+         for p in positions},
+        {}, {}, {}, {},
+    ))
+    pipeline.enrich_hierarchies = MagicMock(return_value=HierarchyResult())
+    return pipeline
+
+
+class TestDiscovery:
+    """Test expansion of directories and manifests."""
+
+    def test_directory_and_manifest(self, portfolio_dir, tmp_path):
+        """Directories yield supported files; manifests resolve relative paths and skip comments."""
+        manifest = tmp_path / "accounts.txt"
+        manifest.write_text("# overnight\nacct_b.csv\n\nacct_a.csv  # primary\n")
+
+        assert [p.rsplit("/", 1)[-1] for p in discover_portfolio_files([str(portfolio_dir)])] == [
+            "acct_a.csv", "acct_b.csv",
+        ]
+        assert discover_portfolio_files([str(manifest)]) == [
+            str(tmp_path / "acct_b.csv"), str(tmp_path / "acct_a.csv"),
+        ]
+
+    def test_missing_source(self, tmp_path):
+        """Unknown sources raise FileNotFoundError."""
+        with pytest.raises(FileNotFoundError):
+            discover_portfolio_files([str(tmp_path / "missing.csv")])
+
+
+class TestBatchPipeline:
+    """Test shared enrichment and graph statements."""
+
+    def test_enriches_union_once(self, portfolio_dir):
+        """Shared identifiers are priced and enriched once; every portfolio gets its holdings."""
+        pipeline = make_pipeline()
+        files = discover_portfolio_files([str(portfolio_dir)]) + [str(portfolio_dir / "missing.csv")]
+
+        result = BatchPipeline(pipeline).execute(files)
+
+        pipeline.enrich_positions.assert_called_once()
+        [enriched] = pipeline.enrich_positions.call_args.args
+        assert sorted(p.ticker for p in enriched) == ["AAPL", "MSFT", "NVDA"]
+        pipeline.price_fetcher.fetch.assert_called_once()
+        pipeline.enrich_hierarchies.assert_called_once()
+
+        assert [item.positions for item in result.items] == [2, 2, 0]
+        assert result.failed[0].path.endswith("missing.csv")
+        assert result.unique_identifiers == 3
+        assert result.stats.portfolios_loaded == 2
+
+        statements = result.statements
+        assert sum(s.startswith("MERGE (s:Stock {fibo_id: 'fibo:stock:AAPL'})") for s in statements) == 1
+        assert sum("MERGE (pos)-[:INVESTED_IN]->(s)" in s for s in statements) == 4
+        assert all(
+            any(f"MATCH (a:ExposureAggregate {{portfolio: '{name}'}})" in s for s in statements)
+            for name in ("acct_a", "acct_b")
+        )
+
+    def test_report_is_json(self, portfolio_dir):
+        """The report serializes per-portfolio outcomes and totals."""
+        result = BatchPipeline(make_pipeline()).execute(discover_portfolio_files([str(portfolio_dir)]))
+
+        report = json.loads(json.dumps(result.to_dict()))
+
+        assert report["portfolios_failed"] == 0
+        assert report["stats"]["positions_loaded"] == 4
+        assert report["statements"] == len(result.statements)
+
+    def test_unique_positions(self, portfolio_dir):
+        """Positions dedupe by primary identifier, keeping the first."""
+        loader = PortfolioLoader()
+        positions = [p for f in sorted(portfolio_dir.glob("*.csv")) for p in loader.load(str(f)).positions]
+
+        assert [p.quantity for p in unique_positions(positions)] == [10, 5, 1]
+
+
+class TestCli:
+    """Test the pagr console entry point."""
+
+    def test_etl_writes_report(self, portfolio_dir, tmp_path):
+        """pagr etl runs the batch through ETLManager and writes the report."""
+        report_path = tmp_path / "report.json"
+        manager = MagicMock()
+        manager.process_batch.return_value = BatchResult(portfolios=[MagicMock()])
+
+        with patch("pagr.etl_manager.ETLManager", return_value=manager):
+            code = cli.main(["etl", str(portfolio_dir), "--clear", "--report", str(report_path)])
+
+        assert code == cli.EXIT_OK
+        files = manager.process_batch.call_args.args[0]
+        assert len(files) == 2
+        assert manager.process_batch.call_args.kwargs["clear"] is True
+        assert json.loads(report_path.read_text())["portfolios_failed"] == 0
+
+    def test_no_files(self, tmp_path):
+        """An empty directory fails without touching the database."""
+        with patch("pagr.etl_manager.ETLManager") as manager:
+            assert cli.main(["etl", str(tmp_path)]) == cli.EXIT_FAILED
+        manager.assert_not_called()
@@ -0,0 +1,127 @@
+"""Tests for vectorized bond analytics."""
+
+import time
+from datetime import date
+from unittest.mock import MagicMock
+
+import numpy as np
+import pytest
+
+from pagr.fds.graph.queries import GraphQueries
+from pagr.fds.services.bond_analytics import (
+    ANALYTICS_COLUMNS,
+    BondAnalyticsService,
+    bond_analytics,
+    cash_flow_schedule,
+)
+
+SETTLEMENT = date(2025, 6, 15)
+
+
+def dirty_price(coupon, maturity, ytm, settlement=SETTLEMENT):
+    """Reference dirty price from the schedule at a given yield (%)."""
+    schedule = cash_flow_schedule([coupon], [maturity], settlement)
+    base = 1 + ytm / 100 / 2
+    return float((schedule.amounts * base ** -schedule.periods).sum())
+
+
+class TestCashFlowSchedule:
+    """Test schedule generation."""
+
+    def test_on_coupon_date(self):
+        """A 10y bond settling on a coupon date has 20 full periods and no accrual."""
+        schedule = cash_flow_schedule([5.0], ["2035-06-15"], SETTLEMENT)
+
+        assert schedule.periods[0].tolist() == list(np.arange(1.0, 21.0))
+        assert schedule.amounts[0, :-1].tolist() == [2.5] * 19
+        assert schedule.amounts[0, -1] == 102.5
+        assert schedule.accrued_fraction[0] == 0.0
+
+    def test_mid_period_and_padding(self):
+        """Bonds of different lengths share one padded matrix."""
+        schedule = cash_flow_schedule([4.0, 6.0, None], ["2026-09-15", "2025-12-15", "2030-01-01"], SETTLEMENT)
+
+        # 15 Jun -> 15 Sep is half a semiannual period
+        assert schedule.periods[0, :3].tolist() == [0.5, 1.5, 2.5]
+        assert schedule.accrued_fraction[0] == 0.5
+        assert schedule.amounts[1].tolist() == [103.0, 0.0, 0.0]
+        assert schedule.valid.tolist() == [True, True, False]
+
+
+class TestBondAnalytics:
+    """Test yield, duration and convexity."""
+
+    def test_par_bond(self):
+        """A bond priced at par on a coupon date yields its coupon."""
+        result = bond_analytics([5.0], ["2035-06-15"], [100.0], SETTLEMENT)
+
+        row = result.iloc[0]
+        assert row["ytm"] == pytest.approx(5.0, abs=1e-9)
+        assert row["accrued_interest"] == 0.0
+        assert row["modified_duration"] == pytest.approx(7.7946, abs=1e-4)
+        bump = 0.01
+        up = dirty_price(5.0, "2035-06-15", 5.0 + bump)
+        down = dirty_price(5.0, "2035-06-15", 5.0 - bump)
+        assert row["convexity"] == pytest.approx((up + down - 200.0) / (100.0 * (bump / 100) ** 2), rel=1e-4)
+
+    def test_yield_reprices_bond(self):
+        """The solved yield reproduces the dirty price; duration matches a bump."""
+        result = bond_analytics([4.0], ["2031-09-15"], [96.0], SETTLEMENT)
+        row = result.iloc[0]
+
+        assert row["accrued_interest"] == pytest.approx(1.0)
+        assert row["dirty_price"] == pytest.approx(97.0)
+        assert dirty_price(4.0, "2031-09-15", row["ytm"]) == pytest.approx(97.0, abs=1e-9)
+
+        bump = 0.01
+        up = dirty_price(4.0, "2031-09-15", row["ytm"] + bump)
+        down = dirty_price(4.0, "2031-09-15", row["ytm"] - bump)
+        assert row["modified_duration"] == pytest.approx((down - up) / (2 * 97.0 * bump / 100), rel=1e-5)
+        assert row["dv01"] == pytest.approx((down - up) / 2, rel=1e-4)
+
+    def test_invalid_rows_are_nan(self):
+        """Missing coupon, missing price and matured bonds yield NaN rows."""
+        result = bond_analytics(
+            [5.0, None, 5.0, 5.0], ["2030-06-15", "2030-06-15", "2020-01-01", "2030-06-15"],
+            [100.0, 100.0, 100.0, None], SETTLEMENT,
+        )
+
+        assert list(result.columns) == ANALYTICS_COLUMNS
+        assert result["ytm"].notna().tolist() == [True, False, False, False]
+
+    def test_thousands_of_bonds(self):
+        """Thousands of bonds solve together in well under a second."""
+        rng = np.random.default_rng(0)
+        n = 5000
+        coupons = rng.uniform(0, 8, n)
+        maturities = [f"{y}-{m:02d}-15" for y, m in zip(rng.integers(2026, 2055, n), rng.integers(1, 13, n))]
+        prices = rng.uniform(70, 120, n)
+
+        started = time.perf_counter()
+        result = bond_analytics(coupons, maturities, prices, SETTLEMENT)
+        elapsed = time.perf_counter() - started
+
+        assert result["ytm"].notna().all()
+        assert elapsed < 1.0
+
+
+class TestBondAnalyticsService:
+    """Test write-back to Bond nodes."""
+
+    def test_writes_analytics(self):
+        """Analytics are written with one UNWIND statement; unusable bonds are skipped."""
+        graph = MagicMock()
+        graph.execute_query.return_value = [
+            {"fibo_id": "fibo:bond:A", "coupon": 5.0, "maturity_date": "2035-06-15", "market_price": 100.0},
+            {"fibo_id": "fibo:bond:B", "coupon": 5.0, "maturity_date": "2020-06-15", "market_price": 100.0},
+        ]
+
+        updated = BondAnalyticsService(graph).refresh(settlement=SETTLEMENT)
+
+        assert updated == 1
+        query, params = graph.execute_query.call_args.args
+        assert query == GraphQueries.update_bond_analytics()
+        [row] = params["rows"]
+        assert row["fibo_id"] == "fibo:bond:A"
+        assert row["as_of"] == "2025-06-15"
+        assert row["ytm"] == pytest.approx(5.0)
@@ -0,0 +1,136 @@
+"""Tests for Parquet/Arrow portfolio input and output."""
+
+from unittest.mock import MagicMock
+
+import pandas as pd
+import pytest
+
+pa = pytest.importorskip("pyarrow")
+import pyarrow.ipc as ipc  # noqa: E402
+import pyarrow.parquet as pq  # noqa: E402
+
+from pagr.fds.loaders.portfolio_loader import PortfolioLoader, PortfolioLoaderError  # noqa: E402
+from pagr.fds.loaders.portfolio_writer import PortfolioWriter  # noqa: E402
+from pagr.fds.models.portfolio import Portfolio, Position  # noqa: E402
+from pagr.portfolio_manager import PortfolioManager  # noqa: E402
+
+
+def sample_table():
+    """Typed Arrow table as produced by an upstream warehouse."""
+    return pa.table(
+        {
+            "Ticker": ["AAPL-US", None],
+            "Quantity": pa.array([100, 500], type=pa.int64()),
+            "Book Value": [19000.0, 50000.0],
+            "Security Type": ["Common Stock", "Corporate Bond"],
+            "ISIN": ["US0378331005", "US037833AA56"],
+            "CUSIP": [None, "037833AA5"],
+        }
+    )
+
+
+def sample_portfolio():
+    """Enriched portfolio with market values and weights."""
+    portfolio = Portfolio(name="Growth")
+    portfolio.add_position(Position(ticker="AAPL-US", quantity=10, book_value=1500.0, market_value=2000.0))
+    portfolio.add_position(Position(isin="US037833AA56", cusip="037833AA5", quantity=5,
+                                    book_value=5000.0, security_type="Corporate Bond"))
+    return portfolio
+
+
+class TestColumnarLoad:
+    """Test PortfolioLoader Parquet/Arrow input."""
+
+    @pytest.mark.parametrize("suffix", [".parquet", ".arrow", ".feather"])
+    def test_load_typed_file(self, tmp_path, suffix):
+        """Typed columnar files load to the same positions as CSV."""
+        path = tmp_path / f"Warehouse{suffix}"
+        if suffix == ".parquet":
+            pq.write_table(sample_table(), path)
+        else:
+            with ipc.new_file(str(path), sample_table().schema) as writer:
+                writer.write_table(sample_table())
+
+        portfolio = PortfolioLoader.load(str(path))
+
+        assert portfolio.name == "Warehouse"
+        assert [p.get_primary_identifier() for p in portfolio.positions] == [
+            ("isin", "US0378331005"),
+            ("cusip", "037833AA5"),
+        ]
+        assert portfolio.positions[0].quantity == 100.0
+        assert portfolio.total_value == 69000.0
+
+    def test_arrow_stream_format(self, tmp_path):
+        """Arrow IPC streams are accepted as well as IPC files."""
+        path = tmp_path / "stream.arrow"
+        with ipc.new_stream(str(path), sample_table().schema) as writer:
+            writer.write_table(sample_table())
+
+        assert len(PortfolioLoader.load(str(path)).positions) == 2
+
+    def test_typed_values_validated(self, tmp_path):
+        """Numeric columns are validated without a text round trip."""
+        path = tmp_path / "bad.parquet"
+        table = sample_table().set_column(1, "Quantity", pa.array([100, -1], type=pa.int64()))
+        pq.write_table(table, path)
+
+        with pytest.raises(PortfolioLoaderError, match="Row 3: Quantity must be positive"):
+            PortfolioLoader.load(str(path))
+
+    def test_unsupported_extension(self, tmp_path):
+        """Unknown extensions list the supported formats."""
+        path = tmp_path / "portfolio.xlsx"
+        path.write_bytes(b"")
+
+        with pytest.raises(PortfolioLoaderError, match=r"Expected: .*\.parquet"):
+            PortfolioLoader.load(str(path))
+
+
+class TestPortfolioWriter:
+    """Test PortfolioWriter output."""
+
+    def test_frame_includes_enrichment(self):
+        """Exported frames carry position IDs, market values and weights."""
+        portfolio = sample_portfolio()
+
+        frame = PortfolioWriter.to_frame(portfolio)
+
+        assert list(frame.columns) == PortfolioWriter.COLUMNS
+        assert frame["position_id"].tolist() == [
+            p.get_position_id("Growth") for p in portfolio.positions
+        ]
+        assert frame["market_value"].tolist()[0] == 2000.0
+        assert pd.isna(frame["market_value"].tolist()[1])
+        assert frame["weight"].tolist() == [100.0, 0.0]
+
+    @pytest.mark.parametrize("fmt", sorted(PortfolioWriter.SUPPORTED_FORMATS))
+    def test_round_trip(self, tmp_path, fmt):
+        """Written files load back to the same positions and name."""
+        portfolio = sample_portfolio()
+        path = PortfolioWriter.write(portfolio, str(tmp_path / f"export.{fmt}"))
+
+        loaded = PortfolioLoader.load(str(path))
+
+        # CSV has nowhere to keep the name, so it falls back to the file stem
+        assert loaded.name == ("export" if fmt == "csv" else "Growth")
+        assert [p.model_dump() for p in loaded.positions] == [
+            p.model_dump() for p in portfolio.positions
+        ]
+
+    def test_parquet_metadata_names_portfolio(self, tmp_path):
+        """Parquet output records the portfolio name in the schema metadata."""
+        path = PortfolioWriter.write(sample_portfolio(), str(tmp_path / "out.parquet"))
+
+        assert pq.read_schema(path).metadata[b"pagr.portfolio"] == b"Growth"
+
+    def test_export_from_database(self, tmp_path):
+        """PortfolioManager exports a reconstructed portfolio."""
+        manager = PortfolioManager(MagicMock())
+        manager.reconstruct_portfolio_from_database = MagicMock(return_value=sample_portfolio())
+
+        path = manager.export_portfolio("Growth", str(tmp_path / "Growth.parquet"))
+
+        assert pq.read_table(path).num_rows == 2
+        manager.reconstruct_portfolio_from_database = MagicMock(return_value=None)
+        assert manager.export_portfolio("Missing", str(tmp_path / "Missing.parquet")) is None
@@ -0,0 +1,146 @@
+"""Tests for the columnar (pandas) CSV ingest path."""
+
+import tempfile
+from pathlib import Path
+
+import pandas as pd
+import pytest
+
+from pagr.fds.loaders.portfolio_loader import PortfolioLoader, PortfolioLoaderError
+from pagr.fds.loaders.validator import PositionValidator, ValidationError
+from pagr.fds.models.portfolio import Portfolio, Position
+
+
+def write_csv(content: str) -> str:
+    """Write CSV content to a temp file and return its path."""
+    with tempfile.NamedTemporaryFile(mode="w", suffix=".csv", delete=False) as f:
+        f.write(content)
+        return f.name
+
+
+class TestValidateFrame:
+    """Test PositionValidator.validate_frame."""
+
+    def frame(self, rows, columns=("ticker", "isin", "cusip", "quantity", "book_value")):
+        return pd.DataFrame(rows, columns=list(columns), dtype=str)
+
+    def test_collects_all_row_errors(self):
+        """Every invalid row is reported in one error, with file row numbers."""
+        frame = self.frame([
+            ["AAPL-US", "", "", "10", "100"],
+            ["N/A", "null", "", "10", "100"],
+            ["MSFT-US", "", "", "abc", "100"],
+            ["GOOG-US", "", "", "-5", "100"],
+            ["AMZN-US", "", "", "5", "-1"],
+        ])
+
+        with pytest.raises(ValidationError) as exc_info:
+            PositionValidator.validate_frame(frame)
+
+        message = str(exc_info.value)
+        assert "Row 3: Must provide at least one identifier" in message
+        assert "Row 4: Quantity 'abc' is not a valid number" in message
+        assert "Row 5: Quantity must be positive" in message
+        assert "Row 6: Book value cannot be negative" in message
+        assert "Row 2" not in message
+
+    def test_error_report_is_truncated(self):
+        """Large numbers of bad rows are summarized."""
+        frame = self.frame([["", "", "", "1", "1"]] * 50)
+
+        with pytest.raises(ValidationError) as exc_info:
+            PositionValidator.validate_frame(frame)
+
+        assert "... and 30 more invalid rows" in str(exc_info.value)
+
+    def test_normalizes_values(self):
+        """Tickers are uppercased, N/A identifiers dropped, market value backfills book value."""
+        frame = pd.DataFrame(
+            {
+                "ticker": [" aapl-us ", "n/a"],
+                "isin": ["", "US912828Z772"],
+                "cusip": ["N/A", ""],
+                "quantity": ["10", "300"],
+                "book_value": ["", "30000"],
+                "market_value": ["1500", ""],
+            },
+            dtype=str,
+        )
+
+        typed = PositionValidator.validate_frame(frame)
+
+        assert typed["ticker"].tolist() == ["AAPL-US", None]
+        assert typed["cusip"].tolist() == [None, None]
+        assert typed["book_value"].tolist() == [1500.0, 30000.0]
+        assert typed["security_type"].tolist() == ["Common Stock", "Common Stock"]
+
+    def test_duplicates_detected_on_primary_identifier(self):
+        """Duplicate primary identifiers are rejected."""
+        frame = self.frame([
+            ["AAPL-US", "", "", "10", "100"],
+            ["aapl-us", "", "", "5", "50"],
+        ])
+
+        with pytest.raises(ValidationError, match="Duplicate identifiers found: ticker:AAPL-US"):
+            PositionValidator.validate_frame(frame)
+
+
+class TestColumnarLoad:
+    """Test end-to-end loading through the columnar path."""
+
+    def test_load_matches_object_path(self):
+        """Positions and weights match those built through pydantic validation."""
+        path = write_csv(
+            "Ticker,Quantity,Book Value,Security Type,ISIN,CUSIP,Purchase Date\n"
+            "AAPL-US,100,19000.00,Common Stock,US0378331005,,2024-01-02\n"
+            ",500,50000.00,Corporate Bond,US037833AA56,037833AA5,\n"
+        )
+        try:
+            portfolio = PortfolioLoader.load(path, portfolio_name="Test")
+        finally:
+            Path(path).unlink()
+
+        expected = Portfolio(name="Test")
+        expected.add_position(Position(ticker="AAPL-US", quantity=100, book_value=19000.0,
+                                       isin="US0378331005", purchase_date="2024-01-02"))
+        expected.add_position(Position(quantity=500, book_value=50000.0, security_type="Corporate Bond",
+                                       isin="US037833AA56", cusip="037833AA5"))
+
+        assert [p.model_dump() for p in portfolio.positions] == [
+            p.model_dump() for p in expected.positions
+        ]
+        assert portfolio.total_value == expected.total_value
+
+    def test_loaded_positions_behave_like_models(self):
+        """Bulk-constructed positions support assignment and helper methods."""
+        path = write_csv("ticker,quantity,book_value\nAAPL-US,10,100\n")
+        try:
+            portfolio = PortfolioLoader.load(path)
+        finally:
+            Path(path).unlink()
+
+        position = portfolio.positions[0]
+        position.market_value = 150.0
+        portfolio.calculate_weights()
+
+        assert position.get_primary_identifier() == ("ticker", "AAPL-US")
+        assert portfolio.total_value == 150.0
+        assert position.weight == 100.0
+
+    def test_header_only_file(self):
+        """A file with headers but no rows has no positions."""
+        path = write_csv("ticker,quantity,book_value\n")
+        try:
+            with pytest.raises(PortfolioLoaderError, match="No positions found"):
+                PortfolioLoader.load(path)
+        finally:
+            Path(path).unlink()
+
+    def test_empty_file(self):
+        """A completely empty file is rejected."""
+        path = write_csv("")
+        try:
+            with pytest.raises(PortfolioLoaderError, match="empty"):
+                PortfolioLoader.load(path)
+        finally:
+            Path(path).unlink()
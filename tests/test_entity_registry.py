@@ -0,0 +1,134 @@
+"""Tests for the shared entity registry and its use in the pipeline."""
+
+from datetime import datetime, timedelta, timezone
+from unittest.mock import MagicMock, patch
+
+from pagr.fds.graph.builder import GraphBuilder
+from pagr.fds.graph.queries import GraphQueries
+from pagr.fds.models.fibo import Bond, Company, Country, Executive, Stock
+from pagr.fds.models.portfolio import Portfolio, Position
+from pagr.fds.services.entity_registry import BOND, EXECUTIVES, STOCK, EntityRegistry, RegistryEntry
+from pagr.fds.services.pipeline import ETLPipeline
+
+APPLE = Company(fibo_id="fibo:company:AAPL", factset_id="000C7F-E", name="Apple Inc.", ticker="AAPL", country="US")
+US = Country(fibo_id="fibo:country:US", name="US", iso_code="US")
+
+
+def stock_entry(**kwargs):
+    """Registry entry for AAPL."""
+    return RegistryEntry(
+        security=Stock(fibo_id="fibo:stock:AAPL", ticker="AAPL", security_type="Common Stock"),
+        company=APPLE,
+        countries={"US": US},
+        **kwargs,
+    )
+
+
+def make_pipeline(registry):
+    """Pipeline with a mocked FactSet client and a real graph builder."""
+    return ETLPipeline(MagicMock(), MagicMock(), GraphBuilder(), hierarchy_crawler=MagicMock(), entity_registry=registry)
+
+
+class TestEntityRegistry:
+    """Test freshness, persistence and graph membership."""
+
+    def test_stale_entries_are_misses(self):
+        """Entries older than max_age are not returned."""
+        registry = EntityRegistry(max_age_days=1)
+        registry.put(STOCK, "AAPL", stock_entry())
+        registry.put(STOCK, "MSFT", stock_entry(enriched_at=datetime.now(timezone.utc) - timedelta(days=2)))
+
+        assert registry.get(STOCK, "AAPL").company.name == "Apple Inc."
+        assert registry.get(STOCK, "MSFT") is None
+        assert (registry.hits, registry.misses) == (1, 1)
+
+    def test_persists_across_instances(self, tmp_path):
+        """A file-backed registry reloads fresh entries with their models."""
+        path = str(tmp_path / "entities.sqlite")
+        registry = EntityRegistry(path)
+        registry.put(STOCK, "AAPL", stock_entry())
+        registry.put(BOND, "912828Z77", RegistryEntry(security=Bond(fibo_id="fibo:bond:912828Z77", cusip="912828Z77", coupon=1.5)))
+        registry.put(EXECUTIVES, "000C7F-E", RegistryEntry(executives=[Executive(fibo_id="fibo:exec:1", name="Tim Cook")]))
+        registry.close()
+
+        reloaded = EntityRegistry(path)
+
+        assert isinstance(reloaded.get(STOCK, "AAPL").security, Stock)
+        assert reloaded.get(STOCK, "AAPL").countries["US"] == US
+        assert reloaded.get(BOND, "912828Z77").security.coupon == 1.5
+        assert reloaded.get(EXECUTIVES, "000C7F-E").executives[0].name == "Tim Cook"
+
+    def test_sync_from_graph(self):
+        """Graph membership is loaded from entity nodes and cleared with the graph."""
+        graph = MagicMock()
+        graph.execute_query.return_value = [{"fibo_id": "fibo:stock:AAPL"}, {"fibo_id": None}]
+        registry = EntityRegistry()
+
+        assert registry.sync_from_graph(graph) == 1
+        graph.execute_query.assert_called_once_with(GraphQueries.entity_fibo_ids())
+        assert registry.in_graph("fibo:stock:AAPL")
+
+        registry.forget_graph()
+        assert not registry.in_graph("fibo:stock:AAPL")
+
+
+class TestPipelineWithRegistry:
+    """Test that the pipeline reuses fresh entries and links existing nodes."""
+
+    def test_fresh_entries_skip_factset(self):
+        """Registered securities and officers are not enriched again."""
+        registry = EntityRegistry()
+        registry.put(STOCK, "AAPL", stock_entry())
+        registry.put(EXECUTIVES, "000C7F-E", RegistryEntry(executives=[Executive(fibo_id="fibo:exec:1", name="Tim Cook")]))
+        pipeline = make_pipeline(registry)
+
+        with patch("pagr.fds.services.pipeline.CompanyEnricher") as enricher_cls:
+            stocks, bonds, companies, countries, executives = pipeline.enrich_positions(
+                [Position(ticker="AAPL", quantity=10, book_value=1000.0)]
+            )
+
+        enricher = enricher_cls.return_value
+        enricher.enrich_company.assert_not_called()
+        enricher.enrich_executives_bulk.assert_not_called()
+        assert stocks["AAPL"].fibo_id == "fibo:stock:AAPL"
+        assert companies["AAPL"] == APPLE
+        assert countries == {"US": US}
+        assert list(executives) == ["fibo:exec:1"]
+        assert pipeline.stats.entities_reused == 1
+
+    def test_new_identifiers_are_enriched_and_registered(self):
+        """Only unregistered identifiers reach FactSet, and their results are recorded."""
+        registry = EntityRegistry()
+        registry.put(STOCK, "AAPL", stock_entry())
+        pipeline = make_pipeline(registry)
+        msft = Company(fibo_id="fibo:company:MSFT", factset_id="P8R3C2-E", name="Microsoft", ticker="MSFT")
+
+        with patch("pagr.fds.services.pipeline.CompanyEnricher") as enricher_cls:
+            enricher = enricher_cls.return_value
+            enricher.enrich_company.return_value = msft
+            enricher.enrich_executives_bulk.return_value = {"P8R3C2-E": []}
+            pipeline.enrich_positions([
+                Position(ticker="AAPL", quantity=10, book_value=1000.0),
+                Position(ticker="MSFT", quantity=5, book_value=500.0),
+            ])
+
+        enricher.enrich_company.assert_called_once_with("MSFT")
+        # AAPL's officers were never registered, so both issuers are fetched once
+        assert enricher.enrich_executives_bulk.call_args.args[0] == ["000C7F-E", "P8R3C2-E"]
+        assert registry.get(STOCK, "MSFT").company == msft
+        assert registry.get(EXECUTIVES, "P8R3C2-E").executives == []
+
+    def test_existing_nodes_are_linked_not_merged(self):
+        """Nodes known to be in the graph get no MERGE, but positions still link to them."""
+        registry = EntityRegistry()
+        entry = stock_entry()
+        registry.mark_in_graph([entry.security.fibo_id, APPLE.fibo_id, US.fibo_id])
+        pipeline = make_pipeline(registry)
+        portfolio = Portfolio(name="acct")
+        portfolio.add_position(Position(ticker="AAPL", quantity=10, book_value=1000.0))
+
+        statements = pipeline.build_graph(portfolio, {"AAPL": entry.security}, {}, {"AAPL": APPLE}, {"US": US}, {})
+
+        assert not any(s.startswith(("MERGE (s:Stock", "MERGE (c:Company", "MERGE (c:Country")) for s in statements)
+        assert any("fibo:stock:AAPL" in s and "INVESTED_IN" in s for s in statements)
+        assert pipeline.graph_entity_ids == {"fibo:stock:AAPL", "fibo:company:AAPL", "fibo:country:US"}
@@ -0,0 +1,133 @@
+"""Tests for bulk executive enrichment and CEO_OF / LEADS edges."""
+
+from unittest.mock import MagicMock
+
+from pagr.fds.clients.factset_client import FactSetClient
+from pagr.fds.config import FIBOConfig
+from pagr.fds.enrichers.company_enricher import CompanyEnricher
+from pagr.fds.graph.builder import GraphBuilder
+from pagr.fds.models.fibo import Company, Executive
+from pagr.fds.models.portfolio import Portfolio, Position
+from pagr.fds.services.pipeline import ETLPipeline
+
+
+OFFICERS = {
+    "AAPL-E": [
+        {"name": "Tim Cook", "title": "Chief Executive Officer"},
+        {"name": "Kevan Parekh", "title": "Chief Financial Officer"},
+    ],
+    "MSFT-E": [{"name": "Satya Nadella", "title": "Chairman & Chief Executive Officer"}],
+}
+
+
+def officers_response(ids):
+    """Fake profiles response tagged with requestId."""
+    return {
+        "data": [
+            dict(officer, requestId=entity_id)
+            for entity_id in ids
+            for officer in OFFICERS.get(entity_id, [])
+        ]
+    }
+
+
+class TestBulkExecutiveEnrichment:
+    """Test CompanyEnricher bulk fetch."""
+
+    def setup_method(self):
+        """Setup mock client."""
+        self.client = MagicMock(spec=FactSetClient)
+        self.client.get_company_officers.side_effect = officers_response
+        self.enricher = CompanyEnricher(self.client)
+
+    def test_bulk_groups_by_request_id(self):
+        """Officers are attributed to the entity that requested them."""
+        result = self.enricher.enrich_executives_bulk(["AAPL-E", "MSFT-E", "AAPL-E"])
+
+        self.client.get_company_officers.assert_called_once_with(["AAPL-E", "MSFT-E"])
+        assert [e.name for e in result["AAPL-E"]] == ["Tim Cook", "Kevan Parekh"]
+        assert result["MSFT-E"][0].company_fibo_id == "fibo:company:MSFT-E"
+        assert result["MSFT-E"][0].fibo_id == "fibo:person:MSFT-E:satya-nadella"
+
+    def test_bulk_batches_requests(self):
+        """Entity IDs are split across batch_size-limited requests."""
+        self.enricher.enrich_executives_bulk(["A", "B", "C"], batch_size=2)
+
+        assert self.client.get_company_officers.call_count == 2
+
+    def test_bulk_skips_failed_batch(self):
+        """A failing batch leaves the other batches intact."""
+        self.client.get_company_officers.side_effect = [
+            Exception("boom"),
+            officers_response(["MSFT-E"]),
+        ]
+
+        result = self.enricher.enrich_executives_bulk(["AAPL-E", "MSFT-E"], batch_size=1)
+
+        assert result["AAPL-E"] == []
+        assert len(result["MSFT-E"]) == 1
+
+    def test_get_ceo_uses_prefetched_executives(self):
+        """get_ceo makes no request when executives are supplied."""
+        executives = self.enricher.enrich_executives_bulk(["AAPL-E"])["AAPL-E"]
+        self.client.get_company_officers.reset_mock()
+
+        ceo = self.enricher.get_ceo("AAPL-E", executives)
+
+        assert ceo.name == "Tim Cook"
+        self.client.get_company_officers.assert_not_called()
+
+
+class TestExecutiveGraphEdges:
+    """Test executives are linked to companies in the graph."""
+
+    def test_pipeline_fetches_officers_once_by_entity_id(self):
+        """All stock issuers are resolved before a single officers request."""
+        client = MagicMock(spec=FactSetClient)
+        client.get_company_profile.side_effect = lambda tickers: {
+            "data": [{"fsymId": tickers[0].split("-")[0] + "-E", "name": tickers[0]}]
+        }
+        client.get_company_officers.side_effect = officers_response
+        pipeline = ETLPipeline(
+            factset_client=client,
+            portfolio_loader=MagicMock(),
+            graph_builder=GraphBuilder(),
+            fibo_config=FIBOConfig(fetch_subsidiaries=False),
+        )
+
+        positions = [
+            Position(ticker="AAPL-US", quantity=1, book_value=1.0),
+            Position(ticker="MSFT-US", quantity=1, book_value=1.0),
+        ]
+        _, _, _, _, executives = pipeline.enrich_positions(positions)
+
+        client.get_company_officers.assert_called_once_with(["AAPL-E", "MSFT-E"])
+        assert len(executives) == 3
+        assert pipeline.stats.executives_enriched == 3
+
+    def test_build_graph_emits_ceo_and_leads(self):
+        """CEOs get CEO_OF edges and other officers get LEADS edges."""
+        pipeline = ETLPipeline(
+            factset_client=MagicMock(spec=FactSetClient),
+            portfolio_loader=MagicMock(),
+            graph_builder=GraphBuilder(),
+        )
+        portfolio = Portfolio(name="Test")
+        portfolio.add_position(Position(ticker="AAPL-US", quantity=1, book_value=1.0))
+        company = Company(fibo_id="fibo:company:AAPL-E", factset_id="AAPL-E", name="Apple")
+        executives = {
+            e.fibo_id: e
+            for e in [
+                Executive(fibo_id="fibo:person:AAPL-E:tim-cook", name="Tim Cook",
+                          title="Chief Executive Officer", company_fibo_id=company.fibo_id),
+                Executive(fibo_id="fibo:person:AAPL-E:cfo", name="CFO",
+                          title="Chief Financial Officer", company_fibo_id=company.fibo_id),
+            ]
+        }
+
+        statements = pipeline.build_graph(portfolio, {}, {}, {"AAPL-US": company}, {}, executives)
+
+        ceo = [s for s in statements if "CEO_OF" in s and "MERGE (e)" in s]
+        leads = [s for s in statements if "LEADS" in s]
+        assert len(ceo) == 1 and "tim-cook" in ceo[0]
+        assert len(leads) == 1 and "cfo" in leads[0]
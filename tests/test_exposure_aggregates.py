@@ -0,0 +1,115 @@
+"""Tests for materialized exposure aggregates."""
+
+from unittest.mock import Mock
+
+from pagr.fds.graph.builder import GraphBuilder
+from pagr.fds.graph.queries import GraphQueries, QueryService
+
+
+class TestAggregateStatements:
+    """Test the Cypher that maintains ExposureAggregate nodes."""
+
+    def test_refresh_drops_then_rebuilds_each_kind(self):
+        """Refresh deletes old aggregates first, then writes sector/country/issuer rows."""
+        statements = GraphQueries.refresh_exposure_aggregates("Growth")
+
+        assert len(statements) == 5
+        assert "DETACH DELETE a" in statements[0]
+        assert "portfolio: 'Growth'" in statements[0]
+        assert "kind: 'sector'" in statements[1]
+        assert "kind: 'country'" in statements[2]
+        assert "HEADQUARTERED_IN" in statements[2]
+        assert "kind: 'issuer'" in statements[3]
+        assert "p.position_count" in statements[4]
+
+    def test_refresh_all_portfolios(self):
+        """Passing no portfolio name refreshes every portfolio."""
+        statements = GraphQueries.refresh_exposure_aggregates()
+
+        assert statements[0].startswith("MATCH (a:ExposureAggregate) ")
+        assert all("{name:" not in stmt for stmt in statements)
+
+    def test_refresh_escapes_portfolio_name(self):
+        """Quotes in portfolio names must not break the Cypher literal."""
+        statements = GraphQueries.refresh_exposure_aggregates("O'Neil Fund")
+
+        assert "O''Neil Fund" in statements[0]
+
+    def test_read_queries_do_not_traverse_positions(self):
+        """Dashboard reads must hit aggregate rows, not Position nodes."""
+        for query in (
+            GraphQueries.sector_exposure_aggregate("Growth"),
+            GraphQueries.country_breakdown_aggregate("Growth"),
+            GraphQueries.executive_lookup_aggregate("Growth"),
+        ):
+            assert "ExposureAggregate" in query
+            assert "Position" not in query
+
+    def test_builder_appends_aggregates_after_relationships(self):
+        """GraphBuilder emits aggregate statements with the relationship batch."""
+        builder = GraphBuilder()
+        builder.add_ceo_of_relationships({"fibo:person:x": "fibo:company:y"})
+        builder.add_exposure_aggregates("Growth")
+
+        statements = builder.get_all_statements()
+        assert "CEO_OF" in statements[0]
+        assert "DETACH DELETE a" in statements[1]
+
+
+class TestAggregateQueryService:
+    """Test QueryService reads aggregates with a live fallback."""
+
+    def setup_method(self):
+        """Setup mock graph client."""
+        self.mock_client = Mock()
+        self.query_service = QueryService(self.mock_client)
+
+    def test_sector_exposure_reads_aggregates(self):
+        """Only one query is issued when aggregates exist."""
+        self.mock_client.execute_query.return_value = [
+            {"sector": "Technology", "total_exposure": 100.0, "total_weight": 50.0, "num_positions": 2},
+        ]
+
+        result = self.query_service.sector_exposure("Growth")
+
+        assert result.records[0]["sector"] == "Technology"
+        assert self.mock_client.execute_query.call_count == 1
+        assert "ExposureAggregate" in self.mock_client.execute_query.call_args[0][0]
+
+    def test_country_breakdown_falls_back_to_live_query(self):
+        """Portfolios without aggregates are served by the traversal query."""
+        live_records = [
+            {"country_code": "US", "country": "United States", "total_exposure": 10.0,
+             "total_weight": 100.0, "num_positions": 1},
+        ]
+        # No aggregate rows, and no aggregated_at stamp on the portfolio
+        self.mock_client.execute_query.side_effect = [[], [], live_records]
+
+        result = self.query_service.country_breakdown("Legacy")
+
+        assert result.records == live_records
+        assert self.mock_client.execute_query.call_args_list[1][0] == (
+            GraphQueries.aggregated_portfolios(), {"names": ["Legacy"]}
+        )
+        live_cypher = self.mock_client.execute_query.call_args_list[2][0][0]
+        assert "HEADQUARTERED_IN" in live_cypher
+
+    def test_aggregated_portfolio_with_no_rows_is_not_traversed(self):
+        """An aggregated portfolio without CEOs (e.g. all bonds) keeps its empty result."""
+        self.mock_client.execute_query.side_effect = [[], [{"name": "Bonds"}]]
+
+        result = self.query_service.executive_lookup("Bonds")
+
+        assert result.records == []
+        assert self.mock_client.execute_query.call_count == 2
+
+    def test_refresh_exposure_aggregates_executes_all_statements(self):
+        """Refreshing runs every maintenance statement in order, in one transaction."""
+        self.query_service.refresh_exposure_aggregates("Growth")
+
+        [call] = self.mock_client.execute_transactions.call_args_list
+        statements = call.args[0]
+        assert call.kwargs == {"batch_size": len(statements)}
+        assert statements[:4] == GraphQueries.refresh_exposure_aggregates("Growth")[:4]
+        assert "p.aggregated_at" in statements[4]
+        self.mock_client.execute_query.assert_not_called()
@@ -0,0 +1,125 @@
+"""Tests for the FI analytics calculations client against the local stand-in server."""
+
+from unittest.mock import MagicMock
+
+import pytest
+
+from pagr.fds.clients.factset_client import FactSetClientError
+from pagr.fds.clients.fi_analytics_client import FIAnalyticsClient, _max_age
+from pagr.fds.clients.fi_analytics_stub import FIAnalyticsStubServer
+
+CALCS = ["Effective Duration", "Yield To Worst"]
+PRICES = {"037833AA5": 98.5, "912828Z77": 101.25, "594918BP8": 95.0}
+
+
+def make_client(server, **kwargs):
+    """Client pointed at the stub, polling fast."""
+    kwargs.setdefault("poll_interval", 0.01)
+    return FIAnalyticsClient("user", "key", base_url=server.base_url, **kwargs)
+
+
+@pytest.fixture
+def server():
+    with FIAnalyticsStubServer(pending_polls=2) as stub:
+        yield stub
+
+
+class TestFIAnalyticsClient:
+    """Test submission, polling, batching and caching."""
+
+    def test_polls_until_complete(self, server):
+        """Jobs answered with 202 are polled to completion and results parsed."""
+        client = make_client(server)
+
+        rows = {row["symbol"]: row for row in client.calculate(PRICES, CALCS, "20251201")}
+
+        assert set(rows) == set(PRICES)
+        assert rows["037833AA5"]["Effective Duration"] == server.value("037833AA5", 98.5, "Effective Duration")
+        assert rows["037833AA5"]["as_of_date"] == "20251201"
+        assert all(job["polls"] == 3 for job in server.jobs.values())
+
+    def test_batches_and_waits_concurrently(self, server):
+        """A sleeve larger than batch_size is split into jobs polled together."""
+        client = make_client(server, batch_size=2)
+
+        rows = list(client.calculate(PRICES, CALCS, "20251201", discount_curve="UST"))
+
+        assert len(rows) == 3
+        assert [len(r["securities"]) for r in server.requests] == [2, 1]
+        assert server.requests[0]["securities"][0]["discountCurve"] == "UST"
+
+    def test_cache_per_bond_date_and_curve(self, server):
+        """Repeat requests are served from cache; a new curve or date recalculates."""
+        client = make_client(server)
+        list(client.calculate(PRICES, CALCS, "20251201"))
+
+        list(client.calculate(PRICES, CALCS, "20251201"))
+        assert len(server.requests) == 1
+
+        list(client.calculate({"037833AA5": 98.5}, CALCS, "20251201", discount_curve="UST"))
+        list(client.calculate({"037833AA5": 98.5}, CALCS, "20251202"))
+        assert [len(r["securities"]) for r in server.requests] == [3, 1, 1]
+
+    def test_immediate_result(self):
+        """A 201 answer to the submission needs no polling."""
+        with FIAnalyticsStubServer(immediate=True) as stub:
+            rows = list(make_client(stub).calculate(PRICES, CALCS, "20251201"))
+
+        assert len(rows) == 3
+        assert stub.jobs == {}
+
+    def test_backoff_respects_max_age(self):
+        """A Cache-Control max-age hint sets the next poll delay."""
+        with FIAnalyticsStubServer(pending_polls=1, max_age=0) as stub:
+            client = make_client(stub, poll_interval=0.0)
+            job = client.submit([{"symbol": "037833AA5", "calcFromValue": 98.5}], CALCS, "20251201")
+
+            assert client.poll(job) is False
+            assert job.poll_interval == 0.0
+            assert client.poll(job) is True
+
+        assert _max_age("private, max-age=5") == 5.0
+        assert _max_age(None) is None
+
+    def test_timeout_cancels_pending(self):
+        """Jobs still pending after max_wait are cancelled and an error raised."""
+        with FIAnalyticsStubServer(pending_polls=1000) as stub:
+            client = make_client(stub, max_wait=0.05)
+
+            with pytest.raises(FactSetClientError):
+                list(client.calculate(PRICES, CALCS, "20251201"))
+
+            assert len(stub.cancelled) == 1
+
+    def test_async_does_not_block(self, server):
+        """calculate_async returns a future resolved on a worker thread."""
+        client = make_client(server)
+
+        future = client.calculate_async(PRICES, CALCS, "20251201")
+
+        assert len(future.result(timeout=10)) == 3
+        client.close()
+
+    def test_bad_request(self, server):
+        """Server-side validation errors surface as FactSetClientError."""
+        client = make_client(server)
+
+        with pytest.raises(FactSetClientError):
+            client.submit([{"symbol": "X", "calcFromValue": 1.0}], CALCS, "")
+
+    def test_rate_limit_retries_are_bounded(self, server):
+        """429 answers are retried up to max_retries times, then raised."""
+        client = make_client(server, max_retries=2)
+        limited = MagicMock(status_code=429, headers={"Retry-After": "0"})
+        client.session.request = MagicMock(return_value=limited)
+
+        with pytest.raises(FactSetClientError, match="rate limited after 3 attempts"):
+            client.get_discount_curves()
+
+        assert client.session.request.call_count == 3
+
+        ok = MagicMock(status_code=200, headers={})
+        ok.json.return_value = {"data": {}}
+        client.session.request = MagicMock(side_effect=[limited, ok])
+        client.get_discount_curves()
+        assert client.session.request.call_count == 2
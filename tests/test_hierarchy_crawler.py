@@ -0,0 +1,185 @@
+"""Tests for the breadth-first entity hierarchy crawler."""
+
+from unittest.mock import MagicMock
+
+from pagr.fds.clients.factset_client import FactSetClient
+from pagr.fds.enrichers.hierarchy_crawler import EntityHierarchyCrawler
+from pagr.fds.graph.builder import GraphBuilder
+from pagr.fds.models.fibo import Company
+from pagr.fds.services.pipeline import ETLPipeline
+from pagr.fds.config import FIBOConfig
+
+
+# parent -> [(child, ownership %)]
+STRUCTURE = {
+    "HOLD": [("APPL", 100.0), ("MINOR", 5.0)],
+    "APPL": [("APPL-IE", 100.0)],
+    "APPL-IE": [("APPL-IE-SUB", 100.0)],
+}
+
+
+def structure_response(ids):
+    """Fake entity-structures response covering both edge directions."""
+    data = []
+    for parent, children in STRUCTURE.items():
+        for child, pct in children:
+            if parent in ids or child in ids:
+                data.append({
+                    "parentId": parent,
+                    "entityId": child,
+                    "ownershipPercentage": pct,
+                    "parentName": f"{parent} Name",
+                    "entityName": f"{child} Name",
+                })
+    return {"data": data}
+
+
+def make_client():
+    """Mock FactSet client backed by STRUCTURE."""
+    client = MagicMock(spec=FactSetClient)
+    client.get_entity_structure.side_effect = structure_response
+    return client
+
+
+class TestEntityHierarchyCrawler:
+    """Test BFS crawl behaviour."""
+
+    def test_one_request_per_level_batch(self):
+        """Each frontier level is fetched with batched requests."""
+        client = make_client()
+        crawler = EntityHierarchyCrawler(client, max_depth=3, batch_size=10)
+
+        result = crawler.crawl(["APPL"])
+
+        # Levels: {APPL}, {HOLD, APPL-IE}, {MINOR, APPL-IE-SUB}
+        assert client.get_entity_structure.call_count == 3
+        assert sorted(client.get_entity_structure.call_args_list[1][0][0]) == ["APPL-IE", "HOLD"]
+        edges = {(r.source_fibo_id, r.target_fibo_id) for r in result.relationships}
+        assert ("fibo:company:HOLD", "fibo:company:APPL") in edges
+        assert ("fibo:company:APPL-IE", "fibo:company:APPL-IE-SUB") in edges
+        assert all(r.rel_type == "HAS_SUBSIDIARY" for r in result.relationships)
+
+    def test_depth_limit(self):
+        """max_depth bounds the number of hops from the seeds."""
+        client = make_client()
+        result = EntityHierarchyCrawler(client, max_depth=1).crawl(["APPL"])
+
+        assert client.get_entity_structure.call_count == 1
+        assert len(result.relationships) == 2
+
+    def test_ownership_threshold(self):
+        """Edges below the ownership threshold are neither stored nor followed."""
+        client = make_client()
+        result = EntityHierarchyCrawler(client, max_depth=3, min_ownership=10.0).crawl(["HOLD"])
+
+        assert "fibo:company:MINOR" not in result.companies
+        assert all("MINOR" not in r.target_fibo_id for r in result.relationships)
+
+    def test_batch_size_splits_frontier(self):
+        """Frontiers larger than batch_size are split across requests."""
+        client = make_client()
+        EntityHierarchyCrawler(client, max_depth=1, batch_size=2).crawl(["A", "B", "C"])
+
+        assert client.get_entity_structure.call_count == 2
+
+    def test_visited_set_shared_across_crawls(self):
+        """A second portfolio sharing issuers triggers no repeat requests."""
+        client = make_client()
+        crawler = EntityHierarchyCrawler(client, max_depth=3)
+        crawler.crawl(["APPL"])
+        calls = client.get_entity_structure.call_count
+
+        second = crawler.crawl(["APPL", "HOLD"])
+
+        assert client.get_entity_structure.call_count == calls
+        assert second.relationships == []
+
+        crawler.reset()
+        crawler.crawl(["APPL"])
+        assert client.get_entity_structure.call_count == 2 * calls
+
+    def test_seeds_are_not_stubbed(self):
+        """Seed issuers already have full company nodes, so no stubs are emitted."""
+        result = EntityHierarchyCrawler(make_client(), max_depth=1).crawl(["APPL"])
+
+        assert "fibo:company:APPL" not in result.companies
+        assert result.companies["fibo:company:HOLD"].name == "HOLD Name"
+
+    def test_failed_batch_is_skipped(self):
+        """API errors on one batch don't abort the crawl."""
+        client = MagicMock(spec=FactSetClient)
+        client.get_entity_structure.side_effect = Exception("boom")
+
+        result = EntityHierarchyCrawler(client).crawl(["APPL"])
+
+        assert result.relationships == []
+        # Not recorded as crawled, so its hierarchy stays stale and is retried
+        assert result.crawled == []
+
+    def test_failed_batch_retried_on_next_crawl(self):
+        """Entities whose fetch failed are not marked visited."""
+        client = make_client()
+        client.get_entity_structure.side_effect = [Exception("boom"), structure_response(["APPL"])]
+        crawler = EntityHierarchyCrawler(client, max_depth=1)
+
+        crawler.crawl(["APPL"])
+        assert "APPL" not in crawler.visited
+
+        result = crawler.crawl(["APPL"])
+        assert result.crawled == ["APPL"]
+        assert result.entities_visited == 1
+        assert crawler.visited == {"APPL"}
+
+
+class TestHierarchyGraphStatements:
+    """Test crawled hierarchies reach the graph builder."""
+
+    def test_stub_nodes_do_not_overwrite(self):
+        """Stub companies are only written on create."""
+        builder = GraphBuilder()
+        builder.add_company_stub_nodes(
+            {"fibo:company:X": Company(fibo_id="fibo:company:X", factset_id="X", name="X Corp")}
+        )
+
+        assert "ON CREATE SET c.name = 'X Corp'" in builder.node_statements[0]
+
+    def test_company_relationships_merge(self):
+        """Relationships are merged so re-crawls stay idempotent."""
+        result = EntityHierarchyCrawler(make_client(), max_depth=1).crawl(["APPL"])
+        builder = GraphBuilder()
+        builder.add_company_relationships(result.relationships)
+
+        statement = builder.relationship_statements[0]
+        assert "MERGE (s)-[r:HAS_SUBSIDIARY]->(t)" in statement
+        assert "SET r += {ownership_percentage: 100.0}" in statement
+
+    def test_pipeline_crawls_when_enabled(self):
+        """ETLPipeline seeds the crawl with enriched issuers."""
+        client = make_client()
+        pipeline = ETLPipeline(
+            factset_client=client,
+            portfolio_loader=MagicMock(),
+            graph_builder=GraphBuilder(),
+            fibo_config=FIBOConfig(hierarchy_max_depth=1),
+        )
+        companies = {"AAPL-US": Company(fibo_id="fibo:company:APPL", factset_id="APPL", name="Apple")}
+
+        hierarchy = pipeline.enrich_hierarchies(companies)
+
+        client.get_entity_structure.assert_called_once_with(["APPL"])
+        assert pipeline.stats.hierarchy_relationships == 2
+        assert len(hierarchy.companies) == 2
+
+    def test_pipeline_skips_when_disabled(self):
+        """fetch_subsidiaries=False disables the crawl."""
+        client = make_client()
+        pipeline = ETLPipeline(
+            factset_client=client,
+            portfolio_loader=MagicMock(),
+            graph_builder=GraphBuilder(),
+            fibo_config=FIBOConfig(fetch_subsidiaries=False),
+        )
+
+        pipeline.enrich_hierarchies({"X": Company(fibo_id="fibo:company:X", factset_id="X", name="X")})
+
+        client.get_entity_structure.assert_not_called()
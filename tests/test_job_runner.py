@@ -0,0 +1,160 @@
+"""Tests for background upload jobs and the shared FactSet rate limiter."""
+
+import threading
+from unittest.mock import MagicMock
+
+import pytest
+
+from pagr.fds.clients.factset_client import FactSetClient
+from pagr.fds.clients.rate_limiter import RateLimiter
+from pagr.fds.services.job_runner import FAILED, QUEUED, RUNNING, SUCCEEDED, JobRunner, JobStore
+from pagr.fds.services.pipeline import PIPELINE_STAGES, ETLPipeline, PipelineStatistics
+
+
+class FakeClock:
+    """Manual clock whose sleep advances time."""
+
+    def __init__(self):
+        self.now = 0.0
+        self.sleeps = []
+
+    def __call__(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.sleeps.append(seconds)
+        self.now += seconds
+
+
+class TestRateLimiter:
+    """Test the token bucket."""
+
+    def test_spaces_requests(self):
+        """Requests beyond the burst wait for tokens at the configured rate."""
+        clock = FakeClock()
+        limiter = RateLimiter(10, burst=2, clock=clock, sleep=clock.sleep)
+
+        waits = [limiter.acquire() for _ in range(4)]
+
+        assert waits[:2] == [0.0, 0.0]
+        assert waits[2] == pytest.approx(0.1)
+        assert waits[3] == pytest.approx(0.1)
+
+    def test_shared_across_threads(self):
+        """Concurrent callers reserve distinct slots rather than bursting together."""
+        clock = FakeClock()
+        limiter = RateLimiter(5, clock=clock, sleep=lambda seconds: None)
+
+        waits = []
+        threads = [threading.Thread(target=lambda: waits.append(limiter.acquire())) for _ in range(5)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        assert sorted(waits) == pytest.approx([0.0, 0.2, 0.4, 0.6, 0.8])
+
+    def test_factset_client_uses_shared_limiter(self):
+        """FactSet clients acquire from the injected limiter before each request."""
+        limiter = MagicMock()
+        client = FactSetClient("user", "key", rate_limiter=limiter)
+        client.session = MagicMock()
+        client.session.get.return_value = MagicMock(status_code=200, json=lambda: {"data": []})
+
+        client._make_request("GET", "/test")
+
+        limiter.acquire.assert_called_once()
+
+
+class TestJobStore:
+    """Test job persistence."""
+
+    def test_survives_reopen_and_fails_interrupted(self, tmp_path):
+        """Jobs persist across store instances; unfinished ones are failed on start-up."""
+        path = str(tmp_path / "jobs.sqlite")
+        store = JobStore(path)
+        done = store.create("a.csv", owner="s1")
+        store.update(done.job_id, status=SUCCEEDED, stats={"positions_loaded": 3})
+        pending = store.create("b.csv", owner="s2")
+        store.update(pending.job_id, status=RUNNING, stage="enrich")
+        store.close()
+
+        runner = JobRunner(MagicMock(), JobStore(path))
+
+        assert runner.get(done.job_id).stats == {"positions_loaded": 3}
+        assert runner.get(pending.job_id).status == FAILED
+        assert [job.filename for job in runner.list_jobs(owner="s1")] == ["a.csv"]
+        runner.shutdown()
+
+    def test_rejects_unknown_fields(self):
+        """Updates are limited to job columns."""
+        store = JobStore()
+        job = store.create("a.csv")
+
+        with pytest.raises(ValueError):
+            store.update(job.job_id, bogus=1)
+        assert store.get(job.job_id).status == QUEUED
+
+
+class TestJobRunner:
+    """Test background execution and progress reporting."""
+
+    def test_reports_progress_and_result(self):
+        """Stage reports update progress and statistics; the result is held for pickup."""
+        release = threading.Event()
+
+        def handler(filename, data, report):
+            stats = PipelineStatistics()
+            report("load", stats)
+            stats.positions_loaded = 2
+            report("enrich", stats)
+            release.wait(5)
+            return f"portfolio:{data.decode()}", stats
+
+        runner = JobRunner(handler, stages=["load", "enrich"])
+        job_id = runner.submit("p.csv", b"abc", owner="s1")
+        while runner.get(job_id).stage != "enrich":
+            threading.Event().wait(0.01)
+        running = runner.get(job_id)
+        release.set()
+        job = runner.wait(job_id, timeout=5)
+
+        assert running.status == RUNNING
+        assert running.progress == 0.5
+        assert running.stats["positions_loaded"] == 2
+        assert job.status == SUCCEEDED and job.progress == 1.0
+        assert runner.result(job_id)[0] == "portfolio:abc"
+        runner.shutdown()
+
+    def test_failure_is_recorded(self):
+        """Handler exceptions mark the job failed with the message."""
+        def handler(filename, data, report):
+            raise RuntimeError("boom")
+
+        runner = JobRunner(handler)
+        job = runner.wait(runner.submit("p.csv", b""), timeout=5)
+
+        assert job.status == FAILED
+        assert job.error == "boom"
+        assert runner.result(job.job_id) is None
+        runner.shutdown()
+
+
+class TestPipelineProgress:
+    """Test the pipeline's stage callback."""
+
+    def test_execute_reports_stages(self, tmp_path):
+        """execute() reports every stage in order."""
+        portfolio_file = tmp_path / "p.csv"
+        portfolio_file.write_text("ticker,quantity,book_value\nAAPL,10,1000\n")
+        pipeline = ETLPipeline(MagicMock(), MagicMock(), MagicMock())
+        pipeline.load_portfolio = MagicMock(return_value=MagicMock(positions=[]))
+        pipeline.enrich_prices = MagicMock()
+        pipeline.enrich_positions = MagicMock(return_value=({}, {}, {}, {}, {}))
+        pipeline.enrich_hierarchies = MagicMock()
+        pipeline.build_graph = MagicMock(return_value=[])
+
+        stages = []
+        pipeline.execute(str(portfolio_file), progress=lambda stage, stats: stages.append(stage))
+
+        assert stages == PIPELINE_STAGES
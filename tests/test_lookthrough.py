@@ -0,0 +1,167 @@
+"""Tests for look-through exposure across ownership and supply-chain edges."""
+
+from unittest.mock import Mock
+
+import pytest
+
+from pagr.fds.graph.lookthrough import LookThroughEngine
+from pagr.fds.graph.queries import GraphQueries, QueryService
+
+
+def edge(source, target, rel_type, ownership=None, revenue=None):
+    """Build a company edge record as returned by GraphQueries.company_edges."""
+    return {
+        "source_id": source,
+        "source_name": source.upper(),
+        "source_ticker": None,
+        "target_id": target,
+        "target_name": target.upper(),
+        "target_ticker": None,
+        "rel_type": rel_type,
+        "ownership_percentage": ownership,
+        "revenue_percentage": revenue,
+    }
+
+
+def holding(fibo_id, value):
+    """Build a direct exposure record."""
+    return {"fibo_id": fibo_id, "company_name": fibo_id.upper(), "ticker": None, "direct_exposure": value}
+
+
+@pytest.fixture
+def client():
+    """Graph client returning edges first, then direct exposure."""
+    mock = Mock()
+    mock.edges = []
+    mock.holdings = []
+
+    def execute_query(cypher, parameters=None):
+        if "HAS_SUBSIDIARY|SUBSIDIARY_OF|CUSTOMER_OF|SUPPLIES_TO" in cypher:
+            return mock.edges
+        return mock.holdings
+
+    mock.execute_query.side_effect = execute_query
+    return mock
+
+
+class TestLookThroughEngine:
+    """Test in-process look-through propagation."""
+
+    def by_id(self, exposures):
+        """Index exposures by fibo_id."""
+        return {e.fibo_id: e for e in exposures}
+
+    def test_ownership_chain_multiplies_percentages(self, client):
+        """Holdings in a grandchild roll up with the product of ownership weights."""
+        client.edges = [
+            edge("parent", "child", "HAS_SUBSIDIARY", ownership=60.0),
+            edge("grandchild", "child", "SUBSIDIARY_OF", ownership=50.0),
+        ]
+        client.holdings = [holding("grandchild", 1000.0)]
+
+        result = self.by_id(LookThroughEngine(client).compute("P"))
+
+        assert result["grandchild"].direct_exposure == 1000.0
+        assert result["child"].subsidiary_exposure == pytest.approx(500.0)
+        assert result["parent"].subsidiary_exposure == pytest.approx(300.0)
+        assert result["parent"].total_exposure == pytest.approx(300.0)
+
+    def test_supply_chain_flows_to_customers(self, client):
+        """Supplier holdings are attributed to customers by revenue share."""
+        client.edges = [
+            edge("supplier", "customer", "SUPPLIES_TO", revenue=25.0),
+            edge("customer", "supplier", "CUSTOMER_OF", revenue=25.0),
+        ]
+        client.holdings = [holding("supplier", 400.0)]
+
+        result = self.by_id(LookThroughEngine(client).compute("P"))
+
+        # Duplicate edge pair must not double count
+        assert result["customer"].supplier_exposure == pytest.approx(100.0)
+        assert result["customer"].subsidiary_exposure == 0.0
+
+    def test_depth_and_weight_limits(self, client):
+        """Propagation stops at max_depth and prunes low-weight paths."""
+        client.edges = [
+            edge("b", "a", "SUBSIDIARY_OF"),
+            edge("c", "b", "SUBSIDIARY_OF"),
+            edge("x", "a", "SUBSIDIARY_OF", ownership=0.5),
+        ]
+        client.holdings = [holding("c", 100.0), holding("x", 100.0)]
+
+        result = self.by_id(LookThroughEngine(client).compute("P", max_depth=1))
+
+        assert result["b"].subsidiary_exposure == 100.0
+        assert "a" not in result
+
+    def test_cycles_do_not_credit_origin(self, client):
+        """Cross-holdings never attribute a company's holdings back to itself."""
+        client.edges = [
+            edge("a", "b", "HAS_SUBSIDIARY", ownership=50.0),
+            edge("b", "a", "HAS_SUBSIDIARY", ownership=50.0),
+        ]
+        client.holdings = [holding("a", 100.0)]
+
+        result = self.by_id(LookThroughEngine(client).compute("P", max_depth=5))
+
+        assert result["a"].subsidiary_exposure == 0.0
+        assert result["b"].subsidiary_exposure == pytest.approx(50.0)
+
+    def test_cycles_away_from_origin_credited_once(self):
+        """A cycle downstream of the origin does not re-credit its members."""
+        adjacency = {"a": {"b": 1.0}, "b": {"c": 1.0}, "c": {"b": 1.0}}
+
+        indirect = LookThroughEngine._propagate({"a": 100.0}, adjacency, max_depth=6, min_weight=0.01)
+
+        assert indirect == {"b": 100.0, "c": 100.0}
+
+    def test_adjacency_cached_until_invalidated(self, client):
+        """Edges are loaded once per engine until invalidate() is called."""
+        engine = LookThroughEngine(client)
+        engine.compute("P1")
+        engine.compute("P2")
+        assert client.execute_query.call_count == 3
+
+        engine.invalidate()
+        engine.compute("P1")
+        assert client.execute_query.call_count == 5
+
+
+class TestTotalCompanyExposureQuery:
+    """Test the bounded variable-length Cypher variant."""
+
+    def test_query_traverses_both_edge_families(self):
+        """Query walks ownership and supply edges with weighted reduce."""
+        query = GraphQueries.total_company_exposure("Tech", "AAPL", max_depth=4)
+
+        assert "HAS_SUBSIDIARY|SUBSIDIARY_OF*1..4" in query
+        assert "CUSTOMER_OF|SUPPLIES_TO*1..4" in query
+        assert "ownership_percentage" in query
+        assert "revenue_percentage" in query
+        assert "0 AS subsidiary_exposure" not in query
+
+    def test_query_collapses_both_edge_directions(self):
+        """Paths over the same company chain are reduced to one weight before positions are summed."""
+        query = GraphQueries.total_company_exposure("Tech", "AAPL")
+
+        for prefix, company in [("sub", "sub"), ("sup", "supplier")]:
+            path, chain, weight = f"{prefix}_path", f"{prefix}_chain", f"{prefix}_weight"
+            grouped = query.index(f"{company}, nodes({path}) AS {chain},\n     max(reduce(")
+            summed = query.index(f"{company}, SUM(chain_weight) AS {weight}")
+            holdings = query.index(f"-[:ISSUED_BY]->({company})")
+            assert grouped < summed < holdings
+            assert f"{prefix}_pos.market_value * {weight}" in query
+        assert "market_value * reduce(" not in query
+
+    def test_query_service_look_through(self, client):
+        """QueryService exposes all companies in one result."""
+        client.edges = [edge("child", "parent", "SUBSIDIARY_OF", ownership=100.0)]
+        client.holdings = [holding("child", 10.0)]
+
+        result = QueryService(client).look_through_exposure("P")
+
+        assert result.query_name == "look_through_exposure"
+        assert {r["fibo_id"]: r["total_exposure"] for r in result.records} == {
+            "child": 10.0,
+            "parent": 10.0,
+        }
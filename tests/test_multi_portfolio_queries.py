@@ -0,0 +1,103 @@
+"""Tests for the multi-portfolio Holdings view queries."""
+
+from unittest.mock import Mock
+
+import pytest
+
+from pagr.fds.graph.queries import GraphQueries, QueryService
+from pagr.ui.tabular import combine_exposures
+
+
+def sector_row(portfolio, sector, exposure, positions=1):
+    """One per-portfolio sector exposure record."""
+    return {
+        "portfolio": portfolio, "sector": sector, "total_exposure": exposure,
+        "total_weight": 50.0, "num_positions": positions,
+    }
+
+
+class TestMultiPortfolioQueries:
+    """Test the $names-parameterized query templates."""
+
+    def test_queries_take_a_names_list_and_return_portfolio(self):
+        """Every variant filters by $names and returns a portfolio column."""
+        for query in (
+            GraphQueries.positions_multi(),
+            GraphQueries.sector_exposure_multi(),
+            GraphQueries.country_breakdown_multi(),
+            GraphQueries.sector_positions_multi(),
+            GraphQueries.country_positions_multi(),
+        ):
+            assert "p.name IN $names" in query
+            assert "AS portfolio" in query
+        for query in (GraphQueries.sector_exposure_multi_aggregate(), GraphQueries.country_breakdown_multi_aggregate()):
+            assert "a.portfolio IN $names" in query
+            assert "Position" not in query
+
+
+class TestMultiPortfolioService:
+    """Test round-trips and the per-portfolio aggregate fallback."""
+
+    def setup_method(self):
+        """Create a query service over a mock client."""
+        self.client = Mock()
+        self.service = QueryService(self.client)
+
+    def test_one_round_trip_when_aggregates_cover_all(self):
+        """Combining N portfolios costs one query."""
+        self.client.execute_query.return_value = [sector_row("A", "Tech", 100.0), sector_row("B", "Tech", 50.0)]
+
+        result = self.service.sector_exposure_multi(["A", "B", "A"])
+
+        self.client.execute_query.assert_called_once_with(
+            GraphQueries.sector_exposure_multi_aggregate(), {"names": ["A", "B"]}
+        )
+        assert result.record_count == 2
+
+    def test_live_fallback_only_for_missing_portfolios(self):
+        """Portfolios without aggregates are traversed live, and rows are merged by exposure."""
+        self.client.execute_query.side_effect = [
+            [sector_row("A", "Tech", 100.0)],
+            [{"name": "C"}],
+            [sector_row("B", "Energy", 300.0)],
+        ]
+
+        result = self.service.sector_exposure_multi(["A", "B", "C"])
+
+        # C was aggregated but has no sector rows, so only B is traversed
+        aggregated_call, live_call = self.client.execute_query.call_args_list[1:]
+        assert aggregated_call.args == (GraphQueries.aggregated_portfolios(), {"names": ["B", "C"]})
+        assert live_call.args == (GraphQueries.sector_exposure_multi(), {"names": ["B"]})
+        assert [r["portfolio"] for r in result.records] == ["B", "A"]
+
+    def test_no_portfolios_no_query(self):
+        """An empty selection does not hit the database."""
+        assert self.service.country_breakdown_multi([]).records == []
+        self.client.execute_query.assert_not_called()
+
+    def test_drilldown_parameters(self):
+        """Drill-downs pass the bucket as a parameter, not as a Cypher literal."""
+        self.client.execute_query.return_value = []
+
+        self.service.country_positions_multi(["A", "B"], "US")
+
+        self.client.execute_query.assert_called_once_with(
+            GraphQueries.country_positions_multi(), {"names": ["A", "B"], "country_iso": "US"}
+        )
+
+
+class TestCombineExposures:
+    """Test the combined view's per-bucket totals."""
+
+    def test_sums_portfolios_and_reweights(self):
+        """Exposures add across portfolios and weights are recomputed on the combined total."""
+        combined = combine_exposures(
+            [sector_row("A", "Tech", 100.0, 2), sector_row("B", "Tech", 50.0), sector_row("B", "Energy", 50.0)],
+            "sector",
+        )
+
+        rows = combined.set_index("sector")
+        assert rows.loc["Tech", "total_exposure"] == 150.0
+        assert rows.loc["Tech", "num_positions"] == 3
+        assert rows.loc["Tech", "total_weight"] == pytest.approx(75.0)
+        assert list(combined["sector"]) == ["Tech", "Energy"]
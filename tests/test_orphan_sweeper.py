@@ -0,0 +1,105 @@
+"""Tests for batched portfolio deletion and the orphan sweeper."""
+
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from pagr import cli
+from pagr.fds.graph.queries import GraphQueries
+from pagr.fds.services.orphan_sweeper import ORPHAN_KINDS, OrphanSweeper, SweepResult
+
+
+def deleting(counts):
+    """Graph mock whose bounded deletes report counts per query, in order."""
+    remaining = {query: list(batches) for query, batches in counts.items()}
+
+    def execute(query, params=None):
+        batches = remaining.get(query)
+        return [{"deleted": batches.pop(0) if batches else 0}]
+
+    graph = MagicMock()
+    graph.execute_query.side_effect = execute
+    return graph
+
+
+class TestOrphanQueries:
+    """Test the bounded delete templates."""
+
+    def test_every_kind_is_bounded(self):
+        """Each sweep query limits its batch and reports the deleted count."""
+        for kind in ORPHAN_KINDS:
+            query = GraphQueries.delete_orphans(kind)
+            assert "LIMIT $limit" in query
+            assert "DETACH DELETE n" in query
+            assert query.endswith("RETURN count(*) AS deleted;")
+        assert "*1..3]" in GraphQueries.delete_orphans("companies", company_depth=3)
+
+        with pytest.raises(ValueError):
+            GraphQueries.delete_orphans("portfolios")
+
+
+class TestOrphanSweeper:
+    """Test batching, ordering and results."""
+
+    def test_delete_portfolio_batches_positions_then_sweeps(self):
+        """Positions are deleted until a short batch, then orphans kind by kind."""
+        positions = GraphQueries.delete_portfolio_positions()
+        securities = GraphQueries.delete_orphans("securities")
+        graph = deleting({
+            positions: [2, 2, 1],
+            GraphQueries.delete_portfolio_node(): [1],
+            securities: [2],
+        })
+
+        result = OrphanSweeper(graph, batch_size=2).delete_portfolio("Growth")
+
+        queries = [c.args[0] for c in graph.execute_query.call_args_list]
+        assert queries[:4] == [positions] * 3 + [GraphQueries.delete_portfolio_node()]
+        assert queries[4:] == (
+            [GraphQueries.delete_orphans("positions"), securities, securities]
+            + [GraphQueries.delete_orphans(kind) for kind in ORPHAN_KINDS[2:]]
+        )
+        assert graph.execute_query.call_args_list[0].args[1] == {"name": "Growth", "limit": 2}
+        assert result.portfolio_deleted
+        assert result.positions_deleted == 5
+        assert result.orphans_deleted["securities"] == 2
+        assert result.total_deleted == 8
+
+    def test_missing_portfolio_without_sweep(self):
+        """Deleting an unknown portfolio reports it and can skip the sweep."""
+        graph = deleting({})
+
+        result = OrphanSweeper(graph).delete_portfolio("Missing", sweep=False)
+
+        assert not result.portfolio_deleted
+        assert graph.execute_query.call_count == 2
+        assert result.orphans_deleted == {}
+
+    def test_sweep_subset_keeps_dependency_order(self):
+        """Requested kinds run in ORPHAN_KINDS order; unknown kinds are rejected."""
+        graph = deleting({GraphQueries.delete_orphans("countries"): [3]})
+        sweeper = OrphanSweeper(graph, batch_size=10)
+
+        result = sweeper.sweep(["countries", "securities"])
+
+        assert list(result.orphans_deleted) == ["securities", "countries"]
+        assert result.to_dict()["total_deleted"] == 3
+        with pytest.raises(ValueError):
+            sweeper.sweep(["portfolios"])
+
+
+class TestSweepCli:
+    """Test the pagr sweep command."""
+
+    def test_sweep_passes_kinds_and_writes_report(self, tmp_path):
+        """Kinds reach ETLManager.sweep_orphans and the report is written."""
+        report_path = tmp_path / "sweep.json"
+        manager = MagicMock()
+        manager.sweep_orphans.return_value = SweepResult(orphans_deleted={"securities": 4})
+
+        with patch("pagr.etl_manager.ETLManager", return_value=manager):
+            code = cli.main(["sweep", "--kind", "securities", "--report", str(report_path)])
+
+        assert code == cli.EXIT_OK
+        manager.sweep_orphans.assert_called_once_with(kinds=["securities"])
+        assert '"total_deleted": 4' in report_path.read_text()
@@ -0,0 +1,113 @@
+"""Tests for the streaming .pagr JSON portfolio loader."""
+
+import json
+from pathlib import Path
+
+import pytest
+
+from pagr.fds.loaders.pagr_reader import PagrFormatError, PagrReader
+from pagr.fds.loaders.portfolio_loader import PortfolioLoader, PortfolioLoaderError
+
+
+DOCUMENT = {
+    "portfolio_name": "PAGR Portfolio",
+    "currency": "USD",
+    "positions": [
+        {"ticker": "AAPL-US", "quantity": 100, "book_value": 4460.50},
+        {"ticker": None, "quantity": 500, "book_value": 50000.0,
+         "security_type": "Corporate Bond", "isin": "US037833AA56", "cusip": "037833AA5"},
+        {"ticker": "MSFT-US", "quantity": 12345678, "market_value": 1.25e6},
+    ],
+    "last_updated": "2024-05-21",
+}
+
+
+def write_pagr(tmp_path, document, name="portfolio.pagr", **dump_kwargs) -> Path:
+    """Write a .pagr document and return its path."""
+    path = tmp_path / name
+    path.write_text(json.dumps(document, **dump_kwargs), encoding="utf-8")
+    return path
+
+
+class TestPagrReader:
+    """Test incremental parsing."""
+
+    @pytest.mark.parametrize("chunk_size", [1, 3, 7, 1 << 16])
+    def test_chunk_boundaries(self, tmp_path, chunk_size):
+        """Values split across chunks (including numbers) decode correctly."""
+        path = write_pagr(tmp_path, DOCUMENT, indent=2)
+        reader = PagrReader(str(path), chunk_size=chunk_size)
+
+        positions = list(reader.iter_positions())
+
+        assert positions == DOCUMENT["positions"]
+        assert reader.header == {
+            "portfolio_name": "PAGR Portfolio",
+            "currency": "USD",
+            "last_updated": "2024-05-21",
+        }
+
+    def test_columns_fill_missing_fields(self, tmp_path):
+        """Fields absent from some positions are padded with None."""
+        reader = PagrReader(str(write_pagr(tmp_path, DOCUMENT)))
+
+        columns, count = reader.columns()
+
+        assert count == 3
+        assert columns["isin"] == [None, "US037833AA56", None]
+        assert columns["market_value"] == [None, None, 1.25e6]
+        assert all(len(values) == 3 for values in columns.values())
+
+    @pytest.mark.parametrize(
+        "text",
+        ['{"positions": [{"ticker": "A"}', '["not", "an", "object"]', '{"positions": [1 2]}'],
+    )
+    def test_malformed(self, tmp_path, text):
+        """Truncated or malformed documents raise PagrFormatError."""
+        path = tmp_path / "bad.pagr"
+        path.write_text(text, encoding="utf-8")
+
+        with pytest.raises(PagrFormatError):
+            list(PagrReader(str(path), chunk_size=4).iter_positions())
+
+
+class TestPagrLoad:
+    """Test PortfolioLoader .pagr support."""
+
+    def test_load(self, tmp_path):
+        """Positions go through the columnar validation path."""
+        portfolio = PortfolioLoader.load(str(write_pagr(tmp_path, DOCUMENT)))
+
+        assert portfolio.name == "PAGR Portfolio"
+        assert len(portfolio.positions) == 3
+        assert portfolio.positions[1].get_primary_identifier() == ("cusip", "037833AA5")
+        assert portfolio.positions[2].book_value == 1.25e6
+        assert portfolio.total_value == 1.25e6
+
+    def test_explicit_name_wins(self, tmp_path):
+        """An explicit portfolio name overrides the file header."""
+        portfolio = PortfolioLoader.load(str(write_pagr(tmp_path, DOCUMENT)), portfolio_name="Mine")
+
+        assert portfolio.name == "Mine"
+
+    def test_rows_numbered_by_position(self, tmp_path):
+        """Validation errors reference 1-based position numbers."""
+        document = {"positions": [{"ticker": "A-US", "quantity": 1, "book_value": 1},
+                                  {"ticker": "B-US", "quantity": -1, "book_value": 1}]}
+
+        with pytest.raises(PortfolioLoaderError, match="Row 2: Quantity must be positive"):
+            PortfolioLoader.load(str(write_pagr(tmp_path, document)))
+
+    def test_no_positions(self, tmp_path):
+        """An empty positions array is rejected."""
+        with pytest.raises(PortfolioLoaderError, match="No positions found"):
+            PortfolioLoader.load(str(write_pagr(tmp_path, {"portfolio_name": "X", "positions": []})))
+
+    def test_default_portfolio_file(self):
+        """The bundled default_portfolio.pagr loads."""
+        path = Path(__file__).resolve().parents[1] / "default_portfolio.pagr"
+
+        portfolio = PortfolioLoader.load(str(path))
+
+        assert portfolio.name == "USD Odlum Portfolio"
+        assert len(portfolio.positions) > 0
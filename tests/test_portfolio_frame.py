@@ -0,0 +1,160 @@
+"""Tests for the array-backed PortfolioFrame and Portfolio bulk operations."""
+
+import math
+import time
+
+import numpy as np
+import pytest
+
+from pagr.fds.models.portfolio import Portfolio, Position
+from pagr.fds.models.portfolio_frame import PortfolioFrame
+
+
+def make_portfolio() -> Portfolio:
+    """Mixed stock/bond portfolio."""
+    portfolio = Portfolio(name="Mixed")
+    portfolio.add_positions([
+        Position(ticker="AAPL-US", quantity=10, book_value=1000.0),
+        Position(ticker="MSFT-US", quantity=20, book_value=2000.0, purchase_date="2024-01-02"),
+        Position(isin="US037833AA56", cusip="037833AA5", quantity=5, book_value=5000.0,
+                 security_type="Corporate Bond"),
+    ])
+    return portfolio
+
+
+class TestPortfolioFrame:
+    """Test PortfolioFrame conversion, lookup and math."""
+
+    def test_round_trip(self):
+        """Portfolio -> frame -> Portfolio preserves every position field."""
+        portfolio = make_portfolio()
+
+        restored = PortfolioFrame.from_portfolio(portfolio).to_portfolio()
+
+        assert restored.name == "Mixed"
+        assert [p.model_dump() for p in restored.positions] == [
+            p.model_dump() for p in portfolio.positions
+        ]
+        assert restored.total_value == portfolio.total_value
+
+    def test_weights_match_portfolio(self):
+        """Vectorized weights agree with Portfolio.calculate_weights."""
+        portfolio = make_portfolio()
+        portfolio.positions[0].market_value = 1500.0
+        portfolio.calculate_weights()
+        frame = PortfolioFrame.from_portfolio(portfolio)
+
+        total = frame.recalculate_weights()
+
+        assert total == portfolio.total_value
+        np.testing.assert_allclose(frame.weight, [p.weight for p in portfolio.positions])
+        assert frame.weight.tolist() == [100.0, 0.0, 0.0]
+
+    def test_index_lookup(self):
+        """Tickers, ISINs and CUSIPs resolve to rows."""
+        frame = PortfolioFrame.from_portfolio(make_portfolio())
+
+        assert frame.row("MSFT-US") == 1
+        assert frame.row("037833AA5") == 2
+        assert frame.row("US037833AA56") == 2
+        assert frame.row("NOPE") is None
+
+    def test_apply_prices(self):
+        """Prices match by ticker first, then by primary identifier."""
+        portfolio = make_portfolio()
+        frame = PortfolioFrame.from_portfolio(portfolio)
+
+        updated = frame.apply_prices({"AAPL-US": 150.0, "037833AA5": 98.5})
+        frame.apply_to(portfolio.positions)
+
+        assert updated == 2
+        assert portfolio.positions[0].market_value == 1500.0
+        assert portfolio.positions[1].market_value is None
+        assert portfolio.positions[2].market_value == 492.5
+        assert math.isclose(sum(p.weight for p in portfolio.positions), 100.0)
+
+    def test_set_market_values_and_remove(self):
+        """Bulk updates and removals keep the index and weights consistent."""
+        frame = PortfolioFrame.from_portfolio(make_portfolio())
+
+        assert frame.set_market_values({"MSFT-US": 3000.0, "NOPE": 1.0}) == 1
+        assert frame.weight.tolist() == [0.0, 100.0, 0.0]
+
+        assert frame.remove(["AAPL-US", "037833AA5"]) == 2
+        assert len(frame) == 1
+        assert frame.row("MSFT-US") == 0
+        assert frame.weight.tolist() == [100.0]
+
+    def test_extend(self):
+        """Appending positions extends every column."""
+        frame = PortfolioFrame.from_portfolio(make_portfolio())
+
+        frame.extend([Position(ticker="GE-US", quantity=1, book_value=2000.0)])
+
+        assert len(frame) == 4
+        assert frame.row("GE-US") == 3
+        assert frame.weight[3] == 20.0
+
+    def test_constructed_positions_are_independent(self):
+        """Positions built from columns do not share pydantic state."""
+        first, second = Position.construct_many(ticker=["A", "B"], quantity=[1.0, 2.0])
+
+        first.market_value = 10.0
+
+        assert first.model_fields_set is not second.model_fields_set
+        assert "market_value" not in second.model_fields_set
+        assert (second.security_type, second.market_value) == ("Common Stock", None)
+
+    def test_to_positions_throughput(self):
+        """100k rows convert to positions well inside a second."""
+        n = 100_000
+        frame = PortfolioFrame(
+            ticker=[f"T{i}-US" for i in range(n)], quantity=np.ones(n), book_value=np.ones(n)
+        )
+
+        start = time.perf_counter()
+        positions = frame.to_positions()
+        elapsed = time.perf_counter() - start
+
+        assert len(positions) == n
+        assert positions[-1].ticker == f"T{n - 1}-US"
+        assert elapsed < 1.0
+
+    def test_mismatched_columns(self):
+        """Columns of different lengths are rejected."""
+        with pytest.raises(ValueError, match="ticker"):
+            PortfolioFrame(quantity=[1.0], book_value=[1.0], ticker=["A", "B"])
+
+
+class TestPortfolioBulkOperations:
+    """Test Portfolio recalculate flags and indexed lookup."""
+
+    def test_add_position_without_recalculate(self):
+        """Weights are only computed when asked."""
+        portfolio = Portfolio(name="P")
+        portfolio.add_position(Position(ticker="A-US", quantity=1, book_value=1.0), recalculate=False)
+
+        assert portfolio.positions[0].weight is None
+        portfolio.calculate_weights()
+        assert portfolio.positions[0].weight == 100.0
+
+    def test_get_position_tracks_changes(self):
+        """The ticker index follows adds, removals and reassignment of the list."""
+        portfolio = make_portfolio()
+        assert portfolio.get_position("MSFT-US").quantity == 20
+
+        portfolio.add_position(Position(ticker="GE-US", quantity=1, book_value=1.0))
+        assert portfolio.get_position("GE-US") is portfolio.positions[3]
+
+        assert portfolio.remove_position("AAPL-US")
+        assert not portfolio.remove_position("AAPL-US")
+        assert portfolio.get_position("AAPL-US") is None
+        assert portfolio.get_position("GE-US") is portfolio.positions[2]
+
+        portfolio.positions = [Position(ticker="NVDA-US", quantity=1, book_value=1.0)]
+        assert portfolio.get_position("NVDA-US") is portfolio.positions[0]
+        assert portfolio.get_position("MSFT-US") is None
+
+        portfolio.positions.append(Position(ticker="TSLA-US", quantity=1, book_value=1.0))
+        portfolio.reindex()
+        assert portfolio.get_position("TSLA-US") is portfolio.positions[1]
@@ -0,0 +1,160 @@
+"""Tests for cached, column-wise portfolio reconstruction and listing."""
+
+from unittest.mock import MagicMock
+
+import pytest
+
+from pagr.fds.graph.queries import GraphQueries
+from pagr.portfolio_manager import PortfolioManager
+
+ROWS = {
+    "Growth": [
+        ["AAPL", "US0378331005", None, "Common Stock", "2024-01-02", 10, 1000.0, 3000.0],
+        ["", None, "037833AA5", "Corporate Bond", "", 5, 500.0, 1000.0],
+        # No identifier and zero quantity: dropped, not fatal
+        [None, None, None, None, None, 0, 0, None],
+    ],
+    "Income": [["MSFT", None, None, None, None, 2, 600.0, None]],
+}
+
+
+class FakeGraph:
+    """Graph client answering the version, positions and summary queries."""
+
+    def __init__(self, version="v1"):
+        self.version = version
+        self.is_connected = True
+        self.execute_query = MagicMock(side_effect=self._execute)
+
+    def _execute(self, query, params=None):
+        if query == GraphQueries.graph_version():
+            return [{"version": self.version}]
+        if query == GraphQueries.portfolio_positions():
+            return [
+                {"name": name, "created_at": "2024-01-01", "positions": ROWS[name]}
+                for name in params["names"] if name in ROWS
+            ]
+        if query == GraphQueries.portfolio_summaries():
+            return [
+                {"name": "Growth", "created_at": "2024-01-01", "position_count": 3,
+                 "total_market_value": 4000.0, "last_updated": "2024-02-01"},
+                {"name": "Income", "created_at": None, "position_count": 1,
+                 "total_market_value": None, "last_updated": None},
+            ]
+        if query == GraphQueries.count_portfolios():
+            return [{"count": 2}]
+        if query == GraphQueries.delete_portfolio_node():
+            return [{"deleted": 1}]
+        return []
+
+    def calls(self, query):
+        """Number of times a query was run."""
+        return sum(1 for c in self.execute_query.call_args_list if c.args[0] == query)
+
+    def position_loads(self):
+        """Names requested by each positions query."""
+        return [
+            c.args[1]["names"] for c in self.execute_query.call_args_list
+            if c.args[0] == GraphQueries.portfolio_positions()
+        ]
+
+
+class TestPortfolioReconstruction:
+    """Test one-query bulk reconstruction and the version-keyed cache."""
+
+    def setup_method(self):
+        """Create a manager over a fake graph."""
+        self.graph = FakeGraph()
+        self.manager = PortfolioManager(self.graph)
+
+    def test_builds_positions_and_weights_column_wise(self):
+        """Rows become positions with weights; empty strings are missing values."""
+        portfolio = self.manager.reconstruct_portfolio_from_database("Growth")
+
+        assert [(p.ticker, p.cusip) for p in portfolio.positions] == [("AAPL", None), (None, "037833AA5")]
+        assert portfolio.positions[1].purchase_date is None
+        assert portfolio.total_value == 4000.0
+        assert [p.weight for p in portfolio.positions] == pytest.approx([75.0, 25.0])
+        assert portfolio.created_at == "2024-01-01"
+
+    def test_missing_security_type_defaults(self):
+        """A null security type does not invalidate the position."""
+        portfolio = self.manager.reconstruct_portfolio_from_database("Income")
+
+        assert portfolio.positions[0].security_type == "Unknown"
+        assert portfolio.positions[0].weight == pytest.approx(100.0)
+
+    def test_cached_until_graph_version_changes(self):
+        """Switching back to a portfolio reuses it until the graph is stamped again."""
+        first = self.manager.reconstruct_portfolio_from_database("Growth")
+        self.manager.reconstruct_portfolio_from_database("Income")
+
+        assert self.manager.reconstruct_portfolio_from_database("Growth") is first
+        assert self.graph.position_loads() == [["Growth"], ["Income"]]
+
+        self.graph.version = "v2"
+        assert self.manager.reconstruct_portfolio_from_database("Growth") is not first
+        assert self.graph.position_loads()[-1] == ["Growth"]
+
+    def test_misses_load_in_one_query(self):
+        """Only uncached portfolios are loaded, together; unknown names are omitted."""
+        self.manager.reconstruct_portfolio_from_database("Growth")
+
+        portfolios = self.manager.reconstruct_portfolios(["Growth", "Income", "Missing", "Income"])
+
+        assert sorted(portfolios) == ["Growth", "Income"]
+        assert self.graph.position_loads() == [["Growth"], ["Income", "Missing"]]
+
+    def test_delete_stamps_version_and_drops_cache(self):
+        """Deleting a portfolio writes a new version stamp and forgets the portfolio."""
+        self.manager.reconstruct_portfolio_from_database("Growth")
+
+        assert self.manager.delete_portfolio("Growth")
+
+        stamp = self.graph.execute_query.call_args_list[-1]
+        assert stamp.args[0] == GraphQueries.stamp_graph_version()
+        assert stamp.args[1]["version"]
+        assert "Growth" not in self.manager._cache
+
+    def test_database_errors_return_none(self):
+        """Failures are logged and reconstruction returns None."""
+        self.graph.execute_query.side_effect = RuntimeError("connection lost")
+
+        assert self.manager.reconstruct_portfolio_from_database("Growth") is None
+
+
+class TestPortfolioSummaries:
+    """Test the one-query, version-cached portfolio list."""
+
+    def setup_method(self):
+        """Create a manager over a fake graph."""
+        self.graph = FakeGraph()
+        self.manager = PortfolioManager(self.graph)
+
+    def test_lists_counts_values_and_update_times(self):
+        """Summaries carry real position counts and totals, with missing values defaulted."""
+        growth, income = self.manager.list_portfolios()
+
+        assert growth == {
+            "name": "Growth", "created_at": "2024-01-01", "position_count": 3,
+            "total_market_value": 4000.0, "last_updated": "2024-02-01",
+        }
+        assert (income["created_at"], income["total_market_value"], income["last_updated"]) == ("", 0.0, "")
+
+    def test_reruns_are_served_from_cache(self):
+        """The list is queried once per graph version, and callers get copies."""
+        self.manager.list_portfolios()[0]["name"] = "changed"
+
+        assert self.manager.list_portfolios()[0]["name"] == "Growth"
+        assert self.manager.count_portfolios() == 2
+        assert self.graph.calls(GraphQueries.portfolio_summaries()) == 1
+        assert self.graph.calls(GraphQueries.count_portfolios()) == 0
+
+        self.graph.version = "v2"
+        self.manager.list_portfolios()
+        assert self.graph.calls(GraphQueries.portfolio_summaries()) == 2
+
+    def test_count_without_listing(self):
+        """Counting with no cached list runs a count query, not the full list."""
+        assert self.manager.count_portfolios() == 2
+        assert self.graph.calls(GraphQueries.portfolio_summaries()) == 0
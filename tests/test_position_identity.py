@@ -0,0 +1,108 @@
+"""Tests for deterministic position IDs and MERGE-based position writes."""
+
+from unittest.mock import MagicMock
+
+from pagr.fds.graph.builder import GraphBuilder
+from pagr.fds.graph.schema import IndexDefinition
+from pagr.fds.models.fibo import Bond, Stock
+from pagr.fds.models.portfolio import Portfolio, Position
+from pagr.fds.services.pipeline import ETLPipeline
+
+
+class TestPositionId:
+    """Test Position.get_position_id."""
+
+    def test_stable_across_instances(self):
+        """Same portfolio, identifier and lot give the same ID."""
+        a = Position(ticker="AAPL-US", quantity=10, book_value=1500.0, purchase_date="2024-01-02")
+        b = Position(ticker="AAPL-US", quantity=10.0, book_value=1500, purchase_date="2024-01-02")
+
+        assert a.get_position_id("Growth") == b.get_position_id("Growth")
+        assert a.get_position_id("Growth").startswith("pos:")
+
+    def test_distinct_by_portfolio_and_lot(self):
+        """Portfolios and lots of the same security get distinct IDs."""
+        lot1 = Position(ticker="AAPL-US", quantity=10, book_value=1500.0, purchase_date="2024-01-02")
+        lot2 = Position(ticker="AAPL-US", quantity=10, book_value=1500.0, purchase_date="2024-06-03")
+
+        assert lot1.get_position_id("Growth") != lot1.get_position_id("Income")
+        assert lot1.get_position_id("Growth") != lot2.get_position_id("Growth")
+
+    def test_identical_lots_stay_distinct(self):
+        """Two identical rows in one portfolio get two IDs; the first keeps its plain ID."""
+        lot = Position(ticker="AAPL-US", quantity=10, book_value=1500.0, purchase_date="2024-01-02")
+        same = lot.model_copy()
+
+        ids = Position.position_ids([lot, same], "Growth")
+
+        assert ids[0] == lot.get_position_id("Growth")
+        assert len(set(ids)) == 2
+
+        builder = GraphBuilder()
+        builder.add_position_nodes([lot, same], "Growth")
+        assert all(position_id in s for position_id, s in zip(ids, builder.node_statements))
+
+    def test_uses_primary_identifier(self):
+        """Bonds are identified by CUSIP, not by their (absent) ticker."""
+        bond = Position(cusip="037833100", quantity=1000, book_value=100000.0, security_type="Corporate Bond")
+        other = Position(cusip="037833101", quantity=1000, book_value=100000.0, security_type="Corporate Bond")
+
+        assert bond.get_position_id("P") != other.get_position_id("P")
+
+
+class TestPositionStatements:
+    """Test GraphBuilder position and INVESTED_IN statements."""
+
+    def test_positions_merge_on_position_id(self):
+        """Position nodes and CONTAINS edges are merged by position_id."""
+        position = Position(ticker="AAPL-US", quantity=10, book_value=1500.0)
+        position_id = position.get_position_id("Growth")
+        builder = GraphBuilder()
+
+        builder.add_position_nodes([position], "Growth")
+
+        assert builder.node_statements[0].startswith(
+            f"MERGE (pos:Position {{position_id: '{position_id}'}})"
+        )
+        contains = builder.relationship_statements[0]
+        assert f"(pos:Position {{position_id: '{position_id}'}})" in contains
+        assert "MERGE (p)-[r:CONTAINS]->(pos)" in contains
+
+    def test_rerun_produces_identical_statements(self):
+        """Building twice yields the same statements, so MERGE makes writes idempotent."""
+        portfolio = Portfolio(name="Growth")
+        portfolio.add_position(Position(ticker="AAPL-US", quantity=10, book_value=1500.0))
+
+        first, second = GraphBuilder(), GraphBuilder()
+        first.add_position_nodes(portfolio.positions, portfolio.name)
+        second.add_position_nodes(portfolio.positions, portfolio.name)
+
+        assert first.get_all_statements() == second.get_all_statements()
+        assert not any("CREATE" in stmt for stmt in first.get_all_statements())
+
+    def test_invested_in_keyed_by_position_id(self):
+        """Duplicate tickers in one portfolio resolve to separate INVESTED_IN matches."""
+        portfolio = Portfolio(name="Growth")
+        portfolio.add_position(Position(ticker="AAPL-US", quantity=10, book_value=1500.0))
+        portfolio.add_position(Position(ticker="AAPL-US", quantity=5, book_value=900.0))
+        portfolio.add_position(Position(cusip="037833100", quantity=1000, book_value=1e5,
+                                        security_type="Corporate Bond"))
+        stocks = {"AAPL-US": Stock(fibo_id="fibo:stock:AAPL-US", ticker="AAPL-US")}
+        bonds = {"037833100": Bond(fibo_id="fibo:bond:037833100", cusip="037833100")}
+        pipeline = ETLPipeline(
+            factset_client=MagicMock(),
+            portfolio_loader=MagicMock(),
+            graph_builder=GraphBuilder(),
+        )
+
+        statements = pipeline.build_graph(portfolio, stocks, bonds, {}, {}, {})
+
+        invested = [s for s in statements if "MERGE (pos)-[:INVESTED_IN]" in s]
+        assert len(invested) == 3
+        for position in portfolio.positions:
+            position_id = position.get_position_id("Growth")
+            assert sum(position_id in s for s in invested) == 1
+
+    def test_position_id_indexed(self):
+        """position_id lookups are backed by an index."""
+        assert "CREATE INDEX ON :Position(position_id);" in IndexDefinition.get_indexes()
@@ -0,0 +1,127 @@
+"""Tests for the reprice-only refresh."""
+
+from unittest.mock import MagicMock
+
+import pytest
+
+from pagr.fds.clients.factset_client import FactSetClient
+from pagr.fds.graph.queries import GraphQueries, QueryService
+from pagr.fds.services.price_refresh import PriceRefreshService
+from pagr.fds.services.pricing import PriceFetcher
+
+
+SECURITIES = [
+    {"label": "Stock", "fibo_id": "fibo:stock:AAPL-US", "ticker": "AAPL-US", "cusip": None, "isin": None},
+    {"label": "Stock", "fibo_id": "fibo:stock:MSFT-US", "ticker": "MSFT-US", "cusip": None, "isin": None},
+    {"label": "Bond", "fibo_id": "fibo:bond:037833AA5", "ticker": None, "cusip": "037833AA5", "isin": "US037833AA56"},
+]
+
+POSITIONS = [
+    {"portfolio": "Growth", "position_id": "pos:1", "ticker": "AAPL-US", "cusip": None, "isin": None,
+     "quantity": 10.0, "book_value": 1000.0, "market_value": 1400.0},
+    {"portfolio": "Growth", "position_id": "pos:2", "ticker": "", "cusip": "037833AA5", "isin": "US037833AA56",
+     "quantity": 100.0, "book_value": 10000.0, "market_value": 9700.0},
+    {"portfolio": "Income", "position_id": "pos:3", "ticker": "AAPL-US", "cusip": None, "isin": None,
+     "quantity": 5.0, "book_value": 500.0, "market_value": None},
+    {"portfolio": "Income", "position_id": "pos:4", "ticker": "MSFT-US", "cusip": None, "isin": None,
+     "quantity": 5.0, "book_value": 500.0, "market_value": None},
+    {"portfolio": "Income", "position_id": None, "ticker": "MSFT-US", "cusip": None, "isin": None,
+     "quantity": 1.0, "book_value": 1.0, "market_value": None},
+]
+
+
+def make_graph():
+    """Mock graph client answering the repricing reads."""
+    graph = MagicMock()
+
+    def execute_query(query, parameters=None):
+        if query == GraphQueries.priced_securities():
+            return SECURITIES
+        if query == GraphQueries.positions_for_repricing():
+            return POSITIONS
+        return []
+
+    graph.execute_query.side_effect = execute_query
+    return graph
+
+
+def make_fetcher():
+    """Price fetcher over a mock FactSet client."""
+    client = MagicMock(spec=FactSetClient)
+    client.get_last_close_prices.return_value = {"data": [
+        {"requestId": "AAPL-US", "price": 149.0, "date": "2025-11-28"},
+        {"requestId": "AAPL-US", "price": 150.0, "date": "2025-12-01"},
+    ]}
+    client.get_bond_prices_formula_api.return_value = {"data": {"037833AA5": {"price": 98.5}}}
+    return PriceFetcher(client), client
+
+
+def writes(graph, query):
+    """Rows passed to every execution of a parameterized write."""
+    return [
+        c.args[1]["rows"] for c in graph.execute_query.call_args_list
+        if c.args[0] == query and len(c.args) > 1
+    ]
+
+
+class TestPriceRefreshService:
+    """Test PriceRefreshService.refresh."""
+
+    def test_prices_each_identifier_once(self):
+        """Securities are priced once each, deduplicated across portfolios."""
+        graph = make_graph()
+        fetcher, client = make_fetcher()
+
+        PriceRefreshService(graph, fetcher).refresh()
+
+        client.get_last_close_prices.assert_called_once_with(["AAPL-US", "MSFT-US"])
+        client.get_bond_prices_formula_api.assert_called_once_with(["037833AA5"])
+
+    def test_unwind_writes(self):
+        """Prices, market values, weights and totals are written with UNWIND."""
+        graph = make_graph()
+        fetcher, _ = make_fetcher()
+
+        result = PriceRefreshService(graph, fetcher).refresh()
+
+        [stocks] = writes(graph, GraphQueries.update_security_prices("Stock"))
+        assert stocks == [{"fibo_id": "fibo:stock:AAPL-US", "price": 150.0, "date": "2025-12-01"}]
+        [bonds] = writes(graph, GraphQueries.update_security_prices("Bond"))
+        assert bonds == [{"fibo_id": "fibo:bond:037833AA5", "price": 98.5, "date": None}]
+
+        [positions] = writes(graph, GraphQueries.update_position_values())
+        by_id = {row["position_id"]: row for row in positions}
+        assert by_id["pos:1"]["market_value"] == 1500.0
+        assert by_id["pos:2"]["market_value"] == 9850.0
+        assert by_id["pos:1"]["weight"] == pytest.approx(1500.0 / 11350.0 * 100)
+        # MSFT has no price: it keeps no market value and weighs zero
+        assert by_id["pos:3"]["weight"] == 100.0
+        assert by_id["pos:4"]["market_value"] is None and by_id["pos:4"]["weight"] == 0.0
+
+        [portfolios] = writes(graph, GraphQueries.update_portfolio_totals())
+        assert {row["name"]: row["total_value"] for row in portfolios} == {"Growth": 11350.0, "Income": 750.0}
+
+        assert (result.securities_priced, result.positions_updated, result.portfolios_updated) == (2, 4, 2)
+
+    def test_invalidates_exposures(self):
+        """Exposure aggregates are rebuilt and query caches dropped."""
+        graph = make_graph()
+        fetcher, _ = make_fetcher()
+        query_service = MagicMock(spec=QueryService)
+
+        PriceRefreshService(graph, fetcher, query_service=query_service).refresh()
+
+        query_service.refresh_exposure_aggregates.assert_called_once_with()
+        query_service.invalidate_caches.assert_called_once_with()
+
+    def test_no_prices_leaves_graph_untouched(self):
+        """A failed price fetch performs no writes."""
+        graph = make_graph()
+        fetcher, client = make_fetcher()
+        client.get_last_close_prices.side_effect = Exception("down")
+        client.get_bond_prices_formula_api.return_value = {"data": {}}
+
+        result = PriceRefreshService(graph, fetcher).refresh()
+
+        assert all(len(c.args) == 1 for c in graph.execute_query.call_args_list)
+        assert result.errors == ["Stock price enrichment failed: down"]
@@ -0,0 +1,188 @@
+"""Tests for the local price history store."""
+
+from datetime import date, timedelta
+from unittest.mock import MagicMock
+
+import pandas as pd
+import pytest
+
+from pagr.fds.clients.factset_client import FactSetClient
+from pagr.fds.services.price_store import (
+    PriceStore,
+    annualized_volatility,
+    daily_returns,
+    position_pnl,
+)
+from pagr.fds.services.pricing import PRICE_COLUMNS, PriceFetcher
+
+
+def history(ids, start_date, end_date, id_type=None):
+    """Fake global prices history: one price per weekday, rising by 1 a day."""
+    items = []
+    day = date.fromisoformat(start_date)
+    while day <= date.fromisoformat(end_date):
+        if day.weekday() < 5:
+            for offset, identifier in enumerate(ids):
+                items.append({
+                    "requestId": identifier,
+                    "date": day.isoformat(),
+                    "price": 100.0 + offset * 10 + day.toordinal() % 100,
+                    "currency": "USD",
+                })
+        day += timedelta(days=1)
+    return {"data": items}
+
+
+def make_fetcher():
+    """Price fetcher over a mock client serving fake history."""
+    client = MagicMock(spec=FactSetClient)
+    client.get_price_history.side_effect = history
+    return PriceFetcher(client), client
+
+
+def table(rows):
+    """Price table from (identifier, date, price) tuples."""
+    return pd.DataFrame(
+        [(i, d, p, "USD", "global_prices") for i, d, p in rows], columns=PRICE_COLUMNS
+    )
+
+
+class TestPriceStore:
+    """Test storage, incremental fill and lookup."""
+
+    def test_upsert_and_range_lookup(self):
+        """Prices are keyed by (identifier, date); re-inserting replaces."""
+        store = PriceStore()
+        store.upsert(table([
+            ("AAPL-US", "2025-12-01", 150.0),
+            ("AAPL-US", "2025-12-02", 151.0),
+            ("MSFT-US", "2025-12-01", 400.0),
+        ]))
+        store.upsert(table([("AAPL-US", "2025-12-02", 152.0)]))
+
+        prices = store.get_prices(["AAPL-US"], "2025-12-02", "2025-12-31")
+
+        assert prices[["identifier", "date", "price"]].values.tolist() == [["AAPL-US", "2025-12-02", 152.0]]
+
+    def test_undated_rows_use_as_of(self):
+        """Undated prices are stored against as_of, or dropped without it."""
+        store = PriceStore()
+        undated = table([("037833AA5", None, 98.5)])
+
+        assert store.upsert(undated) == 0
+        assert store.upsert(undated, as_of="2025-12-01") == 1
+        assert store.get_prices(["037833AA5"], "2025-12-01", "2025-12-01")["price"].tolist() == [98.5]
+
+    def test_fill_only_fetches_missing_dates(self):
+        """A second fill over a wider window only requests the new edges."""
+        store = PriceStore()
+        fetcher, client = make_fetcher()
+
+        store.fill(fetcher, ["AAPL-US", "MSFT-US"], "2025-12-01", "2025-12-05")
+        client.get_price_history.assert_called_once_with(
+            ["AAPL-US", "MSFT-US"], "2025-12-01", "2025-12-05", id_type=None
+        )
+
+        client.get_price_history.reset_mock()
+        store.fill(fetcher, ["AAPL-US", "MSFT-US"], "2025-12-01", "2025-12-05")
+        client.get_price_history.assert_not_called()
+
+        store.fill(fetcher, ["AAPL-US", "NVDA-US"], "2025-11-24", "2025-12-12")
+        calls = sorted(c.args for c in client.get_price_history.call_args_list)
+        assert calls == [
+            (["AAPL-US"], "2025-11-24", "2025-11-30"),
+            (["AAPL-US"], "2025-12-06", "2025-12-12"),
+            (["NVDA-US"], "2025-11-24", "2025-12-12"),
+        ]
+        assert store.coverage(["AAPL-US"]) == {"AAPL-US": ("2025-11-24", "2025-12-12")}
+
+    def test_disjoint_fills_fetch_the_gap(self):
+        """A window after the coverage also fetches the dates in between."""
+        store = PriceStore()
+        fetcher, client = make_fetcher()
+
+        store.fill(fetcher, ["AAPL-US"], "2024-01-01", "2024-01-31")
+        store.fill(fetcher, ["AAPL-US"], "2024-06-01", "2024-06-30")
+        assert client.get_price_history.call_args.args == (["AAPL-US"], "2024-02-01", "2024-06-30")
+
+        client.get_price_history.reset_mock()
+        assert not store.get_prices(["AAPL-US"], "2024-03-01", "2024-03-31").empty
+        store.fill(fetcher, ["AAPL-US"], "2024-03-01", "2024-03-31")
+        client.get_price_history.assert_not_called()
+
+    def test_failed_fill_is_retried(self):
+        """A failed request leaves coverage untouched."""
+        store = PriceStore()
+        fetcher, client = make_fetcher()
+        client.get_price_history.side_effect = Exception("down")
+
+        assert store.fill(fetcher, ["AAPL-US"], "2025-12-01", "2025-12-05") == 0
+        assert store.coverage(["AAPL-US"]) == {}
+
+    def test_today_not_marked_covered(self):
+        """Today's close may not be final, so it is fetched again next time."""
+        store = PriceStore()
+        fetcher, _ = make_fetcher()
+        today = date.today()
+
+        store.fill(fetcher, ["AAPL-US"], (today - timedelta(days=10)).isoformat(), today.isoformat())
+
+        _, covered_end = store.coverage(["AAPL-US"])["AAPL-US"]
+        assert covered_end == (today - timedelta(days=1)).isoformat()
+
+    def test_persists_to_file(self, tmp_path):
+        """A file-backed store keeps prices and coverage across instances."""
+        path = str(tmp_path / "prices" / "prices.sqlite")
+        store = PriceStore(path)
+        fetcher, client = make_fetcher()
+        store.fill(fetcher, ["AAPL-US"], "2025-12-01", "2025-12-05")
+        store.close()
+
+        reopened = PriceStore(path)
+        client.get_price_history.reset_mock()
+        reopened.fill(fetcher, ["AAPL-US"], "2025-12-01", "2025-12-05")
+
+        client.get_price_history.assert_not_called()
+        assert len(reopened.get_prices(["AAPL-US"], "2025-12-01", "2025-12-05")) == 5
+
+
+class TestAnalytics:
+    """Test matrix-based return and P&L calculations."""
+
+    def make_matrix(self):
+        store = PriceStore()
+        store.upsert(table([
+            ("AAPL-US", "2025-12-01", 100.0),
+            ("AAPL-US", "2025-12-02", 110.0),
+            ("AAPL-US", "2025-12-03", 99.0),
+            ("MSFT-US", "2025-12-02", 200.0),
+            ("MSFT-US", "2025-12-03", 210.0),
+        ]))
+        return store.price_matrix(["MSFT-US", "AAPL-US", "NVDA-US"], "2025-12-01", "2025-12-31")
+
+    def test_price_matrix(self):
+        """Columns follow the requested order; missing prices are NaN."""
+        matrix = self.make_matrix()
+
+        assert list(matrix.columns) == ["MSFT-US", "AAPL-US", "NVDA-US"]
+        assert isinstance(matrix.index, pd.DatetimeIndex)
+        assert matrix["NVDA-US"].isna().all()
+
+    def test_returns_and_volatility(self):
+        """Daily returns and annualized volatility per identifier."""
+        matrix = self.make_matrix()
+
+        returns = daily_returns(matrix)
+        volatility = annualized_volatility(matrix)
+
+        assert returns["AAPL-US"].tolist() == pytest.approx([0.1, -0.1])
+        assert returns["MSFT-US"].iloc[-1] == pytest.approx(0.05)
+        assert volatility["AAPL-US"] == pytest.approx(pd.Series([0.1, -0.1]).std() * 252 ** 0.5)
+
+    def test_position_pnl(self):
+        """P&L uses each identifier's first and last available price."""
+        pnl = position_pnl({"AAPL-US": 10, "MSFT-US": 2}, self.make_matrix())
+
+        assert pnl["AAPL-US"] == pytest.approx(-10.0)
+        assert pnl["MSFT-US"] == pytest.approx(20.0)
+        assert pd.isna(pnl["NVDA-US"])
@@ -0,0 +1,130 @@
+"""Tests for the columnar price table and vectorized price application."""
+
+from datetime import date
+from unittest.mock import MagicMock
+
+from pagr.fds.clients.factset_client import FactSetClient
+from pagr.fds.models.portfolio import Portfolio, Position
+from pagr.fds.services.pipeline import ETLPipeline
+from pagr.fds.services.price_store import PriceStore
+from pagr.fds.services.pricing import PRICE_COLUMNS, PriceFetcher, latest_prices
+
+
+STOCK_WINDOW = {
+    "data": [
+        {"requestId": "AAPL-US", "price": 148.0, "date": "2025-11-28", "currency": "USD"},
+        {"requestId": "AAPL-US", "price": 150.0, "date": "2025-12-01", "currency": "USD"},
+        {"requestId": "AAPL-US", "price": 149.0, "date": "2025-11-27", "currency": "USD"},
+        {"requestId": "MSFT-US", "price": 100.0, "date": "2025-12-01", "currency": "USD"},
+        {"requestId": "MSFT-US", "price": None, "date": "2025-12-02", "currency": "USD"},
+    ]
+}
+
+
+def make_client():
+    """Mock FactSet client with stock and bond prices."""
+    client = MagicMock(spec=FactSetClient)
+    client.get_last_close_prices.return_value = STOCK_WINDOW
+    client.get_bond_prices_formula_api.return_value = {"data": {"037833AA5": {"price": 98.5}}}
+    client.get_bond_prices.return_value = {
+        "data": [{"requestId": "US912828Z772", "price": 101.25, "date": "2025-12-01"}]
+    }
+    return client
+
+
+def make_portfolio():
+    """Stocks plus a CUSIP bond and an ISIN-only bond."""
+    portfolio = Portfolio(name="Test")
+    portfolio.add_positions([
+        Position(ticker="AAPL-US", quantity=10, book_value=1000.0),
+        Position(ticker="MSFT-US", quantity=20, book_value=2000.0),
+        Position(cusip="037833AA5", quantity=100, book_value=10000.0, security_type="Corporate Bond"),
+        Position(isin="US912828Z772", quantity=10, book_value=1000.0, security_type="Treasury Bond"),
+    ])
+    return portfolio
+
+
+class TestPriceFetcher:
+    """Test PriceFetcher output."""
+
+    def test_keeps_full_history_window(self):
+        """Every dated price is kept, with source and currency."""
+        table = PriceFetcher(make_client()).fetch(make_portfolio().positions)
+
+        assert list(table.columns) == PRICE_COLUMNS
+        aapl = table[table["identifier"] == "AAPL-US"]
+        assert sorted(aapl["date"]) == ["2025-11-27", "2025-11-28", "2025-12-01"]
+        assert set(table["source"]) == {"global_prices", "formula_api"}
+        # Null prices are dropped
+        assert len(table[table["identifier"] == "MSFT-US"]) == 1
+
+    def test_latest_prices(self):
+        """The newest dated price per identifier wins."""
+        table = PriceFetcher(make_client()).fetch(make_portfolio().positions)
+
+        latest = latest_prices(table).set_index("identifier")["price"]
+
+        assert latest.to_dict() == {
+            "AAPL-US": 150.0,
+            "MSFT-US": 100.0,
+            "037833AA5": 98.5,
+            "US912828Z772": 101.25,
+        }
+
+    def test_formula_api_failure_falls_back(self):
+        """A failing Formula API batch falls back to global prices per CUSIP."""
+        client = make_client()
+        client.get_bond_prices_formula_api.side_effect = Exception("boom")
+        client.get_bond_prices.return_value = {"data": [{"price": 97.0, "date": "2025-12-01"}]}
+
+        table = PriceFetcher(client).fetch(make_portfolio().positions)
+
+        client.get_bond_prices.assert_any_call(["037833AA5"], id_type="CUSIP")
+        assert table[table["identifier"] == "037833AA5"]["price"].tolist() == [97.0]
+
+    def test_stock_failure_recorded(self):
+        """Stock request failures are reported through errors."""
+        client = make_client()
+        client.get_last_close_prices.side_effect = Exception("down")
+        fetcher = PriceFetcher(client)
+
+        table = fetcher.fetch([Position(ticker="AAPL-US", quantity=1, book_value=1.0)])
+
+        assert table.empty
+        assert fetcher.errors == ["Stock price enrichment failed: down"]
+
+
+class TestEnrichPrices:
+    """Test ETLPipeline.enrich_prices with the price table."""
+
+    def test_prices_applied_and_history_kept(self):
+        """Market values come from the latest prices; the history stays on the pipeline."""
+        pipeline = ETLPipeline(
+            factset_client=make_client(),
+            portfolio_loader=MagicMock(),
+            graph_builder=MagicMock(),
+        )
+        portfolio = make_portfolio()
+
+        pipeline.enrich_prices(portfolio)
+
+        assert [p.market_value for p in portfolio.positions] == [1500.0, 2000.0, 9850.0, 1012.5]
+        assert portfolio.total_value == 14362.5
+        assert len(pipeline.price_history) == 6
+        assert pipeline.stats.errors == []
+
+    def test_history_saved_to_price_store(self):
+        """Fetched prices are written to the price store, undated ones as of today."""
+        store = PriceStore()
+        pipeline = ETLPipeline(
+            factset_client=make_client(),
+            portfolio_loader=MagicMock(),
+            graph_builder=MagicMock(),
+            price_store=store,
+        )
+
+        pipeline.enrich_prices(make_portfolio())
+
+        today = date.today().isoformat()
+        assert len(store.get_prices(["AAPL-US"], "2025-01-01", today)) == 3
+        assert store.get_prices(["037833AA5"], today, today)["price"].tolist() == [98.5]
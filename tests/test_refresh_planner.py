@@ -0,0 +1,160 @@
+"""Tests for node freshness metadata and the TTL-based refresh planner."""
+
+from datetime import datetime, timedelta, timezone
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from pagr import cli
+from pagr.fds.config import FIBOConfig, FreshnessConfig
+from pagr.fds.enrichers.hierarchy_crawler import HierarchyResult
+from pagr.fds.graph.builder import GraphBuilder
+from pagr.fds.graph.queries import GraphQueries
+from pagr.fds.models.fibo import Company, Relationship, Stock
+from pagr.fds.services.price_refresh import PriceRefreshResult
+from pagr.fds.services.refresh_planner import RefreshPlan, RefreshPlanner, RefreshResult
+
+NOW = datetime(2026, 3, 2, 12, 0, tzinfo=timezone.utc)
+APPLE = Company(fibo_id="fibo:company:AAPL", factset_id="000C7F-E", name="Apple Inc.", ticker="AAPL")
+
+
+def make_planner(graph=None, fibo_config=None, **config):
+    """Planner over a mocked graph, pipeline and price refresh service."""
+    pipeline = MagicMock(fibo_config=fibo_config or FIBOConfig(), graph_builder=GraphBuilder())
+    pipeline.stats.errors = []
+    price_refresh = MagicMock()
+    price_refresh.refresh.return_value = PriceRefreshResult(securities_priced=1)
+    return RefreshPlanner(graph or MagicMock(), pipeline, price_refresh, config=FreshnessConfig(**config))
+
+
+class TestFreshnessMetadata:
+    """Test that enriched nodes are stamped with source and fetch times."""
+
+    def test_enriched_nodes_carry_source_and_timestamps(self):
+        """Company and security MERGEs set source, fetched_at and created/updated times."""
+        builder = GraphBuilder()
+        builder.add_company_nodes({"AAPL": APPLE})
+        builder.add_security_nodes(
+            {"AAPL": Stock(fibo_id="fibo:stock:AAPL", ticker="AAPL", isin="US0378331005", market_price=190.0)}
+        )
+        company, stock = builder.node_statements
+
+        assert f"ON CREATE SET c.created_at = '{builder.timestamp}' SET c.name" in company
+        assert f"c.source = 'factset', c.fetched_at = '{builder.timestamp}'" in company
+        assert f"c.updated_at = '{builder.timestamp}'" in company
+        assert "s.isin = 'US0378331005'" in stock
+        assert f"s.market_price = 190.0, s.priced_at = '{builder.timestamp}'" in stock
+
+    def test_earlier_fetch_time_is_kept(self):
+        """Entities served from the registry keep their original fetched_at."""
+        builder = GraphBuilder()
+        builder.fetched_at[APPLE.fibo_id] = "2026-02-01T00:00:00+00:00"
+        builder.add_company_nodes({"AAPL": APPLE})
+        builder.add_hierarchy_refreshed(["000C7F-E", None])
+
+        assert "c.fetched_at = '2026-02-01T00:00:00+00:00'" in builder.node_statements[0]
+        assert builder.node_statements[1] == (
+            f"MATCH (c:Company) WHERE c.factset_id IN ['000C7F-E'] "
+            f"SET c.hierarchy_fetched_at = '{builder.timestamp}';"
+        )
+
+
+class TestRefreshPlanner:
+    """Test TTL selection and bounded batch refresh."""
+
+    def test_plan_uses_per_type_ttls(self):
+        """Each type is selected with its own cutoff and the per-run limit."""
+        graph = MagicMock()
+        graph.execute_query.return_value = [{"fibo_id": "x"}]
+        planner = make_planner(graph, price_ttl_minutes=30, profile_ttl_days=14, hierarchy_ttl_days=90,
+                               max_refresh_per_run=50)
+
+        plan = planner.plan(now=NOW)
+
+        calls = {c.args[0]: c.args[1] for c in graph.execute_query.call_args_list}
+        assert calls[GraphQueries.stale_securities("priced_at")] == {
+            "cutoff": (NOW - timedelta(minutes=30)).isoformat(), "limit": 50,
+        }
+        assert calls[GraphQueries.stale_securities("fetched_at")]["cutoff"] == (NOW - timedelta(days=14)).isoformat()
+        assert calls[GraphQueries.stale_hierarchies()]["cutoff"] == (NOW - timedelta(days=90)).isoformat()
+        assert plan.to_dict() == {"planned_at": NOW.isoformat(), "prices": 1, "profiles": 1, "hierarchy": 1}
+
+    def test_plan_subset_and_validation(self):
+        """Only requested kinds are queried; hierarchies are skipped when crawling is off."""
+        graph = MagicMock()
+        planner = make_planner(graph, fibo_config=FIBOConfig(fetch_subsidiaries=False))
+
+        planner.plan(kinds=["hierarchy"], now=NOW)
+
+        graph.execute_query.assert_not_called()
+        with pytest.raises(ValueError):
+            planner.plan(kinds=["quotes"])
+
+    def test_execute_refreshes_each_type(self):
+        """Prices are repriced, profiles re-enriched and hierarchies re-crawled."""
+        graph = MagicMock()
+        graph.execute_transactions.side_effect = lambda statements, batch_size: len(statements)
+        planner = make_planner(graph)
+        pipeline = planner.pipeline
+        stock = Stock(fibo_id="fibo:stock:AAPL", ticker="AAPL", security_type="Common Stock")
+        pipeline.enrich_positions.return_value = ({"AAPL": stock}, {}, {"AAPL": APPLE}, {}, {})
+        pipeline.build_entity_graph.return_value = ["MERGE (s:Stock ...);"]
+        pipeline.hierarchy_crawler.crawl.return_value = HierarchyResult(
+            relationships=[Relationship(
+                rel_type="HAS_SUBSIDIARY", source_fibo_id="fibo:company:P", target_fibo_id=APPLE.fibo_id,
+                source_type="company", target_type="company",
+            )],
+            companies={"fibo:company:P": Company(fibo_id="fibo:company:P", factset_id="P", name="Parent")},
+            crawled=["000C7F-E", "P"],
+        )
+        prices = [{"label": "Stock", "fibo_id": "fibo:stock:AAPL", "ticker": "AAPL"}]
+        plan = RefreshPlan(
+            prices=prices,
+            profiles=prices + [{"label": "Bond", "fibo_id": "fibo:bond:X", "cusip": "037833AA5", "isin": None}],
+            hierarchy=[{"fibo_id": APPLE.fibo_id, "factset_id": "000C7F-E"}],
+        )
+
+        result = planner.execute(plan)
+
+        planner.price_refresh.refresh.assert_called_once_with(prices)
+        [positions] = pipeline.enrich_positions.call_args.args
+        assert [(p.ticker, p.cusip) for p in positions] == [("AAPL", None), (None, "037833AA5")]
+        pipeline.hierarchy_crawler.reset.assert_called_once()
+        pipeline.hierarchy_crawler.crawl.assert_called_once_with(["000C7F-E"])
+        hierarchy_statements = graph.execute_transactions.call_args_list[1].args[0]
+        assert any("hierarchy_fetched_at" in s and "'000C7F-E', 'P'" in s for s in hierarchy_statements)
+        planner.price_refresh.query_service.refresh_exposure_aggregates.assert_called_once()
+
+        assert (result.prices_refreshed, result.profiles_refreshed, result.hierarchies_refreshed) == (1, 1, 1)
+        assert result.errors == []
+
+    def test_failure_in_one_type_does_not_stop_others(self):
+        """A failing profile refresh is reported and hierarchies still run."""
+        planner = make_planner()
+        planner.pipeline.enrich_positions.side_effect = RuntimeError("quota exceeded")
+        planner.pipeline.hierarchy_crawler.crawl.return_value = HierarchyResult(crawled=["000C7F-E"])
+
+        result = planner.execute(RefreshPlan(
+            profiles=[{"label": "Stock", "fibo_id": "fibo:stock:AAPL", "ticker": "AAPL"}],
+            hierarchy=[{"fibo_id": APPLE.fibo_id, "factset_id": "000C7F-E"}],
+        ))
+
+        assert result.errors == ["Profile refresh failed: quota exceeded"]
+        assert result.hierarchies_refreshed == 1
+
+
+class TestRefreshCli:
+    """Test the pagr refresh command."""
+
+    def test_refresh_passes_kinds_and_limit(self, tmp_path):
+        """Kinds and limit reach ETLManager.refresh_stale and the report is written."""
+        report_path = tmp_path / "refresh.json"
+        manager = MagicMock()
+        manager.refresh_stale.return_value = RefreshResult(prices_refreshed=3)
+
+        with patch("pagr.etl_manager.ETLManager", return_value=manager):
+            code = cli.main(["refresh", "--kind", "prices", "--limit", "10", "--report", str(report_path)])
+
+        assert code == cli.EXIT_OK
+        manager.refresh_stale.assert_called_once_with(kinds=["prices"], limit=10)
+        assert '"prices_refreshed": 3' in report_path.read_text()
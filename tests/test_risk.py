@@ -0,0 +1,183 @@
+"""Tests for Monte Carlo VaR / expected shortfall."""
+
+from datetime import date, timedelta
+from unittest.mock import Mock
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from pagr.fds.config import RiskConfig
+from pagr.fds.services.price_store import PriceStore
+from pagr.fds.services.pricing import PRICE_COLUMNS
+from pagr.fds.services.risk import CovarianceModel, MonteCarloSimulator, RiskService
+
+
+def returns_frame(n_days=400, seed=1):
+    """Correlated daily returns for three tickers."""
+    rng = np.random.default_rng(seed)
+    market = rng.normal(0, 0.01, n_days)
+    return pd.DataFrame(
+        {
+            "AAA": market + rng.normal(0, 0.005, n_days),
+            "BBB": market + rng.normal(0, 0.005, n_days),
+            "CCC": rng.normal(0, 0.02, n_days),
+        }
+    )
+
+
+def store_with_history(end="2025-12-31", n_days=300):
+    """Price store holding a random walk per ticker up to end."""
+    returns = returns_frame(n_days)
+    prices = 100 * (1 + returns).cumprod()
+    last = date.fromisoformat(end)
+    dates = [(last - timedelta(days=n_days - 1 - i)).isoformat() for i in range(n_days)]
+    rows = [
+        (ticker, day, float(price), "USD", "global_prices")
+        for ticker in prices.columns
+        for day, price in zip(dates, prices[ticker])
+    ]
+    store = PriceStore()
+    store.upsert(pd.DataFrame(rows, columns=PRICE_COLUMNS))
+    return store
+
+
+def record(position_id, ticker, sector, country, market_value):
+    """Scenario exposure record."""
+    return {
+        "position_id": position_id, "ticker": ticker, "cusip": None, "isin": None,
+        "security_id": f"fibo:sec:{ticker}", "issuer_id": f"fibo:co:{ticker}",
+        "issuer_ticker": ticker, "issuer_name": ticker, "sector": sector,
+        "country": country, "market_value": market_value,
+    }
+
+
+RECORDS = [
+    record("pos:1", "AAA", "Technology", "US", 1000.0),
+    record("pos:2", "BBB", "Technology", "GB", 2000.0),
+    record("pos:3", "CCC", "Energy", "US", 500.0),
+    record("pos:4", "NEW", "Energy", "US", 500.0),
+]
+
+
+class TestSimulator:
+    """Test path generation and the risk measures."""
+
+    def test_var_matches_normal_quantile(self):
+        """A single normal holding has VaR close to z * sigma * value."""
+        model = CovarianceModel(loadings=np.array([[0.02]]), kind="historical", observations=0)
+        simulator = MonteCarloSimulator(RiskConfig(paths=200_000, chunk_size=50_000, seed=7))
+
+        total, _ = simulator.simulate(model, np.array([1000.0]))
+        measure = simulator.measure(total, "portfolio", "p", 1000.0)
+
+        assert len(total) == 200_000
+        assert measure.var[0.99] == pytest.approx(2.326 * 20.0, rel=0.02)
+        assert measure.es[0.99] == pytest.approx(2.665 * 20.0, rel=0.03)
+        assert measure.es[0.95] < measure.es[0.99]
+
+    def test_reproducible_across_workers(self):
+        """The seed fixes the result regardless of thread count."""
+        model = CovarianceModel.historical(returns_frame(), ["AAA", "BBB", "CCC"])
+        values = np.array([1000.0, 2000.0, 500.0])
+
+        single, _ = MonteCarloSimulator(RiskConfig(paths=10_000, chunk_size=1_000, seed=3)).simulate(model, values)
+        threaded, _ = MonteCarloSimulator(
+            RiskConfig(paths=10_000, chunk_size=1_000, seed=3, workers=4)
+        ).simulate(model, values)
+
+        np.testing.assert_array_equal(single, threaded)
+
+    def test_horizon_scales_by_root_time(self):
+        """A 4-day horizon doubles the standard deviation."""
+        model = CovarianceModel(loadings=np.array([[0.01]]), kind="historical", observations=0)
+        one_day, _ = MonteCarloSimulator(RiskConfig(paths=50_000, seed=1)).simulate(model, np.array([100.0]))
+        four_day, _ = MonteCarloSimulator(RiskConfig(paths=50_000, seed=1, horizon_days=4)).simulate(
+            model, np.array([100.0])
+        )
+
+        np.testing.assert_allclose(four_day, 2 * one_day)
+
+
+class TestCovarianceModels:
+    """Test covariance estimation."""
+
+    def test_historical_matches_sample_covariance(self):
+        """The historical model reproduces the sample covariance, zero for missing."""
+        returns = returns_frame()
+        model = CovarianceModel.historical(returns, ["AAA", "BBB", "NEW"])
+
+        np.testing.assert_allclose(model.covariance[:2, :2], returns[["AAA", "BBB"]].cov().to_numpy(), atol=1e-12)
+        assert model.covariance[2, 2] == 0.0
+        assert model.missing == ["NEW"]
+
+    def test_factor_model_covers_missing_history(self):
+        """A holding without history keeps its sector and country risk."""
+        model = CovarianceModel.factor(
+            returns_frame(), ["AAA", "BBB", "CCC", "NEW"],
+            sector_codes=np.array([0, 0, 1, 1]), country_codes=np.array([0, 1, 0, 0]),
+        )
+
+        covariance = model.covariance
+        assert covariance[3, 3] > 0
+        # Same sector, correlated through the sector factor
+        assert covariance[0, 1] > 0
+        assert model.missing == ["NEW"]
+
+
+class TestRiskService:
+    """Test per-portfolio and per-bucket reports."""
+
+    def make_service(self, **config):
+        graph = Mock()
+        graph.execute_query.return_value = RECORDS
+        return RiskService(graph, store_with_history(), RiskConfig(paths=20_000, seed=11, **config))
+
+    def test_report_by_bucket(self):
+        """VaR is reported for the portfolio and each sector and country."""
+        report = self.make_service().portfolio_risk("Growth", as_of="2025-12-31")
+
+        buckets = {(b.kind, b.bucket): b for b in report.buckets}
+        assert set(buckets) == {
+            ("sector", "Technology"), ("sector", "Energy"), ("country", "US"), ("country", "GB"),
+        }
+        assert buckets[("sector", "Technology")].value == 3000.0
+        assert report.total.value == 4000.0
+        # Diversification: portfolio VaR below the sum of sector VaRs
+        assert 0 < report.total.var[0.99] < sum(
+            b.var[0.99] for b in report.buckets if b.kind == "sector"
+        )
+        assert report.missing_history == ["NEW"]
+        assert report.to_dict()["total"]["var_99"] == report.total.var[0.99]
+
+    def test_factor_model(self):
+        """The factor model runs off the same history."""
+        report = self.make_service().portfolio_risk("Growth", model="factor", as_of="2025-12-31")
+
+        energy = next(b for b in report.buckets if b.bucket == "Energy")
+        assert report.model == "factor"
+        assert energy.var[0.95] > 0
+
+    def test_history_filled_per_identifier_type(self):
+        """Bond CUSIPs and ISINs are requested with their id_type, not as tickers."""
+        graph = Mock()
+        graph.execute_query.return_value = RECORDS + [
+            {**record("pos:5", None, "Technology", "US", 300.0), "cusip": "037833AA5"},
+            {**record("pos:6", None, "Government", "US", 200.0), "isin": "US912828Z772"},
+        ]
+        store = store_with_history()
+        store.fill = Mock(return_value=0)
+        service = RiskService(graph, store, RiskConfig(paths=1_000, seed=11), price_fetcher=Mock())
+
+        service.portfolio_risk("Growth", as_of="2025-12-31")
+
+        assert {c.kwargs["id_type"]: c.args[1] for c in store.fill.call_args_list} == {
+            None: ["AAA", "BBB", "CCC", "NEW"],
+            "CUSIP": ["037833AA5"],
+            "ISIN": ["US912828Z772"],
+        }
+
+    def test_unknown_model(self):
+        """Unknown model kinds are rejected."""
+        with pytest.raises(ValueError):
+            self.make_service().portfolio_risk("Growth", model="garch")
@@ -0,0 +1,169 @@
+"""Tests for vectorized scenario shocks."""
+
+import time
+from unittest.mock import Mock
+
+import numpy as np
+import pytest
+
+from pagr.fds.graph.queries import GraphQueries, QueryService
+from pagr.fds.graph.scenario import ExposureMatrix, Scenario, ScenarioEngine, Shock
+
+
+def position(position_id, ticker, issuer, sector, country, market_value, cusip=None):
+    """Build a scenario exposure record."""
+    return {
+        "position_id": position_id,
+        "ticker": ticker,
+        "cusip": cusip,
+        "isin": None,
+        "security_id": f"fibo:sec:{ticker or cusip}",
+        "issuer_id": f"fibo:co:{issuer}" if issuer else None,
+        "issuer_ticker": issuer,
+        "issuer_name": f"{issuer} Inc." if issuer else None,
+        "sector": sector,
+        "country": country,
+        "market_value": market_value,
+    }
+
+
+RECORDS = [
+    position("pos:1", "AAPL-US", "AAPL-US", "Technology", "US", 1000.0),
+    position("pos:2", "MSFT-US", "MSFT-US", "Technology", "US", 2000.0),
+    position("pos:3", None, "AAPL-US", "Technology", "US", 500.0, cusip="037833AA5"),
+    position("pos:4", "TSM-TW", "TSM-TW", "Technology", "TW", 1500.0),
+    position("pos:5", "XOM-US", "XOM-US", "Energy", "US", 1000.0),
+    position("pos:6", "UNK", None, None, None, None),
+]
+
+
+@pytest.fixture
+def matrix():
+    return ExposureMatrix(RECORDS)
+
+
+def pnl_by_position(result):
+    return dict(zip(result.position_ids, result.position_pnl))
+
+
+class TestShocks:
+    """Test shock targeting and composition."""
+
+    def test_security_shock(self, matrix):
+        """A security shock matches by ticker or CUSIP."""
+        [result] = matrix.evaluate([Scenario("s", [Shock("security", "037833AA5", -0.1)])])
+
+        assert result.total_pnl == pytest.approx(-50.0)
+        assert pnl_by_position(result)["pos:3"] == pytest.approx(-50.0)
+
+    def test_issuer_shock_hits_stock_and_bond(self, matrix):
+        """An issuer shock reaches every security of the issuer."""
+        [result] = matrix.evaluate([Scenario("s", [Shock("issuer", "AAPL-US", -0.2)])])
+
+        pnl = pnl_by_position(result)
+        assert (pnl["pos:1"], pnl["pos:3"], pnl["pos:2"]) == pytest.approx((-200.0, -100.0, 0.0))
+
+    def test_sector_and_country(self, matrix):
+        """Sector and country shocks add up on overlapping positions."""
+        [result] = matrix.evaluate([
+            Scenario("s", [Shock("sector", "Technology", -0.1), Shock("country", "tw", -0.3)])
+        ])
+
+        pnl = pnl_by_position(result)
+        assert pnl["pos:4"] == pytest.approx(-1500.0 * 0.4)
+        assert pnl["pos:5"] == 0.0
+        assert result.total_pnl == pytest.approx(-(5000.0 * 0.1) - 1500.0 * 0.3)
+        assert result.pnl_pct == pytest.approx(result.total_pnl / 6000.0 * 100)
+
+    def test_multiplicative_composition(self, matrix):
+        """Compounded shocks multiply price relatives."""
+        [result] = matrix.evaluate([
+            Scenario(
+                "s",
+                [Shock("sector", "Technology", -0.1), Shock("country", "TW", -0.3)],
+                composition="multiplicative",
+            )
+        ])
+
+        assert pnl_by_position(result)["pos:4"] == pytest.approx(1500.0 * (0.9 * 0.7 - 1))
+
+    def test_unmatched_and_unenriched(self, matrix):
+        """Unknown targets are reported; positions without issuer data are untouched."""
+        [result] = matrix.evaluate([
+            Scenario("s", [Shock("sector", "Utilities", -0.5), Shock("sector", "Energy", 0.1)])
+        ])
+
+        assert result.total_pnl == pytest.approx(100.0)
+        assert result.to_dict()["unmatched_shocks"] == ["sector:Utilities"]
+        assert [p["position_id"] for p in result.to_dict()["positions"]] == ["pos:5"]
+
+    def test_invalid_shock(self):
+        """Unknown shock kinds and composition rules are rejected."""
+        with pytest.raises(ValueError):
+            Shock("region", "EMEA", -0.1)
+        with pytest.raises(ValueError):
+            Scenario("s", composition="max")
+
+    def test_batch_matches_individual(self, matrix):
+        """Evaluating a batch gives the same results as one at a time."""
+        rng = np.random.default_rng(0)
+        scenarios = [
+            Scenario(
+                f"s{i}",
+                [Shock("sector", "Technology", rng.normal(0, 0.1)), Shock("issuer", "XOM-US", rng.normal(0, 0.1))],
+                composition="multiplicative" if i % 2 else "additive",
+            )
+            for i in range(20)
+        ]
+
+        batch = [r.total_pnl for r in matrix.evaluate(scenarios)]
+        single = [matrix.evaluate([s])[0].total_pnl for s in scenarios]
+
+        assert batch == pytest.approx(single)
+
+    def test_hundreds_of_scenarios_per_second(self):
+        """Large batches evaluate as array operations."""
+        records = [
+            position(f"pos:{i}", f"T{i}", f"T{i}", f"S{i % 11}", f"C{i % 30}", 100.0 + i)
+            for i in range(2000)
+        ]
+        matrix = ExposureMatrix(records)
+        scenarios = [
+            Scenario(f"s{i}", [Shock("sector", f"S{i % 11}", -0.1), Shock("country", f"C{i % 30}", -0.05)])
+            for i in range(500)
+        ]
+
+        started = time.perf_counter()
+        results = matrix.evaluate(scenarios)
+        assert len(results) == 500
+        assert time.perf_counter() - started < 1.0
+
+
+class TestScenarioEngine:
+    """Test graph loading and caching."""
+
+    def test_loads_exposures_once(self):
+        """The exposure matrix is read once per portfolio until invalidated."""
+        client = Mock()
+        client.execute_query.return_value = RECORDS
+        service = QueryService(client)
+        scenarios = [Scenario("a", [Shock("sector", "Energy", -0.5)]), Scenario("b")]
+
+        first = service.scenario_analysis("Growth", scenarios)
+        service.scenario_analysis("Growth", scenarios)
+
+        client.execute_query.assert_called_once_with(GraphQueries.scenario_exposures("Growth"))
+        assert [r["total_pnl"] for r in first.records] == [-500.0, 0.0]
+
+        service.invalidate_caches()
+        service.scenario_analysis("Growth", scenarios)
+        assert client.execute_query.call_count == 2
+
+    def test_duplicate_positions_dropped(self):
+        """A position matched twice by the optional matches counts once."""
+        client = Mock()
+        client.execute_query.return_value = RECORDS + [RECORDS[0]]
+
+        [result] = ScenarioEngine(client).run("Growth", [Scenario("s", [Shock("issuer", "AAPL-US", -1.0)])])
+
+        assert result.total_pnl == pytest.approx(-1500.0)
@@ -0,0 +1,154 @@
+"""Tests for uploads that replace one portfolio's subgraph instead of the whole graph."""
+
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from pagr.etl_manager import ETLManager
+from pagr.fds.clients.memgraph_client import MemgraphQueryError
+from pagr.fds.graph.builder import GraphBuilder
+from pagr.fds.graph.queries import GraphQueries
+from pagr.fds.models.portfolio import Portfolio
+from pagr.fds.services.pipeline import PipelineStatistics
+
+
+class FakeGraph:
+    """Graph client recording queries, with a settable version stamp."""
+
+    def __init__(self, version=None):
+        self.version = version
+        self.is_connected = True
+        self.execute_query = MagicMock(side_effect=self._execute)
+        self.execute_transactions = MagicMock(side_effect=lambda statements, batch_size=1000: len(statements))
+
+    def _execute(self, query, params=None):
+        if query == GraphQueries.graph_version():
+            return [{"version": self.version}] if self.version else []
+        if query == GraphQueries.stamp_graph_version():
+            self.version = params["version"]
+        return []
+
+    def queries(self):
+        """Queries run so far, in order."""
+        return [c.args[0] for c in self.execute_query.call_args_list]
+
+
+def make_manager(graph):
+    """ETLManager over a fake graph with its collaborators mocked."""
+    manager = ETLManager()
+    manager._memgraph_client = graph
+    manager._factset_client = MagicMock()
+    manager._price_store = MagicMock()
+    manager._hierarchy_crawler = MagicMock()
+    manager._entity_registry = MagicMock()
+    manager._orphan_sweeper = MagicMock()
+    return manager
+
+
+class TestScopedUpload:
+    """Test that an upload only replaces its own portfolio."""
+
+    def test_upload_replaces_only_its_portfolio(self):
+        """No database wipe; the old subgraph is deleted in the write transaction."""
+        graph = FakeGraph()
+        manager = make_manager(graph)
+        statement = "MERGE (p:Portfolio {name: 'Growth'}) RETURN p;"
+
+        with patch("pagr.etl_manager.ETLPipeline") as pipeline_cls, \
+                patch("pagr.etl_manager.BondAnalyticsService") as bonds_cls:
+            pipeline_cls.return_value.execute.return_value = (
+                Portfolio(name="Growth"), [statement], PipelineStatistics(),
+            )
+            manager._run_pipeline("growth.csv", lambda stage, stats: None)
+
+        assert "MATCH (n) DETACH DELETE n" not in graph.queries()
+        manager._orphan_sweeper.delete_portfolio.assert_not_called()
+        graph.execute_transactions.assert_called_once_with(
+            GraphQueries.replace_portfolio("Growth") + [statement]
+        )
+        bonds_cls.return_value.refresh.assert_called_once_with(portfolio_names=["Growth"])
+        manager._entity_registry.mark_in_graph.assert_called_once()
+
+    def test_failed_write_fails_the_upload(self):
+        """A failed write transaction raises instead of reporting success."""
+        graph = FakeGraph()
+        manager = make_manager(graph)
+        graph.execute_transactions.side_effect = MemgraphQueryError("Transaction failed")
+
+        with patch("pagr.etl_manager.ETLPipeline") as pipeline_cls, \
+                patch("pagr.etl_manager.BondAnalyticsService") as bonds_cls:
+            pipeline_cls.return_value.execute.return_value = (
+                Portfolio(name="Growth"), ["CREATE (n);"], PipelineStatistics(),
+            )
+            with pytest.raises(MemgraphQueryError):
+                manager._run_pipeline("growth.csv", lambda stage, stats: None)
+
+        manager._entity_registry.mark_in_graph.assert_not_called()
+        bonds_cls.return_value.refresh.assert_not_called()
+        # Earlier batches may have committed, so the graph version still moves on
+        assert graph.version is not None
+        assert graph.version == manager._graph_version
+
+    def test_failed_first_batch_keeps_old_portfolio(self):
+        """The old portfolio is only deleted inside the write transaction that failed."""
+        graph = FakeGraph()
+        manager = make_manager(graph)
+        graph.execute_transactions.side_effect = MemgraphQueryError("Transaction failed")
+
+        with patch("pagr.etl_manager.ETLPipeline") as pipeline_cls, \
+                patch("pagr.etl_manager.BondAnalyticsService"):
+            pipeline_cls.return_value.execute.return_value = (
+                Portfolio(name="Growth"), ["CREATE (n);"], PipelineStatistics(),
+            )
+            with pytest.raises(MemgraphQueryError):
+                manager._run_pipeline("growth.csv", lambda stage, stats: None)
+
+        manager._orphan_sweeper.delete_portfolio.assert_not_called()
+        assert not any("DELETE" in query for query in graph.queries())
+        (statements,), kwargs = graph.execute_transactions.call_args
+        assert statements[:3] == GraphQueries.replace_portfolio("Growth")
+        assert len(statements) <= kwargs.get("batch_size", 1000)
+
+    def test_batch_deletes_share_first_transaction(self):
+        """Batch uploads replace their portfolios in the first write transaction."""
+        graph = FakeGraph()
+        manager = make_manager(graph)
+        result = MagicMock(portfolios=[Portfolio(name="A"), Portfolio(name="B")], statements=["s1;", "s2;", "s3;"])
+
+        with patch("pagr.etl_manager.ETLPipeline"), \
+                patch("pagr.etl_manager.BatchPipeline") as batch_cls, \
+                patch("pagr.etl_manager.BondAnalyticsService"):
+            batch_cls.return_value.execute.return_value = result
+            manager.process_batch(["a.csv", "b.csv"], transaction_size=2)
+
+        deletes = GraphQueries.replace_portfolio("A") + GraphQueries.replace_portfolio("B")
+        first, rest = graph.execute_transactions.call_args_list
+        assert first.args[0] == deletes + ["s1;", "s2;"]
+        assert first.kwargs == {"batch_size": 8}
+        assert rest.args[0] == ["s3;"]
+        manager._orphan_sweeper.delete_portfolio.assert_not_called()
+
+    def test_registry_resynced_only_after_other_writers(self):
+        """Graph membership is reloaded when the version is not this manager's own."""
+        graph = FakeGraph(version="external")
+        manager = make_manager(graph)
+
+        manager._sync_with_graph()
+        manager.mark_graph_changed()
+        manager._sync_with_graph()
+
+        manager._entity_registry.sync_from_graph.assert_called_once_with(graph)
+        manager._hierarchy_crawler.reset.assert_called_once()
+
+        graph.version = "deleted-elsewhere"
+        manager._sync_with_graph()
+        assert manager._entity_registry.sync_from_graph.call_count == 2
+
+    def test_portfolio_node_is_keyed_by_name(self):
+        """Re-writing a portfolio updates its node instead of creating another."""
+        builder = GraphBuilder()
+        builder.add_portfolio_nodes(Portfolio(name="Growth", created_at="2024-01-01", total_value=10.0))
+
+        assert builder.node_statements[0] == (
+            "MERGE (p:Portfolio {name: 'Growth'}) SET p.created_at = '2024-01-01', p.total_value = 10.0 RETURN p;"
+        )